@@ -0,0 +1,597 @@
+"""SCPI-like TCP command interface for scripted measurements.
+
+CommandServer lets a test station drive the analyser over a plain-text
+TCP connection — the GUI or the headless daemon.  Each line holds one or
+more commands separated by ``;``; keywords are case-insensitive and take
+the SCPI short or long form (``FREQ:CENT`` or ``FREQUENCY:CENTER``), and
+numbers may carry a unit (``433.92MHz``, ``2.5 s``).  Every query answers
+with one line.  Errors are queued per client and read with ``SYST:ERR?``;
+a query that fails answers with an empty line so a script never hangs.
+
+    *IDN?  *OPC?  *CLS  SYST:ERR?
+    FREQ:STAR|STOP|CENT|SPAN <Hz>      and the same with ?
+    FFT:SIZE <n>                       FFT:SIZE?
+    TRAC?                              the current trace, comma separated
+    TRAC? <n>                          the next n new traces, ';' between them
+    TRAC:MAXH? <s>                     max hold of the new traces over s seconds
+    TRAC:FREQ?                         first bin, last bin, bin count; one such
+                                       triple per evenly spaced run, ';' between
+                                       them, for bands with gaps or mixed bin sizes
+    CALC:MARK<1|2>:X <Hz>              X?  Y?  MAX
+    CALC:MARK:AOFF
+    CALC:BPOW? [<Hz>,<Hz>]             band power, default between markers 1 and 2
+    CALC:PEAK? [<n>]                   strongest peaks as freq,power pairs
+
+The network thread only reads lines and writes replies.  Commands run on
+the pipeline thread in ``service()``, which DataProcessor (GUI) and
+HeadlessAnalyser call once per tick, so they never race the DSP.  Batched
+queries (``TRAC? n``, ``TRAC:MAXH? s``) collect the frames the pipeline
+publishes and answer in one round trip; a client's later commands wait
+until its batch completes.
+"""
+
+import logging
+import re
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+from datasources.base import SampleDataSource
+from utils.frequency_helpers import grid_segments
+from utils.signal_processing import find_top_peaks
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 5025                       # the usual SCPI socket port
+IDENTITY = "TopDog,Spectrum Analyser,0,1.0"
+
+_BATCH_TIMEOUT_S = 30.0
+_MAX_BATCH_TRACES = 1000
+_MAX_ERRORS = 16
+_MAX_LINE = 4096
+
+_NO_ERROR = '0,"No error"'
+_E_COMMAND = (-100, "Command error")
+_E_PARAMETER = (-109, "Missing parameter")
+_E_DATA_TYPE = (-104, "Data type error")
+_E_HEADER = (-113, "Undefined header")
+_E_EXECUTION = (-200, "Execution error")
+_E_CONFLICT = (-221, "Settings conflict")
+_E_RANGE = (-222, "Data out of range")
+_E_NO_DATA = (-230, "Data stale or not available")
+_E_HARDWARE = (-241, "Hardware missing")
+_E_OVERFLOW = (-350, "Queue overflow")
+
+# Long forms accepted for each short keyword
+_LONG_FORMS = {
+    'SENSE': 'SENS', 'FREQUENCY': 'FREQ', 'START': 'STAR', 'CENTER': 'CENT', 'CENTRE': 'CENT',
+    'TRACE': 'TRAC', 'MAXHOLD': 'MAXH', 'CALCULATE': 'CALC', 'MARKER': 'MARK',
+    'MAXIMUM': 'MAX', 'BPOWER': 'BPOW', 'PEAKS': 'PEAK', 'SYSTEM': 'SYST', 'ERROR': 'ERR',
+}
+_MARKER = re.compile(r"CALC:MARK([12]?):(X|Y|MAX|AOFF)$")
+_UNITS = {'HZ': 1.0, 'KHZ': 1e3, 'MHZ': 1e6, 'GHZ': 1e9, 'S': 1.0, 'MS': 1e-3, 'DBM': 1.0, 'DB': 1.0}
+_NUMBER = re.compile(r"^([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*([A-Za-z]*)$")
+
+
+class CommandError(Exception):
+    """A command failed; carries the SCPI error code and message."""
+
+    def __init__(self, error: tuple, detail: str = ""):
+        super().__init__(detail or error[1])
+        self.code, self.message = error
+        self.detail = detail
+
+
+def _number(text: str) -> float:
+    match = _NUMBER.match(text.strip())
+    if not match:
+        raise CommandError(_E_DATA_TYPE, f"'{text}' is not a number")
+    value, unit = match.groups()
+    scale = _UNITS.get(unit.upper()) if unit else 1.0
+    if scale is None:
+        raise CommandError(_E_DATA_TYPE, f"Unknown unit '{unit}'")
+    return float(value) * scale
+
+
+def _header(text: str) -> str:
+    """Normalise a command header to upper-case short forms, without a leading SENS:."""
+    text = text.strip().upper().lstrip(':')
+    query = text.endswith('?')
+    parts = [_LONG_FORMS.get(p, p) for p in text.rstrip('?').split(':')]
+    if parts[0] == 'SENS' and len(parts) > 1:
+        parts = parts[1:]
+    return ':'.join(parts) + ('?' if query else '')
+
+
+def _format_trace(power: np.ndarray) -> str:
+    return ",".join(map("{:.2f}".format, np.asarray(power, dtype=np.float64).tolist()))
+
+
+class _Batch:
+    """A batched query collecting published frames for one client."""
+
+    __slots__ = ('kind', 'remaining', 'deadline', 'expires', 'traces', 'hold', 'grid')
+
+    def __init__(self, kind: str, remaining: int = 0, deadline: float = 0.0):
+        self.kind = kind                  # 'traces' or 'maxhold'
+        self.remaining = remaining
+        self.deadline = deadline
+        self.expires = time.monotonic() + max(_BATCH_TIMEOUT_S, deadline - time.monotonic())
+        self.traces: list = []
+        self.hold: Optional[np.ndarray] = None
+        self.grid = None
+
+
+class _Client:
+    def __init__(self, conn, address):
+        self.conn = conn
+        self.address = address
+        self.inbuf = b""
+        self.lines: deque = deque()       # appended by the network thread, run by service()
+        self.out = bytearray()
+        self.errors: deque = deque(maxlen=_MAX_ERRORS)
+        self.batch: Optional[_Batch] = None
+        self.queries = 0
+
+
+class CommandServer:
+    """Accepts measurement commands over TCP and runs them on the pipeline thread.
+
+    Also usable as a headless sink (``set_source``, ``write_frame``,
+    ``write_peaks``, ``write_event``, ``close``); HeadlessAnalyser then
+    calls ``service()`` every step.
+
+    Args:
+        host: Interface to listen on (local only by default).
+        port: TCP port (0 picks a free one; see ``address``).
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT):
+        self._listener = socket.create_server((host, port), backlog=8)
+        self._listener.setblocking(False)
+        self.address = self._listener.getsockname()[:2]
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._listener, selectors.EVENT_READ)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        self._lock = threading.Lock()
+        self._clients: dict = {}          # socket -> _Client
+        self._last_power: Optional[np.ndarray] = None
+        self.queries_served = 0
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, name="CommandServer", daemon=True)
+        self._thread.start()
+        logger.info(f"Command server listening on {self.address[0]}:{self.address[1]}")
+
+    @property
+    def client_count(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+    def get_stats(self) -> list:
+        """Per-client {'address', 'queries'}."""
+        with self._lock:
+            return [{'address': c.address, 'queries': c.queries} for c in self._clients.values()]
+
+    # ------------------------------------------------------------------
+    # Pipeline thread
+    # ------------------------------------------------------------------
+
+    def service(self, mw) -> None:
+        """Run every client's queued commands against ``mw``.
+
+        ``mw`` is the main window, or a HeadlessAnalyser standing in for
+        it.  Call on the pipeline thread once per tick.
+        """
+        with self._lock:
+            clients = list(self._clients.values())
+        now = time.monotonic()
+        for client in clients:
+            batch = client.batch
+            if batch is not None and (now >= batch.expires
+                                      or (batch.kind == 'maxhold' and now >= batch.deadline)):
+                self._finish_batch(client)
+            while client.batch is None and client.lines:
+                self._run_line(client, client.lines.popleft(), mw)
+        if any(c.out for c in clients):
+            self._wake()
+
+    def publish(self, freqs: np.ndarray, power: np.ndarray, timestamp: Optional[float] = None) -> bool:
+        """Feed a processed frame to the pending batched queries.
+
+        Returns:
+            False if the frame repeats the previous one and was not used.
+        """
+        if len(power) == 0:
+            return False
+        if self._last_power is not None and np.array_equal(power, self._last_power, equal_nan=True):
+            return False                  # a sweep source repeating its last sweep
+        self._last_power = np.array(power, dtype=np.float32)
+        with self._lock:
+            waiting = [c for c in self._clients.values() if c.batch is not None]
+        for client in waiting:
+            self._feed(client, freqs, power)
+        return True
+
+    def _feed(self, client: _Client, freqs: np.ndarray, power: np.ndarray) -> None:
+        batch = client.batch
+        if batch.kind == 'traces':
+            batch.traces.append(_format_trace(power))
+            batch.remaining -= 1
+            if batch.remaining <= 0:
+                self._finish_batch(client)
+            return
+        grid = grid_segments(freqs)
+        if batch.hold is None or grid != batch.grid:
+            batch.hold = np.array(power, dtype=np.float64)           # a retune restarts the hold
+            batch.grid = grid
+        else:
+            np.fmax(batch.hold, power, out=batch.hold)
+        if time.monotonic() >= batch.deadline:
+            self._finish_batch(client)
+
+    def _finish_batch(self, client: _Client) -> None:
+        batch, client.batch = client.batch, None
+        if batch.kind == 'traces':
+            if batch.remaining > 0:
+                self._error(client, CommandError(_E_NO_DATA, f"{len(batch.traces)} traces before timeout"))
+            self._reply(client, ";".join(batch.traces))
+        elif batch.hold is None:
+            self._error(client, CommandError(_E_NO_DATA, "No frames during the max hold"))
+            self._reply(client, "")
+        else:
+            self._reply(client, _format_trace(batch.hold))
+        self._wake()
+
+    def _run_line(self, client: _Client, line: str, mw) -> None:
+        commands = [c for c in line.split(';') if c.strip()]
+        for i, command in enumerate(commands):
+            head, _, args = command.strip().partition(' ')
+            header = _header(head)
+            query = header.endswith('?')
+            try:
+                result = self._execute(client, header, args.strip(), mw)
+            except CommandError as e:
+                self._error(client, e)
+                result = "" if query else None
+            except Exception as e:
+                logger.error(f"Command '{command.strip()}' failed: {e}")
+                self._error(client, CommandError(_E_EXECUTION, str(e)))
+                result = "" if query else None
+            if query:
+                client.queries += 1
+                self.queries_served += 1
+            if result is not None:
+                self._reply(client, result)
+            if client.batch is not None:
+                rest = ";".join(commands[i + 1:])
+                if rest:
+                    client.lines.appendleft(rest)     # runs when the batch completes
+                return
+
+    def _reply(self, client: _Client, text: str) -> None:
+        with self._lock:
+            client.out += text.encode("ascii", errors="replace") + b"\n"
+
+    @staticmethod
+    def _error(client: _Client, error: CommandError) -> None:
+        if len(client.errors) == client.errors.maxlen:
+            client.errors[-1] = CommandError(_E_OVERFLOW)
+            return
+        client.errors.append(error)
+
+    # ------------------------------------------------------------------
+    # Commands
+    # ------------------------------------------------------------------
+
+    def _execute(self, client: _Client, header: str, args: str, mw) -> Optional[str]:
+        """Run one command; returns the reply for queries, None otherwise."""
+        if header == '*IDN?':
+            return IDENTITY
+        if header == '*OPC?':
+            return "1"
+        if header == '*CLS':
+            client.errors.clear()
+            return None
+        if header == 'SYST:ERR?':
+            if not client.errors:
+                return _NO_ERROR
+            e = client.errors.popleft()
+            detail = f"; {e.detail}" if e.detail and e.detail != e.message else ""
+            text = f"{e.message}{detail}".replace('"', "'")
+            return f'{e.code},"{text}"'
+        if header.startswith('FREQ:'):
+            return self._frequency(header, args, mw)
+        if header in ('FFT:SIZE', 'FFT:SIZE?'):
+            return self._fft_size(header, args, mw)
+        if header.startswith('TRAC'):
+            return self._trace(client, header, args, mw)
+        if header.startswith('CALC:MARK'):
+            return self._marker(header, args, mw)
+        if header == 'CALC:BPOW?':
+            return self._band_power(args, mw)
+        if header == 'CALC:PEAK?':
+            return self._peaks(args, mw)
+        raise CommandError(_E_HEADER, header)
+
+    @staticmethod
+    def _args(args: str, count: int) -> list:
+        values = [a for a in args.split(',') if a.strip()]
+        if len(values) < count:
+            raise CommandError(_E_PARAMETER)
+        return [_number(v) for v in values]
+
+    def _frequency(self, header: str, args: str, mw) -> Optional[str]:
+        freq = mw.frequency
+        name = header[5:].rstrip('?')
+        values = {'STAR': freq.start, 'STOP': freq.stop, 'CENT': freq.centre, 'SPAN': freq.span}
+        if name not in values:
+            raise CommandError(_E_HEADER, header)
+        if header.endswith('?'):
+            return f"{values[name]:.6f}" if values[name] is not None else ""
+        value = self._args(args, 1)[0]
+        if name == 'STAR':
+            start, stop = value, freq.stop
+        elif name == 'STOP':
+            start, stop = freq.start, value
+        elif name == 'CENT':
+            start, stop = value - freq.span / 2, value + freq.span / 2
+        else:
+            start, stop = freq.centre - value / 2, freq.centre + value / 2
+        if value < 0 or stop <= start:
+            raise CommandError(_E_RANGE, f"{start:.0f} to {stop:.0f} Hz")
+        mw.frequency_manager.set_frequency_range(start, stop)
+        self._last_power = None
+        return None
+
+    @staticmethod
+    def _fft_size(header: str, args: str, mw) -> Optional[str]:
+        src = mw.current_source
+        if not isinstance(src, SampleDataSource):
+            raise CommandError(_E_CONFLICT, "FFT size applies to sample sources")
+        if header.endswith('?'):
+            return str(src.sample_count)
+        size = int(CommandServer._args(args, 1)[0])
+        if size < 16 or size & (size - 1):
+            raise CommandError(_E_RANGE, f"FFT size {size} is not a power of two of at least 16")
+        mw.source_manager.set_fft_size(size)
+        if src.sample_count != size:
+            raise CommandError(_E_CONFLICT, f"Source kept FFT size {src.sample_count}")
+        return None
+
+    @staticmethod
+    def _live(mw) -> tuple:
+        bins, power = mw.frequency_bins, mw.live_power_levels
+        if isinstance(power, tuple):          # stereo audio: the left channel, as the holds use
+            power = power[0]
+        if bins is None or power is None or len(power) != len(bins):
+            raise CommandError(_E_NO_DATA)
+        return bins, power
+
+    def _trace(self, client: _Client, header: str, args: str, mw) -> Optional[str]:
+        if header == 'TRAC?':
+            if not args:
+                return _format_trace(self._live(mw)[1])
+            n = int(self._args(args, 1)[0])
+            if not 1 <= n <= _MAX_BATCH_TRACES:
+                raise CommandError(_E_RANGE, f"Trace count {n}")
+            client.batch = _Batch('traces', remaining=n)
+            return None
+        if header == 'TRAC:MAXH?':
+            seconds = self._args(args, 1)[0]
+            if not 0 < seconds <= 3600:
+                raise CommandError(_E_RANGE, f"Max hold of {seconds} s")
+            client.batch = _Batch('maxhold', deadline=time.monotonic() + seconds)
+            return None
+        if header == 'TRAC:FREQ?':
+            bins, _ = self._live(mw)
+            return ";".join(f"{start:.6f},{stop:.6f},{n}" for start, stop, n in grid_segments(bins))
+        raise CommandError(_E_HEADER, header)
+
+    @staticmethod
+    def _markers(mw):
+        mm = getattr(mw, 'marker_manager', None)
+        if mm is None:
+            raise CommandError(_E_HARDWARE, "Markers are not available")
+        return mm
+
+    def _marker(self, header: str, args: str, mw) -> Optional[str]:
+        match = _MARKER.match(header.rstrip('?'))
+        if not match:
+            raise CommandError(_E_HEADER, header)
+        mm = self._markers(mw)
+        number, op = match.groups()
+        if op == 'AOFF':
+            mm.clear_all()
+            return None
+        name = f"F{number or 1}"
+        if op == 'MAX':
+            self._live(mw)
+            mm.peak(name)
+            return None
+        if op == 'X' and not header.endswith('?'):
+            mm.set_position(name, self._args(args, 1)[0])
+            return None
+        marker = mm.markers[name]
+        if not marker.enabled:
+            raise CommandError(_E_CONFLICT, f"Marker {number or 1} is off")
+        if op == 'X':
+            return f"{marker.position:.6f}"
+        level = mm.level(name)
+        if level is None:
+            raise CommandError(_E_NO_DATA)
+        return f"{level:.2f}"
+
+    def _band_power(self, args: str, mw) -> str:
+        mm = self._markers(mw)
+        if args:
+            f1, f2 = self._args(args, 2)[:2]
+        else:
+            m1, m2 = mm.markers['F1'], mm.markers['F2']
+            if not (m1.enabled and m2.enabled):
+                raise CommandError(_E_CONFLICT, "Band power needs markers 1 and 2 or two frequencies")
+            f1, f2 = m1.position, m2.position
+        self._live(mw)
+        power = mm.band_power(f1, f2)
+        if power is None:
+            raise CommandError(_E_RANGE, "No bins between the two frequencies")
+        return f"{power:.2f}"
+
+    def _peaks(self, args: str, mw) -> str:
+        n = int(self._args(args, 1)[0]) if args else 5
+        if not 1 <= n <= 100:
+            raise CommandError(_E_RANGE, f"Peak count {n}")
+        bins, power = self._live(mw)
+        peaks = find_top_peaks(
+            bins, power, n=n, min_sep_bins=max(10, len(bins) // 50),
+            min_excursion_db=getattr(mw, 'peak_excursion', 10.0))
+        return ",".join(f"{f:.6f},{p:.2f}" for f, p in peaks)
+
+    # ------------------------------------------------------------------
+    # Headless sink interface
+    # ------------------------------------------------------------------
+
+    def set_source(self, source_type: str, cal_offset_db: float) -> None:
+        pass
+
+    def write_frame(self, timestamp: float, freqs: np.ndarray, power: np.ndarray) -> None:
+        self.publish(freqs, power, timestamp)
+
+    def write_peaks(self, timestamp: float, peaks: list) -> None:
+        pass
+
+    def write_event(self, timestamp: float, text: str) -> None:
+        pass
+
+    def close(self) -> None:
+        """Stop listening, send pending replies (waiting up to a second) and disconnect."""
+        if not self._running:
+            return
+        self._running = False
+        self._wake()
+        self._thread.join(timeout=2.0)
+        for client in list(self._clients.values()):
+            try:
+                client.conn.settimeout(1.0)
+                client.conn.sendall(bytes(client.out))
+            except OSError:
+                pass
+            self._drop(client)
+        self._selector.close()
+        for sock in (self._listener, self._wake_r, self._wake_w):
+            sock.close()
+        logger.info("Command server stopped")
+
+    # ------------------------------------------------------------------
+    # Network thread
+    # ------------------------------------------------------------------
+
+    def _wake(self) -> None:
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass                              # a wake-up is already pending
+
+    def _serve(self) -> None:
+        while self._running:
+            for key, events in self._selector.select(timeout=1.0):
+                sock = key.fileobj
+                if sock is self._listener:
+                    self._accept()
+                elif sock is self._wake_r:
+                    try:
+                        while self._wake_r.recv(4096):
+                            pass
+                    except (BlockingIOError, OSError):
+                        pass
+                else:
+                    client = self._clients.get(sock)
+                    if client is None:
+                        continue
+                    if events & selectors.EVENT_READ and not self._receive(client):
+                        continue
+            if not self._running:
+                break
+            for client in list(self._clients.values()):
+                self._flush(client)
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                conn, address = self._listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                logger.error(f"Command server accept failed: {e}")
+                return
+            conn.setblocking(False)
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            client = _Client(conn, address[:2])
+            with self._lock:
+                self._clients[conn] = client
+            self._selector.register(conn, selectors.EVENT_READ)
+            logger.info(f"Command client connected from {address[0]}:{address[1]}")
+
+    def _receive(self, client: _Client) -> bool:
+        """Split received bytes into lines for service(); False if the client hung up."""
+        try:
+            data = client.conn.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return True
+        except OSError:
+            data = b""
+        if not data:
+            self._drop(client)
+            return False
+        lines = (client.inbuf + data).split(b"\n")
+        client.inbuf = lines.pop()
+        if len(client.inbuf) > _MAX_LINE:
+            client.inbuf = b""
+            self._error(client, CommandError(_E_COMMAND, "Line too long"))
+        for line in lines:
+            text = line.decode('ascii', errors='replace').strip()
+            if text:
+                client.lines.append(text)
+        return True
+
+    def _flush(self, client: _Client) -> None:
+        """Send as much of the pending replies as the socket takes without blocking."""
+        with self._lock:
+            if not client.out:
+                self._set_writable(client, False)
+                return
+            try:
+                sent = client.conn.send(client.out)
+            except (BlockingIOError, InterruptedError):
+                sent = 0
+            except OSError:
+                sent = -1
+            if sent >= 0:
+                del client.out[:sent]
+        if sent < 0:
+            self._drop(client)
+            return
+        self._set_writable(client, bool(client.out))
+
+    def _set_writable(self, client: _Client, writable: bool) -> None:
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if writable else 0)
+        try:
+            self._selector.modify(client.conn, events)
+        except (KeyError, ValueError):
+            pass
+
+    def _drop(self, client: _Client) -> None:
+        with self._lock:
+            self._clients.pop(client.conn, None)
+        try:
+            self._selector.unregister(client.conn)
+        except (KeyError, ValueError):
+            pass
+        client.conn.close()
@@ -14,13 +14,19 @@ import numpy as np
 import logging
 
 from datasources.base import SampleDataSource, SweepDataSource
+from datasources.network_source import NetworkSweepDataSource
+from datasources.shared_memory_source import SharedMemorySweepDataSource
 from core.tare_state import TareState
+from core.zero_span import ZeroSpanEngine
 from utils.constants import DisplayMode, UIConstants, FrequencyPresets
-from utils.signal_processing import TraceAverager
-from utils.frequency_helpers import format_hz
+from utils.signal_processing import TraceAverager, minmax_envelope, find_top_peaks
+from utils.frequency_helpers import format_hz, grid_segments
 
 _STALE_DATA_TIMEOUT = 3.0  # seconds
 
+# Sweep sources whose grid is set by another analyser and may change under us
+_REMOTE_GRID_SOURCES = (NetworkSweepDataSource, SharedMemorySweepDataSource)
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,6 +39,7 @@ class DataProcessor:
         DisplayMode.SURFACE,
         DisplayMode.RIBBON,
         DisplayMode.DENSITY,
+        DisplayMode.BANDS,
     })
 
     def __init__(self, main_window, display_manager):
@@ -40,6 +47,8 @@ class DataProcessor:
         self.dm = display_manager
         self._sweep_averager = TraceAverager()
         self._sweep_rate_update_counter = 0
+        self._zero_span = ZeroSpanEngine()
+        self._zs_source = None
 
     def reset_sweep_averager(self) -> None:
         """Reset the sweep averaging buffer (call when switching sources)."""
@@ -53,6 +62,12 @@ class DataProcessor:
         """Periodic entry point: route to the correct processing path and refresh display."""
         mw = self.mw
         dm = self.dm
+        if mw.command_server is not None:
+            mw.command_server.service(mw)     # remote commands run between frames
+        if mw.current_stacked_index == DisplayMode.MULTI_SOURCE:
+            if not mw.paused:
+                self._refresh_multi_source()  # the group's channels run their own pipelines
+            return
         if mw.current_source is None or mw.paused:
             return
 
@@ -72,14 +87,11 @@ class DataProcessor:
             return
 
         try:
-            if isinstance(mw.current_source, SampleDataSource):
-                self._process_sample_data()
-            elif isinstance(mw.current_source, SweepDataSource):
-                self._process_sweep_data()
-            else:
+            if not self.process_frame():
                 mw.status_label.setText(f"Invalid source type: {type(mw.current_source)}")
                 logger.error(f"Invalid source type: {type(mw.current_source)}")
                 return
+            self._publish_frame()
 
             if mw.current_stacked_index == DisplayMode.WATERFALL:
                 tpr = dm._calc_time_per_row()
@@ -92,6 +104,40 @@ class DataProcessor:
             mw.status_label.setText(f"Error updating data: {str(e)}")
             logger.error(f"Error updating data: {str(e)}")
 
+    def process_frame(self) -> bool:
+        """Fetch one frame from the current source and run the DSP stages.
+
+        Calibration, tare, averaging, holds, duty cycle and the peak list are
+        applied and the results left on the main window; no display is
+        touched, so headless callers can use this directly.
+
+        Returns:
+            False if the current source is neither a sample nor a sweep source.
+        """
+        source = self.mw.current_source
+        if isinstance(source, SampleDataSource):
+            self._process_sample_data()
+        elif isinstance(source, SweepDataSource):
+            self._process_sweep_data()
+        else:
+            return False
+        return True
+
+    def _publish_frame(self) -> None:
+        """Hand the processed frame to the frame server, shared-memory ring and command server (all skip repeats)."""
+        mw = self.mw
+        targets = [t for t in (mw.frame_server, mw.frame_ring, mw.command_server) if t is not None]
+        if not targets:
+            return
+        power = mw.live_power_levels
+        if power is None or mw.frequency_bins is None:
+            return
+        if isinstance(power, tuple):          # stereo audio: the left channel, as the holds use
+            power = power[0]
+        if len(power) == len(mw.frequency_bins):
+            for target in targets:
+                target.publish(mw.frequency_bins, power)
+
     # ------------------------------------------------------------------
     # Display routing
     # ------------------------------------------------------------------
@@ -133,6 +179,12 @@ class DataProcessor:
             return
         self._dispatch_widget_data(widget)
 
+    def _refresh_multi_source(self) -> None:
+        """Draw the latest frame of every source in the multi-source group."""
+        widget = self.mw.multi_source_widget
+        if widget.isVisible():
+            widget.update_frames(self.mw.source_manager.source_group.snapshot())
+
     def _check_stale_data(self) -> None:
         """Warn on status label if a sample source has stopped delivering data."""
         mw = self.mw
@@ -200,9 +252,17 @@ class DataProcessor:
                 FrequencyPresets.HACKRF_DEFAULT_STOP
             )
 
-        mw.frequency_bins = np.linspace(
-            mw.frequency.start, mw.frequency.stop, len(power_levels)
-        )
+        source = mw.current_source
+        if isinstance(source, _REMOTE_GRID_SOURCES) and (
+                source.start_freq != mw.frequency.start or source.stop_freq != mw.frequency.stop):
+            mw.frequency_manager.set_frequency_range(source.start_freq, source.stop_freq)   # remote retuned
+
+        if source.has_own_grid and len(source.frequency_grid) == len(power_levels):
+            mw.frequency_bins = source.frequency_grid      # bands end to end, or mixed resolution
+        else:
+            mw.frequency_bins = np.linspace(
+                mw.frequency.start, mw.frequency.stop, len(power_levels)
+            )
 
         power_levels = self._apply_cal_offset(power_levels)
 
@@ -211,6 +271,9 @@ class DataProcessor:
         if np.all(np.isnan(power_levels)):
             return
 
+        if mw.source_manager.sweep_recorder.recording:
+            self._record_sweep(power_levels)
+
         if self._sweep_averager.is_active:
             linear = 10.0 ** (power_levels / 10.0)
             power_levels = 10.0 * np.log10(
@@ -227,6 +290,17 @@ class DataProcessor:
             self._sweep_rate_update_counter = 0
             mw.frequency_manager.update_frequency_values()
 
+    def _record_sweep(self, power_levels: np.ndarray) -> None:
+        """Append the calibrated, unaveraged sweep to the active recording."""
+        mw = self.mw
+        recorder = mw.source_manager.sweep_recorder
+        if not recorder.matches_grid(grid_segments(mw.frequency_bins)):
+            recorder.stop()
+            mw.status_label.setText(
+                f"Sweep recording stopped: frequency grid changed ({recorder.rows} sweeps saved)")
+            return
+        recorder.append(power_levels)
+
     def _process_constellation_data(self) -> None:
         """Fetch raw IQ samples and push to the active constellation widget."""
         mw = self.mw
@@ -258,57 +332,79 @@ class DataProcessor:
                 else:
                     readout.setText("")
 
+    def stop_zero_span(self) -> None:
+        """Detach the zero-span detector from its source and clear its history."""
+        if self._zs_source is not None:
+            self._zs_source.remove_stream_consumer(self._zero_span.process)
+            self._zs_source = None
+        self._zero_span.reset()
+
+    def _zero_span_target(self, source) -> float:
+        """Tune to frequency marker F1 when it lies inside the capture band, else centre."""
+        centre = float(source.centre_freq or 0.0)
+        mm = getattr(self.mw, 'marker_manager', None)
+        marker = mm.markers.get('F1') if mm is not None else None
+        if marker is not None and marker.enabled and marker.position is not None:
+            if abs(marker.position - centre) < float(source.sample_rate) / 2.0:
+                return float(marker.position)
+        return centre
+
     def _process_zero_span_data(self) -> None:
-        """Fetch samples and update the zero-span time-domain display."""
+        """Update the zero-span display from the streaming RBW power detector."""
         mw = self.mw
-        raw = mw.current_source.read_samples_only()
-        if raw is None or len(raw) == 0:
+        dm = self.dm
+        src = mw.current_source
+        engine = self._zero_span
+        if self._zs_source is not src:
+            self.stop_zero_span()
+            src.add_stream_consumer(engine.process)
+            self._zs_source = src
+
+        cal = self._cal_offset_db()
+        engine.configure(float(getattr(src, 'sample_rate', 44100)), float(src.centre_freq or 0.0),
+                         self._zero_span_target(src), dm.zero_span_rbw)
+        # The trigger sees uncalibrated detector output, so shift the level instead
+        engine.trigger.configure(dm.zero_span_trigger_mode, dm.zero_span_trigger_level - cal,
+                                 dm.zero_span_trigger_hysteresis, dm.zero_span_holdoff,
+                                 dm.zero_span_pre_trigger)
+
+        # Sources without a reader thread capture on demand; this read also
+        # keeps streaming sources' display queues drained.
+        src.read_samples_only()
+
+        values, total = engine.snapshot()
+        if len(values) == 0:
             return
+        buf = values + cal if cal != 0.0 else values
+        out_rate = engine.output_rate
+        dt = 1.0 / out_rate
 
-        if raw.ndim == 2:
-            raw = raw.mean(axis=1)
-        samples = (
-            raw.real if np.iscomplexobj(raw) else raw.ravel()
-        ).astype(np.float32)
-
-        sample_rate = float(getattr(mw.current_source, 'sample_rate', 44100))
-        _ZS_BUFFER_SECONDS = 2.0
-
-        buf = self.dm.zero_span_buffer
-        buf = samples if buf is None else np.concatenate((buf, samples))
-        max_buf = int(_ZS_BUFFER_SECONDS * sample_rate)
-        if len(buf) > max_buf:
-            buf = buf[-max_buf:]
-        self.dm.zero_span_buffer = buf
-
-        n_display = max(int(self.dm.zero_span_time_window * sample_rate), 4)
-
-        if len(buf) < n_display:
-            chunk = buf
-        elif self.dm.zero_span_trigger_mode == "free_run":
+        n_display = max(int(dm.zero_span_time_window * out_rate), 4)
+        t0 = 0.0
+        if dm.zero_span_trigger_mode == "free_run":
             chunk = buf[-n_display:]
         else:
-            search_end   = len(buf) - n_display
-            search_start = max(0, search_end - n_display * 8)
-            level = self.dm.zero_span_trigger_level
-            if search_end > search_start:
-                seg = buf[search_start:search_end]
-                if self.dm.zero_span_trigger_mode == "rise":
-                    mask = (seg[:-1] < level) & (seg[1:] >= level)
-                else:
-                    mask = (seg[:-1] >= level) & (seg[1:] < level)
-                crossings = np.where(mask)[0]
-            else:
-                crossings = np.array([], dtype=int)
-
-            if len(crossings) > 0:
-                cross_idx = search_start + int(crossings[-1]) + 1
-                chunk = buf[cross_idx : cross_idx + n_display]
-            else:
+            # Trigger sits at t = 0 with the pre-trigger depth to its left
+            t0 = -int(engine.trigger.pre_trigger * n_display) * dt
+            start = engine.trigger.window_start(total, n_display, len(buf))
+            if start is None:
                 chunk = buf[-n_display:]
-
-        time_s = np.arange(len(chunk), dtype=np.float32) / sample_rate
-        mw.zero_span_widget.update_zero_span_data(time_s, chunk)
+            else:
+                offset = start - (total - len(buf))
+                chunk = buf[offset:offset + n_display]
+
+        # Reduce to a per-pixel min/max envelope so long windows plot cheaply
+        widget = mw.zero_span_widget
+        time_s, env = minmax_envelope(chunk, widget.pixel_width(), dt)
+        widget.update_zero_span_data(time_s + t0, env)
+
+        if dm.duty_cycle_enabled:
+            rises, falls = engine.trigger.edge_times()
+            dm.duty_cycle_analyser.update_from_edges(rises, falls, buf,
+                                                     dm.zero_span_trigger_level)
+            readout = getattr(mw, 'marker_readout_label', None)
+            if readout is not None:
+                readout.setText(dm.duty_cycle_analyser.get_readout())
 
     # ------------------------------------------------------------------
     # DSP helpers
@@ -316,15 +412,19 @@ class DataProcessor:
 
     def _apply_cal_offset(self, power_levels: np.ndarray) -> np.ndarray:
         """Add the per-source calibration offset if one is configured."""
+        offset = self._cal_offset_db()
+        return power_levels + offset if offset != 0.0 else power_levels
+
+    def _cal_offset_db(self) -> float:
+        """Calibration offset in dB for the active source type (0 if none)."""
         mw = self.mw
         cal = getattr(mw, 'calibration_manager', None)
         if cal is None:
-            return power_levels
+            return 0.0
         source_type = mw.source_manager.last_source_type
         if not source_type:
-            return power_levels
-        offset = cal.get_offset(source_type)
-        return power_levels + offset if offset != 0.0 else power_levels
+            return 0.0
+        return cal.get_offset(source_type)
 
     def _apply_tare(self, power_levels: np.ndarray) -> np.ndarray:
         """Accumulate the tare baseline if collecting, then subtract it if active."""
@@ -415,7 +515,7 @@ class DataProcessor:
 
         min_sep  = max(10, len(freq_bins) // 50)
         excursion = getattr(mw, 'peak_excursion', 10.0)
-        peaks = self._find_top_peaks(
+        peaks = find_top_peaks(
             freq_bins, power_levels, n=5,
             min_sep_bins=min_sep, min_excursion_db=excursion
         )
@@ -429,47 +529,6 @@ class DataProcessor:
             ]
             readout.setText("\n".join(lines))
 
-    @staticmethod
-    def _find_top_peaks(freq_bins: np.ndarray, power: np.ndarray,
-                        n: int = 5, min_sep_bins: int = 10,
-                        min_excursion_db: float = 10.0) -> list:
-        """Return up to n (freq, power) tuples for the highest local maxima.
-
-        Two candidates are treated as the same signal unless there is both a
-        minimum bin separation AND a valley at least min_excursion_db below
-        both peaks between them.
-        """
-        if len(power) < 3:
-            return []
-        is_max = (power[1:-1] > power[:-2]) & (power[1:-1] > power[2:])
-        indices = np.where(is_max)[0] + 1
-
-        if len(indices) == 0:
-            return []
-
-        indices = indices[np.argsort(power[indices])[::-1]]
-        selected, selected_power = [], []
-
-        for idx in indices:
-            if len(selected) >= n:
-                break
-            reject = False
-            for sel_idx, sel_pwr in zip(selected, selected_power):
-                if abs(idx - sel_idx) < min_sep_bins:
-                    reject = True
-                    break
-                lo, hi = min(idx, sel_idx), max(idx, sel_idx)
-                valley = float(np.min(power[lo : hi + 1]))
-                if (power[idx] - valley < min_excursion_db
-                        or sel_pwr - valley < min_excursion_db):
-                    reject = True
-                    break
-            if not reject:
-                selected.append(idx)
-                selected_power.append(float(power[idx]))
-
-        return [(float(freq_bins[i]), float(power[i])) for i in selected]
-
     @staticmethod
     def _nan_safe(arr: np.ndarray, fill: float) -> np.ndarray:
         """Return arr with NaN replaced by fill."""
@@ -5,14 +5,20 @@ from datasources.rtl_sweep import RtlSweepDataSource
 from datasources.hackrf_sweep import HackRFSweepDataSource
 from datasources.hackrf_samples import HackrfSamplesDataSource
 from datasources.rtl_samples import RtlSamplesDataSource
+from datasources.file_samples import IQFileSamplesDataSource
+from datasources.sweep_file import SweepFileDataSource
+from datasources.network_source import parse_address
+from datasources.rtl_tcp import DEFAULT_PORT as RTL_TCP_PORT
 from menu.menu_manager import MenuItem
+from displays.multi_source_view import OVERLAY, SIDE_BY_SIDE
 from utils.constants import DisplayMode, UIConstants, FrequencyPresets, MenuButtonId, FFTSize, AmplitudeConstants, SourceType, SourceLimits
-from utils.frequency_helpers import format_hz
+from utils.frequency_helpers import format_hz, format_seconds
 from utils.validators import clamp_centre_span
 from core.export_manager import ExportManager
 from core.display_data_processor import DataProcessor
 from core.tare_state import TareState
 from core.duty_cycle import DutyCycleAnalyser
+from core.iq_history import captures_dir
 from typing import Optional, Dict, Callable
 import logging
 
@@ -36,6 +42,8 @@ class DisplayManager:
         DisplayMode.ZERO_SPAN:         lambda mw: mw.zero_span_widget,
         DisplayMode.RIBBON:            lambda mw: mw.ribbon_widget,
         DisplayMode.DENSITY:           lambda mw: mw.density_widget,
+        DisplayMode.BANDS:             lambda mw: mw.band_view_widget,
+        DisplayMode.MULTI_SOURCE:      lambda mw: mw.multi_source_widget,
     }
 
     def __init__(self, main_window):
@@ -78,7 +86,10 @@ class DisplayManager:
         self.zero_span_trigger_mode:  str   = "free_run"
         self.zero_span_trigger_level: float = 0.0
         self.zero_span_time_window:   float = 0.01
-        self.zero_span_buffer               = None
+        self.zero_span_rbw:           float = 100e3
+        self.zero_span_trigger_hysteresis: float = 1.0   # dB
+        self.zero_span_holdoff:       float = 0.0        # seconds
+        self.zero_span_pre_trigger:   float = 0.1        # fraction of the window
 
         self._data_proc  = DataProcessor(main_window, self)
         self._exporter   = ExportManager(main_window)
@@ -144,7 +155,7 @@ class DisplayManager:
         mw.button_max_hold.setStyleSheet(style)
         if self.max_peak_search_enabled:
             mw.max_power_levels = None  # start fresh on each enable
-        for mode in [DisplayMode.TWO_D, DisplayMode.THREE_D]:
+        for mode in [DisplayMode.TWO_D, DisplayMode.THREE_D, DisplayMode.BANDS]:
             widget = self.DISPLAY_WIDGETS_MAP[mode](mw)
             if hasattr(widget, 'set_max_peak_search_enabled'):
                 widget.set_max_peak_search_enabled(self.max_peak_search_enabled)
@@ -510,12 +521,119 @@ class DisplayManager:
         if source_id == SourceType.HACKRF_SAMPLES.value:
             mw.menu.select_menu("HackRF\nSamples")
 
+    def _open_iq_file(self) -> None:
+        """Pick an IQ recording and play it as the current sample source."""
+        from PyQt6.QtWidgets import QFileDialog
+        mw = self.main_window
+        filename, _ = QFileDialog.getOpenFileName(
+            mw, "Open IQ Recording", str(captures_dir()),
+            "IQ recordings (*.cf32 *.fc32 *.cfile *.cs8 *.sc8 *.cu8 *.uc8);;All files (*)"
+        )
+        if not filename:
+            return
+        mw.source_manager.open_iq_file(filename)
+        if isinstance(mw.current_source, IQFileSamplesDataSource):
+            self.set_analysis_mode(mw.analysis_mode)
+
+    def _control_playback(self, op: Callable) -> None:
+        """Apply ``op`` to the IQ file source and report the playback state."""
+        mw = self.main_window
+        src = mw.current_source
+        if not isinstance(src, IQFileSamplesDataSource):
+            mw.status_label.setText("Playback controls need an IQ file source")
+            return
+        op(src)
+        pacing = f"×{src.speed:g}" if src.pacing == "realtime" else src.pacing
+        loop = "loop" if src.loop else "once"
+        mw.status_label.setText(
+            f"Playback {pacing}, {loop}: {src.position:.1f} s / {src.duration:.1f} s")
+
+    def _open_sweep_file(self) -> None:
+        """Pick a sweep recording and replay it as the current sweep source."""
+        from PyQt6.QtWidgets import QFileDialog
+        mw = self.main_window
+        filename, _ = QFileDialog.getOpenFileName(
+            mw, "Open Sweep Recording", str(captures_dir()),
+            "Sweep recordings (*.sweeps);;All files (*)"
+        )
+        if filename:
+            mw.source_manager.open_sweep_file(filename)
+
+    def _open_network_stream(self) -> None:
+        """Ask for a frame server address and view its stream as the current sweep source."""
+        from PyQt6.QtWidgets import QInputDialog
+        mw = self.main_window
+        last = mw.source_manager.network_address
+        text, ok = QInputDialog.getText(mw, "Network Stream", "Frame server (host:port):",
+                                        text=f"{last[0]}:{last[1]}" if last else "")
+        if not ok or not text.strip():
+            return
+        try:
+            host, port = parse_address(text)
+        except ValueError as e:
+            mw.status_label.setText(f"Network stream: {e}")
+            return
+        mw.source_manager.open_network_stream(host, port)
+
+    def _open_rtl_tcp(self) -> None:
+        """Ask for an rtl_tcp server address and stream its IQ as the current sample source."""
+        from PyQt6.QtWidgets import QInputDialog
+        mw = self.main_window
+        last = mw.source_manager.rtl_tcp_address
+        text, ok = QInputDialog.getText(mw, "rtl_tcp", "rtl_tcp server (host:port):",
+                                        text=f"{last[0]}:{last[1]}" if last else "")
+        if not ok or not text.strip():
+            return
+        try:
+            host, port = parse_address(text, RTL_TCP_PORT)
+        except ValueError as e:
+            mw.status_label.setText(f"rtl_tcp: {e}")
+            return
+        mw.source_manager.open_rtl_tcp(host, port)
+
+    def _add_to_multi_source(self) -> None:
+        """Move the current source into the multi-source group and show the group."""
+        if self.main_window.source_manager.add_to_group():
+            self._show_multi_source(None)
+
+    def _show_multi_source(self, mode: Optional[str]) -> None:
+        """Switch to the multi-source display, optionally changing its layout."""
+        mw = self.main_window
+        if mode is not None:
+            mw.multi_source_widget.set_mode(mode)
+        self._exit_zero_span()
+        self.set_display(DisplayMode.MULTI_SOURCE, UIConstants.BUTTON_ACTIVE_STYLE, None)
+        if not mw.source_manager.source_group.channels:
+            mw.status_label.setText("Multi source: choose a source and Add Current to run it here")
+
+    def _control_sweep_playback(self, op: Callable) -> None:
+        """Apply ``op`` to the sweep file source and report the replay state."""
+        mw = self.main_window
+        src = mw.current_source
+        if not isinstance(src, SweepFileDataSource):
+            mw.status_label.setText("Replay controls need a sweep file source")
+            return
+        op(src)
+        loop = "loop" if src.loop else "once"
+        mw.status_label.setText(
+            f"Replay ×{src.speed:g}, {loop}: {src.position:.1f} s / {src.duration:.1f} s")
+
     _FULL_SPAN = {
         SourceType.HACKRF_SWEEP.value: (
             FrequencyPresets.HACKRF_SWEEP_FULL_START,
             FrequencyPresets.HACKRF_SWEEP_FULL_STOP,
             "Full span: 0 – 7 GHz",
         ),
+        SourceType.HACKRF_ADAPTIVE.value: (
+            FrequencyPresets.HACKRF_SWEEP_FULL_START,
+            FrequencyPresets.HACKRF_SWEEP_FULL_STOP,
+            "Full span: 0 – 7 GHz",
+        ),
+        SourceType.HACKRF_SHARDED.value: (
+            FrequencyPresets.HACKRF_SWEEP_FULL_START,
+            FrequencyPresets.HACKRF_SWEEP_FULL_STOP,
+            "Full span: 0 – 7 GHz",
+        ),
         SourceType.RTL_SWEEP.value: (
             FrequencyPresets.RTL_SWEEP_FULL_START,
             FrequencyPresets.RTL_SWEEP_FULL_STOP,
@@ -538,7 +656,7 @@ class DisplayManager:
         if not self.zero_span_active:
             return
         self.zero_span_active = False
-        self.zero_span_buffer = None
+        self._data_proc.stop_zero_span()
         idx = mw._resolve_display_index()
         self.set_display(idx, UIConstants.BUTTON_ACTIVE_STYLE, None)
         logger.debug("Zero span exited")
@@ -550,7 +668,7 @@ class DisplayManager:
             mw.menu.go_back()
             return
         self.zero_span_active = True
-        self.zero_span_buffer = None
+        self._data_proc.stop_zero_span()
         mw.zero_span_widget._first_data = True
         mw.zero_span_widget.set_trigger_mode(self.zero_span_trigger_mode)
         mw.zero_span_widget.set_trigger_level(self.zero_span_trigger_level)
@@ -568,6 +686,23 @@ class DisplayManager:
         else:
             mw.frequency_manager.change_entry_mode('zero_span_time')
 
+    def _set_zero_span_rbw(self, rbw: float) -> None:
+        self.zero_span_rbw = rbw
+        self.main_window.status_label.setText(f"Zero span RBW: {format_hz(rbw, 3)}")
+
+    def _set_zero_span_hysteresis(self, db: float) -> None:
+        self.zero_span_trigger_hysteresis = db
+        self.main_window.status_label.setText(f"Trigger hysteresis: {db:g} dB")
+
+    def _set_zero_span_holdoff(self, seconds: float) -> None:
+        self.zero_span_holdoff = seconds
+        label = format_seconds(seconds) if seconds > 0 else "off"
+        self.main_window.status_label.setText(f"Trigger holdoff: {label}")
+
+    def _set_zero_span_pre_trigger(self, fraction: float) -> None:
+        self.zero_span_pre_trigger = fraction
+        self.main_window.status_label.setText(f"Pre-trigger: {fraction * 100:.0f}% of window")
+
     def _enter_zero_span_time(self) -> None:
         self.main_window.frequency_manager.change_entry_mode('zero_span_time')
 
@@ -1217,6 +1352,25 @@ class DisplayManager:
             MenuButtonId.ZERO_SPAN_RISE.value:     lambda: self._set_zero_span_trigger_mode("rise"),
             MenuButtonId.ZERO_SPAN_FALL.value:     lambda: self._set_zero_span_trigger_mode("fall"),
             MenuButtonId.ZERO_SPAN_TIME.value:     self._enter_zero_span_time,
+            MenuButtonId.ZERO_SPAN_RBW_1K.value:   lambda: self._set_zero_span_rbw(1e3),
+            MenuButtonId.ZERO_SPAN_RBW_10K.value:  lambda: self._set_zero_span_rbw(10e3),
+            MenuButtonId.ZERO_SPAN_RBW_30K.value:  lambda: self._set_zero_span_rbw(30e3),
+            MenuButtonId.ZERO_SPAN_RBW_100K.value: lambda: self._set_zero_span_rbw(100e3),
+            MenuButtonId.ZERO_SPAN_RBW_300K.value: lambda: self._set_zero_span_rbw(300e3),
+            MenuButtonId.ZERO_SPAN_RBW_1M.value:   lambda: self._set_zero_span_rbw(1e6),
+            MenuButtonId.ZERO_SPAN_HYST_0_5.value: lambda: self._set_zero_span_hysteresis(0.5),
+            MenuButtonId.ZERO_SPAN_HYST_1.value:   lambda: self._set_zero_span_hysteresis(1.0),
+            MenuButtonId.ZERO_SPAN_HYST_3.value:   lambda: self._set_zero_span_hysteresis(3.0),
+            MenuButtonId.ZERO_SPAN_HYST_6.value:   lambda: self._set_zero_span_hysteresis(6.0),
+            MenuButtonId.ZERO_SPAN_HOLDOFF_OFF.value:  lambda: self._set_zero_span_holdoff(0.0),
+            MenuButtonId.ZERO_SPAN_HOLDOFF_100U.value: lambda: self._set_zero_span_holdoff(100e-6),
+            MenuButtonId.ZERO_SPAN_HOLDOFF_1M.value:   lambda: self._set_zero_span_holdoff(1e-3),
+            MenuButtonId.ZERO_SPAN_HOLDOFF_10M.value:  lambda: self._set_zero_span_holdoff(10e-3),
+            MenuButtonId.ZERO_SPAN_HOLDOFF_100M.value: lambda: self._set_zero_span_holdoff(100e-3),
+            MenuButtonId.ZERO_SPAN_PRE_0.value:    lambda: self._set_zero_span_pre_trigger(0.0),
+            MenuButtonId.ZERO_SPAN_PRE_10.value:   lambda: self._set_zero_span_pre_trigger(0.10),
+            MenuButtonId.ZERO_SPAN_PRE_25.value:   lambda: self._set_zero_span_pre_trigger(0.25),
+            MenuButtonId.ZERO_SPAN_PRE_50.value:   lambda: self._set_zero_span_pre_trigger(0.50),
             # FFT / window
             MenuButtonId.HAMMING.value:   lambda: mw.set_window_type("hamming"),
             MenuButtonId.HANNING.value:   lambda: mw.set_window_type("hanning"),
@@ -1235,6 +1389,41 @@ class DisplayManager:
             MenuButtonId.MICROPHONE_SAMPLES.value: lambda: self._activate_sample_source(SourceType.MICROPHONE_SAMPLES.value),
             MenuButtonId.RTL_SWEEP.value:          lambda: mw.source_manager.set_source(SourceType.RTL_SWEEP.value),
             MenuButtonId.HACKRF_SWEEP.value:       lambda: mw.source_manager.set_source(SourceType.HACKRF_SWEEP.value),
+            MenuButtonId.HACKRF_WIDEBAND.value:    lambda: mw.source_manager.set_source(SourceType.HACKRF_WIDEBAND.value),
+            MenuButtonId.HACKRF_ADAPTIVE.value:    lambda: mw.source_manager.set_adaptive_dwell('sweep'),
+            MenuButtonId.HACKRF_ADAPTIVE_IQ.value: lambda: mw.source_manager.set_adaptive_dwell('capture'),
+            MenuButtonId.HACKRF_SHARDED.value:     lambda: mw.source_manager.set_source(SourceType.HACKRF_SHARDED.value),
+            MenuButtonId.HACKRF_MATCH_LEVELS.value: mw.source_manager.match_sharded_levels,
+            MenuButtonId.MULTI_ADD.value:          self._add_to_multi_source,
+            MenuButtonId.MULTI_OVERLAY.value:      lambda: self._show_multi_source(OVERLAY),
+            MenuButtonId.MULTI_SIDE_BY_SIDE.value: lambda: self._show_multi_source(SIDE_BY_SIDE),
+            MenuButtonId.MULTI_REMOVE.value:       mw.source_manager.remove_last_from_group,
+            MenuButtonId.MULTI_CLEAR.value:        mw.source_manager.clear_group,
+            MenuButtonId.HACKRF_BANDS_ISM.value:     lambda: mw.source_manager.set_sweep_bands(FrequencyPresets.ISM_BANDS),
+            MenuButtonId.HACKRF_BANDS_ISM_ALL.value: lambda: mw.source_manager.set_sweep_bands(FrequencyPresets.ISM_ALL_BANDS),
+            MenuButtonId.HACKRF_BANDS_OFF.value:     mw.source_manager.clear_sweep_bands,
+            MenuButtonId.IQ_FILE_OPEN.value:       self._open_iq_file,
+            MenuButtonId.PLAYBACK_REALTIME.value:  lambda: self._control_playback(lambda s: s.set_pacing("realtime", 1.0)),
+            MenuButtonId.PLAYBACK_X4.value:        lambda: self._control_playback(lambda s: s.set_pacing("realtime", 4.0)),
+            MenuButtonId.PLAYBACK_FAST.value:      lambda: self._control_playback(lambda s: s.set_pacing("fast")),
+            MenuButtonId.PLAYBACK_STEP.value:      lambda: self._control_playback(lambda s: s.step()),
+            MenuButtonId.PLAYBACK_LOOP.value:      lambda: self._control_playback(lambda s: s.set_loop(not s.loop)),
+            MenuButtonId.PLAYBACK_REWIND.value:    lambda: self._control_playback(lambda s: s.seek(0.0)),
+            MenuButtonId.PLAYBACK_SKIP.value:      lambda: self._control_playback(
+                lambda s: s.seek(s.position + s.duration / 10)),
+            MenuButtonId.SIM_SAMPLES.value:        lambda: self._activate_sample_source(SourceType.SIM_SAMPLES.value),
+            MenuButtonId.SIM_SWEEP.value:          lambda: mw.source_manager.set_source(SourceType.SIM_SWEEP.value),
+            MenuButtonId.SWEEP_FILE_OPEN.value:    self._open_sweep_file,
+            MenuButtonId.NETWORK_STREAM.value:     self._open_network_stream,
+            MenuButtonId.SHARED_MEMORY.value:      lambda: mw.source_manager.set_source(SourceType.SHARED_MEMORY.value),
+            MenuButtonId.RTL_TCP.value:            self._open_rtl_tcp,
+            MenuButtonId.SWEEP_PLAY_X1.value:      lambda: self._control_sweep_playback(lambda s: s.set_speed(1.0)),
+            MenuButtonId.SWEEP_PLAY_X10.value:     lambda: self._control_sweep_playback(lambda s: s.set_speed(10.0)),
+            MenuButtonId.SWEEP_PLAY_X100.value:    lambda: self._control_sweep_playback(lambda s: s.set_speed(100.0)),
+            MenuButtonId.SWEEP_PLAY_LOOP.value:    lambda: self._control_sweep_playback(lambda s: s.set_loop(not s.loop)),
+            MenuButtonId.SWEEP_PLAY_REWIND.value:  lambda: self._control_sweep_playback(lambda s: s.seek(0.0)),
+            MenuButtonId.SWEEP_PLAY_SKIP.value:    lambda: self._control_sweep_playback(
+                lambda s: s.seek(s.position + s.duration / 10)),
         }
 
     def _amplitude_actions(self) -> dict:
@@ -1290,6 +1479,7 @@ class DisplayManager:
             MenuButtonId.SURFACE.value:   lambda: self._switch_display_format(DisplayMode.SURFACE),
             MenuButtonId.RIBBON.value:    lambda: self._switch_display_format(DisplayMode.RIBBON),
             MenuButtonId.DENSITY.value:   lambda: self._switch_display_format(DisplayMode.DENSITY),
+            MenuButtonId.BANDS.value:     lambda: self._switch_display_format(DisplayMode.BANDS),
             MenuButtonId.LOG_FREQ.value:  self._toggle_log_freq,
             MenuButtonId.TWO_D_FILL_GRADIENT.value: lambda: self._2d_set_fill_type("gradient"),
             MenuButtonId.TWO_D_FILL_SOLID.value:    lambda: self._2d_set_fill_type("solid"),
@@ -1407,6 +1597,7 @@ class DisplayManager:
             MenuButtonId.CONST_POINTS_2K.value:   lambda: self._set_constellation_points(2000),
             MenuButtonId.CONST_POINTS_5K.value:   lambda: self._set_constellation_points(5000),
             MenuButtonId.CONST_POINTS_10K.value:  lambda: self._set_constellation_points(10000),
+            MenuButtonId.CONST_POINTS_100K.value: lambda: self._set_constellation_points(100000),
         }
 
     def _calibration_actions(self) -> dict:
@@ -1436,6 +1627,21 @@ class DisplayManager:
             MenuButtonId.EXPORT_DISPLAY_SVG.value:  lambda: self._exporter.export_display('svg'),
             MenuButtonId.EXPORT_WINDOW_PNG.value:   lambda: self._exporter.export_window('png'),
             MenuButtonId.EXPORT_WINDOW_JPEG.value:  lambda: self._exporter.export_window('jpeg'),
+            MenuButtonId.IQ_SAVE.value:             self._exporter.save_iq_history,
+            MenuButtonId.IQ_HISTORY_1S.value:       lambda: self._exporter.set_iq_history_seconds(1.0),
+            MenuButtonId.IQ_HISTORY_2S.value:       lambda: self._exporter.set_iq_history_seconds(2.0),
+            MenuButtonId.IQ_HISTORY_5S.value:       lambda: self._exporter.set_iq_history_seconds(5.0),
+            MenuButtonId.IQ_HISTORY_10S.value:      lambda: self._exporter.set_iq_history_seconds(10.0),
+            MenuButtonId.SWEEP_RECORD_F16.value:    lambda: self._exporter.start_sweep_recording("float16"),
+            MenuButtonId.SWEEP_RECORD_F32.value:    lambda: self._exporter.start_sweep_recording("float32"),
+            MenuButtonId.SWEEP_RECORD_STOP.value:   self._exporter.stop_sweep_recording,
+            MenuButtonId.FRAME_SERVE_DELTA.value:   lambda: self._exporter.start_frame_server("delta"),
+            MenuButtonId.FRAME_SERVE_INT16.value:   lambda: self._exporter.start_frame_server("int16"),
+            MenuButtonId.FRAME_SERVE_STOP.value:    self._exporter.stop_frame_server,
+            MenuButtonId.FRAME_RING_START.value:    self._exporter.start_frame_ring,
+            MenuButtonId.FRAME_RING_STOP.value:     self._exporter.stop_frame_ring,
+            MenuButtonId.SCPI_START.value:          self._exporter.start_command_server,
+            MenuButtonId.SCPI_STOP.value:           self._exporter.stop_command_server,
         }
 
     # Buttons that start a sample source then set analysis mode
@@ -1449,6 +1655,8 @@ class DisplayManager:
         MenuButtonId.RTL_SAMPLES.value,
         MenuButtonId.MICROPHONE_SAMPLES.value,
         MenuButtonId.HACKRF_SAMPLES.value,
+        MenuButtonId.IQ_FILE.value,
+        MenuButtonId.SIM_SAMPLES.value,
     })
 
     def on_menu_selection(self, item: MenuItem):
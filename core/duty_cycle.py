@@ -2,6 +2,8 @@ import numpy as np
 import logging
 from collections import deque
 
+from utils.frequency_helpers import format_seconds
+
 logger = logging.getLogger(__name__)
 
 _BUFFER_FRAMES = 100  # ~2 s at 20 ms timer
@@ -14,6 +16,9 @@ class DutyCycleAnalyser:
         self.on_power_dbm: float | None = None
         self.off_power_dbm: float | None = None
         self.threshold_dbm: float = -60.0
+        # Edge-timed measurements (set by update_from_edges)
+        self.pulse_width_s: float | None = None
+        self.period_s: float | None = None
 
     def update(self, samples: np.ndarray, threshold_dbm: float) -> None:
         """Update from raw IQ or real samples (computes instantaneous envelope)."""
@@ -37,6 +42,34 @@ class DutyCycleAnalyser:
         self._envelope.append(peak)
         self._recompute(self.threshold_dbm)
 
+    def update_from_edges(self, rise_times: np.ndarray, fall_times: np.ndarray,
+                          power_db: np.ndarray | None = None,
+                          threshold_dbm: float | None = None) -> None:
+        """Update from shared trigger edge timestamps (seconds), e.g. the zero-span trigger.
+
+        Pulse width is each rise to the next fall, period is rise to rise, and
+        duty is their ratio.  ``power_db`` (the detected trace the edges came
+        from) refreshes the on/off power levels when given.
+        """
+        if threshold_dbm is not None:
+            self.threshold_dbm = threshold_dbm
+        rises = np.asarray(rise_times, dtype=np.float64)
+        falls = np.asarray(fall_times, dtype=np.float64)
+        if len(rises) >= 2:
+            self.period_s = float(np.mean(np.diff(rises)))
+        idx = np.searchsorted(falls, rises)
+        paired = idx < len(falls)
+        if np.any(paired):
+            self.pulse_width_s = float(np.mean(falls[idx[paired]] - rises[paired]))
+        if self.period_s and self.pulse_width_s is not None:
+            self.duty_pct = float(np.clip(100.0 * self.pulse_width_s / self.period_s, 0.0, 100.0))
+
+        if power_db is not None and len(power_db):
+            arr = np.asarray(power_db)
+            on_mask = arr >= self.threshold_dbm
+            self.on_power_dbm = float(np.mean(arr[on_mask])) if np.any(on_mask) else None
+            self.off_power_dbm = float(np.mean(arr[~on_mask])) if not np.all(on_mask) else None
+
     def _recompute(self, threshold_dbm: float) -> None:
         if not self._envelope:
             return
@@ -54,12 +87,22 @@ class DutyCycleAnalyser:
         self.duty_pct = 0.0
         self.on_power_dbm = None
         self.off_power_dbm = None
+        self.pulse_width_s = None
+        self.period_s = None
 
     def get_readout(self) -> str:
-        if not self._envelope:
+        if not self._envelope and self.period_s is None:
             return ""
         on = f"{self.on_power_dbm:.1f} dBm" if self.on_power_dbm is not None else "—"
         off = f"{self.off_power_dbm:.1f} dBm" if self.off_power_dbm is not None else "—"
+        timing = ""
+        if self.period_s is not None and self.pulse_width_s is not None:
+            timing = (
+                f'  <span style="color:white;font-weight:bold;">Width:</span> '
+                f'<span style="color:#00ff88;">{format_seconds(self.pulse_width_s)}</span>  '
+                f'<span style="color:white;font-weight:bold;">Period:</span> '
+                f'<span style="color:#00ff88;">{format_seconds(self.period_s)}</span>'
+            )
         return (
             f'<span style="color:white;font-weight:bold;">Duty:</span> '
             f'<span style="color:#00ff88;">{self.duty_pct:.1f}%</span>  '
@@ -67,4 +110,5 @@ class DutyCycleAnalyser:
             f'<span style="color:#00ff88;">{on}</span>  '
             f'<span style="color:white;font-weight:bold;">Off:</span> '
             f'<span style="color:#888888;">{off}</span>'
+            f'{timing}'
         )
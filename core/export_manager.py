@@ -1,13 +1,31 @@
-"""Export functionality for saving display images and full window screenshots."""
+"""Export functionality for display images, window screenshots, retroactive IQ captures, sweep recordings, frame publishing and remote control."""
 
 import logging
+import os
+from core.command_server import CommandServer, DEFAULT_PORT as _SCPI_DEFAULT_PORT
+from core.frame_server import FrameServer
+from utils.frame_protocol import DEFAULT_PORT
+from utils.frame_ring import FrameRing, DEFAULT_NAME as _FRAME_RING_NAME
+from datasources.base import SweepDataSource
+from datasources.sweep_file import SweepFileDataSource
 from utils.constants import DisplayMode
+from utils.frequency_helpers import grid_segments
+from utils import colour_maps
 
 logger = logging.getLogger(__name__)
 
+# The frame server has no authentication, so it too listens locally unless told otherwise
+# (set TDNSA_STREAM_HOST=0.0.0.0 to let other machines view)
+_FRAME_SERVER_HOST = os.environ.get("TDNSA_STREAM_HOST", "127.0.0.1")
+_FRAME_SERVER_PORT = int(os.environ.get("TDNSA_STREAM_PORT", DEFAULT_PORT))
+
+# The command server controls the analyser, so it listens locally unless told otherwise
+_COMMAND_SERVER_HOST = os.environ.get("TDNSA_SCPI_HOST", "127.0.0.1")
+_COMMAND_SERVER_PORT = int(os.environ.get("TDNSA_SCPI_PORT", _SCPI_DEFAULT_PORT))
+
 
 class ExportManager:
-    """Handles all image export operations for the spectrum analyser."""
+    """Handles image, IQ and sweep export operations for the spectrum analyser."""
 
     _EXPORT_FMT = {
         'png':  ('PNG',  '.png'),
@@ -69,14 +87,10 @@ class ExportManager:
                 arr = wf.waterfall_array
                 if arr is None or arr.size == 0:
                     raise RuntimeError("No waterfall data to export yet")
-                norm = np.clip(
-                    (arr - wf.wf_min_db) / max(wf.wf_max_db - wf.wf_min_db, 1e-9),
-                    0.0, 1.0,
-                )
-                lut  = wf._lut_rgba
-                rgba = np.ascontiguousarray(
-                    lut[(norm * 255).astype(np.uint8)], dtype=np.uint8
-                )
+                rgba = np.ascontiguousarray(colour_maps.map_values(
+                    arr, wf.wf_min_db, max(wf.wf_max_db, wf.wf_min_db + 1e-9),
+                    wf._colourmap_name, byte=True,
+                ))
                 h, w = rgba.shape[:2]
                 qi = QImage(bytes(rgba), w, h, w * 4, QImage.Format.Format_RGBA8888)
                 if qi.isNull():
@@ -104,6 +118,8 @@ class ExportManager:
                     DisplayMode.RIBBON:    mw.ribbon_widget,
                     DisplayMode.ZERO_SPAN: mw.zero_span_widget,
                     DisplayMode.DENSITY:   mw.density_widget,
+                    DisplayMode.BANDS:     mw.band_view_widget,
+                    DisplayMode.MULTI_SOURCE: mw.multi_source_widget,
                 }
                 self._save_pixmap(
                     widget_map.get(mode, mw.stacked_widget).grab(), filename, qt_fmt
@@ -135,3 +151,157 @@ class ExportManager:
         except Exception as e:
             mw.status_label.setText(f"Export failed: {e}")
             logger.error(f"Export window error: {e}")
+
+    # ------------------------------------------------------------------
+    # Retroactive IQ capture
+    # ------------------------------------------------------------------
+
+    def save_iq_history(self) -> None:
+        """Dump the held IQ history to the captures directory in the background."""
+        mw = self.mw
+        history = mw.source_manager.iq_history
+        duration = history.duration
+        path = history.save_async()
+        if path is None:
+            mw.status_label.setText("No IQ history to save — start a sample source first")
+            return
+        mw.status_label.setText(f"Saving last {duration:.1f} s of IQ: {path.name}")
+
+    def set_iq_history_seconds(self, seconds: float) -> None:
+        """Change how many seconds of IQ are kept for retroactive capture."""
+        self.mw.source_manager.iq_history.set_seconds(seconds)
+        self.mw.status_label.setText(f"IQ history: last {seconds:g} s")
+
+    # ------------------------------------------------------------------
+    # Sweep recording
+    # ------------------------------------------------------------------
+
+    def start_sweep_recording(self, dtype: str) -> None:
+        """Record every completed sweep of the active sweep source to disk."""
+        mw = self.mw
+        src = mw.current_source
+        if not isinstance(src, SweepDataSource) or isinstance(src, SweepFileDataSource):
+            mw.status_label.setText("Sweep recording needs a live sweep source")
+            return
+        if mw.frequency_bins is None or mw.live_power_levels is None:
+            mw.status_label.setText("Sweep recording: waiting for the first complete sweep")
+            return
+        sm = mw.source_manager
+        cal = getattr(mw, 'calibration_manager', None)
+        offset = cal.get_offset(sm.last_source_type) if cal is not None else 0.0
+        try:
+            path = sm.sweep_recorder.start(mw.frequency.start, mw.frequency.stop,
+                                           len(mw.frequency_bins), dtype,
+                                           source=sm.last_source_type, cal_offset_db=offset,
+                                           segments=grid_segments(mw.frequency_bins))
+        except (OSError, ValueError) as e:
+            mw.status_label.setText(f"Sweep recording failed: {e}")
+            logger.error(f"Sweep recording failed: {e}")
+            return
+        mw.status_label.setText(f"Recording sweeps ({dtype}): {path.name}")
+
+    def stop_sweep_recording(self) -> None:
+        """Finish the sweep recording in progress."""
+        mw = self.mw
+        recorder = mw.source_manager.sweep_recorder
+        duration = recorder.duration
+        path = recorder.stop()
+        if path is None:
+            mw.status_label.setText("No sweep recording in progress")
+            return
+        mw.status_label.setText(
+            f"Saved {recorder.rows} sweeps ({duration:.0f} s): {path.name}")
+
+    # ------------------------------------------------------------------
+    # Frame server
+    # ------------------------------------------------------------------
+
+    def start_frame_server(self, encoding: str) -> None:
+        """Serve every processed frame to remote viewers (restarting with ``encoding``)."""
+        mw = self.mw
+        if mw.frame_server is not None:
+            mw.frame_server.close()
+            mw.frame_server = None
+        try:
+            mw.frame_server = FrameServer(_FRAME_SERVER_HOST, _FRAME_SERVER_PORT, encoding=encoding)
+        except (OSError, ValueError) as e:
+            mw.status_label.setText(f"Frame server failed: {e}")
+            logger.error(f"Frame server failed: {e}")
+            return
+        host, port = mw.frame_server.address
+        mw.status_label.setText(f"Serving frames ({encoding}) on {host}:{port}")
+
+    def stop_frame_server(self) -> None:
+        """Stop serving frames and disconnect the viewers."""
+        mw = self.mw
+        server = mw.frame_server
+        if server is None:
+            mw.status_label.setText("Frame server is not running")
+            return
+        mw.frame_server = None
+        stats = server.get_stats()
+        server.close()
+        mw.status_label.setText(
+            f"Frame server stopped: {server.frames_published} frames, {len(stats)} viewers")
+
+    def start_frame_ring(self) -> None:
+        """Publish every processed frame to local processes through shared memory."""
+        mw = self.mw
+        if mw.frame_ring is not None:
+            mw.status_label.setText(f"Already publishing to shared memory '{mw.frame_ring.name}'")
+            return
+        try:
+            mw.frame_ring = FrameRing(_FRAME_RING_NAME)
+        except FileExistsError:
+            mw.status_label.setText(
+                f"Shared memory '{_FRAME_RING_NAME}' is in use by another analyser")
+            return
+        except (OSError, ValueError) as e:
+            mw.status_label.setText(f"Shared memory publishing failed: {e}")
+            logger.error(f"Shared memory publishing failed: {e}")
+            return
+        mw.status_label.setText(f"Publishing frames to shared memory '{_FRAME_RING_NAME}'")
+
+    def stop_frame_ring(self) -> None:
+        """Stop publishing to shared memory and remove the ring."""
+        mw = self.mw
+        ring = mw.frame_ring
+        if ring is None:
+            mw.status_label.setText("Not publishing to shared memory")
+            return
+        mw.frame_ring = None
+        ring.close()
+        mw.status_label.setText(f"Shared memory publishing stopped: {ring.frames_written} frames")
+
+    # ------------------------------------------------------------------
+    # Command server
+    # ------------------------------------------------------------------
+
+    def start_command_server(self) -> None:
+        """Accept SCPI-like measurement commands over TCP."""
+        mw = self.mw
+        if mw.command_server is not None:
+            host, port = mw.command_server.address
+            mw.status_label.setText(f"Remote control already listening on {host}:{port}")
+            return
+        try:
+            mw.command_server = CommandServer(_COMMAND_SERVER_HOST, _COMMAND_SERVER_PORT)
+        except OSError as e:
+            mw.status_label.setText(f"Remote control failed: {e}")
+            logger.error(f"Command server failed: {e}")
+            return
+        host, port = mw.command_server.address
+        mw.status_label.setText(f"Remote control listening on {host}:{port}")
+
+    def stop_command_server(self) -> None:
+        """Stop accepting commands and disconnect the clients."""
+        mw = self.mw
+        server = mw.command_server
+        if server is None:
+            mw.status_label.setText("Remote control is not running")
+            return
+        mw.command_server = None
+        clients = server.client_count
+        server.close()
+        mw.status_label.setText(
+            f"Remote control stopped: {server.queries_served} queries, {clients} clients")
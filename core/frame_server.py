@@ -0,0 +1,349 @@
+"""TCP publisher of processed spectrum frames for remote viewers.
+
+FrameServer takes the frames DataProcessor produces — in the GUI or in the
+headless daemon — and fans them out to any number of TCP clients using the
+binary format in ``utils.frame_protocol``.  ``publish()`` only quantises
+the frame and queues it; all socket work happens on one network thread.
+
+Each client has a short queue of pending frames.  A client that cannot
+keep up loses the oldest queued frames rather than delaying the others or
+the acquisition loop, and the number dropped is counted per client.  A
+client is sent a delta frame only when it received the frame immediately
+before on the same grid, so it can always reconstruct what it is given;
+otherwise, and every ``keyframe_interval`` frames, it gets a key frame.
+A client that connects is sent the latest frame straight away.
+"""
+
+import logging
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+from utils import frame_protocol as fp
+from utils.frequency_helpers import grid_segments
+
+logger = logging.getLogger(__name__)
+
+ENCODINGS = ("int16", "delta")
+_MAX_EVENTS = 64                  # queued status messages per client
+_CLOSE_FLUSH_S = 1.0
+
+
+class _Frame:
+    """One published frame; encoded payloads are built on first use and shared."""
+
+    __slots__ = ('seq', 'timestamp', 'grid_id', 'grid_msg', 'q', 'previous', '_key', '_delta')
+
+    def __init__(self, seq, timestamp, grid_id, grid_msg, q, previous):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.grid_id = grid_id
+        self.grid_msg = grid_msg
+        self.q = q
+        self.previous = previous      # quantised frame seq - 1 on the same grid, or None
+        self._key = None
+        self._delta = None
+
+    def key(self) -> bytes:
+        if self._key is None:
+            payload = fp.frame_payload(self.q)
+            self._key = fp.encode_header(fp.MSG_FRAME, self.grid_id, self.seq,
+                                         self.timestamp, len(payload)) + payload
+        return self._key
+
+    def delta(self) -> bytes:
+        if self._delta is None:
+            payload = fp.delta_payload(self.q, self.previous)
+            self._delta = fp.encode_header(fp.MSG_DELTA, self.grid_id, self.seq,
+                                           self.timestamp, len(payload)) + payload
+        return self._delta
+
+
+class _Client:
+    def __init__(self, conn, address, queue_depth: int):
+        self.conn = conn
+        self.address = address
+        self.frames: deque = deque(maxlen=queue_depth)
+        self.events: deque = deque(maxlen=_MAX_EVENTS)
+        self.out = memoryview(b"")
+        self.grid_id = None           # last grid sent
+        self.last_seq = None          # last frame sent
+        self.since_key = 0
+        self.sent = 0
+        self.dropped = 0
+        self.bytes_sent = 0
+
+
+class FrameServer:
+    """Serves processed frames to TCP clients.
+
+    Also usable as a headless sink (``set_source``, ``write_frame``,
+    ``write_peaks``, ``write_event``, ``close``).
+
+    Args:
+        host:              Interface to listen on.
+        port:              TCP port (0 picks a free one; see ``address``).
+        encoding:          'delta' or 'int16'.
+        queue_depth:       Frames queued per client before the oldest is dropped.
+        keyframe_interval: Longest run of delta frames between key frames.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = fp.DEFAULT_PORT, encoding: str = "delta",
+                 queue_depth: int = 2, keyframe_interval: int = 50):
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown frame encoding '{encoding}'")
+        self.encoding = encoding
+        self.queue_depth = max(1, int(queue_depth))
+        self.keyframe_interval = max(1, int(keyframe_interval))
+        self._listener = socket.create_server((host, port), backlog=16)
+        self._listener.setblocking(False)
+        self.address = self._listener.getsockname()[:2]
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._listener, selectors.EVENT_READ)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        self._lock = threading.Lock()
+        self._clients: dict = {}      # socket -> _Client
+        self._seq = 0
+        self._grid = None             # ((start, stop, bins), ...) segments
+        self._grid_id = 0
+        self._grid_msg = b""
+        self._last_q: Optional[np.ndarray] = None
+        self._latest: Optional[_Frame] = None    # given to clients as they connect
+        self.frames_published = 0
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, name="FrameServer", daemon=True)
+        self._thread.start()
+        logger.info(f"Frame server listening on {self.address[0]}:{self.address[1]} ({encoding})")
+
+    # ------------------------------------------------------------------
+    # Publishing (one producer thread)
+    # ------------------------------------------------------------------
+
+    @property
+    def client_count(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+    def get_stats(self) -> list:
+        """Per-client {'address', 'sent', 'dropped', 'bytes'}."""
+        with self._lock:
+            return [{'address': c.address, 'sent': c.sent, 'dropped': c.dropped,
+                     'bytes': c.bytes_sent} for c in self._clients.values()]
+
+    def publish(self, freqs: np.ndarray, power: np.ndarray, timestamp: Optional[float] = None) -> bool:
+        """Queue a frame for every client.
+
+        Returns:
+            False if the frame repeats the previous one and was not sent.
+        """
+        if not self._running or len(power) == 0:
+            return False
+        timestamp = time.time() if timestamp is None else timestamp
+        q = fp.quantise(power)
+        grid = grid_segments(freqs)
+        if grid == self._grid:
+            if np.array_equal(q, self._last_q):
+                return False                  # a sweep source repeating its last sweep
+            previous = self._last_q
+        else:
+            self._grid = grid
+            self._grid_id = self._grid_id % 0xFFFF + 1
+            self._grid_msg = fp.encode_grid(self._grid_id, grid, timestamp=timestamp)
+            previous = None
+        self._seq += 1
+        frame = _Frame(self._seq, timestamp, self._grid_id, self._grid_msg, q, previous)
+        self._last_q = q
+        self.frames_published += 1
+        with self._lock:
+            self._latest = frame
+            for client in self._clients.values():
+                if len(client.frames) == client.frames.maxlen:
+                    client.dropped += 1
+                client.frames.append(frame)
+        self._wake()
+        return True
+
+    def send_event(self, text: str, timestamp: Optional[float] = None) -> None:
+        """Send a status message to every client (not subject to frame dropping)."""
+        msg = fp.encode_event(text, time.time() if timestamp is None else timestamp)
+        with self._lock:
+            for client in self._clients.values():
+                client.events.append(msg)
+        self._wake()
+
+    def _wake(self) -> None:
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass                              # a wake-up is already pending
+
+    # ------------------------------------------------------------------
+    # Headless sink interface
+    # ------------------------------------------------------------------
+
+    def set_source(self, source_type: str, cal_offset_db: float) -> None:
+        pass
+
+    def write_frame(self, timestamp: float, freqs: np.ndarray, power: np.ndarray) -> None:
+        self.publish(freqs, power, timestamp)
+
+    def write_peaks(self, timestamp: float, peaks: list) -> None:
+        pass
+
+    def write_event(self, timestamp: float, text: str) -> None:
+        self.send_event(text, timestamp)
+
+    def close(self) -> None:
+        """Stop serving, send each client what is still queued (waiting up to a second) and disconnect."""
+        if not self._running:
+            return
+        self._running = False
+        self._wake()
+        self._thread.join(timeout=2.0)
+        for client in list(self._clients.values()):
+            try:
+                client.conn.settimeout(_CLOSE_FLUSH_S)
+                msg = bytes(client.out) or self._next_message(client)
+                while msg:
+                    client.conn.sendall(msg)
+                    msg = self._next_message(client)
+            except OSError:
+                pass
+            self._drop(client)
+        self._selector.close()
+        for sock in (self._listener, self._wake_r, self._wake_w):
+            sock.close()
+        logger.info("Frame server stopped")
+
+    # ------------------------------------------------------------------
+    # Network thread
+    # ------------------------------------------------------------------
+
+    def _serve(self) -> None:
+        while self._running:
+            for key, events in self._selector.select(timeout=1.0):
+                sock = key.fileobj
+                if sock is self._listener:
+                    self._accept()
+                elif sock is self._wake_r:
+                    try:
+                        while self._wake_r.recv(4096):
+                            pass
+                    except (BlockingIOError, OSError):
+                        pass
+                else:
+                    client = self._clients.get(sock)
+                    if client is None:
+                        continue
+                    if events & selectors.EVENT_READ and not self._discard_input(client):
+                        continue
+                    if events & selectors.EVENT_WRITE:
+                        self._flush(client)
+            if not self._running:
+                break
+            for client in list(self._clients.values()):
+                if not client.out:
+                    self._flush(client)
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                conn, address = self._listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                logger.error(f"Frame server accept failed: {e}")
+                return
+            conn.setblocking(False)
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            client = _Client(conn, address[:2], self.queue_depth)
+            with self._lock:
+                self._clients[conn] = client
+                if self._latest is not None:
+                    client.frames.append(self._latest)
+            self._selector.register(conn, selectors.EVENT_READ)
+            logger.info(f"Frame client connected from {address[0]}:{address[1]}")
+
+    def _discard_input(self, client: _Client) -> bool:
+        """Clients send nothing; a readable socket means data to ignore or a hang-up."""
+        try:
+            if client.conn.recv(4096):
+                return True
+        except (BlockingIOError, InterruptedError):
+            return True
+        except OSError:
+            pass
+        self._drop(client)
+        return False
+
+    def _next_message(self, client: _Client) -> Optional[bytes]:
+        with self._lock:
+            if client.events:
+                return client.events.popleft()
+            if not client.frames:
+                return None
+            frame = client.frames.popleft()
+        parts = []
+        if frame.grid_id != client.grid_id:
+            parts.append(frame.grid_msg)
+            client.grid_id = frame.grid_id
+            client.last_seq = None
+        if (self.encoding == "delta" and frame.previous is not None
+                and client.last_seq == frame.seq - 1 and client.since_key < self.keyframe_interval):
+            parts.append(frame.delta())
+            client.since_key += 1
+        else:
+            parts.append(frame.key())
+            client.since_key = 0
+        client.last_seq = frame.seq
+        client.sent += 1
+        return b"".join(parts)
+
+    def _flush(self, client: _Client) -> None:
+        """Send as much as the socket takes without blocking."""
+        while True:
+            if not client.out:
+                msg = self._next_message(client)
+                if msg is None:
+                    self._set_writable(client, False)
+                    return
+                client.out = memoryview(msg)
+            try:
+                sent = client.conn.send(client.out)
+            except (BlockingIOError, InterruptedError):
+                self._set_writable(client, True)
+                return
+            except OSError:
+                self._drop(client)
+                return
+            client.bytes_sent += sent
+            client.out = client.out[sent:]
+
+    def _set_writable(self, client: _Client, writable: bool) -> None:
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if writable else 0)
+        try:
+            self._selector.modify(client.conn, events)
+        except (KeyError, ValueError):
+            pass
+
+    def _drop(self, client: _Client) -> None:
+        with self._lock:
+            self._clients.pop(client.conn, None)
+        try:
+            self._selector.unregister(client.conn)
+        except (KeyError, ValueError):
+            pass
+        try:
+            client.conn.close()
+        except OSError:
+            pass
+        logger.info(f"Frame client {client.address[0]}:{client.address[1]} disconnected "
+                    f"({client.sent} sent, {client.dropped} dropped)")
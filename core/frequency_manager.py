@@ -96,10 +96,10 @@ class FrequencyManager:
                     sweep_rate = getattr(self.main_window.current_source, 'sweep_rate', None)
                     if sweep_rate:
                         ms = 1000.0 / sweep_rate
-                        if ms >= 1000:
-                            self.main_window.output_sample_rate.setText(f"{ms / 1000:.2f} s")
-                        else:
-                            self.main_window.output_sample_rate.setText(f"{ms:.1f} ms")
+                        text = f"{ms / 1000:.2f} s" if ms >= 1000 else f"{ms:.1f} ms"
+                        if not getattr(self.main_window.current_source, 'stitch_ok', True):
+                            text += " (stitch)"     # multi-device levels disagree at a boundary
+                        self.main_window.output_sample_rate.setText(text)
                     else:
                         self.main_window.output_sample_rate.setText("-")
                 else:
@@ -0,0 +1,555 @@
+"""Acquisition and DSP without a display.
+
+HeadlessAnalyser runs one source through the same DataProcessor stages as
+the GUI — calibration, tare, averaging, max/min hold, duty cycle and the
+peak list — and hands every processed frame, peak list and status event to
+a set of sinks.  Nothing here imports PyQt6, pyqtgraph or vispy, and the
+source classes are imported only when chosen, so a node without a sound
+card or without libhackrf can still run the sources it does have.
+
+Sinks:
+    DirectorySink  frames as a sweep recording (replayable with the Sweep
+                   File source), peaks.jsonl and events.jsonl
+    SocketSink     newline-delimited JSON on a local (Unix domain) socket
+    FrameServer    (core.frame_server) binary frames to remote viewers over TCP
+    FrameRing      (utils.frame_ring) a shared-memory ring for local processes
+    CommandServer  (core.command_server) SCPI-like remote control; its
+                   commands run at the start of every step
+"""
+
+import importlib
+import json
+import logging
+import os
+import socket
+import stat
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from core.calibration_manager import CalibrationManager
+from core.command_server import CommandServer
+from core.display_data_processor import DataProcessor
+from core.duty_cycle import DutyCycleAnalyser
+from core.marker_manager import MarkerManager
+from core.preset_manager import PRESET_FILE
+from core.sweep_recorder import SweepRecorder
+from core.tare_state import TareState
+from datasources.base import SampleDataSource, SweepDataSource
+from utils.constants import SourceType
+from utils.frequency_helpers import grid_segments
+from utils.frequency_selector import FrequencyRange
+
+logger = logging.getLogger(__name__)
+
+# source type -> (module, class); imported on first use
+_SOURCE_CLASSES = {
+    SourceType.RTL_SWEEP.value:          ("datasources.rtl_sweep", "RtlSweepDataSource"),
+    SourceType.HACKRF_SWEEP.value:       ("datasources.hackrf_sweep", "HackRFSweepDataSource"),
+    SourceType.RTL_SAMPLES.value:        ("datasources.rtl_samples", "RtlSamplesDataSource"),
+    SourceType.MICROPHONE_SAMPLES.value: ("datasources.audio_samples", "MicrophoneSamplesDataSource"),
+    SourceType.HACKRF_SAMPLES.value:     ("datasources.hackrf_samples", "HackrfSamplesDataSource"),
+    SourceType.IQ_FILE.value:            ("datasources.file_samples", "IQFileSamplesDataSource"),
+    SourceType.SWEEP_FILE.value:         ("datasources.sweep_file", "SweepFileDataSource"),
+    SourceType.SIM_SAMPLES.value:        ("datasources.simulated", "SimulatedSamplesDataSource"),
+    SourceType.SIM_SWEEP.value:          ("datasources.simulated", "SimulatedSweepDataSource"),
+    SourceType.HACKRF_WIDEBAND.value:    ("datasources.hackrf_wideband", "HackrfWidebandDataSource"),
+    SourceType.HACKRF_ADAPTIVE.value:    ("datasources.hackrf_adaptive", "HackrfAdaptiveDataSource"),
+    SourceType.HACKRF_SHARDED.value:     ("datasources.hackrf_sharded", "HackrfShardedDataSource"),
+}
+_FILE_SOURCES = frozenset({SourceType.IQ_FILE.value, SourceType.SWEEP_FILE.value})
+
+# Sweep bin sizes used by SourceManager when a preset does not give one
+_SWEEP_BIN_SIZES = {
+    SourceType.RTL_SWEEP.value:       10_000,
+    SourceType.HACKRF_SWEEP.value:    30_000,
+    SourceType.SIM_SWEEP.value:       30_000,
+    SourceType.HACKRF_WIDEBAND.value: 30_000,
+    SourceType.HACKRF_ADAPTIVE.value: 500_000,
+    SourceType.HACKRF_SHARDED.value:  30_000,
+}
+_AUDIO_RATE_LIMITS = (8_000, 96_000)
+_HACKRF_LNA_GAIN = 16
+_HACKRF_VGA_GAIN = 20
+_SWEEP_POLL_S = 0.02              # the GUI display timer interval
+_MAX_CLIENT_BACKLOG = 4 * 1024 * 1024
+_CLOSE_FLUSH_S = 1.0
+
+
+def load_preset(selector: str, path: Optional[str] = None) -> tuple[str, dict]:
+    """Find a preset by slot number or (case-insensitive) name.
+
+    Returns:
+        (name, settings)
+    """
+    path = path or PRESET_FILE
+    with open(path) as f:
+        presets = json.load(f)
+    entry = presets.get(str(selector))
+    if entry is None:
+        wanted = str(selector).strip().lower()
+        entry = next((e for e in presets.values()
+                      if str(e.get('name', '')).strip().lower() == wanted), None)
+    if entry is None or not entry.get('settings'):
+        raise KeyError(f"No preset '{selector}' in {path}")
+    return entry.get('name', str(selector)), dict(entry['settings'])
+
+
+# ------------------------------------------------------------------
+# Sinks
+# ------------------------------------------------------------------
+
+class DirectorySink:
+    """Writes frames, peaks and events under one directory.
+
+    Frames go through SweepRecorder, so each run of frames on one grid is a
+    ``frames_NNN.sweeps`` recording; a grid change starts the next file.
+    """
+
+    def __init__(self, directory, dtype: str = "float32"):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.dtype = dtype
+        self._recorder = SweepRecorder()
+        self._files = 0
+        self._source: Optional[str] = None
+        self._cal_offset_db = 0.0
+        self._peaks = open(self.directory / "peaks.jsonl", 'a', buffering=1)
+        self._events = open(self.directory / "events.jsonl", 'a', buffering=1)
+
+    def set_source(self, source_type: str, cal_offset_db: float) -> None:
+        self._source = source_type
+        self._cal_offset_db = cal_offset_db
+
+    def write_frame(self, timestamp: float, freqs: np.ndarray, power: np.ndarray) -> None:
+        rec = self._recorder
+        grid = grid_segments(freqs)
+        if not rec.recording or not rec.matches_grid(grid):
+            rec.stop()
+            self._files += 1
+            rec.start(freqs[0], freqs[-1], len(power), self.dtype,
+                      path=self.directory / f"frames_{self._files:03d}.sweeps",
+                      source=self._source, cal_offset_db=self._cal_offset_db, segments=grid)
+        rec.append(power, timestamp=timestamp)
+
+    def write_peaks(self, timestamp: float, peaks: list) -> None:
+        self._peaks.write(json.dumps({"t": timestamp, "peaks": peaks}) + "\n")
+
+    def write_event(self, timestamp: float, text: str) -> None:
+        self._events.write(json.dumps({"t": timestamp, "event": text}) + "\n")
+
+    def close(self) -> None:
+        self._recorder.stop()
+        self._peaks.close()
+        self._events.close()
+
+
+class SocketSink:
+    """Serves newline-delimited JSON messages on a Unix domain socket.
+
+    Messages are ``{"type": "frame", "t", "start", "stop", "segments", "power"}``,
+    ``{"type": "peaks", "t", "peaks"}`` and ``{"type": "event", "t", "event"}``.
+    A frame's ``segments`` list its grid as [first bin, last bin, bin count]
+    runs, so a band set with gaps between the bands is described exactly.
+    Sends never block the acquisition loop: each client has an output
+    backlog, and a client that lets it grow past 4 MB is disconnected.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        if os.path.lexists(self.path):
+            if not self._is_socket():
+                raise FileExistsError(f"{self.path} exists and is not a socket; not replacing it")
+            os.unlink(self.path)            # left behind by an earlier run
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.path)
+        self._server.listen(8)
+        self._server.setblocking(False)
+        self._clients: dict = {}          # socket -> pending bytes
+
+    def set_source(self, source_type: str, cal_offset_db: float) -> None:
+        pass
+
+    def _is_socket(self) -> bool:
+        try:
+            return stat.S_ISSOCK(os.lstat(self.path).st_mode)
+        except OSError:
+            return False
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            conn.setblocking(False)
+            self._clients[conn] = bytearray()
+
+    def _send(self, message: dict) -> None:
+        self._accept()
+        if not self._clients:
+            return
+        data = (json.dumps(message) + "\n").encode()
+        for conn in list(self._clients):
+            pending = self._clients[conn]
+            pending += data
+            try:
+                sent = conn.send(pending)
+                del pending[:sent]
+            except (BlockingIOError, InterruptedError):
+                pass
+            except OSError:
+                self._drop(conn)
+                continue
+            if len(pending) > _MAX_CLIENT_BACKLOG:
+                logger.warning("Headless socket client too slow; disconnecting")
+                self._drop(conn)
+
+    def _drop(self, conn) -> None:
+        self._clients.pop(conn, None)
+        try:
+            conn.close()
+        except OSError:
+            pass
+
+    def write_frame(self, timestamp: float, freqs: np.ndarray, power: np.ndarray) -> None:
+        self._send({"type": "frame", "t": timestamp, "start": float(freqs[0]),
+                    "stop": float(freqs[-1]), "segments": [list(s) for s in grid_segments(freqs)],
+                    "power": np.round(np.nan_to_num(power, nan=-200.0), 2).tolist()})
+
+    def write_peaks(self, timestamp: float, peaks: list) -> None:
+        self._send({"type": "peaks", "t": timestamp, "peaks": peaks})
+
+    def write_event(self, timestamp: float, text: str) -> None:
+        self._send({"type": "event", "t": timestamp, "event": text})
+
+    def close(self) -> None:
+        """Flush each client's backlog (waiting up to a second) and disconnect."""
+        for conn, pending in list(self._clients.items()):
+            try:
+                conn.settimeout(_CLOSE_FLUSH_S)
+                conn.sendall(pending)
+            except OSError:
+                pass
+            self._drop(conn)
+        self._server.close()
+        if self._is_socket():
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+
+# ------------------------------------------------------------------
+# Analyser
+# ------------------------------------------------------------------
+
+class _StatusEvents:
+    """Receives the status-bar messages DataProcessor writes and turns them into events."""
+
+    def __init__(self, emit):
+        self._emit = emit
+
+    def setText(self, text: str) -> None:
+        if text:
+            self._emit(text)
+
+
+class _PeakList:
+    """Receives the peak list DataProcessor would draw on the 2-D display, and ignores markers."""
+
+    def __init__(self):
+        self.peaks: list = []
+
+    def set_peak_list(self, peaks: list) -> None:
+        self.peaks = peaks
+
+    def set_marker(self, name: str, kind: str, position: float, active: bool = False) -> None:
+        pass
+
+    def clear_marker(self, name: str) -> None:
+        pass
+
+
+class HeadlessAnalyser:
+    """Runs one source through DataProcessor with no display.
+
+    DataProcessor expects a main window and a display manager; this object
+    plays both, carrying only the state the DSP stages read and write.  It
+    also stands in for the source and frequency managers, whose only
+    members used on the data path are ``last_source_type``,
+    ``sweep_recorder`` and ``update_frequency_values``, and which a
+    CommandServer sink reaches through ``set_frequency_range`` and
+    ``set_fft_size``.
+    """
+
+    def __init__(self, settings: dict, sinks=(), source_path: Optional[str] = None,
+                 calibration: Optional[CalibrationManager] = None):
+        source_type = settings.get('source_type')
+        if source_type not in _SOURCE_CLASSES:
+            raise ValueError(f"Unknown source type '{source_type}'")
+        if source_type in _FILE_SOURCES and not source_path:
+            raise ValueError(f"Source '{source_type}' needs a recording path")
+        self.settings = settings
+        self.sinks = list(sinks)
+        self.source_path = source_path
+        self.command_server = next((s for s in self.sinks if isinstance(s, CommandServer)), None)
+        self.cpu_meter = None          # given to a sweep source for its own threads' CPU
+
+        # Main-window state used by DataProcessor
+        self.current_source = None
+        self.paused = False
+        self.frequency = FrequencyRange(float(settings.get('freq_start') or 88e6),
+                                        float(settings.get('freq_stop') or 108e6))
+        self.frequency_bins = None
+        self.live_power_levels = None
+        self.max_power_levels = None
+        self.min_power_levels = None
+        self.min_hold_enabled = bool(settings.get('min_hold_enabled', False))
+        self.tare_active = False
+        self.baseline_power_levels = None
+        self.peak_excursion = float(settings.get('peak_excursion', 6.0))
+        self.calibration_manager = calibration or CalibrationManager()
+        self.status_label = _StatusEvents(self._event)
+        self.two_d_widget = _PeakList()
+        self.waterfall_widget = self.two_d_widget
+        self.source_manager = self
+        self.frequency_manager = self
+        self.display_manager = self
+        self.marker_manager = MarkerManager(self)
+        self.last_source_type = source_type
+        self.sweep_recorder = SweepRecorder()      # never started here
+
+        # Display-manager state used by DataProcessor
+        self.tare_state = TareState()
+        self.max_peak_search_enabled = bool(settings.get('max_hold_enabled', False))
+        self.peak_list_enabled = True
+        self.duty_cycle_enabled = bool(settings.get('duty_cycle_enabled', False))
+        self.duty_cycle_analyser = DutyCycleAnalyser()
+
+        self._proc = DataProcessor(self, self)
+        self._last_frame = None
+        self.frames = 0
+
+    # ------------------------------------------------------------------
+    # Hooks DataProcessor calls on the managers
+    # ------------------------------------------------------------------
+
+    def update_frequency_values(self) -> None:
+        pass
+
+    def _update_tare_button_label(self, label: str) -> None:
+        pass
+
+    def _clear_tare(self) -> None:
+        self.tare_active = False
+        self.baseline_power_levels = None
+        self.tare_state = TareState()
+
+    def change_entry_mode(self, mode: str) -> None:
+        pass
+
+    def set_frequency_range(self, start: float, stop: float) -> None:
+        """Retune the running source; sweep sources and the microphone are restarted.
+
+        Raises:
+            RuntimeError: The source is a recording, whose range is fixed.
+        """
+        if self.last_source_type in _FILE_SOURCES:
+            raise RuntimeError("A recording's frequency range is fixed")
+        old_start, old_stop = self.frequency.start, self.frequency.stop
+        self.frequency.set_start_stop(start, stop)
+        src = self.current_source
+        if (isinstance(src, SampleDataSource)
+                and self.last_source_type != SourceType.MICROPHONE_SAMPLES.value):
+            src.update_frequency(self.frequency.span, self.frequency.centre)
+        elif src is not None:
+            src.stop()
+            self.current_source = None
+            self.start()
+        self.max_power_levels = None
+        self.min_power_levels = None
+        self._last_frame = None
+        self.marker_manager.reposition_on_frequency_change(old_start, old_stop, start, stop)
+
+    def set_fft_size(self, size: int) -> None:
+        """Set the FFT size of a sample source, kept if the source is restarted."""
+        if not isinstance(self.current_source, SampleDataSource):
+            raise RuntimeError("FFT size applies to sample sources")
+        self.current_source.sample_count = int(size)
+        self.settings['fft_size'] = int(size)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def _create_source(self):
+        source_type = self.last_source_type
+        module_name, class_name = _SOURCE_CLASSES[source_type]
+        source_class = getattr(importlib.import_module(module_name), class_name)
+        freq = self.frequency
+        if source_type in _FILE_SOURCES:
+            return source_class(self.source_path)
+        if source_type in _SWEEP_BIN_SIZES:
+            bin_size = int(self.settings.get('sweep_bin_size') or _SWEEP_BIN_SIZES[source_type])
+            src = source_class(freq.start, freq.stop, bin_size=bin_size)
+            bands = self.settings.get('sweep_bands')
+            if bands and hasattr(src, 'set_bands'):
+                src.set_bands([tuple(b) for b in bands])
+                freq.set_start_stop(src.start_freq, src.stop_freq)
+        elif source_type == SourceType.MICROPHONE_SAMPLES.value:
+            lo, hi = _AUDIO_RATE_LIMITS
+            src = source_class(sample_rate=max(lo, min(hi, int(round(freq.span * 2)))), centre_freq=0)
+        else:
+            src = source_class(sample_rate=freq.span, centre_freq=freq.centre)
+        if hasattr(src, 'lna_gain'):
+            src.lna_gain = _HACKRF_LNA_GAIN
+            src.vga_gain = _HACKRF_VGA_GAIN
+        if hasattr(src, 'load_cal_offsets'):
+            src.load_cal_offsets(self.calibration_manager.get_offset)
+        return src
+
+    def start(self, tare: bool = False) -> None:
+        """Create and start the source and apply the preset's processing settings.
+
+        Args:
+            tare: Collect a normalisation baseline from the first frames.
+        """
+        s = self.settings
+        src = self._create_source()
+        if isinstance(src, SweepDataSource):
+            src.cpu_meter = self.cpu_meter
+        src.start(self.frequency)
+        self.current_source = src
+        if self.last_source_type == SourceType.SWEEP_FILE.value:
+            self.frequency.set_start_stop(src.start_freq, src.stop_freq)
+        elif self.last_source_type == SourceType.IQ_FILE.value:
+            self.frequency.set_start_stop(src.centre_freq - src.sample_rate / 2,
+                                          src.centre_freq + src.sample_rate / 2)
+
+        if not isinstance(src, SweepDataSource):
+            if s.get('fft_size'):
+                src.sample_count = int(s['fft_size'])
+            if s.get('window_type') and hasattr(src, 'set_window_type'):
+                src.set_window_type(str(s['window_type']).lower())
+        mode, n = s.get('avg_mode', 'off') or 'off', int(s.get('avg_n', 1) or 1)
+        if hasattr(src, 'set_averaging'):
+            src.set_averaging(mode, n)
+        self._proc._sweep_averager.set_mode(mode, n)
+        if tare:
+            self.tare_state = TareState(collecting=True)
+
+        cal = self.calibration_manager.get_offset(self.last_source_type)
+        for sink in self.sinks:
+            sink.set_source(self.last_source_type, cal)
+        self._event(f"Started {self.last_source_type}: {self.frequency.start / 1e6:.3f}–"
+                    f"{self.frequency.stop / 1e6:.3f} MHz, averaging {mode} ×{n}, "
+                    f"cal {cal:+.1f} dB")
+
+    def stop(self) -> None:
+        if self.current_source is not None:
+            try:
+                self.current_source.stop()
+            except Exception as e:
+                logger.error(f"Error stopping source: {e}")
+            self._event(f"Stopped after {self.frames} frames")
+            self.current_source = None
+        for sink in self.sinks:
+            sink.close()
+        self.sinks = []
+
+    # ------------------------------------------------------------------
+    # Processing
+    # ------------------------------------------------------------------
+
+    def _event(self, text: str) -> None:
+        logger.info(text)
+        t = time.time()
+        for sink in self.sinks:
+            sink.write_event(t, text)
+
+    def step(self) -> bool:
+        """Process one frame and pass it to the sinks.
+
+        Returns:
+            True if a new frame was produced.  Sweep sources repeat their
+            last sweep until the next completes; repeats are not passed on.
+        """
+        if self.command_server is not None:
+            self.command_server.service(self)
+        previous = self.live_power_levels
+        self._proc.process_frame()
+        power = self.live_power_levels
+        if power is None or power is previous:
+            return False
+        if isinstance(power, tuple):          # stereo audio: the left channel, as the holds use
+            power = power[0]
+        if (self._last_frame is not None and len(power) == len(self._last_frame)
+                and np.array_equal(power, self._last_frame, equal_nan=True)):
+            return False
+        self._last_frame = power
+        t = time.time()
+        freqs = self.frequency_bins
+        for sink in self.sinks:
+            sink.write_frame(t, freqs, power)
+            sink.write_peaks(t, self.two_d_widget.peaks)
+        self.frames += 1
+        return True
+
+    def run(self, duration: Optional[float] = None, max_frames: Optional[int] = None,
+            fps: Optional[float] = None, report_interval: float = 10.0,
+            should_stop=None) -> dict:
+        """Process frames until a limit is reached or ``should_stop()`` is true.
+
+        Args:
+            duration:        Seconds to run (None for no limit).
+            max_frames:      Frames to produce (None for no limit).
+            fps:             Upper limit on the processing rate; sample
+                             sources otherwise run as fast as they deliver
+                             and sweep sources are polled every 20 ms.
+            report_interval: Seconds between sustained-rate events.
+            should_stop:     Optional callable polled every frame.
+
+        Returns:
+            {'frames', 'elapsed', 'fps'} for the whole run.
+        """
+        period = 1.0 / fps if fps else (_SWEEP_POLL_S if isinstance(
+            self.current_source, SweepDataSource) else 0.0)
+        start = time.monotonic()
+        first_frame = self.frames
+        window_start, window_frames = start, 0
+        due = start
+        while True:
+            now = time.monotonic()
+            if duration is not None and now - start >= duration:
+                break
+            if max_frames is not None and self.frames - first_frame >= max_frames:
+                break
+            if should_stop is not None and should_stop():
+                break
+            try:
+                if self.step():
+                    window_frames += 1
+            except Exception as e:
+                self._event(f"Error processing frame: {e}")
+                time.sleep(0.1)
+            now = time.monotonic()
+            if now - window_start >= report_interval:
+                self._event(f"Sustained {window_frames / (now - window_start):.1f} fps")
+                window_start, window_frames = now, 0
+            if period:
+                due += period
+                if due > now:
+                    time.sleep(due - now)
+                else:
+                    due = now
+        elapsed = time.monotonic() - start
+        frames = self.frames - first_frame
+        return {'frames': frames, 'elapsed': elapsed,
+                'fps': frames / elapsed if elapsed > 0 else 0.0}
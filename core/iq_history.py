@@ -0,0 +1,213 @@
+"""Always-on IQ history for retroactive capture.
+
+IQHistory is attached to the active SampleDataSource as a stream consumer
+and keeps the last ``seconds`` of IQ in a preallocated complex64 ring, so
+"save the last N seconds" can be done after something has already been
+seen on screen.
+
+The history holds one contiguous stretch of the stream: a retune, or a
+block arriving later than the sample clock allows (a paused or stalled
+source), starts it afresh, so a saved file's duration and start time are
+those of its samples.
+
+Saving never pauses acquisition and keeps the history: the lock is held
+only to note the ring position, and a background thread copies the ring
+out oldest first, drops whatever capture overwrote during the copy, and
+writes the rest to disk as raw cf32 with a JSON sidecar.
+"""
+
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from utils.config_paths import config_dir
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_SECONDS = 2.0
+_MAX_LATE_S = 0.25            # a block this much later than its samples' duration is a gap
+
+
+def captures_dir() -> Path:
+    """Return the directory IQ captures are written to, creating it if necessary."""
+    d = config_dir() / "captures"
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+class IQHistory:
+    """Preallocated ring of the most recent IQ samples from one source.
+
+    ``write`` runs on the source's capture thread; ``attach``, ``save_async``
+    and the setters are called from the GUI thread.  The ring is rebuilt
+    (and emptied) whenever the source's sample rate or centre frequency
+    changes, so every saved file has a single tuning, and emptied after a
+    gap in the stream, so every saved file is contiguous.
+    """
+
+    def __init__(self, seconds: float = _DEFAULT_SECONDS):
+        self._lock = threading.Lock()
+        self.seconds = float(seconds)
+        self.sample_rate: float = 0.0
+        self.centre_freq: float = 0.0
+        self._source = None
+        self._buf: Optional[np.ndarray] = None
+        self._pos = 0
+        self._count = 0
+        self._written = 0             # samples written into the current ring
+        self._end_time = 0.0          # wall-clock time of the newest sample
+        self.gaps = 0                 # histories restarted after a gap in the stream
+
+    @property
+    def duration(self) -> float:
+        """Seconds of IQ currently held."""
+        return self._count / self.sample_rate if self.sample_rate > 0 else 0.0
+
+    # ------------------------------------------------------------------
+    # Source wiring
+    # ------------------------------------------------------------------
+
+    def attach(self, source) -> None:
+        """Start recording from ``source``, replacing any previous source."""
+        if source is self._source:
+            return
+        self.detach()
+        self._source = source
+        source.add_stream_consumer(self.write)
+        logger.debug(f"IQHistory: attached to {type(source).__name__}")
+
+    def detach(self) -> None:
+        """Stop recording and drop the held history."""
+        if self._source is not None:
+            self._source.remove_stream_consumer(self.write)
+            self._source = None
+        with self._lock:
+            self._buf = None
+            self._pos = self._count = 0
+
+    def set_seconds(self, seconds: float) -> None:
+        """Change the history depth; the ring is reallocated on the next block."""
+        with self._lock:
+            self.seconds = float(seconds)
+            self._buf = None
+            self._pos = self._count = 0
+
+    # ------------------------------------------------------------------
+    # Capture (stream-consumer callback)
+    # ------------------------------------------------------------------
+
+    def write(self, samples: np.ndarray) -> None:
+        """Append one captured block."""
+        if samples is None or len(samples) == 0:
+            return
+        if samples.ndim == 2:
+            samples = samples.mean(axis=1)
+        src = self._source
+        rate = float(getattr(src, 'sample_rate', 0) or 0)
+        centre = float(getattr(src, 'centre_freq', 0) or 0)
+        if rate <= 0:
+            return
+        now = time.time()
+        with self._lock:
+            if self._buf is None or rate != self.sample_rate or centre != self.centre_freq:
+                self.sample_rate, self.centre_freq = rate, centre
+                self._buf = np.empty(max(int(self.seconds * rate), 1), dtype=np.complex64)
+                self._pos = self._count = self._written = 0
+            elif self._count and now - self._end_time > len(samples) / rate + _MAX_LATE_S:
+                # Keep writing at _pos, so a save in progress still sees the oldest samples go first
+                self._count = 0
+                self.gaps += 1
+            self._append(samples)
+            self._written += len(samples)
+            self._end_time = now
+
+    def _append(self, samples: np.ndarray) -> None:
+        buf = self._buf
+        cap = len(buf)
+        n = len(samples)
+        if n >= cap:
+            buf[:] = samples[-cap:]
+            self._pos, self._count = 0, cap
+            return
+        first = min(n, cap - self._pos)
+        buf[self._pos:self._pos + first] = samples[:first]
+        buf[:n - first] = samples[first:]
+        self._pos = (self._pos + n) % cap
+        self._count = min(self._count + n, cap)
+
+    # ------------------------------------------------------------------
+    # Dump
+    # ------------------------------------------------------------------
+
+    def save_async(self, path: Optional[Path] = None) -> Optional[Path]:
+        """Write the held history to ``path`` (.cf32) plus a .json sidecar.
+
+        The copy and write happen on a background thread; acquisition
+        continues into the same history, which the save leaves intact.
+
+        Args:
+            path: Destination data file; defaults to a timestamped name in
+                  ``captures_dir()``.
+
+        Returns:
+            The data file path, or None if there is nothing to save.
+        """
+        with self._lock:
+            if self._buf is None or self._count == 0:
+                return None
+            held = (self._buf, self._pos, self._count, self._written, self._end_time)
+            rate, centre = self.sample_rate, self.centre_freq
+
+        buf, pos, count, written, end_time = held
+        if path is None:
+            stamp = datetime.fromtimestamp(end_time - count / rate).strftime("%Y%m%d_%H%M%S")
+            path = captures_dir() / f"iq_{stamp}_{centre / 1e6:.3f}MHz_{rate:.0f}sps.cf32"
+        path = Path(path)
+        meta = {
+            "format":      "cf32",
+            "sample_rate": rate,
+            "centre_freq": centre,
+            "source":      type(self._source).__name__ if self._source is not None else None,
+        }
+        threading.Thread(target=self._write_files, args=(path, held, meta),
+                         daemon=True, name="iq-history-save").start()
+        return path
+
+    def _copy_held(self, held: tuple) -> np.ndarray:
+        """The samples held when ``held`` was noted, oldest first, less any overwritten since."""
+        buf, pos, count, written, _ = held
+        # Oldest sample is at pos once the ring has wrapped, else at pos - count
+        start = (pos - count) % len(buf)
+        if start + count <= len(buf):
+            data = buf[start:start + count].copy()
+        else:
+            data = np.concatenate((buf[start:], buf[:start + count - len(buf)]))
+        with self._lock:
+            # New blocks overwrite the ring from pos on, i.e. the oldest samples first
+            overwritten = self._written - written if self._buf is buf else 0
+        return data[min(overwritten, count):]
+
+    def _write_files(self, path: Path, held: tuple, meta: dict) -> None:
+        data = self._copy_held(held)
+        rate, end_time = meta["sample_rate"], held[4]
+        start_time = end_time - len(data) / rate
+        meta.update({
+            "samples":     len(data),
+            "duration_s":  len(data) / rate,
+            "timestamp":   datetime.fromtimestamp(start_time, timezone.utc).isoformat(),
+            "unix_time":   start_time,
+        })
+        try:
+            with open(path, 'wb') as f:
+                data.tofile(f)
+            with open(path.with_suffix('.json'), 'w') as f:
+                json.dump(meta, f, indent=2)
+            logger.info(f"IQHistory: saved {meta['duration_s']:.2f} s to {path}")
+        except OSError as e:
+            logger.error(f"IQHistory: save to {path} failed: {e}")
@@ -79,21 +79,10 @@ class MarkerManager:
         if marker.kind != 'freq':
             self.main_window.status_label.setText("Snap to peak: select a frequency marker first")
             return
-        bins, levels = self._data()
-        if bins is None:
+        position = self._highest_peak()
+        if position is None:
             return
-
-        threshold = getattr(self.main_window, 'peak_threshold', -200.0)
-        excursion = getattr(self.main_window, 'peak_excursion', 6.0)
-
-        peaks, props = _scipy_find_peaks(levels, height=threshold,
-                                          prominence=excursion, distance=3)
-        if len(peaks) > 0:
-            best = peaks[int(np.argmax(props['peak_heights']))]
-            marker.position = float(bins[best])
-        else:
-            marker.position = float(bins[np.argmax(levels)])
-
+        marker.position = position
         marker.enabled = True
         self._sync_display(self.active_marker)
         self._refresh_status()
@@ -157,6 +146,33 @@ class MarkerManager:
                 self._sync_display(name)
             self._refresh_status()
 
+    def set_position(self, name: str, position: float) -> None:
+        """Enable a marker at ``position`` without selecting it (remote control)."""
+        marker = self.markers[name]
+        marker.position = float(position)
+        marker.enabled = True
+        self._sync_display(name)
+        self._refresh_status()
+
+    def peak(self, name: str) -> bool:
+        """Enable frequency marker ``name`` on the highest peak; False if there is no trace."""
+        position = self._highest_peak()
+        if position is None:
+            return False
+        self.set_position(name, position)
+        return True
+
+    def level(self, name: str):
+        """Live trace level at frequency marker ``name``, or None if it is off or there is no trace."""
+        marker = self.markers[name]
+        bins, levels = self._data()
+        if bins is None or not marker.enabled or marker.position is None:
+            return None
+        idx = int(np.clip(np.searchsorted(bins, marker.position), 1, len(bins) - 1))
+        if marker.position - bins[idx - 1] < bins[idx] - marker.position:
+            idx -= 1
+        return float(levels[idx])
+
     def clear_all(self) -> None:
         mw = self.main_window
         three_d = getattr(mw, 'three_d_widget', None)
@@ -243,6 +259,20 @@ class MarkerManager:
             return None, None
         return bins, levels
 
+    def _highest_peak(self):
+        """Frequency of the highest peak above threshold (else the maximum), or None."""
+        bins, levels = self._data()
+        if bins is None:
+            return None
+        threshold = getattr(self.main_window, 'peak_threshold', -200.0)
+        excursion = getattr(self.main_window, 'peak_excursion', 6.0)
+
+        peaks, props = _scipy_find_peaks(levels, height=threshold,
+                                          prominence=excursion, distance=3)
+        if len(peaks) > 0:
+            return float(bins[peaks[int(np.argmax(props['peak_heights']))]])
+        return float(bins[np.argmax(levels)])
+
     def _refresh_status(self) -> None:
         mw = self.main_window
         parts = []
@@ -288,7 +318,7 @@ class MarkerManager:
         if f1.enabled and f2.enabled:
             delta = f2.position - f1.position
             lines.append(f'{_lbl("ΔF", False)} {_val(format_hz(abs(delta)), self._FREQ_COLOUR)}')
-            bp = self._band_power(f1.position, f2.position)
+            bp = self.band_power(f1.position, f2.position)
             if bp is not None:
                 lines.append(f'{_lbl("Band Power", False)} '
                              f'{_val(f"{bp:.1f} dBm", self._FREQ_COLOUR)}')
@@ -305,7 +335,8 @@ class MarkerManager:
 
         return "<br>".join(lines)
 
-    def _band_power(self, f_start: float, f_stop: float):
+    def band_power(self, f_start: float, f_stop: float):
+        """Total power in dBm between two frequencies, or None if no bins fall inside."""
         bins, levels = self._data()
         if bins is None:
             return None
@@ -0,0 +1,299 @@
+"""Several sources running at once, each through its own pipeline.
+
+SourceGroup runs any number of channels side by side.  A channel is one
+source with its own HeadlessAnalyser — the same DataProcessor stages as the
+GUI, with its own calibration, averaging, holds and peak list — driven by
+its own acquisition thread.  Every processed frame is stamped with the time
+it was produced and kept as the channel's latest frame; a renderer takes a
+``snapshot`` of all channels' latest frames at once and draws them on a
+common frequency axis.
+
+The channels share a CpuBudget.  Each gets an equal share of it, and a
+channel whose frames cost more CPU than its share waits afterwards for long
+enough to bring it back within it, so a greedy source (a large FFT at a
+high sample rate) is slowed down instead of starving the others while
+cheap sources are never held back.
+
+A channel's CPU is what its acquisition thread spends processing frames
+plus what a sweep source spends on its own threads, which it reports after
+every hop or sweep through the source's ``cpu_meter``.  Both are charged
+against one deadline, and each waits on its own thread: a sweep source over
+the channel's share is paused between hops, where waiting on the
+acquisition thread alone would not slow it down.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+
+from core.calibration_manager import CalibrationManager
+from core.headless import HeadlessAnalyser, _SOURCE_CLASSES
+
+logger = logging.getLogger(__name__)
+
+_POLL_S = 0.02                # the GUI display timer interval; no channel runs faster
+_ERROR_BACKOFF_S = 0.1
+_USAGE_SMOOTHING = 0.2        # weight of the newest frame in a channel's CPU usage
+_CREDIT_S = 0.25              # idle time a channel may carry over as CPU allowance
+_JOIN_TIMEOUT_S = 2.0
+
+# Source types a channel can run (those HeadlessAnalyser can create)
+CHANNEL_SOURCE_TYPES = frozenset(_SOURCE_CLASSES)
+
+
+@dataclass
+class SourceFrame:
+    """One processed frame from a channel."""
+    name: str
+    seq: int
+    timestamp: float                      # time.time() when the frame was produced
+    freqs: np.ndarray
+    power: np.ndarray
+    max_power: Optional[np.ndarray] = None
+    peaks: list = field(default_factory=list)
+
+
+def frame_skew(frames: List[SourceFrame]) -> float:
+    """Seconds between the oldest and newest of a set of frames (0 for fewer than two)."""
+    if len(frames) < 2:
+        return 0.0
+    stamps = [f.timestamp for f in frames]
+    return max(stamps) - min(stamps)
+
+
+class CpuBudget:
+    """A CPU allowance shared equally between the channels registered with it.
+
+    Args:
+        cores: The allowance, in CPU cores.
+    """
+
+    def __init__(self, cores: float = 1.0):
+        if cores <= 0:
+            raise ValueError("The CPU budget must be positive")
+        self.cores = float(cores)
+        self._lock = threading.Lock()
+        self._members: set = set()
+
+    def register(self, name: str) -> None:
+        with self._lock:
+            self._members.add(name)
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._members.discard(name)
+
+    @property
+    def share(self) -> float:
+        """Each channel's share, in cores."""
+        with self._lock:
+            return self.cores / max(len(self._members), 1)
+
+    def charge(self, cpu_s: float, wall_s: float) -> float:
+        """Seconds a channel must wait after a frame that took ``cpu_s`` of CPU in ``wall_s``.
+
+        At its share a channel may use ``cpu_s`` of CPU per ``cpu_s / share``
+        seconds, so it waits for whatever part of that the frame itself did
+        not take.
+        """
+        return max(cpu_s / self.share - wall_s, 0.0)
+
+
+class SourceChannel:
+    """One source with its own pipeline and acquisition thread.
+
+    The channel is its analyser's only sink: every frame the analyser passes
+    on becomes the channel's latest SourceFrame.
+
+    Args:
+        name:        Label for the combined display.
+        settings:    Preset settings, as HeadlessAnalyser takes them.
+        budget:      CpuBudget shared with the other channels.
+        source_path: Recording for the file sources.
+        calibration: Calibration offsets (default: the saved ones).
+    """
+
+    def __init__(self, name: str, settings: dict, budget: CpuBudget,
+                 source_path: Optional[str] = None,
+                 calibration: Optional[CalibrationManager] = None):
+        self.name = name
+        self.source_type = settings.get('source_type')
+        self.budget = budget
+        self.analyser = HeadlessAnalyser(settings, sinks=[self], source_path=source_path,
+                                         calibration=calibration)
+        self.analyser.cpu_meter = self._meter_source
+        self.cpu_usage = 0.0          # recent CPU use of the acquisition and source threads, in cores
+        self.throttled = 0            # frames or sweep hops after which the budget made the channel wait
+        self._lock = threading.Lock()
+        self._cost_lock = threading.Lock()
+        self._due = 0.0               # time.monotonic() until which the channel's CPU so far entitles it
+        self._source_cpu = 0.0        # CPU seconds reported by the source's own threads
+        self._latest: Optional[SourceFrame] = None
+        self._seq = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the source and its acquisition thread."""
+        self._stop.clear()
+        self.budget.register(self.name)
+        self.analyser.start()
+        self._thread = threading.Thread(target=self._run, name=f"source-{self.name}", daemon=True)
+        self._thread.start()
+        logger.debug(f"Channel {self.name} started ({self.source_type})")
+
+    def stop(self) -> None:
+        """Stop the acquisition thread and then the source."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=_JOIN_TIMEOUT_S)
+            if self._thread.is_alive():
+                logger.warning(f"Channel {self.name}: acquisition thread did not stop in time")
+            self._thread = None
+        self.budget.unregister(self.name)
+        self.analyser.stop()
+        logger.debug(f"Channel {self.name} stopped after {self._seq} frames")
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def frames(self) -> int:
+        return self._seq
+
+    def latest(self) -> Optional[SourceFrame]:
+        with self._lock:
+            return self._latest
+
+    def _charge(self, cpu_s: float, started: float) -> float:
+        """Seconds to wait after work that took ``cpu_s`` of CPU from ``started`` on.
+
+        The acquisition thread and the source's threads share one deadline,
+        so together they stay within the channel's share.  It trails the
+        present by at most ``_CREDIT_S`` (or the work's own duration), so
+        work running alongside other work is not charged for its time.
+        """
+        with self._cost_lock:
+            now = time.monotonic()
+            start = max(self._due, min(started, now - _CREDIT_S))
+            self._due = start + cpu_s / self.budget.share
+            return self.budget.charge(cpu_s, now - start)
+
+    def _meter_source(self, cpu_s: float, started: float) -> None:
+        """The source's ``cpu_meter``: charge a sweep thread's work and make it wait."""
+        wait = self._charge(cpu_s, started)
+        with self._cost_lock:
+            self._source_cpu += cpu_s
+            if wait > 0:
+                self.throttled += 1
+        if wait > 0:
+            self._stop.wait(wait)
+
+    def _run(self) -> None:
+        source_cpu = 0.0
+        while not self._stop.is_set():
+            started, cpu = time.monotonic(), time.thread_time()
+            try:
+                self.analyser.step()
+            except Exception as e:
+                logger.error(f"Channel {self.name}: error processing frame: {e}")
+                self._stop.wait(_ERROR_BACKOFF_S)
+                continue
+            cpu = time.thread_time() - cpu
+            wall = time.monotonic() - started
+            wait = self._charge(cpu, started)
+            with self._cost_lock:
+                if wait > max(_POLL_S - wall, 0.0):
+                    self.throttled += 1
+                else:
+                    wait = _POLL_S - wall
+                cpu, source_cpu = cpu + self._source_cpu - source_cpu, self._source_cpu
+            self.cpu_usage += _USAGE_SMOOTHING * (cpu / max(wall + wait, 1e-6) - self.cpu_usage)
+            if wait > 0:
+                self._stop.wait(wait)
+
+    # ------------------------------------------------------------------
+    # Sink interface (called by the analyser on the acquisition thread)
+    # ------------------------------------------------------------------
+
+    def set_source(self, source_type: str, cal_offset_db: float) -> None:
+        pass
+
+    def write_frame(self, timestamp: float, freqs: np.ndarray, power: np.ndarray) -> None:
+        held = self.analyser.max_power_levels
+        with self._lock:
+            self._seq += 1
+            self._latest = SourceFrame(self.name, self._seq, timestamp, freqs, power,
+                                       held.copy() if held is not None else None)
+
+    def write_peaks(self, timestamp: float, peaks: list) -> None:
+        with self._lock:
+            if self._latest is not None:
+                self._latest.peaks = list(peaks)
+
+    def write_event(self, timestamp: float, text: str) -> None:
+        logger.info(f"Channel {self.name}: {text}")
+
+    def close(self) -> None:
+        pass
+
+
+class SourceGroup:
+    """The channels running at once and the CPU budget they share.
+
+    Args:
+        cores: CPU allowance shared by every channel, in cores.
+    """
+
+    def __init__(self, cores: float = 1.0):
+        self.budget = CpuBudget(cores)
+        self.channels: List[SourceChannel] = []
+
+    def __len__(self) -> int:
+        return len(self.channels)
+
+    def add(self, name: str, settings: dict, source_path: Optional[str] = None,
+            calibration: Optional[CalibrationManager] = None) -> SourceChannel:
+        """Start a channel for ``settings``; a name already in use gets a number.
+
+        Raises:
+            ValueError: A source type that cannot run in a channel.
+            RuntimeError: The source failed to start.
+        """
+        names = {c.name for c in self.channels}
+        unique, n = name, 2
+        while unique in names:
+            unique, n = f"{name} {n}", n + 1
+        channel = SourceChannel(unique, settings, self.budget, source_path, calibration)
+        channel.start()
+        self.channels.append(channel)
+        return channel
+
+    def remove(self, name: str) -> None:
+        """Stop and remove one channel."""
+        for channel in self.channels:
+            if channel.name == name:
+                self.channels.remove(channel)
+                channel.stop()
+                return
+        raise KeyError(name)
+
+    def clear(self) -> None:
+        """Stop and remove every channel."""
+        channels, self.channels = self.channels, []
+        for channel in channels:
+            channel.stop()
+
+    def snapshot(self) -> List[SourceFrame]:
+        """The latest frame of every channel that has produced one, in the order they were added."""
+        frames = (c.latest() for c in self.channels)
+        return [f for f in frames if f is not None]
@@ -117,6 +117,10 @@ class PresetManager:
         'marker_manager',
     )
 
+    def current_settings(self) -> dict:
+        """The current state as preset settings, without saving it to a slot."""
+        return self._capture()
+
     def _capture(self) -> dict:
         """Collect state from each manager and merge into a single dict."""
         result = {}
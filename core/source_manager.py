@@ -4,6 +4,15 @@ from datasources.hackrf_sweep import HackRFSweepDataSource
 from datasources.rtl_samples import RtlSamplesDataSource
 from datasources.audio_samples import MicrophoneSamplesDataSource
 from datasources.hackrf_samples import HackrfSamplesDataSource
+from datasources.hackrf_wideband import HackrfWidebandDataSource
+from datasources.hackrf_adaptive import HackrfAdaptiveDataSource
+from datasources.hackrf_sharded import HackrfShardedDataSource, cal_key
+from datasources.file_samples import IQFileSamplesDataSource
+from datasources.sweep_file import SweepFileDataSource
+from datasources.simulated import SimulatedSamplesDataSource, SimulatedSweepDataSource
+from datasources.network_source import NetworkSweepDataSource
+from datasources.shared_memory_source import SharedMemorySweepDataSource
+from datasources.rtl_tcp import RtlTcpSamplesDataSource
 from utils.constants import (
     SourceType, FrequencyPresets, SourceLimits,
     UIConstants, MenuButtonId, DisplayMode
@@ -11,6 +20,9 @@ from utils.constants import (
 from utils.frequency_helpers import calculate_frequency_bins_from_range, update_display_frequency_bins, update_all_display_frequency_bins, format_hz
 from utils.validators import clamp_centre_span
 from utils.config_paths import config_dir
+from core.iq_history import IQHistory
+from core.sweep_recorder import SweepRecorder
+from core.multi_source import SourceGroup, CHANNEL_SOURCE_TYPES
 from typing import Optional, Dict, Type
 import logging
 import os
@@ -27,6 +39,16 @@ class SourceManager:
         SourceType.RTL_SAMPLES.value:        "RTL Samples",
         SourceType.MICROPHONE_SAMPLES.value: "Microphone",
         SourceType.HACKRF_SAMPLES.value:     "HackRF Samples",
+        SourceType.IQ_FILE.value:            "IQ File",
+        SourceType.SWEEP_FILE.value:         "Sweep File",
+        SourceType.SIM_SAMPLES.value:        "Simulated Samples",
+        SourceType.SIM_SWEEP.value:          "Simulated Sweep",
+        SourceType.NETWORK.value:            "Network Stream",
+        SourceType.SHARED_MEMORY.value:      "Shared Memory",
+        SourceType.RTL_TCP.value:            "rtl_tcp",
+        SourceType.HACKRF_WIDEBAND.value:    "HackRF Wideband",
+        SourceType.HACKRF_ADAPTIVE.value:    "HackRF Adaptive",
+        SourceType.HACKRF_SHARDED.value:     "HackRF Multi-Device",
     }
 
     # Class-level mapping of source types to classes
@@ -35,19 +57,37 @@ class SourceManager:
         SourceType.HACKRF_SWEEP.value: HackRFSweepDataSource,
         SourceType.RTL_SAMPLES.value: RtlSamplesDataSource,
         SourceType.MICROPHONE_SAMPLES.value: MicrophoneSamplesDataSource,
-        SourceType.HACKRF_SAMPLES.value: HackrfSamplesDataSource
+        SourceType.HACKRF_SAMPLES.value: HackrfSamplesDataSource,
+        SourceType.IQ_FILE.value: IQFileSamplesDataSource,
+        SourceType.SWEEP_FILE.value: SweepFileDataSource,
+        SourceType.SIM_SAMPLES.value: SimulatedSamplesDataSource,
+        SourceType.SIM_SWEEP.value: SimulatedSweepDataSource,
+        SourceType.NETWORK.value: NetworkSweepDataSource,
+        SourceType.SHARED_MEMORY.value: SharedMemorySweepDataSource,
+        SourceType.RTL_TCP.value: RtlTcpSamplesDataSource,
+        SourceType.HACKRF_WIDEBAND.value: HackrfWidebandDataSource,
+        SourceType.HACKRF_ADAPTIVE.value: HackrfAdaptiveDataSource,
+        SourceType.HACKRF_SHARDED.value: HackrfShardedDataSource,
     }
 
     # Mapping from button IDs to source types
     BUTTON_TO_SOURCE: Dict[str, str] = {
         MenuButtonId.RTL_SAMPLES.value: SourceType.RTL_SAMPLES.value,
         MenuButtonId.MICROPHONE_SAMPLES.value: SourceType.MICROPHONE_SAMPLES.value,
-        MenuButtonId.HACKRF_SAMPLES.value: SourceType.HACKRF_SAMPLES.value
+        MenuButtonId.HACKRF_SAMPLES.value: SourceType.HACKRF_SAMPLES.value,
+        MenuButtonId.IQ_FILE.value: SourceType.IQ_FILE.value,
+        MenuButtonId.SIM_SAMPLES.value: SourceType.SIM_SAMPLES.value,
     }
 
     # Source categories for transfer logic
-    _SWEEP_SOURCES  = frozenset({SourceType.RTL_SWEEP.value, SourceType.HACKRF_SWEEP.value})
-    _SAMPLE_SOURCES = frozenset({SourceType.RTL_SAMPLES.value, SourceType.HACKRF_SAMPLES.value})
+    _SWEEP_SOURCES  = frozenset({SourceType.RTL_SWEEP.value, SourceType.HACKRF_SWEEP.value,
+                                 SourceType.SWEEP_FILE.value, SourceType.SIM_SWEEP.value,
+                                 SourceType.NETWORK.value, SourceType.SHARED_MEMORY.value,
+                                 SourceType.HACKRF_WIDEBAND.value, SourceType.HACKRF_ADAPTIVE.value,
+                                 SourceType.HACKRF_SHARDED.value})
+    _SAMPLE_SOURCES = frozenset({SourceType.RTL_SAMPLES.value, SourceType.HACKRF_SAMPLES.value,
+                                 SourceType.IQ_FILE.value, SourceType.SIM_SAMPLES.value,
+                                 SourceType.RTL_TCP.value})
     _AUDIO_SOURCES  = frozenset({SourceType.MICROPHONE_SAMPLES.value})
 
     # Hardware limits: min/max centre frequency and maximum displayable span
@@ -57,6 +97,16 @@ class SourceManager:
         SourceType.RTL_SAMPLES.value:        {'min': SourceLimits.RTL_MIN_FREQ,    'max': SourceLimits.RTL_MAX_FREQ,    'max_span': SourceLimits.RTL_MAX_SAMPLE_RATE},
         SourceType.HACKRF_SAMPLES.value:     {'min': SourceLimits.HACKRF_MIN_FREQ, 'max': SourceLimits.HACKRF_MAX_FREQ, 'max_span': SourceLimits.HACKRF_MAX_SAMPLE_RATE},
         SourceType.MICROPHONE_SAMPLES.value: {'min': 0.0,                          'max': 48000.0,                      'max_span': 48000.0},
+        SourceType.IQ_FILE.value:            {'min': 0.0,                          'max': SourceLimits.HACKRF_MAX_FREQ, 'max_span': SourceLimits.HACKRF_MAX_SAMPLE_RATE},
+        SourceType.SWEEP_FILE.value:         {'min': 0.0,                          'max': SourceLimits.HACKRF_MAX_FREQ, 'max_span': SourceLimits.HACKRF_MAX_FREQ},
+        SourceType.SIM_SAMPLES.value:        {'min': 0.0,                          'max': SourceLimits.HACKRF_MAX_FREQ, 'max_span': SourceLimits.HACKRF_MAX_SAMPLE_RATE},
+        SourceType.SIM_SWEEP.value:          {'min': 0.0,                          'max': SourceLimits.HACKRF_MAX_FREQ, 'max_span': SourceLimits.HACKRF_MAX_FREQ},
+        SourceType.NETWORK.value:            {'min': 0.0,                          'max': SourceLimits.HACKRF_MAX_FREQ, 'max_span': SourceLimits.HACKRF_MAX_FREQ},
+        SourceType.SHARED_MEMORY.value:      {'min': 0.0,                          'max': SourceLimits.HACKRF_MAX_FREQ, 'max_span': SourceLimits.HACKRF_MAX_FREQ},
+        SourceType.RTL_TCP.value:            {'min': SourceLimits.RTL_MIN_FREQ,    'max': SourceLimits.RTL_MAX_FREQ,    'max_span': SourceLimits.RTL_MAX_SAMPLE_RATE},
+        SourceType.HACKRF_WIDEBAND.value:    {'min': SourceLimits.HACKRF_MIN_FREQ, 'max': SourceLimits.HACKRF_MAX_FREQ, 'max_span': SourceLimits.HACKRF_MAX_FREQ - SourceLimits.HACKRF_MIN_FREQ},
+        SourceType.HACKRF_ADAPTIVE.value:    {'min': SourceLimits.HACKRF_MIN_FREQ, 'max': SourceLimits.HACKRF_MAX_FREQ, 'max_span': SourceLimits.HACKRF_MAX_FREQ - SourceLimits.HACKRF_MIN_FREQ},
+        SourceType.HACKRF_SHARDED.value:     {'min': SourceLimits.HACKRF_MIN_FREQ, 'max': SourceLimits.HACKRF_MAX_FREQ, 'max_span': SourceLimits.HACKRF_MAX_FREQ - SourceLimits.HACKRF_MIN_FREQ},
     }
 
     # First-use defaults per source (centre Hz, span Hz)
@@ -67,6 +117,16 @@ class SourceManager:
         SourceType.RTL_SAMPLES.value:        {'centre': 98e6,    'span': 2.048e6},
         SourceType.HACKRF_SAMPLES.value:     {'centre': 2450e6,  'span': 20e6},
         SourceType.MICROPHONE_SAMPLES.value: {'centre': 11025.0, 'span': 22050.0},
+        SourceType.IQ_FILE.value:            {'centre': 98e6,    'span': 2.048e6},
+        SourceType.SWEEP_FILE.value:         {'centre': 2450e6,  'span': 100e6},
+        SourceType.SIM_SAMPLES.value:        {'centre': 100e6,   'span': 10e6},
+        SourceType.SIM_SWEEP.value:          {'centre': 2450e6,  'span': 100e6},
+        SourceType.NETWORK.value:            {'centre': 2450e6,  'span': 100e6},
+        SourceType.SHARED_MEMORY.value:      {'centre': 2450e6,  'span': 100e6},
+        SourceType.RTL_TCP.value:            {'centre': 98e6,    'span': 2.048e6},
+        SourceType.HACKRF_WIDEBAND.value:    {'centre': 2450e6,  'span': 100e6},
+        SourceType.HACKRF_ADAPTIVE.value:    {'centre': 3000e6,  'span': 6000e6},
+        SourceType.HACKRF_SHARDED.value:     {'centre': 3000e6,  'span': 6000e6},
     }
 
     def __init__(self, main_window):
@@ -75,6 +135,13 @@ class SourceManager:
         self._source_memory: Dict[str, Dict] = {}   # source_id → {centre, span}
         self._switch_message: Optional[str] = None  # shown in status bar after switch
         self.paused_rtl_source = None
+        self.iq_history = IQHistory()   # retroactive IQ capture from the active sample source
+        self.iq_file_path: Optional[str] = None   # recording played by the IQ file source
+        self.sweep_recorder = SweepRecorder()     # on-disk recording of the active sweep source
+        self.sweep_file_path: Optional[str] = None   # recording played by the sweep file source
+        self.network_address: Optional[tuple] = None  # (host, port) of the frame server to view
+        self.rtl_tcp_address: Optional[tuple] = None  # (host, port) of the rtl_tcp server
+        self.source_group = SourceGroup()         # sources running alongside, each in its own channel
         self._last_state_path = str(config_dir() / "source_memory.json")
         self._load_last_state()
 
@@ -257,9 +324,9 @@ class SourceManager:
 
         # Clamp span to hardware sample-rate limits; update displayed range to match
         max_span = None
-        if isinstance(src, RtlSamplesDataSource):
+        if isinstance(src, (RtlSamplesDataSource, RtlTcpSamplesDataSource)):
             max_span = SourceLimits.RTL_MAX_SAMPLE_RATE
-        elif isinstance(src, HackrfSamplesDataSource):
+        elif isinstance(src, (HackrfSamplesDataSource, SimulatedSamplesDataSource)):
             max_span = SourceLimits.HACKRF_MAX_SAMPLE_RATE
 
         if max_span is not None and span > max_span:
@@ -315,6 +382,9 @@ class SourceManager:
         if not self.main_window.current_source:
             return
 
+        self.iq_history.detach()
+        if self.sweep_recorder.recording:
+            self.sweep_recorder.stop()
         try:
             if logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"Stopping source: {self.main_window.current_source.__class__.__name__}")
@@ -444,10 +514,33 @@ class SourceManager:
                     self._initialise_hackrf_sweep(source_class)
                 elif source == SourceType.HACKRF_SAMPLES.value:
                     self._initialise_hackrf_samples(source_class)
+                elif source == SourceType.HACKRF_WIDEBAND.value:
+                    self._initialise_hackrf_wideband(source_class)
+                elif source == SourceType.HACKRF_ADAPTIVE.value:
+                    self._initialise_hackrf_adaptive(source_class)
+                elif source == SourceType.HACKRF_SHARDED.value:
+                    self._initialise_hackrf_sharded(source_class)
                 elif source == SourceType.RTL_SAMPLES.value:
                     self._initialise_rtl_samples(source_class)
                 elif source == SourceType.MICROPHONE_SAMPLES.value:
                     self._initialise_microphone_samples(source_class)
+                elif source == SourceType.IQ_FILE.value:
+                    self._initialise_iq_file(source_class)
+                elif source == SourceType.SWEEP_FILE.value:
+                    self._initialise_sweep_file(source_class)
+                elif source == SourceType.SIM_SAMPLES.value:
+                    self._initialise_sim_samples(source_class)
+                elif source == SourceType.SIM_SWEEP.value:
+                    self._initialise_sim_sweep(source_class)
+                elif source == SourceType.NETWORK.value:
+                    self._initialise_network(source_class)
+                elif source == SourceType.SHARED_MEMORY.value:
+                    self._initialise_shared_memory(source_class)
+                elif source == SourceType.RTL_TCP.value:
+                    self._initialise_rtl_tcp(source_class)
+
+            if isinstance(self.main_window.current_source, SampleDataSource):
+                self.iq_history.attach(self.main_window.current_source)
 
             # Enable UI controls and update display
             self._enable_source_controls()
@@ -499,7 +592,7 @@ class SourceManager:
             self.main_window.current_source = source_class(
                 self.main_window.frequency.start,
                 self.main_window.frequency.stop,
-                bin_size=100000
+                bin_size=10000
             )
             self.main_window.current_source.start(self.main_window.frequency)
         except Exception as e:
@@ -523,6 +616,53 @@ class SourceManager:
             logger.error(f"HackRF Sweep start failed: {str(e)}")
             raise
 
+    def _initialise_hackrf_wideband(self, source_class: Type) -> None:
+        """Initialise HackRF wideband source. Frequency already set by _apply_frequency_for_source."""
+        try:
+            mw = self.main_window
+            src = source_class(mw.frequency.start, mw.frequency.stop, bin_size=30000)
+            src.lna_gain = mw.hackrf_lna_gain
+            src.vga_gain = mw.hackrf_vga_gain
+            mw.current_source = src
+            mw.current_source.start(mw.frequency)
+        except Exception as e:
+            self._reset_source_state()
+            self.main_window.status_label.setText(f"HackRF Wideband start failed: {str(e)}")
+            logger.error(f"HackRF Wideband start failed: {str(e)}")
+            raise
+
+    def _initialise_hackrf_adaptive(self, source_class: Type) -> None:
+        """Initialise HackRF adaptive source. Frequency already set by _apply_frequency_for_source."""
+        try:
+            mw = self.main_window
+            src = source_class(mw.frequency.start, mw.frequency.stop, bin_size=500000)
+            src.lna_gain = mw.hackrf_lna_gain
+            src.vga_gain = mw.hackrf_vga_gain
+            mw.current_source = src
+            mw.current_source.start(mw.frequency)
+        except Exception as e:
+            self._reset_source_state()
+            self.main_window.status_label.setText(f"HackRF Adaptive start failed: {str(e)}")
+            logger.error(f"HackRF Adaptive start failed: {str(e)}")
+            raise
+
+    def _initialise_hackrf_sharded(self, source_class: Type) -> None:
+        """Initialise HackRF multi-device source. Frequency already set by _apply_frequency_for_source."""
+        try:
+            mw = self.main_window
+            src = source_class(mw.frequency.start, mw.frequency.stop, bin_size=30000)
+            src.lna_gain = mw.hackrf_lna_gain
+            src.vga_gain = mw.hackrf_vga_gain
+            src.load_cal_offsets(mw.calibration_manager.get_offset)
+            mw.current_source = src
+            mw.current_source.start(mw.frequency)
+            mw.status_label.setText(f"HackRF Multi-Device: {len(src.serials)} device(s)")
+        except Exception as e:
+            self._reset_source_state()
+            self.main_window.status_label.setText(f"HackRF Multi-Device start failed: {str(e)}")
+            logger.error(f"HackRF Multi-Device start failed: {str(e)}")
+            raise
+
     def _post_start_sample_source(self) -> None:
         """Common post-start steps for every sample source.
 
@@ -593,6 +733,148 @@ class SourceManager:
             logger.error(f"Microphone start failed: {str(e)}")
             raise
 
+    def _initialise_iq_file(self, source_class: Type) -> None:
+        """Open the selected IQ recording and retune the display to its band."""
+        mw = self.main_window
+        if not self.iq_file_path:
+            raise RuntimeError("No IQ file selected")
+        try:
+            mw.current_source = source_class(self.iq_file_path)
+            mw.current_source.start(mw.frequency)
+            src = mw.current_source
+            mw.frequency_manager.set_frequency_range(src.centre_freq - src.sample_rate / 2,
+                                                     src.centre_freq + src.sample_rate / 2)
+            self._post_start_sample_source()
+            self._switch_message = (f"Playing {os.path.basename(self.iq_file_path)} "
+                                    f"({src.duration:.1f} s)")
+        except Exception as e:
+            self._reset_source_state()
+            self.main_window.status_label.setText(f"IQ file open failed: {str(e)}")
+            logger.error(f"IQ file open failed: {str(e)}")
+            raise
+
+    def open_iq_file(self, path: str) -> None:
+        """Play the IQ recording at ``path`` as the current sample source."""
+        self.iq_file_path = path
+        if self.last_source_type == SourceType.IQ_FILE.value:
+            self._stop_current_source(SourceType.IQ_FILE.value)   # re-open with the new file
+        self.set_source(SourceType.IQ_FILE.value)
+
+    def _initialise_sweep_file(self, source_class: Type) -> None:
+        """Open the selected sweep recording and retune the display to its grid."""
+        mw = self.main_window
+        if not self.sweep_file_path:
+            raise RuntimeError("No sweep recording selected")
+        try:
+            mw.current_source = source_class(self.sweep_file_path)
+            mw.current_source.start(mw.frequency)
+            src = mw.current_source
+            mw.frequency_manager.set_frequency_range(src.start_freq, src.stop_freq)
+            self._switch_message = (f"Replaying {os.path.basename(self.sweep_file_path)} "
+                                    f"({src.duration:.1f} s)")
+        except Exception as e:
+            self._reset_source_state()
+            self.main_window.status_label.setText(f"Sweep file open failed: {str(e)}")
+            logger.error(f"Sweep file open failed: {str(e)}")
+            raise
+
+    def open_sweep_file(self, path: str) -> None:
+        """Replay the sweep recording at ``path`` as the current sweep source."""
+        self.sweep_file_path = path
+        if self.last_source_type == SourceType.SWEEP_FILE.value:
+            self._stop_current_source(SourceType.SWEEP_FILE.value)   # re-open with the new file
+        self.set_source(SourceType.SWEEP_FILE.value)
+
+    def _initialise_sim_samples(self, source_class: Type) -> None:
+        """Initialise the simulated sample source at the current span and centre."""
+        mw = self.main_window
+        mw.current_source = source_class(sample_rate=mw.frequency.span, centre_freq=mw.frequency.centre)
+        try:
+            mw.current_source.start(mw.frequency)
+            self._post_start_sample_source()
+        except Exception as e:
+            self._reset_source_state()
+            mw.status_label.setText(f"Simulated samples start failed: {str(e)}")
+            logger.error(f"Simulated samples start failed: {str(e)}")
+            raise
+
+    def _initialise_sim_sweep(self, source_class: Type) -> None:
+        """Initialise the simulated sweep source over the current range."""
+        mw = self.main_window
+        try:
+            mw.current_source = source_class(mw.frequency.start, mw.frequency.stop, bin_size=30000)
+            mw.current_source.start(mw.frequency)
+        except Exception as e:
+            self._reset_source_state()
+            mw.status_label.setText(f"Simulated sweep start failed: {str(e)}")
+            logger.error(f"Simulated sweep start failed: {str(e)}")
+            raise
+
+    def _initialise_network(self, source_class: Type) -> None:
+        """Connect to the selected frame server and retune the display to its grid."""
+        mw = self.main_window
+        if not self.network_address:
+            raise RuntimeError("No frame server selected")
+        host, port = self.network_address
+        try:
+            mw.current_source = source_class(host, port)
+            mw.current_source.start(mw.frequency)
+            src = mw.current_source
+            mw.frequency_manager.set_frequency_range(src.start_freq, src.stop_freq)
+            self._switch_message = f"Viewing {host}:{port}"
+        except Exception as e:
+            self._reset_source_state()
+            mw.status_label.setText(f"Network stream failed: {str(e)}")
+            logger.error(f"Network stream failed: {str(e)}")
+            raise
+
+    def _initialise_shared_memory(self, source_class: Type) -> None:
+        """Open the frame ring another analyser on this host publishes and retune to its grid."""
+        mw = self.main_window
+        try:
+            mw.current_source = source_class()
+            mw.current_source.start(mw.frequency)
+            src = mw.current_source
+            mw.frequency_manager.set_frequency_range(src.start_freq, src.stop_freq)
+            self._switch_message = f"Reading frame ring '{src.name}'"
+        except Exception as e:
+            self._reset_source_state()
+            mw.status_label.setText(f"Shared memory source failed: {str(e)}")
+            logger.error(f"Shared memory source failed: {str(e)}")
+            raise
+
+    def _initialise_rtl_tcp(self, source_class: Type) -> None:
+        """Connect to the selected rtl_tcp server at the current span and centre."""
+        mw = self.main_window
+        if not self.rtl_tcp_address:
+            raise RuntimeError("No rtl_tcp server selected")
+        host, port = self.rtl_tcp_address
+        try:
+            mw.current_source = source_class(sample_rate=mw.frequency.span, centre_freq=mw.frequency.centre,
+                                             host=host, port=port)
+            mw.current_source.start(mw.frequency)
+            self._post_start_sample_source()
+            self._switch_message = f"rtl_tcp {host}:{port} ({mw.current_source.tuner})"
+        except Exception as e:
+            self._reset_source_state()
+            mw.status_label.setText(f"rtl_tcp start failed: {str(e)}")
+            logger.error(f"rtl_tcp start failed: {str(e)}")
+            raise
+
+    def open_rtl_tcp(self, host: str, port: int) -> None:
+        """Stream IQ from the rtl_tcp server at ``host:port`` as the current sample source."""
+        self.rtl_tcp_address = (host, port)
+        if self.last_source_type == SourceType.RTL_TCP.value:
+            self._stop_current_source(SourceType.RTL_TCP.value)   # reconnect to the new server
+        self.set_source(SourceType.RTL_TCP.value)
+
+    def open_network_stream(self, host: str, port: int) -> None:
+        """View the frames served at ``host:port`` as the current sweep source."""
+        self.network_address = (host, port)
+        if self.last_source_type == SourceType.NETWORK.value:
+            self._stop_current_source(SourceType.NETWORK.value)   # reconnect to the new server
+        self.set_source(SourceType.NETWORK.value)
+
     def _enable_source_controls(self) -> None:
         """Enable source control buttons in UI."""
         self.main_window.button_peak_search.setEnabled(True)
@@ -667,7 +949,7 @@ class SourceManager:
         """Shared logic for updating the sample rate on the active source.
 
         Args:
-            expected_class: The class the source must be an instance of.
+            expected_class: The class (or tuple of classes) the source must be an instance of.
             mode_label: Human-readable source label for status messages.
             sample_rate: Requested sample rate in Hz.
         """
@@ -737,32 +1019,121 @@ class SourceManager:
             logger.error(f"Error setting audio sample rate: {e}")
 
     def set_sweep_bin_size(self, bin_size: int) -> None:
-        """Restart the HackRF sweep source with a new bin size (= RBW).
+        """Restart a HackRF sweep, wideband or adaptive source with a new bin size (= RBW).
 
         Stops the running sweep, recreates the source with the requested
         bin_size, and restarts it over the current frequency range.
         """
         src = self.main_window.current_source
-        if not isinstance(src, HackRFSweepDataSource):
-            self.main_window.status_label.setText("RBW only applies to HackRF Sweep mode")
+        if not isinstance(src, (HackRFSweepDataSource, HackrfWidebandDataSource, HackrfAdaptiveDataSource,
+                                HackrfShardedDataSource)):
+            self.main_window.status_label.setText("RBW only applies to HackRF sweep modes")
             return
         try:
             mw = self.main_window
             src.stop()
             mw.display_manager._reset_dsp_state()
-            new_src = HackRFSweepDataSource(mw.frequency.start, mw.frequency.stop, bin_size=bin_size)
+            new_src = type(src)(mw.frequency.start, mw.frequency.stop, bin_size=bin_size)
             new_src.lna_gain = mw.hackrf_lna_gain
             new_src.vga_gain = mw.hackrf_vga_gain
+            if len(getattr(src, 'bands', ())) > 1:
+                new_src.set_bands(src.bands)
+            if isinstance(new_src, HackrfShardedDataSource):
+                new_src.load_cal_offsets(mw.calibration_manager.get_offset)
             mw.current_source = new_src
             mw.current_source.start(mw.frequency)
+            name = self.SOURCE_DISPLAY_NAMES[self.last_source_type]
             rbw_str = f"{bin_size // 1000} kHz" if bin_size >= 1000 else f"{bin_size} Hz"
-            self.main_window.status_label.setText(f"HackRF Sweep RBW: {rbw_str}")
+            self.main_window.status_label.setText(f"{name} RBW: {rbw_str}")
             self.main_window.frequency_manager.update_frequency_values()
-            logger.debug(f"HackRF sweep restarted with bin_size={bin_size} Hz")
+            logger.debug(f"{name} restarted with bin_size={bin_size} Hz")
         except Exception as e:
             self.main_window.status_label.setText(f"Error setting RBW: {str(e)}")
             logger.error(f"Error setting sweep bin_size: {str(e)}")
 
+    def set_sweep_bands(self, bands) -> None:
+        """Sweep only ``bands`` ((start, stop) Hz pairs) with the HackRF sweep source.
+
+        Switches to HackRF Sweep first if another source is active.  The
+        displayed range becomes the outer edges of the bands; the Bands
+        display shows each band in its own panel.
+        """
+        mw = self.main_window
+        try:
+            if not isinstance(mw.current_source, HackRFSweepDataSource):
+                self.set_source(SourceType.HACKRF_SWEEP.value)
+                if not isinstance(mw.current_source, HackRFSweepDataSource):
+                    return                          # set_source reported why
+            src = mw.current_source
+            src.stop()
+            mw.display_manager._reset_dsp_state()
+            src.set_bands(bands)
+            mw.frequency.set_start_stop(src.start_freq, src.stop_freq)
+            mw.frequency_manager.update_frequency_values()
+            src.start()
+            spans = ", ".join(f"{lo / 1e6:g}–{hi / 1e6:g}" for lo, hi in src.bands)
+            mw.status_label.setText(f"HackRF Sweep bands: {spans} MHz")
+            logger.debug(f"HackRF sweep restarted over {len(src.bands)} bands")
+        except Exception as e:
+            mw.status_label.setText(f"Error setting sweep bands: {str(e)}")
+            logger.error(f"Error setting sweep bands: {str(e)}")
+
+    def clear_sweep_bands(self) -> None:
+        """Return the HackRF sweep to one range from the lowest band's start to the highest's stop."""
+        src = self.main_window.current_source
+        if not isinstance(src, HackRFSweepDataSource) or len(src.bands) == 1:
+            self.main_window.status_label.setText("No band set active")
+            return
+        self.set_sweep_bands([(src.start_freq, src.stop_freq)])
+
+    def set_adaptive_dwell(self, mode: str) -> None:
+        """Run the HackRF adaptive survey, dwelling on active regions with ``mode``.
+
+        ``'sweep'`` dwells with fine hackrf_sweep passes, ``'capture'`` with
+        IQ captures.  Switches to HackRF Adaptive first if another source is
+        active.
+        """
+        mw = self.main_window
+        try:
+            if not isinstance(mw.current_source, HackrfAdaptiveDataSource):
+                self.set_source(SourceType.HACKRF_ADAPTIVE.value)
+                if not isinstance(mw.current_source, HackrfAdaptiveDataSource):
+                    return                          # set_source reported why
+            src = mw.current_source
+            if src.fine_mode != mode:
+                mw.display_manager._reset_dsp_state()
+                src.set_fine_mode(mode)
+            dwell = "IQ captures" if mode == 'capture' else "fine sweeps"
+            mw.status_label.setText(f"HackRF Adaptive: {dwell} at {src.fine_bin_size / 1e3:g} kHz "
+                                    f"on active regions")
+            logger.debug(f"HackRF adaptive dwell set to {mode}")
+        except Exception as e:
+            mw.status_label.setText(f"Error setting adaptive dwell: {str(e)}")
+            logger.error(f"Error setting adaptive dwell: {str(e)}")
+
+    def match_sharded_levels(self) -> None:
+        """Calibrate each HackRF of the multi-device sweep to the first from the stitch-boundary check.
+
+        The offsets are saved per device serial, so they apply again the
+        next time the same devices are used.
+        """
+        mw = self.main_window
+        src = mw.current_source
+        if not isinstance(src, HackrfShardedDataSource):
+            mw.status_label.setText("Level matching only applies to HackRF Multi-Device")
+            return
+        if len(src.serials) < 2 or any(np.isnan(e) for e in src.stitch_errors_db):
+            mw.status_label.setText("Level matching needs a complete sweep from every device")
+            return
+        before = ", ".join(f"{e:+.1f}" for e in src.stitch_errors_db)
+        offsets = src.match_levels()
+        for serial, offset in offsets.items():
+            mw.calibration_manager.set_offset(cal_key(serial), offset)
+        src.cal_offsets = offsets
+        mw.display_manager._reset_dsp_state()
+        mw.status_label.setText(f"HackRF levels matched (boundaries were {before} dB)")
+        logger.debug(f"HackRF sharded offsets: {offsets}")
+
     def _exit_zero_span_if_active(self) -> None:
         """Exit zero span mode before changing sample rate, if currently active."""
         if getattr(getattr(self.main_window, 'display_manager', None), 'zero_span_active', False):
@@ -770,7 +1141,7 @@ class SourceManager:
 
     def set_rtl_sample_rate(self, sample_rate: int):
         self._exit_zero_span_if_active()
-        self._set_sample_rate(RtlSamplesDataSource, "RTL Samples", sample_rate)
+        self._set_sample_rate((RtlSamplesDataSource, RtlTcpSamplesDataSource), "RTL Samples", sample_rate)
 
     def set_hackrf_sample_rate(self, sample_rate: int):
         self._exit_zero_span_if_active()
@@ -782,6 +1153,7 @@ class SourceManager:
 
     def capture_preset(self) -> dict:
         mw = self.main_window
+        bands = getattr(mw.current_source, 'bands', ())
         source_type = None
         if mw.current_source:
             for st, cls in self.SOURCE_CLASSES.items():
@@ -793,6 +1165,7 @@ class SourceManager:
             'fft_size':     getattr(mw.current_source, 'sample_count', None) if mw.current_source else None,
             'window_type':  getattr(mw.current_source, 'window_type',  None) if mw.current_source else None,
             'sweep_bin_size': getattr(mw.current_source, 'bin_size',   None) if mw.current_source else None,
+            'sweep_bands':  [list(b) for b in bands] if len(bands) > 1 else None,
         }
 
     def apply_preset(self, s: dict) -> None:
@@ -825,10 +1198,74 @@ class SourceManager:
         if window_type:
             mw.set_window_type(window_type)
         sweep_bin_size = s.get('sweep_bin_size')
-        if sweep_bin_size and source_type == 'hackrf_sweep':
+        if sweep_bin_size and source_type in ('hackrf_sweep', 'hackrf_wideband', 'hackrf_adaptive',
+                                              'hackrf_sharded'):
             self.set_sweep_bin_size(int(sweep_bin_size))
+        sweep_bands = s.get('sweep_bands')
+        if sweep_bands and source_type == 'hackrf_sweep':
+            self.set_sweep_bands([tuple(b) for b in sweep_bands])
+
+    # ------------------------------------------------------------------
+    # Multi-source group
+    # ------------------------------------------------------------------
+
+    def add_to_group(self) -> bool:
+        """Move the current source into the multi-source group.
+
+        The source is stopped here and restarted with the current settings
+        in a channel of its own, so the device is free for the next source
+        chosen while this one keeps running alongside it.
+
+        Returns:
+            True if the channel started.
+        """
+        mw = self.main_window
+        source_type = self.last_source_type
+        if mw.current_source is None or source_type is None:
+            mw.status_label.setText("Multi source: choose a source, then add it")
+            return False
+        name = self.SOURCE_DISPLAY_NAMES.get(source_type, source_type)
+        if source_type not in CHANNEL_SOURCE_TYPES:
+            mw.status_label.setText(f"Multi source: {name} can't run alongside other sources")
+            return False
+        settings = mw.preset_manager.current_settings()
+        settings['source_type'] = source_type
+        path = {SourceType.IQ_FILE.value:    self.iq_file_path,
+                SourceType.SWEEP_FILE.value: self.sweep_file_path}.get(source_type)
+
+        self._save_source_frequency()
+        self._stop_current_source()
+        if self.paused_rtl_source is not None:      # the channel opens the RTL-SDR itself
+            self.paused_rtl_source.stop()
+            self.paused_rtl_source = None
+        try:
+            channel = self.source_group.add(name, settings, path, mw.calibration_manager)
+        except Exception as e:
+            mw.status_label.setText(f"Multi source: {name} failed to start: {e}")
+            logger.error(f"Multi source: {name} failed to start: {e}")
+            return False
+        mw.status_label.setText(f"Multi source: {channel.name} added, {len(self.source_group)} running")
+        return True
+
+    def remove_last_from_group(self) -> None:
+        """Stop the source most recently added to the multi-source group."""
+        mw = self.main_window
+        if not self.source_group.channels:
+            mw.status_label.setText("Multi source: no sources running")
+            return
+        name = self.source_group.channels[-1].name
+        self.source_group.remove(name)
+        mw.status_label.setText(f"Multi source: {name} removed, {len(self.source_group)} running")
+
+    def clear_group(self) -> None:
+        """Stop every source in the multi-source group."""
+        count = len(self.source_group)
+        self.source_group.clear()
+        self.main_window.status_label.setText(f"Multi source: {count} source(s) stopped")
 
     def close(self):
+        self.sweep_recorder.stop()
+        self.source_group.clear()
         if self.main_window.current_source and hasattr(self.main_window.current_source, 'stop'):
             self.main_window.current_source.stop()
             self._cleanup_source_thread()
@@ -0,0 +1,219 @@
+"""Compact on-disk recording of completed sweeps.
+
+SweepRecorder appends every completed sweep from a sweep source as one row
+of a 2-D ``(rows, bins)`` array held in a memory-mapped file, so an
+hours-long survey never sits in RAM and each append is a single row copy.
+
+Files written for ``survey.sweeps``:
+    survey.sweeps  rows of power in dB, float16 (default, half the size)
+                   or float32, row-major with no header
+    survey.tidx    float64 Unix time of each row — the time index
+    survey.json    grid metadata: start/stop frequency, bins, the grid's
+                   evenly spaced segments, dtype, rows
+
+Both data files grow a chunk of rows at a time (the file is extended and
+re-mapped), so growth costs one remap per chunk rather than per sweep.  The
+sidecar is rewritten at every chunk boundary and the time index is
+zero-filled ahead of the write position, so a recording interrupted by a
+crash still replays up to its last written row.  ``stop`` trims both files
+to the rows actually recorded.
+"""
+
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from core.iq_history import captures_dir
+from datasources.sweep_file import SWEEP_DTYPES, INDEX_SUFFIX
+
+logger = logging.getLogger(__name__)
+
+_CHUNK_BYTES = 4 * 1024 * 1024     # target growth per chunk of rows
+_MIN_CHUNK_ROWS = 16
+
+
+class SweepRecorder:
+    """Append-only recorder for one sweep grid.
+
+    All calls come from the GUI thread (the sweep data path runs on the
+    display timer), so no locking is needed.  A sweep source returns the
+    same array until a new sweep completes; repeated rows are dropped so
+    each recorded row is one distinct sweep.
+    """
+
+    def __init__(self):
+        self.path: Optional[Path] = None
+        self.start_freq = 0.0
+        self.stop_freq = 0.0
+        self.bins = 0
+        self.segments: tuple = ()
+        self.dtype = SWEEP_DTYPES[0]
+        self.rows = 0
+        self._meta: dict = {}
+        self._data: Optional[np.memmap] = None
+        self._times: Optional[np.memmap] = None
+        self._capacity = 0
+        self._chunk_rows = _MIN_CHUNK_ROWS
+        self._last: Optional[np.ndarray] = None
+
+    @property
+    def recording(self) -> bool:
+        return self._data is not None
+
+    @property
+    def duration(self) -> float:
+        """Seconds between the first and last recorded sweep."""
+        if not self.recording or self.rows < 2:
+            return 0.0
+        return float(self._times[self.rows - 1] - self._times[0])
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self, start_freq: float, stop_freq: float, bins: int,
+              dtype: str = "float16", path: Optional[Path] = None,
+              source: Optional[str] = None, cal_offset_db: float = 0.0,
+              segments: Optional[tuple] = None) -> Path:
+        """Create a new recording for the given sweep grid.
+
+        Args:
+            start_freq:    Frequency of the first bin in Hz.
+            stop_freq:     Frequency of the last bin in Hz.
+            bins:          Points per sweep.
+            dtype:         "float16" or "float32" row storage.
+            path:          Data file; defaults to a timestamped name in
+                           ``captures_dir()``.
+            source:        Source name stored in the sidecar.
+            cal_offset_db: Calibration offset already applied to the rows.
+            segments:      The grid as (first bin, last bin, bin count) runs
+                           (``grid_segments``) when it is not one linspace
+                           from ``start_freq`` to ``stop_freq``.
+
+        Returns:
+            The data file path.
+        """
+        if dtype not in SWEEP_DTYPES:
+            raise ValueError(f"unsupported sweep dtype '{dtype}'")
+        if bins <= 0:
+            raise ValueError("sweep grid has no bins")
+        segments = tuple(segments) if segments else ((float(start_freq), float(stop_freq), int(bins)),)
+        if sum(n for _, _, n in segments) != bins:
+            raise ValueError("sweep grid segments do not add up to its bins")
+        if self.recording:
+            self.stop()
+
+        now = time.time()
+        if path is None:
+            stamp = datetime.fromtimestamp(now).strftime("%Y%m%d_%H%M%S")
+            path = captures_dir() / (f"sweeps_{stamp}_{start_freq / 1e6:.0f}-"
+                                     f"{stop_freq / 1e6:.0f}MHz.sweeps")
+        self.path = Path(path)
+        self.start_freq, self.stop_freq = float(start_freq), float(stop_freq)
+        self.bins, self.dtype = int(bins), dtype
+        self.segments = tuple((float(a), float(b), int(n)) for a, b, n in segments)
+        self.rows = 0
+        self._last = None
+        row_bytes = self.bins * np.dtype(dtype).itemsize
+        self._chunk_rows = max(_CHUNK_BYTES // row_bytes, _MIN_CHUNK_ROWS)
+        self._meta = {
+            "format":        "sweeps",
+            "dtype":         dtype,
+            "bins":          self.bins,
+            "start_freq":    self.start_freq,
+            "stop_freq":     self.stop_freq,
+            "segments":      [list(seg) for seg in self.segments],
+            "rows":          0,
+            "complete":      False,
+            "timestamp":     datetime.fromtimestamp(now, timezone.utc).isoformat(),
+            "source":        source,
+            "cal_offset_db": cal_offset_db,
+        }
+        for p in (self.path, self._index_path()):
+            open(p, 'wb').close()
+        self._capacity = 0
+        self._grow()
+        logger.info(f"SweepRecorder: recording {self.bins} bins ({dtype}) to {self.path}")
+        return self.path
+
+    def stop(self) -> Optional[Path]:
+        """Finish the recording, trimming the files to the rows written.
+
+        Returns:
+            The data file path, or None if nothing was recording.
+        """
+        if not self.recording:
+            return None
+        self._release()
+        row_bytes = self.bins * np.dtype(self.dtype).itemsize
+        with open(self.path, 'r+b') as f:
+            f.truncate(self.rows * row_bytes)
+        with open(self._index_path(), 'r+b') as f:
+            f.truncate(self.rows * 8)
+        self._meta["complete"] = True
+        self._write_sidecar()
+        logger.info(f"SweepRecorder: stopped after {self.rows} sweeps")
+        return self.path
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def append(self, power: np.ndarray, timestamp: Optional[float] = None) -> bool:
+        """Record one sweep unless it repeats the previous one.
+
+        Returns:
+            False if the sweep does not match the recording grid (nothing
+            is written), True otherwise.
+        """
+        if not self.recording:
+            return False
+        if len(power) != self.bins:
+            return False
+        if self._last is not None and np.array_equal(power, self._last, equal_nan=True):
+            return True
+        if self.rows == self._capacity:
+            self._grow()
+        self._data[self.rows] = power
+        self._times[self.rows] = time.time() if timestamp is None else timestamp
+        self._last = np.array(power, dtype=np.float32)
+        self.rows += 1
+        return True
+
+    def matches_grid(self, segments: tuple) -> bool:
+        """True if a sweep over this grid (``grid_segments``) can be appended to the recording."""
+        return segments == self.segments
+
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
+
+    def _index_path(self) -> Path:
+        return self.path.with_suffix(INDEX_SUFFIX)
+
+    def _grow(self) -> None:
+        """Extend both files by one chunk of rows and re-map them."""
+        self._release()
+        self._capacity += self._chunk_rows
+        self._data = np.memmap(self.path, dtype=self.dtype, mode='r+',
+                               shape=(self._capacity, self.bins))
+        self._times = np.memmap(self._index_path(), dtype=np.float64, mode='r+',
+                                shape=(self._capacity,))
+        self._write_sidecar()
+
+    def _release(self) -> None:
+        """Flush and drop the current maps."""
+        for m in (self._data, self._times):
+            if m is not None:
+                m.flush()
+        self._data = self._times = None
+
+    def _write_sidecar(self) -> None:
+        self._meta["rows"] = self.rows
+        with open(self.path.with_suffix('.json'), 'w') as f:
+            json.dump(self._meta, f, indent=2)
@@ -0,0 +1,214 @@
+"""Streaming level trigger with hysteresis, holdoff and pre-trigger capture.
+
+The trigger is fed block by block from the capture thread (the zero-span
+detector calls ``process`` with every block of power samples it produces),
+so no part of the stream is skipped between GUI frames.
+
+Crossings are found with a Schmitt comparator: a sample at or above
+``level`` decides "high", a sample below ``level - hysteresis`` decides
+"low" and anything in between holds the previous state.  State can only
+change at a deciding sample, so each block reduces to the deciding samples
+(``np.flatnonzero``) and an edge is wherever the decided state differs from
+its predecessor — no per-sample Python loop.  The state at the end of a
+block carries into the next.
+
+Both rising and falling edges are recorded as absolute sample indices; the
+edge selected by ``mode`` is then thinned by the holdoff to give the display
+triggers.  Edge timestamps are shared with the duty-cycle analyser.
+"""
+
+import logging
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+
+from utils.signal_processing import SampleRing
+
+logger = logging.getLogger(__name__)
+
+TRIGGER_MODES = ("free_run", "rise", "fall")
+_DEFAULT_HYSTERESIS = 1.0     # dB
+_DEFAULT_PRE_TRIGGER = 0.1    # fraction of the display window before the trigger
+_MAX_EVENTS = 4096            # edge / trigger history depth
+
+_LOW, _UNKNOWN, _HIGH = -1, 0, 1
+
+
+def find_edges(values: np.ndarray, level: float, hysteresis: float,
+               state: int = _UNKNOWN) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Locate hysteresis crossings in one block.
+
+    Args:
+        values:     Block of samples.
+        level:      Upper threshold; a sample at or above it is "high".
+        hysteresis: Distance below ``level`` a sample must fall to be "low".
+        state:      Comparator state carried in from the previous block.
+
+    Returns:
+        (rise_indices, fall_indices, state_out) with indices relative to the block.
+    """
+    values = np.asarray(values)
+    hi = values >= level
+    lo = values < level - max(hysteresis, 0.0)
+    decided = np.flatnonzero(hi | lo)
+    if len(decided) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, state
+
+    s = np.where(hi[decided], _HIGH, _LOW).astype(np.int8)
+    prev = np.empty_like(s)
+    prev[0] = state
+    prev[1:] = s[:-1]
+    rises = decided[(s == _HIGH) & (prev == _LOW)]
+    falls = decided[(s == _LOW) & (prev == _HIGH)]
+    return rises.astype(np.int64), falls.astype(np.int64), int(s[-1])
+
+
+def apply_holdoff(candidates: np.ndarray, holdoff: int, not_before: int = 0) -> np.ndarray:
+    """Thin sorted trigger candidates so accepted triggers are ≥ ``holdoff`` apart.
+
+    The common case — every gap already at least the holdoff — is a single
+    vectorised check.  Otherwise the search jumps straight from each accepted
+    trigger to the next candidate outside its holdoff, so it iterates once
+    per accepted trigger rather than once per sample.
+    """
+    candidates = candidates[candidates >= not_before]
+    if holdoff <= 0 or len(candidates) < 2:
+        return candidates
+    if np.diff(candidates).min() >= holdoff:
+        return candidates
+    keep = [0]
+    i = 0
+    while True:
+        i = int(np.searchsorted(candidates, candidates[i] + holdoff, side='left'))
+        if i >= len(candidates):
+            break
+        keep.append(i)
+    return candidates[keep]
+
+
+class TriggerEngine:
+    """Edge trigger over a continuous sample stream.
+
+    ``process`` runs on the capture thread; ``configure`` and the query
+    methods are called from the GUI timer.  Indices are absolute sample
+    counts since the last ``reset``; timestamps are those indices divided
+    by ``rate``.
+    """
+
+    def __init__(self, max_events: int = _MAX_EVENTS):
+        self._lock = threading.Lock()
+        self.mode: str = "free_run"
+        self.level: float = 0.0
+        self.hysteresis: float = _DEFAULT_HYSTERESIS
+        self.holdoff: float = 0.0            # seconds
+        self.pre_trigger: float = _DEFAULT_PRE_TRIGGER
+        self.rate: float = 0.0
+        self._rises = SampleRing(max_events, np.int64)
+        self._falls = SampleRing(max_events, np.int64)
+        self._triggers = SampleRing(max_events, np.int64)
+        self._state = _UNKNOWN
+        self._next_index = 0
+        self._holdoff_until = 0
+
+    def configure(self, mode: str, level: float, hysteresis: Optional[float] = None,
+                  holdoff: Optional[float] = None,
+                  pre_trigger: Optional[float] = None) -> None:
+        """Update trigger settings; takes effect from the next processed block."""
+        if mode not in TRIGGER_MODES:
+            raise ValueError(f"unknown trigger mode '{mode}'")
+        with self._lock:
+            if mode != self.mode:
+                self._triggers.clear()
+                self._holdoff_until = 0
+            self.mode = mode
+            self.level = float(level)
+            if hysteresis is not None:
+                self.hysteresis = max(float(hysteresis), 0.0)
+            if holdoff is not None:
+                self.holdoff = max(float(holdoff), 0.0)
+            if pre_trigger is not None:
+                self.pre_trigger = min(max(float(pre_trigger), 0.0), 1.0)
+
+    def reset(self, rate: Optional[float] = None) -> None:
+        """Forget all edges and comparator state; optionally set the sample rate."""
+        with self._lock:
+            if rate is not None:
+                self.rate = float(rate)
+            self._rises.clear()
+            self._falls.clear()
+            self._triggers.clear()
+            self._state = _UNKNOWN
+            self._next_index = 0
+            self._holdoff_until = 0
+
+    def process(self, values: np.ndarray, start_index: int) -> None:
+        """Evaluate one block whose first sample has absolute index ``start_index``."""
+        n = len(values)
+        if n == 0:
+            return
+        with self._lock:
+            if start_index != self._next_index:
+                # Discontinuity in the stream — the carried state is meaningless
+                self._state = _UNKNOWN
+            rises, falls, self._state = find_edges(values, self.level, self.hysteresis,
+                                                   self._state)
+            self._next_index = start_index + n
+            rises += start_index
+            falls += start_index
+            if len(rises):
+                self._rises.write(rises)
+            if len(falls):
+                self._falls.write(falls)
+
+            if self.mode == "free_run":
+                return
+            holdoff = int(round(self.holdoff * self.rate))
+            accepted = apply_holdoff(rises if self.mode == "rise" else falls,
+                                     holdoff, self._holdoff_until)
+            if len(accepted):
+                self._triggers.write(accepted)
+                self._holdoff_until = int(accepted[-1]) + holdoff
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def triggers(self) -> np.ndarray:
+        """Absolute indices of the retained display triggers (oldest first)."""
+        with self._lock:
+            return np.array(self._triggers.latest())
+
+    def trigger_times(self) -> np.ndarray:
+        """Display trigger timestamps in seconds since reset."""
+        return self._to_seconds(self.triggers())
+
+    def edge_times(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Rising and falling edge timestamps in seconds since reset."""
+        with self._lock:
+            rises = np.array(self._rises.latest())
+            falls = np.array(self._falls.latest())
+        return self._to_seconds(rises), self._to_seconds(falls)
+
+    def window_start(self, total: int, window: int, available: int) -> Optional[int]:
+        """Start index of the newest complete triggered capture window.
+
+        The window spans ``pre_trigger × window`` samples before the trigger
+        and the rest after it.  Only triggers whose whole window lies in the
+        retained history ``[total - available, total)`` qualify.
+
+        Returns:
+            Absolute start index, or None if no trigger qualifies.
+        """
+        pre = int(self.pre_trigger * window)
+        starts = self.triggers() - pre
+        ok = (starts >= total - available) & (starts + window <= total)
+        if not np.any(ok):
+            return None
+        return int(starts[ok][-1])
+
+    def _to_seconds(self, indices: np.ndarray) -> np.ndarray:
+        if self.rate <= 0:
+            return np.zeros(0, dtype=np.float64)
+        return indices / self.rate
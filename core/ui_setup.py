@@ -6,6 +6,8 @@ from displays.waterfall import Waterfall
 from displays.surface import Surface
 from displays.ribbon import RibbonWidget
 from displays.density_display import DensityDisplay
+from displays.band_view import BandView
+from displays.multi_source_view import MultiSourceView
 from displays.logo import Logo
 from displays.constellation_2d import Constellation2D
 from displays.constellation_3d import Constellation3D
@@ -26,6 +28,8 @@ class UISetup:
         self.main_window.surface_widget = Surface()
         self.main_window.ribbon_widget = RibbonWidget()
         self.main_window.density_widget = DensityDisplay()
+        self.main_window.band_view_widget = BandView()
+        self.main_window.multi_source_widget = MultiSourceView()
         self.main_window.logo_widget = Logo()
         self.main_window.constellation_2d_widget = Constellation2D()
         self.main_window.constellation_3d_widget = Constellation3D()
@@ -42,6 +46,8 @@ class UISetup:
         self.main_window.stacked_widget.addWidget(self.main_window.zero_span_widget)         # Index 7
         self.main_window.stacked_widget.addWidget(self.main_window.ribbon_widget)            # Index 8
         self.main_window.stacked_widget.addWidget(self.main_window.density_widget)            # Index 9
+        self.main_window.stacked_widget.addWidget(self.main_window.band_view_widget)          # Index 10
+        self.main_window.stacked_widget.addWidget(self.main_window.multi_source_widget)       # Index 11
 
         self.main_window.graphical_display.layout().addWidget(self.main_window.stacked_widget)
         self.main_window.stacked_widget.setCurrentIndex(self.main_window.current_stacked_index)
@@ -1,5 +1,7 @@
 import numpy as np
+import threading
 import time
+from typing import Optional
 import sounddevice as sd
 from scipy import fft
 from utils.frequency_selector import FrequencyRange
@@ -17,8 +19,23 @@ AUDIO_CHANNELS = ('mono', 'left', 'right', 'stereo')
 # we fall back to reading a full FFT window (original behaviour).
 _MAX_READ_MS = 30
 
+# Minimum ring depth in frames (1.4 s at 48 kHz); always at least two FFT windows
+_RING_FRAMES = 1 << 16
+
 
 class MicrophoneSamplesDataSource(SampleDataSource):
+    """Sound card input read continuously by a reader thread.
+
+    The reader reads ``_audio_block`` frames at a time into a stereo float32
+    ring and publishes every block to the stream consumers, so they see the
+    gap-free sample stream; ``get_power_levels`` waits for the next block
+    and transforms the newest ``fft_size`` frames of the ring.
+    """
+
+    CONSUME_TIMEOUT = 0.5
+    STOP_TIMEOUT = 2.0
+    _STREAM_FROM_READER = True     # reader thread publishes every block to stream consumers
+
     def __init__(self, sample_rate: int = 44100, centre_freq: int = 0):
         super().__init__(sample_rate, centre_freq)
         self.fft_size = 1024
@@ -27,8 +44,15 @@ class MicrophoneSamplesDataSource(SampleDataSource):
         self.stream = None
         self.running = False
         self.use_psd = False
-        self._audio_buffer = np.zeros((self.fft_size, 2), dtype=np.float32)
+        self.overflows = 0
         self._audio_block  = self.fft_size  # updated in start()
+        self._ring = np.zeros((_RING_FRAMES, 2), dtype=np.float32)
+        self._lock = threading.Lock()              # ring position
+        self._data_ready = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._written = 0                          # frames read since starting
+        self._last_end = 0                         # ring position of the last frame
         self.set_window()
         logger.debug(f"Initialised MicrophoneSamplesDataSource sample_rate={sample_rate}")
 
@@ -40,7 +64,6 @@ class MicrophoneSamplesDataSource(SampleDataSource):
         self.fft_size = fft_size
         self.set_window()
         self._averager.reset()
-        self._audio_buffer = np.zeros((fft_size, 2), dtype=np.float32)
         self._audio_block  = fft_size
         logger.debug(f"Set FFT size: {fft_size}")
         if self.running:
@@ -91,15 +114,33 @@ class MicrophoneSamplesDataSource(SampleDataSource):
                 dtype=np.float32
             )
             self.stream.start()
-            self._audio_buffer = np.zeros((self.fft_size, 2), dtype=np.float32)
-            self.running = True
-            logger.debug(f"Microphone started ({channels}ch)")
         except Exception as e:
             self.running = False
             logger.error(f"Microphone initialisation failed: {e}")
             raise RuntimeError(f"Microphone initialisation failed: {e}")
 
+        # Whole blocks per ring, so a block never straddles the wrap
+        frames = max(_RING_FRAMES, 2 * self.fft_size)
+        self._ring = np.zeros((-(-frames // self._audio_block) * self._audio_block, 2),
+                              dtype=np.float32)
+        with self._lock:
+            self._written = self._last_end = 0
+        self.running = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._reader, name="MicrophoneReader", daemon=True)
+        self._thread.start()
+        logger.debug(f"Microphone started ({channels}ch)")
+
     def stop(self):
+        self.running = False
+        self._stop_event.set()
+        with self._data_ready:
+            self._data_ready.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.STOP_TIMEOUT)
+            if self._thread.is_alive():
+                logger.warning("Microphone reader did not stop in time")
+        self._thread = None
         if self.stream:
             try:
                 self.stream.stop()
@@ -107,7 +148,51 @@ class MicrophoneSamplesDataSource(SampleDataSource):
             except Exception as e:
                 logger.error(f"Error stopping microphone: {e}")
             self.stream = None
-        self.running = False
+
+    # ------------------------------------------------------------------
+    # Reader thread
+    # ------------------------------------------------------------------
+
+    def _reader(self) -> None:
+        n = self._audio_block
+        ring_frames = len(self._ring)
+        while not self._stop_event.is_set():
+            try:
+                raw, overflowed = self.stream.read(n)
+            except Exception as e:
+                if not self._stop_event.is_set():
+                    logger.error(f"Error reading audio samples: {e}")
+                    self.running = False
+                    with self._data_ready:
+                        self._data_ready.notify_all()
+                break
+            if overflowed:
+                self.overflows += 1
+            pos = self._written % ring_frames
+            self._ring[pos:pos + n] = raw.reshape(n, -1)     # a mono device fills both channels
+            with self._data_ready:
+                self._written += n
+                self._data_ready.notify_all()
+            self.last_data_time = time.monotonic()
+            if self._stream_consumers:
+                self._publish_stream(self._ring[pos:pos + n])
+
+    def _latest_frames(self) -> Optional[np.ndarray]:
+        """Copy of the newest ``fft_size`` frames once a new block has arrived, or None on timeout."""
+        n = self.fft_size
+        ring_frames = len(self._ring)
+        deadline = time.monotonic() + self.CONSUME_TIMEOUT
+        with self._data_ready:
+            while self._written <= self._last_end:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.running:
+                    return None
+                self._data_ready.wait(remaining)
+            end = self._last_end = self._written
+        start = (end - n) % ring_frames
+        if start + n <= ring_frames:
+            return self._ring[start:start + n].copy()
+        return np.concatenate((self._ring[start:], self._ring[:start + n - ring_frames]))
 
     # Number of positive-frequency bins from rfft
     @property
@@ -138,27 +223,13 @@ class MicrophoneSamplesDataSource(SampleDataSource):
             return np.full(self._rfft_bins, -120.0), freq_bins
 
         try:
-            raw, _ = self.stream.read(self._audio_block)
-            self._store_raw(raw.copy())
-
-            # Normalise to (N, 2) stereo
-            if raw.ndim == 1 or raw.shape[1] == 1:
-                raw = raw.reshape(-1, 1)
-                raw = np.hstack([raw, raw])
-
-            if self._audio_block < self.fft_size:
-                # Low sample rate: roll buffer and compute FFT on full window
-                n = len(raw)
-                self._audio_buffer = np.concatenate(
-                    [self._audio_buffer[n:], raw], axis=0
-                )
-                left  = self._audio_buffer[:, 0]
-                right = self._audio_buffer[:, 1]
-            else:
-                # High sample rate: read was a full FFT window, use directly
-                left  = raw[:, 0]
-                right = raw[:, 1]
-
+            frames = self._latest_frames()
+            if frames is None:
+                return np.full(self._rfft_bins, -120.0), freq_bins
+            self._store_raw(frames)
+            # At low sample rates the window overlaps the previous frame's
+            left  = frames[:, 0]
+            right = frames[:, 1]
             mono  = (left + right) * 0.5
 
             floor = DSPConstants.LOG_FLOOR if self.use_psd else DSPConstants.POWER_LOG_FLOOR
@@ -186,13 +257,10 @@ class MicrophoneSamplesDataSource(SampleDataSource):
     def read_samples_only(self) -> np.ndarray | None:
         if not self.running or self.stream is None:
             return None
-        try:
-            raw, _ = self.stream.read(self.fft_size)
-            self._store_raw(raw.copy())
-            return self._last_raw_samples
-        except Exception as e:
-            logger.error(f"Error reading audio samples: {e}")
-            return None
+        frames = self._latest_frames()
+        if frames is not None:
+            self._store_raw(frames)
+        return frames
 
     def update_frequency(self, sample_rate: float, centre_freq: float):
         self.sample_rate = int(sample_rate)
@@ -7,13 +7,33 @@ All implementations should follow these interfaces for consistent behavior.
 from abc import ABC, abstractmethod
 from typing import Optional, Tuple
 import numpy as np
+import logging
 import threading
 import time
 from utils.signal_processing import TraceAverager
 
+logger = logging.getLogger(__name__)
+
+_cpu_marks = threading.local()       # (thread_time, monotonic) of each thread's last report
+
 
 class SweepDataSource(ABC):
-    """Base class for sweep-based data sources (e.g., spectrum sweeps)."""
+    """Base class for sweep-based data sources (e.g., spectrum sweeps).
+
+    A source whose bins are not one even grid from ``start_freq`` to
+    ``stop_freq`` — bands with gaps between them, mixed resolution, or a
+    grid set by a remote producer — sets ``has_own_grid`` and keeps every
+    bin's frequency in ``frequency_grid``; the display then uses that grid
+    instead of spacing the bins evenly.
+
+    A source that sweeps on its own threads calls ``_report_cpu`` from them
+    after each hop or sweep.  Whoever runs the source (a multi-source
+    channel) may set ``cpu_meter`` to meter that work and to pace it: the
+    meter is called on the sweeping thread and may block it.
+    """
+
+    has_own_grid = False
+    cpu_meter = None          # callable(cpu_s, started) receiving each report
 
     @abstractmethod
     def start(self, frequency=None):
@@ -38,6 +58,18 @@ class SweepDataSource(ABC):
         """
         pass
 
+    def _report_cpu(self) -> None:
+        """Hand the CPU this thread used since its last report to ``cpu_meter``.
+
+        The first report from a thread covers everything since it started.
+        """
+        cpu, now = time.thread_time(), time.monotonic()
+        last_cpu, started = getattr(_cpu_marks, 'mark', (0.0, now))
+        meter = self.cpu_meter
+        if meter is not None:
+            meter(cpu - last_cpu, started)
+            cpu, now = time.thread_time(), time.monotonic()     # time the meter made us wait is not ours
+        _cpu_marks.mark = (cpu, now)
 
 
 class SampleDataSource(ABC):
@@ -45,8 +77,16 @@ class SampleDataSource(ABC):
 
     Standardized interface for consistent behavior across hardware implementations.
     All subclasses should use 'sample_count' for FFT size to avoid naming confusion.
+
+    Stream consumers registered with add_stream_consumer() receive every
+    captured block.  Only sources with a continuous reader thread feed
+    them: such a source sets _STREAM_FROM_READER and publishes each block
+    from that thread.  The snapshots a source reads on demand for each
+    display frame have gaps between them and are never published.
     """
 
+    _STREAM_FROM_READER: bool = False
+
     def __init__(self, sample_rate: Optional[int] = None, centre_freq: Optional[int] = None):
         """Initialize the sample data source.
 
@@ -60,6 +100,7 @@ class SampleDataSource(ABC):
         self._last_raw_samples: Optional[np.ndarray] = None
         self.last_data_time: float = 0.0
         self._raw_lock = threading.Lock()
+        self._stream_consumers: list = []
 
     @abstractmethod
     def start(self, frequency=None):
@@ -145,6 +186,30 @@ class SampleDataSource(ABC):
             self._last_raw_samples = samples
         self.last_data_time = time.monotonic()
 
+    def add_stream_consumer(self, consumer) -> None:
+        """Register a callable that receives every captured sample block.
+
+        Consumers run on the capturing thread and must not block.  A source
+        without a continuous reader never calls them.
+        """
+        if not self._STREAM_FROM_READER:
+            logger.warning(f"{type(self).__name__} has no continuous reader; "
+                           f"stream consumers will receive nothing")
+        if consumer not in self._stream_consumers:
+            self._stream_consumers = self._stream_consumers + [consumer]
+
+    def remove_stream_consumer(self, consumer) -> None:
+        """Unregister a stream consumer; unknown consumers are ignored."""
+        self._stream_consumers = [c for c in self._stream_consumers if c != consumer]
+
+    def _publish_stream(self, samples: np.ndarray) -> None:
+        """Hand a captured block to every stream consumer."""
+        for consumer in self._stream_consumers:
+            try:
+                consumer(samples)
+            except Exception as e:
+                logger.error(f"Stream consumer failed: {e}")
+
     def set_psd_mode(self, enabled: bool):
         """Enable or disable Power Spectral Density mode.
 
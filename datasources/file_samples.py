@@ -0,0 +1,325 @@
+"""Memory-mapped IQ file playback.
+
+IQFileSamplesDataSource plays a raw IQ recording through the same FFT path
+as the live sample sources, so every display, zero span and constellation
+can be driven from a capture with no radio attached.  The pacing and frame
+logic live in BufferPlaybackDataSource, which plays any IQ array (a file
+map here, a synthesised bank in ``datasources.simulated``).
+
+Supported formats (interleaved I/Q):
+    cf32  complex64 (gqrx / GNU Radio / IQ history dumps)
+    cs8   signed 8-bit (hackrf_transfer)
+    cu8   unsigned 8-bit, offset 127.5 (rtl_sdr)
+
+The file is opened with ``np.memmap`` so nothing is read until a frame is
+needed, and frames are slices of the map — cf32 slices are used as-is, the
+8-bit formats are scaled to complex64 in one vectorised step.  Sample rate,
+centre frequency and format come from a ``.json`` sidecar when one exists
+(the format written by IQ history saves), else from the file extension and
+constructor arguments.
+
+Pacing:
+    realtime  advance by wall-clock time × ``speed`` (``speed`` > 1 plays
+              faster than real time); every sample played is published to
+              stream consumers, so zero span sees a gap-free stream
+    fast      advance one FFT frame per call — as fast as the caller polls
+    step      hold the current frame; ``step()`` advances frame by frame
+"""
+
+import json
+import logging
+import time
+from abc import abstractmethod
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from utils.constants import DSPConstants
+from utils.frequency_selector import FrequencyRange
+from . import SampleDataSource
+
+logger = logging.getLogger(__name__)
+
+PACING_MODES = ("realtime", "fast", "step")
+
+# format → (memmap dtype, values per complex sample)
+_FORMATS = {
+    "cf32": (np.complex64, 1),
+    "cs8":  (np.int8, 2),
+    "cu8":  (np.uint8, 2),
+}
+_EXTENSIONS = {
+    ".cf32": "cf32", ".fc32": "cf32", ".cfile": "cf32",
+    ".cs8": "cs8", ".sc8": "cs8",
+    ".cu8": "cu8", ".uc8": "cu8",
+}
+_DEFAULT_SAMPLE_RATE = 2_048_000
+_MAX_BLOCK_SECONDS = 0.25     # most samples published per real-time tick
+
+
+def read_sidecar(path) -> dict:
+    """Return the JSON sidecar next to ``path`` as a dict ({} if absent or invalid)."""
+    sidecar = Path(path).with_suffix('.json')
+    try:
+        with open(sidecar) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+class BufferPlaybackDataSource(SampleDataSource):
+    """Paced playback of an IQ array; subclasses supply the array via ``_load``."""
+
+    # Playback publishes each played segment itself (not just FFT frames)
+    _STREAM_FROM_READER = True
+
+    def __init__(self, sample_rate: float, centre_freq: float):
+        super().__init__(sample_rate, centre_freq)
+        self.fft_size = 1024
+        self.window = np.hanning(self.fft_size)
+        self.use_psd = False
+        self.running = False
+        self.last_sample_rate = self.sample_rate
+
+        self.pacing = "realtime"
+        self.speed = 1.0
+        self.loop = True
+        self.at_end = False
+
+        self._map: Optional[np.ndarray] = None
+        self._length = 0                  # complex samples in the file
+        self._pos = 0                     # index of the next unplayed sample
+        self._frac = 0.0                  # sub-sample carry for real-time pacing
+        self._last_tick: Optional[float] = None
+        self._step_pending = 1            # show one frame on the first step-mode call
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @abstractmethod
+    def _load(self) -> np.ndarray:
+        """Return the samples to play (complex64, or rows of I/Q for ``_to_complex``)."""
+        pass
+
+    def start(self, frequency: FrequencyRange = None):
+        """Load the samples and start playback."""
+        if self.running:
+            return
+        self._set_buffer(self._load())
+        self._last_tick = None
+        self.at_end = False
+        self.running = True
+        logger.debug(f"Playing {type(self).__name__}: {self.duration:.2f} s at "
+                     f"{self.sample_rate / 1e6:.3f} MS/s, centre {self.centre_freq / 1e6:.3f} MHz")
+
+    def stop(self):
+        self.running = False
+        self._map = None
+        logger.debug(f"{type(self).__name__} playback stopped")
+
+    def _set_buffer(self, raw: np.ndarray) -> None:
+        if len(raw) < self.fft_size:
+            raise RuntimeError(f"{type(self).__name__}: buffer is shorter than one FFT frame")
+        self._map = raw
+        self._length = len(raw)
+        self._pos = min(self._pos, self._length - 1)
+
+    # ------------------------------------------------------------------
+    # Playback control
+    # ------------------------------------------------------------------
+
+    @property
+    def duration(self) -> float:
+        """Recording length in seconds."""
+        return self._length / self.sample_rate if self.sample_rate else 0.0
+
+    @property
+    def position(self) -> float:
+        """Playback position in seconds."""
+        return self._pos / self.sample_rate if self.sample_rate else 0.0
+
+    def set_pacing(self, mode: str, speed: Optional[float] = None) -> None:
+        """Select realtime / fast / step pacing; ``speed`` scales realtime playback."""
+        if mode not in PACING_MODES:
+            raise ValueError(f"unknown pacing mode '{mode}'")
+        self.pacing = mode
+        if speed is not None:
+            self.speed = max(float(speed), 1e-3)
+        self._last_tick = None
+        self._frac = 0.0
+
+    def set_loop(self, enabled: bool) -> None:
+        self.loop = enabled
+        if enabled:
+            self.at_end = False
+
+    def seek(self, seconds: float) -> None:
+        """Jump to ``seconds`` from the start of the recording (clamped)."""
+        self._pos = int(min(max(seconds * self.sample_rate, 0), max(self._length - 1, 0)))
+        self._last_tick = None
+        self._frac = 0.0
+        self.at_end = False
+        self._step_pending = max(self._step_pending, 1)
+
+    def step(self, frames: int = 1) -> None:
+        """Switch to step pacing and advance ``frames`` FFT frames on the next read."""
+        self.pacing = "step"
+        self._step_pending += max(int(frames), 0)
+
+    # ------------------------------------------------------------------
+    # Frame production
+    # ------------------------------------------------------------------
+
+    def _samples_due(self) -> int:
+        """How many new samples to play on this call, by pacing mode."""
+        if self.pacing == "fast":
+            return self.fft_size
+        if self.pacing == "step":
+            n = self._step_pending * self.fft_size
+            self._step_pending = 0
+            return n
+        now = time.monotonic()
+        if self._last_tick is None:
+            self._last_tick = now
+            return self.fft_size
+        due = (now - self._last_tick) * self.sample_rate * self.speed + self._frac
+        self._last_tick = now
+        n = int(due)
+        self._frac = due - n
+        return n
+
+    def _play(self, n: int) -> List[np.ndarray]:
+        """Advance by ``n`` samples; returns the played map slices in order."""
+        n = min(n, max(int(_MAX_BLOCK_SECONDS * self.sample_rate), self.fft_size))
+        segments = []
+        while n > 0:
+            if self._pos >= self._length:
+                if not self.loop:
+                    self.at_end = True
+                    break
+                self._pos = 0
+            take = min(n, self._length - self._pos)
+            segments.append(self._map[self._pos:self._pos + take])
+            self._pos += take
+            n -= take
+        return segments
+
+    def _to_complex(self, raw: np.ndarray) -> np.ndarray:
+        """Convert a buffer slice to complex64 (buffers are complex64 by default)."""
+        return raw
+
+    def _next_frame(self) -> np.ndarray:
+        """Advance by the pacing rule, publish what was played, return the FFT frame."""
+        for seg in self._play(self._samples_due()):
+            self._publish_stream(self._to_complex(seg))
+        end = max(self._pos, self.fft_size)
+        frame = self._to_complex(self._map[end - self.fft_size:end])
+        self._store_raw(frame)
+        return frame
+
+    # ------------------------------------------------------------------
+    # SampleDataSource interface
+    # ------------------------------------------------------------------
+
+    def get_power_levels(self) -> tuple[np.ndarray, np.ndarray]:
+        if not self.running:
+            return np.zeros(self.fft_size), np.linspace(
+                self.centre_freq - self.sample_rate / 2,
+                self.centre_freq + self.sample_rate / 2,
+                self.fft_size
+            )
+
+        frame = self._next_frame()
+        spectrum = np.fft.fftshift(np.fft.fft(frame * self.window, n=self.fft_size))
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        if self.use_psd:
+            power = self._averager.process(power / (self.sample_rate * self.fft_size))
+            power_db = 10 * np.log10(power + DSPConstants.LOG_FLOOR)
+        else:
+            power = self._averager.process(power)
+            power_db = 10 * np.log10(power + DSPConstants.POWER_LOG_FLOOR)
+        freq_bins = np.fft.fftshift(np.fft.fftfreq(self.fft_size, 1 / self.sample_rate)) + self.centre_freq
+        return power_db, freq_bins
+
+    def read_samples_only(self) -> np.ndarray | None:
+        if not self.running:
+            return None
+        return self._next_frame()
+
+    def set_window_type(self, window_type: str):
+        window_funcs = {
+            'hanning': np.hanning,
+            'hamming': np.hamming,
+            'rectangle': np.ones
+        }
+        self.window = window_funcs.get(window_type.lower(), np.hanning)(self.fft_size)
+
+    def set_fft_size(self, fft_size: int):
+        if fft_size == self.fft_size:
+            return
+        self.fft_size = min(fft_size, self._length) if self._length else fft_size
+        self.window = np.hanning(self.fft_size)
+        self._averager.reset()
+
+    @property
+    def sample_count(self) -> int:
+        return self.fft_size
+
+    @sample_count.setter
+    def sample_count(self, value: int):
+        self.set_fft_size(value)
+
+    def set_psd_mode(self, enabled: bool):
+        self.use_psd = enabled
+
+
+class IQFileSamplesDataSource(BufferPlaybackDataSource):
+    def __init__(self, path, sample_rate: Optional[float] = None,
+                 centre_freq: Optional[float] = None, fmt: Optional[str] = None):
+        meta = read_sidecar(path)
+        fmt = fmt or meta.get('format') or _EXTENSIONS.get(Path(path).suffix.lower())
+        if fmt not in _FORMATS:
+            raise ValueError(f"Unknown IQ file format for {Path(path).name} "
+                             f"(expected one of {', '.join(_FORMATS)})")
+        if sample_rate is None:
+            sample_rate = meta.get('sample_rate', _DEFAULT_SAMPLE_RATE)
+        if centre_freq is None:
+            centre_freq = meta.get('centre_freq', 0.0)
+        super().__init__(sample_rate, centre_freq)
+        self.path = Path(path)
+        self.fmt = fmt
+        logger.debug(f"Initialised IQFileSamplesDataSource for {self.path.name} ({fmt})")
+
+    def _load(self) -> np.ndarray:
+        """Map the file; the recording's own tuning is kept regardless of ``frequency``."""
+        dtype, width = _FORMATS[self.fmt]
+        try:
+            raw = np.memmap(self.path, dtype=dtype, mode='r')
+        except (OSError, ValueError) as e:
+            raise RuntimeError(f"Cannot open IQ file {self.path}: {e}")
+        if width == 2:
+            raw = raw[:len(raw) // 2 * 2].reshape(-1, 2)
+        if len(raw) < self.fft_size:
+            raise RuntimeError(f"IQ file {self.path.name} is shorter than one FFT frame")
+        return raw
+
+    def _to_complex(self, raw: np.ndarray) -> np.ndarray:
+        """View (cf32) or scale (8-bit) a map slice to complex64."""
+        if self.fmt == "cf32":
+            return raw
+        iq = raw.astype(np.float32)
+        if self.fmt == "cu8":
+            iq -= 127.5
+            iq *= 1.0 / 127.5
+        else:
+            iq *= 1.0 / 128.0
+        return iq.view(np.complex64).ravel()
+
+    def update_frequency(self, sample_rate: float, centre_freq: float):
+        """Recordings have fixed tuning; requests are ignored."""
+        logger.debug("IQ file playback: tuning is fixed by the recording")
+
+    def update_centre_frequency(self, centre_freq: float):
+        logger.debug("IQ file playback: tuning is fixed by the recording")
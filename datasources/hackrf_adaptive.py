@@ -0,0 +1,411 @@
+"""Two-tier adaptive HackRF sweep: a fast coarse survey plus fine dwell on active regions.
+
+HackrfAdaptiveDataSource alternates the one HackRF between two tiers every
+revisit period (``REVISIT_S``):
+
+    1. a coarse ``hackrf_sweep`` of the whole range at ``bin_size``,
+    2. the peak finder (``utils.signal_processing.find_top_peaks``) picks the
+       occupied regions — peaks ``THRESHOLD_DB`` above the coarse noise
+       floor, widened to their occupied extent and whole MHz, and held for
+       ``HOLD_REVISITS`` surveys so bursty signals keep their region,
+    3. the rest of the period is spent on those regions only, either as a
+       multi-band ``hackrf_sweep`` at ``fine_bin_size`` (``fine_mode``
+       ``'sweep'``) or as ``HackrfSamplesDataSource`` captures FFT'd at the
+       same resolution (``'capture'``).
+
+The published sweep is one multi-resolution grid: the coarse bins outside
+the regions and the fine bins inside them, in frequency order, so the bin
+spacing is not uniform.  The grid stays the same while the regions do.
+Until a region's first fine sweep arrives it shows the coarse sweep
+interpolated onto its fine bins.
+"""
+
+import logging
+import shutil
+import threading
+import time
+from collections import deque
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from datasources import hackrf_samples
+from datasources.base import SweepDataSource
+from datasources.hackrf_sweep import HackRFSweepDataSource, MAX_BANDS
+from utils.constants import DSPConstants
+from utils.signal_processing import find_top_peaks
+from utils.frequency_selector import FrequencyRange
+
+logger = logging.getLogger(__name__)
+
+_FINE_MODES = ('sweep', 'capture')
+_MIN_FINE_BIN = 2_445             # hackrf_sweep's narrowest -w (20 MS/s / 8180)
+_PASS_TIMEOUT = 5.0               # longest wait for one sweep of either tier
+_CAPTURE_RATE = 20_000_000
+_CAPTURE_SPAN = 15e6              # usable part of one capture inside the baseband filter
+_CAPTURE_FRAMES = 8               # FFT frames averaged per capture
+_MAX_CAPTURE_FFT = 1 << 16
+
+
+def _merge(regions: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Sorted union of (low, high) regions, joining any that overlap or touch."""
+    merged = []
+    for low, high in sorted(regions):
+        if merged and low <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(high, merged[-1][1]))
+        else:
+            merged.append((low, high))
+    return merged
+
+
+class HackrfAdaptiveDataSource(SweepDataSource):
+    """Coarse full-range survey with fine-resolution dwell on occupied regions.
+
+    Args:
+        start_freq:    First frequency in Hz.
+        stop_freq:     Last frequency in Hz.
+        bin_size:      Coarse survey bin in Hz.
+        fine_bin_size: Bin inside occupied regions in Hz (default ``bin_size / FINE_RATIO``).
+    """
+
+    REVISIT_S = 1.0               # coarse survey at least this often; fine dwell fills the rest
+    THRESHOLD_DB = 10.0           # above the coarse noise floor counts as occupied
+    MIN_REGION_HZ = 2e6
+    MAX_REGION_HZ = 40e6
+    HOLD_REVISITS = 3             # a region is kept this many surveys after it was last seen
+    FINE_RATIO = 50
+
+    has_own_grid = True           # coarse and fine bins in one grid
+
+    def __init__(self, start_freq: float, stop_freq: float, bin_size: int,
+                 fine_bin_size: Optional[int] = None):
+        super().__init__()
+        self.start_freq = int(start_freq)
+        self.stop_freq = int(stop_freq)
+        self.bin_size = int(bin_size)
+        self.fine_bin_size = int(fine_bin_size or max(self.bin_size // self.FINE_RATIO, _MIN_FINE_BIN))
+        self.fine_mode = 'sweep'      # 'sweep' or 'capture'
+        self.lna_gain = 16
+        self.vga_gain = 20
+        self.amp_enabled = True
+        self.running = False
+        self.sweep_rate = None        # coarse revisits per second
+        self.sweep_count = 0          # coarse revisits since start
+        self.fine_count = 0           # fine sweeps (or capture passes) since start
+        self.regions: List[Tuple[int, int]] = []
+        self._recent = deque(maxlen=self.HOLD_REVISITS)   # regions found by the last few surveys
+        self.frequency_grid = np.array([])
+        self._coarse = HackRFSweepDataSource(self.start_freq, self.stop_freq, self.bin_size)
+        self._fine = HackRFSweepDataSource(self.start_freq, self.stop_freq, self.fine_bin_size)
+        self._capture = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._sweep: Optional[np.ndarray] = None       # last merged sweep
+        self._grid = np.array([])                      # merged grid for the current regions
+        self._outside = np.array([], dtype=bool)       # coarse bins not covered by a region
+        self._order = np.array([], dtype=np.intp)      # sorts [coarse outside, fine] into frequency order
+        self._coarse_power = np.array([])
+        self._fine_power = np.array([])
+        logger.debug(f"Initialized HackrfAdaptiveDataSource: start={self.start_freq/1e6:.2f} MHz, "
+                     f"stop={self.stop_freq/1e6:.2f} MHz, coarse {self.bin_size/1e3:.1f} kHz, "
+                     f"fine {self.fine_bin_size/1e3:.2f} kHz")
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self, frequency: FrequencyRange = None):
+        """Start the survey over ``frequency`` (or the current range)."""
+        if frequency is not None:
+            self.start_freq = int(frequency.start)
+            self.stop_freq = int(frequency.stop)
+        if self.start_freq >= self.stop_freq:
+            raise ValueError("Start frequency must be less than stop frequency")
+        if shutil.which("hackrf_sweep") is None:
+            raise RuntimeError("hackrf_sweep not found on PATH")
+        if self.fine_mode == 'capture' and not hackrf_samples._HACKRF_AVAILABLE:
+            raise RuntimeError("HackRF library (libhackrf) not available on this system")
+        if self.running:
+            self.stop()
+        self._coarse = HackRFSweepDataSource(self.start_freq, self.stop_freq, self.bin_size)
+        with self._lock:
+            self._sweep = None
+        self.regions = []
+        self._recent.clear()
+        self._grid = np.array([])
+        self.sweep_rate = None
+        self.sweep_count = 0
+        self.fine_count = 0
+        self._stop_event.clear()
+        self.running = True
+        self._thread = threading.Thread(target=self._run, name="HackrfAdaptive", daemon=True)
+        self._thread.start()
+        logger.debug(f"HackRF adaptive sweep started ({self.fine_mode} dwell)")
+
+    def stop(self):
+        """Stop after the current step and release the HackRF."""
+        self.running = False
+        self._stop_event.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=3.0)
+        self._release()
+        logger.debug("HackRF adaptive sweep stopped")
+
+    def _release(self) -> None:
+        for src in (self._coarse, self._fine):
+            if src.is_running or src.process is not None:
+                src.stop()
+        if self._capture is not None:
+            self._capture.stop()
+            self._capture = None
+
+    def get_data(self) -> np.ndarray:
+        """Return a copy of the last merged sweep (empty until the first survey completes)."""
+        with self._lock:
+            if self._sweep is None:
+                return np.array([])
+            return self._sweep.copy()
+
+    def set_fine_mode(self, mode: str):
+        """Dwell on the regions with ``'sweep'`` (hackrf_sweep) or ``'capture'`` (IQ); restarts a running survey.
+
+        Raises:
+            ValueError: Unknown mode.
+        """
+        if mode not in _FINE_MODES:
+            raise ValueError(f"Unknown fine mode '{mode}'")
+        self.fine_mode = mode
+        if self.running:
+            self.stop()
+            self.start()
+
+    def set_gains(self, lna_gain=None, vga_gain=None):
+        """Set LNA and/or VGA gain; used from the next pass of either tier."""
+        if lna_gain is not None:
+            self.lna_gain = int(lna_gain)
+        if vga_gain is not None:
+            self.vga_gain = int(vga_gain)
+
+    def set_amplifier(self, enabled: bool):
+        """Switch the RF amplifier; used from the next pass of either tier."""
+        self.amp_enabled = bool(enabled)
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        last = None
+        try:
+            while self.running:
+                t0 = time.monotonic()
+                coarse = self._coarse_pass()
+                if coarse is None:
+                    continue
+                found = self._find_regions(self._coarse.frequency_grid, coarse)
+                self._recent.append(found)
+                regions = _merge([r for recent in self._recent for r in recent])
+                if len(regions) > MAX_BANDS:         # too many held over: this survey's alone
+                    regions = found
+                if regions != self.regions or len(self._grid) == 0:
+                    self._plan(regions)
+                self._coarse_power = coarse
+                self._publish()
+                if self.regions and self.running:
+                    deadline = t0 + self.REVISIT_S
+                    if self.fine_mode == 'capture':
+                        self._capture_pass(deadline)
+                    else:
+                        self._fine_sweep_pass(deadline)
+                now = time.monotonic()
+                if last is not None:
+                    self.sweep_rate = 1.0 / max(now - last, 1e-6)
+                last = now
+                self.sweep_count += 1
+                self._report_cpu()
+        except Exception as e:
+            if self.running:
+                logger.error(f"HackRF adaptive sweep stopped on error: {e}")
+                self.running = False
+        finally:
+            self._release()
+
+    def _configure(self, src) -> None:
+        src.cpu_meter = self.cpu_meter
+        src.lna_gain = self.lna_gain
+        src.vga_gain = self.vga_gain
+        if hasattr(src, 'amplifier'):
+            src.amplifier = self.amp_enabled
+        else:
+            src.amp_enabled = self.amp_enabled
+
+    def _wait_for_sweep(self, src: HackRFSweepDataSource, seen: int, deadline: float) -> bool:
+        """Wait until ``src`` completes a sweep after its ``seen``-th, it exits, or ``deadline``."""
+        while self.running and src.is_running and src.sweep_count <= seen:
+            if time.monotonic() >= deadline:
+                return False
+            self._stop_event.wait(0.005)
+        return src.sweep_count > seen
+
+    def _coarse_pass(self) -> Optional[np.ndarray]:
+        """One full-range coarse sweep, or None if it did not complete."""
+        src = self._coarse
+        self._configure(src)
+        src.start()
+        try:
+            if not self._wait_for_sweep(src, 0, time.monotonic() + _PASS_TIMEOUT):
+                if self.running:
+                    logger.warning("HackRF adaptive: coarse sweep did not complete")
+                    self._stop_event.wait(0.5)
+                return None
+            return src.get_data()
+        finally:
+            src.stop()
+
+    def _find_regions(self, grid: np.ndarray, power: np.ndarray) -> List[Tuple[int, int]]:
+        """Occupied regions of a coarse sweep as sorted, disjoint (low, high) Hz in whole MHz."""
+        finite = np.isfinite(power)
+        if finite.sum() < 3:
+            return []
+        floor = float(np.median(power[finite]))
+        power = np.where(finite, power, floor)
+        occupied = power > floor + self.THRESHOLD_DB / 2
+        peaks = find_top_peaks(
+            grid, power, n=MAX_BANDS,
+            min_sep_bins=max(int(self.MIN_REGION_HZ / self.bin_size), 2),
+            min_excursion_db=self.THRESHOLD_DB / 2)
+        regions = []
+        for freq, level in peaks:
+            if level < floor + self.THRESHOLD_DB:
+                continue
+            i = int(np.searchsorted(grid, freq))
+            lo = i
+            while lo > 0 and occupied[lo - 1]:
+                lo -= 1
+            hi = i
+            while hi < len(grid) - 1 and occupied[hi + 1]:
+                hi += 1
+            low = max(grid[lo] - self.bin_size, freq - self.MAX_REGION_HZ / 2)
+            high = min(grid[hi] + self.bin_size, freq + self.MAX_REGION_HZ / 2)
+            if high - low < self.MIN_REGION_HZ:
+                low, high = freq - self.MIN_REGION_HZ / 2, freq + self.MIN_REGION_HZ / 2
+            low = max(np.floor(low / 1e6) * 1e6, self.start_freq)
+            high = min(np.ceil(high / 1e6) * 1e6, self.stop_freq)
+            if high > low:
+                regions.append((int(low), int(high)))
+        return _merge(regions)
+
+    def _plan(self, regions: List[Tuple[int, int]]) -> None:
+        """Lay out the merged grid for ``regions``; fine bins start from the coarse sweep."""
+        coarse_grid = self._coarse.frequency_grid
+        outside = np.ones(len(coarse_grid), dtype=bool)
+        if regions:
+            self._fine.set_bands(regions)
+            for low, high in regions:
+                outside &= (coarse_grid < low) | (coarse_grid > high)
+            fine_grid = self._fine.frequency_grid
+        else:
+            fine_grid = np.array([])
+        grid = np.concatenate([coarse_grid[outside], fine_grid])
+        self._order = np.argsort(grid, kind='stable')
+        self._grid = grid[self._order]
+        self._outside = outside
+        self._fine_power = np.full(len(fine_grid), np.nan)
+        self.regions = regions
+        spans = ", ".join(f"{low / 1e6:g}–{high / 1e6:g}" for low, high in regions) or "none"
+        logger.debug(f"HackRF adaptive: {len(regions)} region(s) ({spans} MHz), {len(self._grid)} bins")
+
+    def _publish(self) -> None:
+        """Merge the latest coarse and fine sweeps into the published sweep."""
+        coarse = self._coarse_power
+        fine = self._fine_power
+        if len(fine):
+            missing = np.isnan(fine)
+            if missing.any():             # no fine sweep yet: the coarse sweep on the fine bins
+                fine = fine.copy()
+                fine[missing] = np.interp(self._fine.frequency_grid[missing],
+                                          self._coarse.frequency_grid, coarse)
+        merged = np.concatenate([coarse[self._outside], fine])[self._order]
+        with self._lock:
+            self.frequency_grid = self._grid
+            self._sweep = merged
+
+    # ------------------------------------------------------------------
+    # Fine tier
+    # ------------------------------------------------------------------
+
+    def _fine_sweep_pass(self, deadline: float) -> None:
+        """Multi-band fine sweeps of the regions until ``deadline`` (at least one)."""
+        src = self._fine
+        self._configure(src)
+        src.start()
+        try:
+            first = True
+            while self.running:
+                until = max(deadline, time.monotonic() + _PASS_TIMEOUT) if first else deadline
+                if not self._wait_for_sweep(src, src.sweep_count, until):
+                    break
+                first = False
+                data = src.get_data()
+                if len(data) == len(self._fine_power):
+                    np.copyto(self._fine_power, data, where=~np.isnan(data))
+                    self.fine_count += 1
+                    self._publish()
+        finally:
+            src.stop()
+
+    def _capture_pass(self, deadline: float) -> None:
+        """IQ captures across the regions until ``deadline`` (at least one full pass)."""
+        n = 1
+        while _CAPTURE_RATE / n > self.fine_bin_size and n < _MAX_CAPTURE_FFT:
+            n *= 2
+        window = np.hanning(n).astype(np.float32)
+        offsets = np.fft.fftshift(np.fft.fftfreq(n, 1.0 / _CAPTURE_RATE))
+        fine_grid = self._fine.frequency_grid
+        chunks = []                       # (centre, fine-grid slice) per capture
+        for (low, high), band in zip(self.regions, self._fine.band_slices):
+            count = int(np.ceil((high - low) / _CAPTURE_SPAN))
+            edges = np.linspace(low, high, count + 1)
+            for a, b in zip(edges, edges[1:]):
+                lo, hi = np.searchsorted(fine_grid[band], (a, b), side='left')
+                if b == edges[-1]:
+                    hi = band.stop - band.start
+                chunks.append(((a + b) / 2, slice(band.start + lo, band.start + hi)))
+
+        cap = self._capture
+        if cap is None:
+            cap = self._capture = hackrf_samples.HackrfSamplesDataSource(_CAPTURE_RATE, int(chunks[0][0]))
+        self._configure(cap)
+        cap.set_num_samples(n)
+        cap.centre_freq = int(chunks[0][0])
+        cap.start()
+        try:
+            first = True
+            while self.running and (first or time.monotonic() < deadline):
+                for centre, part in chunks:
+                    cap.retune(centre)
+                    power = np.zeros(n)
+                    frames = 0
+                    for _ in range(_CAPTURE_FRAMES):
+                        samples = cap.read_samples_only()
+                        if samples is None or not self.running:
+                            break
+                        samples = (samples - np.mean(samples)) * window
+                        spectrum = np.fft.fft(samples)
+                        power += spectrum.real ** 2 + spectrum.imag ** 2
+                        frames += 1
+                    if not frames:
+                        continue
+                    # |X| / N per bin, the scaling hackrf_sweep applies to its own FFT
+                    power_db = 10.0 * np.log10(np.fft.fftshift(power) / (frames * n * n)
+                                               + DSPConstants.POWER_LOG_FLOOR)
+                    self._fine_power[part] = np.interp(fine_grid[part], centre + offsets, power_db)
+                if not self.running:
+                    break
+                first = False
+                self.fine_count += 1
+                self._publish()
+        finally:
+            cap.stop()
@@ -29,7 +29,11 @@ class HackrfSamplesDataSource(SampleDataSource):
     MAX_QUEUE_SIZE = 4     # 4 × 3.3 ms = ~13 ms max latency
     CONSUME_TIMEOUT = 0.5  # Max time to wait for samples
     STOP_TIMEOUT = 2.0    # Timeout for thread join
+    SETTLE_S = 0.0005      # PLL lock after a retune, discarded by sample count
+    TRANSFER = 1 << 17     # libhackrf bulk transfer (256 KiB of 8-bit IQ), in samples
+    FIFO = 1 << 20         # libhackrf's 15 queued transfers, rounded up
     _DC_ALPHA = 1.0       # DC tracking smoothing factor; smaller = slower, more stable
+    _STREAM_FROM_READER = True  # reader thread publishes every block to stream consumers
 
     def __init__(self, sample_rate: int, centre_freq: int):
         super().__init__(sample_rate, centre_freq)
@@ -53,6 +57,10 @@ class HackrfSamplesDataSource(SampleDataSource):
         # High-performance queue-based buffering
         self._sample_queue = queue.Queue(maxsize=self.MAX_QUEUE_SIZE)
         self._reader_thread = None
+        # Stream clock for retune(), all guarded by _device_lock
+        self._retune_discard = 0        # samples the reader drops after a retune
+        self._stream_t0 = 0.0           # latest time the stream can have started
+        self._consumed = 0              # stream position of the next unread sample
 
         # FFT resources
         self._window = None
@@ -194,6 +202,10 @@ class HackrfSamplesDataSource(SampleDataSource):
         
         read_errors = 0
         max_consecutive_errors = 5
+        with self._device_lock:
+            self._retune_discard = 0
+            self._consumed = 0
+            self._stream_t0 = time.monotonic()
 
         while self.running and not self._stop_requested.is_set():
             try:
@@ -205,6 +217,22 @@ class HackrfSamplesDataSource(SampleDataSource):
                     
                     # This should release GIL during USB transfer
                     samples = self.device.read_samples(self.READ_CHUNK)
+                    if samples is not None:
+                        # The device had captured at least this much by now, which bounds
+                        # the stream start; a read that blocked makes the bound tight
+                        self._consumed += len(samples)
+                        self._stream_t0 = min(self._stream_t0,
+                                              time.monotonic() - self._consumed / self.last_sample_rate)
+                    if samples is not None and self._retune_discard:
+                        skip = min(self._retune_discard, len(samples))
+                        self._retune_discard -= skip
+                        samples = samples[skip:]
+                        if len(samples) == 0:
+                            continue
+                    # Queued under the device lock, so no block read before a retune
+                    # lands in the queue after the retune has flushed it
+                    if samples is not None and len(samples):
+                        self._enqueue(samples)
                 
                 if samples is None:
                     logger.warning("Received None samples from device")
@@ -216,25 +244,7 @@ class HackrfSamplesDataSource(SampleDataSource):
 
                 read_errors = 0  # Reset error counter on successful read
                 self._stats['last_read_time'] = time.time()
-
-                # Non-blocking put with controlled dropping
-                try:
-                    self._sample_queue.put(samples, block=False)
-                except queue.Full:
-                    # Queue is full, try to make room
-                    try:
-                        # Drop oldest chunk to make room for newest
-                        dropped = self._sample_queue.get_nowait()
-                        self._sample_queue.put(samples, block=False)
-                        self._stats['samples_dropped'] += len(dropped)
-                        self._stats['queue_overflows'] += 1
-                        logger.debug(f"Queue overflow #{self._stats['queue_overflows']} (expected — keeping newest)")
-                            
-                    except (queue.Empty, queue.Full):
-                        # Couldn't make room, drop this chunk
-                        self._stats['samples_dropped'] += len(samples)
-                        if self._stats['samples_dropped'] % (10 * self.READ_CHUNK) == 0:
-                            logger.warning(f"Dropped {self._stats['samples_dropped']} samples total")
+                self._publish_stream(samples)
 
             except Exception as e:
                 read_errors += 1
@@ -251,6 +261,27 @@ class HackrfSamplesDataSource(SampleDataSource):
 
         logger.debug("HackRF reader thread stopped")
 
+    def _enqueue(self, samples: np.ndarray) -> None:
+        """Queue one block for the consumer; caller holds ``_device_lock``."""
+        # Non-blocking put with controlled dropping
+        try:
+            self._sample_queue.put(samples, block=False)
+        except queue.Full:
+            # Queue is full, try to make room
+            try:
+                # Drop oldest chunk to make room for newest
+                dropped = self._sample_queue.get_nowait()
+                self._sample_queue.put(samples, block=False)
+                self._stats['samples_dropped'] += len(dropped)
+                self._stats['queue_overflows'] += 1
+                logger.debug(f"Queue overflow #{self._stats['queue_overflows']} (expected — keeping newest)")
+                    
+            except (queue.Empty, queue.Full):
+                # Couldn't make room, drop this chunk
+                self._stats['samples_dropped'] += len(samples)
+                if self._stats['samples_dropped'] % (10 * self.READ_CHUNK) == 0:
+                    logger.warning(f"Dropped {self._stats['samples_dropped']} samples total")
+
     def _consume_samples(self, count: int) -> np.ndarray:
         """Pull exactly `count` samples, always using the freshest available data.
 
@@ -491,6 +522,37 @@ class HackrfSamplesDataSource(SampleDataSource):
             else:
                 logger.debug(f"Stored centre frequency {centre_freq/1e6:.2f} MHz (will apply on next start)")
 
+    def retune(self, centre_freq: float):
+        """Move a running stream to ``centre_freq`` without stopping it.
+
+        For callers that hop on every capture: the RX stream keeps running and
+        the reader drops, by sample count, everything captured before the PLL
+        settled -- the rest of the transfer in flight, or the backlog the
+        reader has fallen behind by if larger, estimated from the stream clock
+        the way the wideband sweep does.  Falls back to ``update_centre_frequency``
+        when the stream is not running.
+        """
+        centre_freq = int(centre_freq)
+
+        with self._lock:
+            if not self.running:
+                self.update_centre_frequency(centre_freq)
+                return
+            if centre_freq == self.centre_freq:
+                return
+            with self._device_lock:
+                self.device.set_freq(centre_freq)
+                self.centre_freq = centre_freq
+                self._flush_buffers()
+                rate = self.last_sample_rate
+                backlog = int((time.monotonic() - self._stream_t0) * rate) - self._consumed
+                if backlog > self.FIFO:                  # the device dropped the oldest
+                    self._consumed += backlog - self.FIFO
+                    backlog = self.FIFO
+                in_flight = -self._consumed % self.TRANSFER
+                self._retune_discard = max(backlog, in_flight) + int(self.SETTLE_S * rate)
+            logger.debug(f"Retuned to {centre_freq/1e6:.2f} MHz")
+
     def update_sample_rate(self, sample_rate: float):
         """Update sample rate with proper synchronization."""
         sample_rate = int(sample_rate)
@@ -0,0 +1,262 @@
+"""HackRF sweep sharded across several devices.
+
+HackrfShardedDataSource splits the range into one contiguous shard per
+HackRF (chosen by serial number) and runs a ``hackrf_sweep`` on each, so
+every device sweeps only its share and the whole range is revisited about
+N times as often.  Each shard is an ordinary HackRFSweepDataSource with
+its own process and reader threads, its own LNA/VGA gain and its own
+calibration offset in dB.
+
+The merged sweep is on the grid a single-device sweep would use: each
+shard fills the part of it between its boundaries.  Shards overlap their
+neighbours by ``OVERLAP_HZ``, and the overlap is the stitch-boundary
+consistency check: the median difference between the two devices' levels
+there (after calibration) should be near zero.  ``stitch_errors_db`` holds
+it for each boundary and ``match_levels`` returns offsets that null it.
+"""
+
+import logging
+import re
+import subprocess
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from datasources.base import SweepDataSource
+from datasources.hackrf_sweep import HackRFSweepDataSource
+from utils.frequency_selector import FrequencyRange
+
+logger = logging.getLogger(__name__)
+
+_SERIAL_PATTERN = re.compile(r'Serial number:\s*(?:0x)?([0-9a-fA-F]+)')
+_INFO_TIMEOUT = 5.0
+
+
+def list_hackrf_serials() -> List[str]:
+    """Serial numbers of the attached HackRFs, from ``hackrf_info`` (empty if none or no tool)."""
+    try:
+        result = subprocess.run(["hackrf_info"], capture_output=True, text=True, timeout=_INFO_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.warning(f"hackrf_info failed: {e}")
+        return []
+    return _SERIAL_PATTERN.findall(result.stdout)
+
+
+def cal_key(serial: str) -> str:
+    """CalibrationManager key for one device's offset."""
+    return f"hackrf:{serial}"
+
+
+class HackrfShardedDataSource(SweepDataSource):
+    """One range swept by several HackRFs, each taking a contiguous shard.
+
+    Args:
+        start_freq: First frequency in Hz.
+        stop_freq:  Last frequency in Hz.
+        bin_size:   Bin size in Hz, the same on every device.
+        serials:    Devices to use, in frequency order (default: every HackRF found).
+    """
+
+    OVERLAP_HZ = 5e6              # each shard reaches this far into its neighbours
+    STITCH_TOLERANCE_DB = 1.5     # boundary level mismatch reported as inconsistent
+
+    def __init__(self, start_freq: float, stop_freq: float, bin_size: int,
+                 serials: Optional[List[str]] = None):
+        super().__init__()
+        self.start_freq = int(start_freq)
+        self.stop_freq = int(stop_freq)
+        self.bin_size = int(bin_size)
+        self.serials = list(serials) if serials else list_hackrf_serials()
+        self.lna_gain = 16
+        self.vga_gain = 20
+        self.amp_enabled = True
+        self.device_gains: Dict[str, tuple] = {}      # serial -> (lna, vga) overriding the shared gains
+        self.cal_offsets: Dict[str, float] = {}       # serial -> dB added to that device's levels
+        self.shards: List[HackRFSweepDataSource] = []
+        self.boundaries: List[int] = []               # shard i owns [boundaries[i], boundaries[i + 1])
+        self.stitch_errors_db: List[float] = []
+        self.frequency_grid = np.array([])
+        self._lock = threading.Lock()
+        self._merged = np.array([])
+        self._owned: List[slice] = []
+        self._seen: List[int] = []
+        self._stitch_ok = True
+        self._plan()
+        logger.debug(f"Initialized HackrfShardedDataSource: {len(self.serials)} device(s), "
+                     f"start={self.start_freq/1e6:.2f} MHz, stop={self.stop_freq/1e6:.2f} MHz")
+
+    # ------------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------------
+
+    def _plan(self) -> None:
+        """Split the range into one shard per device (whole MHz boundaries) and lay out the grid."""
+        count = max(len(self.serials), 1)
+        edges = np.linspace(self.start_freq, self.stop_freq, count + 1)
+        inner = [int(round(f / 1e6) * 1e6) for f in edges[1:-1]]
+        self.boundaries = [self.start_freq, *inner, self.stop_freq]
+        num_bins = int((self.stop_freq - self.start_freq) / self.bin_size)
+        self.frequency_grid = np.linspace(self.start_freq, self.stop_freq, num_bins)
+        cuts = np.searchsorted(self.frequency_grid, self.boundaries[1:-1])
+        bounds = [0, *cuts.tolist(), num_bins]
+        self._owned = [slice(a, b) for a, b in zip(bounds, bounds[1:])]
+        self._merged = np.full(num_bins, np.nan)
+        self.stitch_errors_db = [float('nan')] * (count - 1)
+
+    def _shard_range(self, i: int) -> tuple:
+        low = max(self.boundaries[i] - self.OVERLAP_HZ, self.start_freq)
+        high = min(self.boundaries[i + 1] + self.OVERLAP_HZ, self.stop_freq)
+        return low, high
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self, frequency: FrequencyRange = None):
+        """Start one hackrf_sweep per device over its shard of ``frequency`` (or the current range)."""
+        if frequency is not None:
+            self.start_freq = int(frequency.start)
+            self.stop_freq = int(frequency.stop)
+        if self.start_freq >= self.stop_freq:
+            raise ValueError("Start frequency must be less than stop frequency")
+        if not self.serials:
+            raise RuntimeError("No HackRF found (hackrf_info lists no serial numbers)")
+        self.stop()
+        self._plan()
+        self.shards = []
+        try:
+            for i, serial in enumerate(self.serials):
+                low, high = self._shard_range(i)
+                shard = HackRFSweepDataSource(low, high, self.bin_size)
+                shard.serial = serial
+                shard.lna_gain, shard.vga_gain = self.device_gains.get(serial, (self.lna_gain, self.vga_gain))
+                shard.amp_enabled = self.amp_enabled
+                shard.cpu_meter = self.cpu_meter
+                shard.start()
+                self.shards.append(shard)
+        except Exception as e:
+            self.stop()
+            raise RuntimeError(f"HackRF sharded sweep start failed: {e}")
+        self._seen = [0] * len(self.shards)
+        self._stitch_ok = True
+        logger.debug("HackRF sharded sweep started: " + ", ".join(
+            f"{s.serial[-8:]} {s.start_freq/1e6:g}–{s.stop_freq/1e6:g} MHz" for s in self.shards))
+
+    def stop(self):
+        """Stop every device's sweep."""
+        for shard in self.shards:
+            shard.stop()
+        logger.debug("HackRF sharded sweep stopped")
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self.shards) and all(s.is_running for s in self.shards)
+
+    @property
+    def sweep_rate(self) -> Optional[float]:
+        """Full-range sweeps per second: the slowest device sets the pace."""
+        rates = [s.sweep_rate for s in self.shards]
+        if not rates or None in rates:
+            return None
+        return min(rates)
+
+    @property
+    def sweep_count(self) -> int:
+        return min((s.sweep_count for s in self.shards), default=0)
+
+    @property
+    def stitch_ok(self) -> bool:
+        """Every boundary measured so far agrees within ``STITCH_TOLERANCE_DB``."""
+        return all(not abs(e) > self.STITCH_TOLERANCE_DB for e in self.stitch_errors_db)
+
+    def get_data(self) -> np.ndarray:
+        """Return the merged sweep; shards not yet swept are NaN."""
+        with self._lock:
+            if not self.shards:
+                return np.array([])
+            counts = [s.sweep_count for s in self.shards]
+            if counts != self._seen:
+                self._merge(counts)
+            return self._merged.copy()
+
+    # ------------------------------------------------------------------
+    # Gains and calibration
+    # ------------------------------------------------------------------
+
+    def set_gains(self, lna_gain=None, vga_gain=None):
+        """Set LNA and/or VGA gain on every device (replacing per-device gains)."""
+        if lna_gain is not None:
+            self.lna_gain = int(lna_gain)
+        if vga_gain is not None:
+            self.vga_gain = int(vga_gain)
+        self.device_gains.clear()
+        for shard in self.shards:
+            shard.set_gains(self.lna_gain, self.vga_gain)
+
+    def set_device_gains(self, serial: str, lna_gain: int, vga_gain: int):
+        """Give one device its own LNA/VGA gain; restarts that device's sweep."""
+        self.device_gains[serial] = (int(lna_gain), int(vga_gain))
+        for shard in self.shards:
+            if shard.serial == serial:
+                shard.set_gains(lna_gain, vga_gain)
+
+    def set_amplifier(self, enabled: bool):
+        self.amp_enabled = bool(enabled)
+        for shard in self.shards:
+            shard.set_amplifier(enabled)
+
+    def load_cal_offsets(self, get_offset) -> None:
+        """Take each device's offset from ``get_offset(key)`` (e.g. CalibrationManager.get_offset)."""
+        self.cal_offsets = {s: float(get_offset(cal_key(s))) for s in self.serials}
+
+    def match_levels(self) -> Dict[str, float]:
+        """Calibration offsets that null every measured stitch error, relative to the first device."""
+        offsets = {s: self.cal_offsets.get(s, 0.0) for s in self.serials}
+        shift = 0.0
+        for serial, error in zip(self.serials[1:], self.stitch_errors_db):
+            if np.isnan(error):
+                break
+            shift += error
+            offsets[serial] += shift
+        return offsets
+
+    # ------------------------------------------------------------------
+    # Merging
+    # ------------------------------------------------------------------
+
+    def _merge(self, counts: List[int]) -> None:
+        """Place each updated shard into its part of the grid and recheck its boundaries."""
+        levels = []
+        for i, shard in enumerate(self.shards):
+            data = shard.get_data()
+            if counts[i] == 0 or len(data) != len(shard.frequency_grid):
+                levels.append(None)
+                continue
+            data = data + self.cal_offsets.get(shard.serial, 0.0)
+            levels.append(data)
+            if counts[i] != self._seen[i]:
+                owned = self._owned[i]
+                self._merged[owned] = np.interp(self.frequency_grid[owned], shard.frequency_grid, data)
+        for i in range(len(self.shards) - 1):
+            if levels[i] is not None and levels[i + 1] is not None:
+                self.stitch_errors_db[i] = self._stitch_error(i, levels[i], levels[i + 1])
+        self._seen = counts
+        ok = self.stitch_ok
+        if ok != self._stitch_ok:
+            if not ok:
+                errors = ", ".join(f"{e:+.1f}" for e in self.stitch_errors_db)
+                logger.warning(f"HackRF sharded sweep: levels disagree at the shard boundaries ({errors} dB)")
+            self._stitch_ok = ok
+
+    def _stitch_error(self, i: int, lower: np.ndarray, upper: np.ndarray) -> float:
+        """Median level difference (lower device minus upper) where shards i and i + 1 overlap."""
+        boundary = self.boundaries[i + 1]
+        a, b = self.shards[i], self.shards[i + 1]
+        freqs = self.frequency_grid[(self.frequency_grid >= max(boundary - self.OVERLAP_HZ, b.start_freq))
+                                    & (self.frequency_grid <= min(boundary + self.OVERLAP_HZ, a.stop_freq))]
+        if len(freqs) < 3:
+            return float('nan')
+        difference = (np.interp(freqs, a.frequency_grid, lower)
+                      - np.interp(freqs, b.frequency_grid, upper))
+        return float(np.nanmedian(difference))
@@ -1,3 +1,4 @@
+import math
 import subprocess
 import numpy as np
 import threading
@@ -7,15 +8,27 @@ from .base import SweepDataSource
 
 logger = logging.getLogger(__name__)
 
+MAX_BANDS = 10                    # hackrf_sweep's MAX_SWEEP_RANGES
+
 class HackRFSweepDataSource(SweepDataSource):
+    """Spectrum from the ``hackrf_sweep`` tool over one range or several separate bands.
+
+    With several bands (``set_bands``) the tool is given one ``-f`` per band
+    and sweeps only those, and the frequency grid is the bands' grids end to
+    end: ``band_slices[i]`` selects band ``i``'s part of the grid and of
+    every sweep from ``get_data``.
+    """
+
     def __init__(self, start_freq: float, stop_freq: float, bin_size: int):
         super().__init__()
         self.start_freq = int(start_freq)
         self.stop_freq = int(stop_freq)
+        self.bands = [(self.start_freq, self.stop_freq)]
         self.bin_size = int(bin_size)
         self.lna_gain = 20
         self.vga_gain = 20
         self.amp_enabled = True
+        self.serial = None  # Device serial number (-d); None opens the first HackRF
         self.is_running = False
         self.sweep_complete = False
         self.process = None
@@ -26,24 +39,62 @@ class HackRFSweepDataSource(SweepDataSource):
         self.thread = None
         self.stderr_thread = None
         self.sweep_rate = None  # Sweeps per second
+        self.sweep_count = 0  # Sweeps completed since start
         self._create_frequency_grid()
         logger.debug(f"Initialized HackRFSweepDataSource: start_freq={self.start_freq/1e6:.2f} MHz, stop_freq={self.stop_freq/1e6:.2f} MHz, bin_size={self.bin_size/1e3:.2f} kHz, grid_size={len(self.frequency_grid)}")
 
     def _create_frequency_grid(self):
-        """Create a fixed frequency grid based on start/stop frequencies and bin size."""
-        # Calculate number of bins
-        num_bins = int((self.stop_freq - self.start_freq) / self.bin_size)
-        # Create evenly spaced frequency grid
-        self.frequency_grid = np.linspace(self.start_freq, self.stop_freq, num_bins)
+        """Create a fixed frequency grid based on the bands and bin size."""
+        grids = []
+        self.band_slices = []
+        for low, high in self.bands:
+            # Calculate number of bins; evenly spaced over the band
+            num_bins = int((high - low) / self.bin_size)
+            first = sum(len(g) for g in grids)
+            self.band_slices.append(slice(first, first + num_bins))
+            grids.append(np.linspace(low, high, num_bins))
+        self.frequency_grid = np.concatenate(grids)
+        num_bins = len(self.frequency_grid)
         # NaN marks bins not yet swept; displays skip or gap them naturally
         self.full_power_array = np.full(num_bins, np.nan)
-        logger.debug(f"Created frequency grid with {num_bins} bins")
+        logger.debug(f"Created frequency grid with {num_bins} bins in {len(self.bands)} band(s)")
+
+    @property
+    def has_own_grid(self) -> bool:
+        return len(self.bands) > 1
+
+    def set_bands(self, bands):
+        """Sweep only ``bands``, a list of (start, stop) Hz; restarts a running sweep.
+
+        Raises:
+            ValueError: No bands, more than hackrf_sweep accepts, an empty
+                band, or bands that overlap.
+        """
+        bands = sorted((int(low), int(high)) for low, high in bands)
+        if not 0 < len(bands) <= MAX_BANDS:
+            raise ValueError(f"Between 1 and {MAX_BANDS} bands are needed, got {len(bands)}")
+        for (low, high), following in zip(bands, bands[1:] + [None]):
+            if high <= low:
+                raise ValueError(f"Band {low / 1e6:.3f}-{high / 1e6:.3f} MHz is empty")
+            if following is not None and following[0] < high:
+                raise ValueError("Bands must not overlap")
+        self.bands = bands
+        self.start_freq, self.stop_freq = bands[0][0], bands[-1][1]
+        self._create_frequency_grid()
+        with self.lock:
+            self.current_sweep_data = {"x": [], "y": []}
+        if self.is_running:
+            self.stop()
+            self.start()
 
     def start(self, frequency=None):
         if frequency:
-            self.start_freq = int(frequency.start)
-            self.stop_freq = int(frequency.stop)
-            logger.debug(f"Updated frequency range: start_freq={self.start_freq/1e6:.2f} MHz, stop_freq={self.stop_freq/1e6:.2f} MHz")
+            if (int(frequency.start), int(frequency.stop)) != (self.start_freq, self.stop_freq):
+                self.start_freq = int(frequency.start)
+                self.stop_freq = int(frequency.stop)
+                # A new range replaces any band set; the same range (a restart) keeps it
+                self.bands = [(self.start_freq, self.stop_freq)]
+                logger.debug(f"Updated frequency range: start_freq={self.start_freq/1e6:.2f} MHz, stop_freq={self.stop_freq/1e6:.2f} MHz")
             # Recreate frequency grid for new range
             self._create_frequency_grid()
 
@@ -53,16 +104,18 @@ class HackRFSweepDataSource(SweepDataSource):
             self.stop()
 
         try:
-            # Format frequencies as integers (e.g., 2400:2500)
-            freq_range = f"{int(self.start_freq/1e6)}:{int(self.stop_freq/1e6)}"
-            cmd = [
-                "hackrf_sweep",
-                "-f", freq_range,
+            # Format frequencies as whole MHz covering each band (e.g., 2400:2500)
+            cmd = ["hackrf_sweep"]
+            for low, high in self.bands:
+                cmd += ["-f", f"{math.floor(low / 1e6)}:{math.ceil(high / 1e6)}"]
+            cmd += [
                 "-a", "1" if self.amp_enabled else "0",
                 "-l", str(self.lna_gain),
                 "-g", str(self.vga_gain),
                 "-w", str(self.bin_size),
             ]
+            if self.serial:
+                cmd += ["-d", self.serial]
             logger.debug(f"Starting hackrf_sweep with command: {' '.join(cmd)}")
             self.process = subprocess.Popen(
                 cmd,
@@ -75,6 +128,10 @@ class HackRFSweepDataSource(SweepDataSource):
             self.is_running = True
             self.sweep_complete = False
             self.sweep_rate = None
+            self.sweep_count = 0
+            with self.lock:
+                # Steps left from before a restart would be joined to the first sweep
+                self.current_sweep_data = {"x": [], "y": []}
 
             # Start stdout monitoring thread
             self.thread = threading.Thread(target=self._sweep_loop)
@@ -91,6 +148,7 @@ class HackRFSweepDataSource(SweepDataSource):
             raise RuntimeError(f"Failed to start hackrf_sweep: {str(e)}")
 
     def _sweep_loop(self):
+        reported = self.sweep_count
         try:
             for line in self.process.stdout:
                 if not self.is_running:
@@ -98,6 +156,9 @@ class HackRFSweepDataSource(SweepDataSource):
                 line = line.strip()
                 if line:
                     self._parse(line)
+                if self.sweep_count != reported:        # once per sweep, outside the lock
+                    reported = self.sweep_count
+                    self._report_cpu()
         except (ValueError, OSError):
             pass  # Pipe closed by stop() — normal shutdown
         except Exception as e:
@@ -151,10 +212,14 @@ class HackRFSweepDataSource(SweepDataSource):
                     sorted_indices = np.argsort(self.current_sweep_data["x"])
                     sweep_freqs = np.array(self.current_sweep_data["x"])[sorted_indices]
                     sweep_powers = np.array(self.current_sweep_data["y"])[sorted_indices]
-                    self.full_power_array = np.interp(
-                        self.frequency_grid, sweep_freqs, sweep_powers
-                    )
+                    if len(self.bands) == 1:
+                        self.full_power_array = np.interp(
+                            self.frequency_grid, sweep_freqs, sweep_powers
+                        )
+                    else:
+                        self.full_power_array = self._interp_bands(sweep_freqs, sweep_powers)
                     self.current_sweep_data = {"x": [], "y": []}
+                    self.sweep_count += 1
 
                 step_bandwidth = (step_high_freq - step_low_freq) / len(step_data)
                 step_frequency_bins = np.arange(
@@ -167,6 +232,15 @@ class HackRFSweepDataSource(SweepDataSource):
         except (ValueError, IndexError) as e:
             logger.error(f"Data parsing error: {str(e)}")
 
+    def _interp_bands(self, sweep_freqs: np.ndarray, sweep_powers: np.ndarray) -> np.ndarray:
+        """Interpolate each band from its own steps, never across the gap to the next band."""
+        power = np.full(len(self.frequency_grid), np.nan)
+        for (low, high), band in zip(self.bands, self.band_slices):
+            lo, hi = np.searchsorted(sweep_freqs, (low - self.bin_size, high + self.bin_size))
+            if hi > lo:
+                power[band] = np.interp(self.frequency_grid[band], sweep_freqs[lo:hi], sweep_powers[lo:hi])
+        return power
+
     def set_gains(self, lna_gain=None, vga_gain=None):
         if lna_gain is not None:
             self.lna_gain = int(lna_gain)
@@ -0,0 +1,287 @@
+"""HackRF wideband spectrum stitched from retuned 20 MS/s captures.
+
+HackrfWidebandDataSource opens the HackRF through the same libhackrf
+bindings as HackrfSamplesDataSource and hops it across spans wider than one
+capture (50–200 MHz and beyond), giving an FFT-resolution sweep instead of
+hackrf_sweep's fixed-step output.  Each hop:
+
+    1. reads ``discard + capture`` samples ending on a USB transfer boundary
+       and drops the first ``discard`` (samples captured before the last
+       retune had settled),
+    2. retunes to the next hop at once, so the PLL settles while
+    3. the capture is windowed and FFT'd as one batch of frames, averaged,
+       and written into its slice of the grid.
+
+Each hop keeps both sides of its LO inside the baseband filter's edge
+roll-off, less a notch of ``DC_GUARD_HZ`` either side of the DC spike, so
+a hop covers about twice the band of a one-sided layout and a sweep needs
+about half the hops (at 20 MS/s and 1024 points: 767 bins per hop instead
+of 371).  Sweeps alternate between two hop layouts offset by half a hop,
+so each layout's notches fall inside the other's sidebands: notch bins
+keep the value from the previous sweep, one sweep old, and every other
+bin is fresh every sweep.
+
+Reads are sized so they end exactly on a transfer: the device hands samples
+over a whole transfer at a time, so a read ending mid-transfer leaves the
+rest of that transfer captured at the old frequency.  If the host falls
+behind, the backlog at the moment of each retune is estimated from the
+stream clock and added to the next hop's discard.
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from datasources import hackrf_samples
+from datasources.base import SweepDataSource
+from utils.constants import DSPConstants
+from utils.frequency_selector import FrequencyRange
+
+logger = logging.getLogger(__name__)
+
+_MIN_FREQ = 1e6                   # HackRF tuning range
+_MAX_FREQ = 6e9
+_HOP_RATE = 20_000_000            # widest capture per hop
+_TRANSFER = 1 << 17               # libhackrf bulk transfer (256 KiB of 8-bit IQ), in samples
+_FIFO = 1 << 20                   # libhackrf's 15 queued transfers, rounded up
+_PASSBAND = 0.75                  # usable fraction of the band inside the baseband filter
+_MIN_FFT = 64
+_MAX_FFT = 1 << 14
+
+
+class HackrfWidebandDataSource(SweepDataSource):
+    """Wideband HackRF spectrum stitched from retuned IQ captures.
+
+    Args:
+        start_freq: First frequency in Hz (clamped to 1 MHz–6 GHz).
+        stop_freq:  Last frequency in Hz.
+        bin_size:   Widest acceptable bin in Hz; the FFT size is chosen from it.
+    """
+
+    SETTLE_S = 0.0005             # PLL lock after a retune, discarded by sample count
+    CAPTURE_SAMPLES = 1 << 16     # kept per hop, split into FFT frames
+    DC_GUARD_HZ = 250e3           # notch either side of the LO left out of every hop
+
+    def __init__(self, start_freq: float, stop_freq: float, bin_size: float):
+        super().__init__()
+        self.start_freq = max(_MIN_FREQ, min(start_freq, _MAX_FREQ))
+        self.stop_freq = max(_MIN_FREQ, min(stop_freq, _MAX_FREQ))
+        self.requested_bin_size = float(bin_size)
+        self.bin_size = float(bin_size)
+        self.lna_gain = 16
+        self.vga_gain = 20
+        self.amp_enabled = True
+        self.device = None
+        self.running = False
+        self.sweep_rate = None        # sweeps per second
+        self.sweep_count = 0
+        self.frequency_grid = np.array([])
+        self.hops = 0
+        self.fft_size = 0
+        self._sample_rate = float(_HOP_RATE)
+        self._lock = threading.Lock()
+        self._device_lock = threading.Lock()
+        self._thread = None
+        self._sweep: Optional[np.ndarray] = None       # last complete sweep
+        self._plan_grid(self._sample_rate)
+        logger.debug(f"Initialized HackrfWidebandDataSource: start={self.start_freq/1e6:.2f} MHz, "
+                     f"stop={self.stop_freq/1e6:.2f} MHz, bin_size={self.bin_size/1e3:.2f} kHz")
+
+    # ------------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------------
+
+    def _plan_grid(self, rate: float) -> None:
+        """Choose the FFT size and lay the hops over the grid for sample rate ``rate``."""
+        n = _MIN_FFT
+        while rate / n > self.requested_bin_size and n < _MAX_FFT:
+            n *= 2
+        res = rate / n
+        guard = max(int(np.ceil(self.DC_GUARD_HZ / res)), 2)
+        half = max(int(n * _PASSBAND / 2), 2 * guard + 1)     # usable bins either side of the LO
+        stride = 2 * half - 1                                   # one hop's sidebands end to end
+        bins = int(round((self.stop_freq - self.start_freq) / res)) + 1
+        top = int((_MAX_FREQ - self.start_freq) / res)          # highest LO in grid bins
+        # The LO of hop k sits on grid bin p; the hop writes grid bins [g0, g1)
+        # of each sideband from shifted FFT bins [f0, f0 + g1 - g0).  The second
+        # layout's LOs sit on the first layout's sideband edges.
+        centres, slices, ends = [], [], []
+        for first in (half - 1, 0):
+            p = first
+            while True:
+                p = min(p, top)
+                pieces = []
+                for lo, hi in ((p - half + 1, p - guard + 1), (p + guard, p + half)):
+                    g0, g1 = max(lo, 0), min(hi, bins)
+                    if g0 < g1:
+                        pieces.append((g0, g1, n // 2 + (g0 - p)))
+                centres.append(self.start_freq + p * res)
+                slices.append(pieces)
+                if p + half >= bins:
+                    break
+                p += stride
+            ends.append(len(centres) - 1)
+        self.fft_size = n
+        self.bin_size = res
+        self.hops = ends[0] + 1                    # per sweep; the second layout may take one more
+        self.frequency_grid = self.start_freq + np.arange(bins) * res
+        self._centres = centres
+        self._slices = slices
+        self._sweep_ends = frozenset(ends)
+        self._window = np.hanning(n).astype(np.float32)
+        # Full scale tone -> 0 dB; averaging the frames is folded into the same constant
+        self._frames = max(self.CAPTURE_SAMPLES // n, 1)
+        self._scale = 1.0 / (float(np.sum(self._window)) ** 2 * self._frames)
+        self._settle = int(self.SETTLE_S * rate)
+        self._work = np.full(bins, np.nan, dtype=np.float32)   # NaN: notch bins not yet swept
+        self._hop_power = np.empty(n, dtype=np.float64)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self, frequency: FrequencyRange = None):
+        """Open the HackRF and start sweeping ``frequency`` (or the current range)."""
+        if not hackrf_samples._HACKRF_AVAILABLE:
+            raise RuntimeError("HackRF library (libhackrf) not available on this system")
+        if frequency is not None:
+            self.start_freq = max(_MIN_FREQ, min(frequency.start, _MAX_FREQ))
+            self.stop_freq = max(_MIN_FREQ, min(frequency.stop, _MAX_FREQ))
+        if self.start_freq >= self.stop_freq:
+            raise ValueError("Start frequency must be less than stop frequency")
+        if self.running:
+            self.stop()
+        self._plan_grid(self._sample_rate)
+        try:
+            with self._device_lock:
+                self.device = hackrf_samples.HackRF()
+                self.device.set_sample_rate(self._sample_rate)
+                self.device.set_freq(self._centres[0])
+                self.device.set_lna_gain(self.lna_gain)
+                self.device.set_vga_gain(self.vga_gain)
+                if self.amp_enabled:
+                    self.device.enable_amp()
+                else:
+                    self.device.disable_amp()
+        except Exception as e:
+            self.stop()
+            logger.error(f"Failed to start HackRF wideband: {e}")
+            raise RuntimeError(f"HackRF wideband start failed: {e}")
+        with self._lock:
+            self._sweep = None
+        self.sweep_rate = None
+        self.sweep_count = 0
+        self.running = True
+        self._thread = threading.Thread(target=self._sweep_loop, name="HackrfWideband", daemon=True)
+        self._thread.start()
+        logger.debug(f"HackRF wideband started: {self.hops} hops of {self.fft_size}-point FFTs, "
+                     f"{len(self.frequency_grid)} bins of {self.bin_size/1e3:.2f} kHz")
+
+    def stop(self):
+        """Stop sweeping and close the HackRF."""
+        self.running = False
+        thread, self._thread = self._thread, None
+        if self.device is not None:
+            try:
+                self.device.close()             # unblocks a read in progress
+            except Exception as e:
+                logger.error(f"Error closing HackRF: {e}")
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2.0)
+        self.device = None
+        logger.debug("HackRF wideband stopped")
+
+    def get_data(self) -> np.ndarray:
+        """Return a copy of the last complete sweep (empty until the first completes)."""
+        with self._lock:
+            if not self.running or self._sweep is None:
+                return np.array([])
+            return self._sweep.copy()
+
+    def set_gains(self, lna_gain=None, vga_gain=None):
+        """Set LNA and/or VGA gain; applied to the running device at once."""
+        if lna_gain is not None:
+            self.lna_gain = int(lna_gain)
+        if vga_gain is not None:
+            self.vga_gain = int(vga_gain)
+        with self._device_lock:
+            if self.device is not None:
+                self.device.set_lna_gain(self.lna_gain)
+                self.device.set_vga_gain(self.vga_gain)
+
+    def set_amplifier(self, enabled: bool):
+        """Switch the RF amplifier; applied to the running device at once."""
+        self.amp_enabled = bool(enabled)
+        with self._device_lock:
+            if self.device is not None:
+                if self.amp_enabled:
+                    self.device.enable_amp()
+                else:
+                    self.device.disable_amp()
+
+    # ------------------------------------------------------------------
+    # Sweeping
+    # ------------------------------------------------------------------
+
+    def _sweep_loop(self) -> None:
+        device = self.device
+        hops = len(self._centres)     # both layouts, one sweep each
+        rate = self._sample_rate
+        count = self._frames * self.fft_size
+        consumed = 0                  # stream position of the next unread sample
+        discard = self._settle
+        t0 = time.monotonic()         # the stream starts with the first read
+        last = None
+        try:
+            while self.running:
+                for k in range(hops):
+                    total = -(-(consumed + discard + count) // _TRANSFER) * _TRANSFER - consumed
+                    called = time.monotonic()
+                    samples = device.read_samples(total)
+                    returned = time.monotonic()
+                    consumed += total
+                    with self._device_lock:
+                        device.set_freq(self._centres[(k + 1) % hops])     # settles during the FFT
+                    # Anything captured after this read's last transfer is already stale.  A read
+                    # that blocked caught up with the stream, so time inside it is not backlog.
+                    behind = (called - t0) + (time.monotonic() - returned)
+                    backlog = int(behind * rate) - consumed
+                    if backlog > _FIFO:                  # the device dropped the oldest
+                        consumed += backlog - _FIFO
+                        backlog = _FIFO
+                    discard = max(backlog, 0) + self._settle
+                    self._process_hop(k, samples[total - count:])
+                    self._report_cpu()
+                    if not self.running:
+                        return
+                    if k not in self._sweep_ends:
+                        continue
+                    with self._lock:
+                        if self._sweep is None:
+                            self._sweep = self._work.copy()
+                        else:
+                            np.copyto(self._sweep, self._work)
+                    now = time.monotonic()
+                    if last is not None:
+                        self.sweep_rate = 1.0 / max(now - last, 1e-6)
+                    last = now
+                    self.sweep_count += 1
+        except Exception as e:
+            if self.running:
+                logger.error(f"HackRF wideband stopped on error: {e}")
+                self.running = False
+
+    def _process_hop(self, k: int, samples: np.ndarray) -> None:
+        """Average the hop's FFT frames and write its two DC-free sidebands into the sweep."""
+        n = self.fft_size
+        frames = samples.reshape(self._frames, n) * self._window
+        spectrum = np.fft.fft(frames, axis=1)
+        power = self._hop_power
+        np.sum(spectrum.real ** 2 + spectrum.imag ** 2, axis=0, out=power)
+        power = np.fft.fftshift(power)
+        for g0, g1, f0 in self._slices[k]:
+            band = power[f0:f0 + g1 - g0] * self._scale
+            self._work[g0:g1] = 10.0 * np.log10(band + DSPConstants.POWER_LOG_FLOOR)
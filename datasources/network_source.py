@@ -0,0 +1,233 @@
+"""Remote spectrum stream received from a frame server.
+
+NetworkSweepDataSource connects to a ``core.frame_server.FrameServer`` —
+another analyser or a headless node — and plays the processed frames it
+sends through the normal sweep data path, so every display works on a
+remote stream.  The remote node owns tuning: the grid comes from the
+stream as evenly spaced segments, ``frequency_grid`` holds every bin (gaps
+between bands included), and ``start_freq``/``stop_freq`` follow it so the
+display can retune when the remote grid changes.
+
+A reader thread decodes frames as they arrive and keeps only the latest,
+so a slow display never backs up the connection.  If the connection
+drops, the reader reconnects every ``RECONNECT_S`` until stopped.
+"""
+
+import logging
+import socket
+import threading
+from typing import Optional
+
+import numpy as np
+
+from utils import frame_protocol as fp
+from utils.frequency_helpers import segments_grid
+from .base import SweepDataSource
+
+logger = logging.getLogger(__name__)
+
+
+def parse_address(text: str, default_port: int = fp.DEFAULT_PORT) -> tuple[str, int]:
+    """``host``, ``host:port`` or ``[v6addr]:port`` → (host, port)."""
+    text = text.strip()
+    if text.startswith('['):
+        host, _, rest = text[1:].partition(']')
+        port = rest.lstrip(':')
+    elif text.count(':') == 1:
+        host, port = text.split(':')
+    else:
+        host, port = text, ''
+    if not host:
+        raise ValueError(f"No host in '{text}'")
+    try:
+        port = int(port) if port else default_port
+    except ValueError:
+        raise ValueError(f"Bad port in '{text}'")
+    if not 0 < port < 65536:
+        raise ValueError(f"Port {port} out of range")
+    return host, port
+
+
+class NetworkSweepDataSource(SweepDataSource):
+    CONNECT_TIMEOUT = 3.0
+    FIRST_FRAME_TIMEOUT = 3.0
+    RECONNECT_S = 1.0
+
+    has_own_grid = True
+
+    def __init__(self, host: str, port: int = fp.DEFAULT_PORT):
+        self.host = host
+        self.port = int(port)
+        self.start_freq: Optional[float] = None     # grid of the last frame returned
+        self.stop_freq: Optional[float] = None
+        self.frequency_grid = np.array([])          # every bin, gaps between bands included
+        self.is_running = False
+        self.connected = False
+        self.sweep_rate = None            # remote frames per second
+        self.last_event: Optional[str] = None
+
+        self.frames_received = 0
+        self.frames_missed = 0            # sequence gaps: dropped by the server for us
+        self.bytes_received = 0
+
+        self._lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._first_frame = threading.Event()
+        self._grids: dict = {}            # grid id -> ((start, stop, bins), ...) segments
+        self._q: Optional[np.ndarray] = None
+        self._q_grid = 0
+        self._last_seq: Optional[int] = None
+        self._last_time: Optional[float] = None
+        self._frame: Optional[np.ndarray] = None
+        self._frame_grid: Optional[tuple] = None
+        self._shown_grid: Optional[tuple] = None
+        logger.debug(f"Initialised NetworkSweepDataSource for {host}:{port}")
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self, frequency=None):
+        """Connect and wait for the first frame; the remote grid is kept regardless of ``frequency``."""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._first_frame.clear()
+        self._connect()
+        self.is_running = True
+        self._thread = threading.Thread(target=self._reader, name="NetworkSweep", daemon=True)
+        self._thread.start()
+        if not self._first_frame.wait(self.FIRST_FRAME_TIMEOUT):
+            self.stop()
+            raise RuntimeError(f"No frames from {self.host}:{self.port} "
+                               f"within {self.FIRST_FRAME_TIMEOUT:.0f} s")
+        with self._lock:
+            self._set_grid(self._frame_grid)
+
+    def stop(self):
+        self.is_running = False
+        self._stop_event.set()
+        self._close_socket()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+        logger.debug("Network stream stopped")
+
+    def _connect(self) -> None:
+        try:
+            sock = socket.create_connection((self.host, self.port), timeout=self.CONNECT_TIMEOUT)
+        except OSError as e:
+            raise RuntimeError(f"Cannot connect to {self.host}:{self.port}: {e}")
+        sock.settimeout(None)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock = sock
+        self._grids.clear()
+        self._q = None
+        self._last_seq = None
+        self.connected = True
+        logger.info(f"Connected to frame server {self.host}:{self.port}")
+
+    def _close_socket(self) -> None:
+        sock, self._sock = self._sock, None
+        self.connected = False
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+    # ------------------------------------------------------------------
+    # Reader thread
+    # ------------------------------------------------------------------
+
+    def _recv_exact(self, sock, n: int) -> bytes:
+        buf = bytearray(n)
+        view = memoryview(buf)
+        got = 0
+        while got < n:
+            k = sock.recv_into(view[got:])
+            if k == 0:
+                raise ConnectionError("Frame server closed the connection")
+            got += k
+        self.bytes_received += n
+        return bytes(buf)
+
+    def _reader(self) -> None:
+        while not self._stop_event.is_set():
+            sock = self._sock
+            try:
+                if sock is None:
+                    self._connect()
+                    continue
+                header = self._recv_exact(sock, fp.HEADER.size)
+                msg_type, grid_id, seq, timestamp, length = fp.decode_header(header)
+                payload = self._recv_exact(sock, length) if length else b""
+                self._handle(msg_type, grid_id, seq, timestamp, payload)
+            except (OSError, ConnectionError, RuntimeError, fp.ProtocolError) as e:
+                if self._stop_event.is_set():
+                    break
+                logger.warning(f"Network stream {self.host}:{self.port}: {e}")
+                self._close_socket()
+                self._stop_event.wait(self.RECONNECT_S)
+
+    def _handle(self, msg_type: int, grid_id: int, seq: int, timestamp: float, payload: bytes) -> None:
+        if msg_type == fp.MSG_GRID:
+            self._grids[grid_id] = fp.decode_grid(payload)
+            return
+        if msg_type == fp.MSG_EVENT:
+            self.last_event = payload.decode('utf-8', errors='replace')
+            return
+        if msg_type not in (fp.MSG_FRAME, fp.MSG_DELTA):
+            return                                    # newer message types are skipped
+        grid = self._grids.get(grid_id)
+        if grid is None:
+            raise fp.ProtocolError(f"Frame on unknown grid {grid_id}")
+        if msg_type == fp.MSG_FRAME:
+            q = fp.decode_frame(payload, fp.grid_bins(grid))
+        else:
+            if self._q is None or self._q_grid != grid_id:
+                raise fp.ProtocolError("Delta frame without its key frame")
+            q = fp.apply_delta(payload, self._q)
+        if self._last_seq is not None and seq > self._last_seq + 1:
+            self.frames_missed += seq - self._last_seq - 1
+        if self._last_time is not None and timestamp > self._last_time:
+            rate = 1.0 / (timestamp - self._last_time)
+            self.sweep_rate = rate if self.sweep_rate is None else 0.9 * self.sweep_rate + 0.1 * rate
+        self._last_seq, self._last_time = seq, timestamp
+        self._q, self._q_grid = q, grid_id
+        frame = fp.dequantise(q)
+        with self._lock:
+            self._frame, self._frame_grid = frame, grid
+        self.frames_received += 1
+        self._first_frame.set()
+
+    # ------------------------------------------------------------------
+    # SweepDataSource interface
+    # ------------------------------------------------------------------
+
+    def get_data(self):
+        """Latest remote frame; ``start_freq``/``stop_freq`` are updated to its grid."""
+        with self._lock:
+            frame, grid = self._frame, self._frame_grid
+        if frame is None or not self.is_running:
+            return np.array([])
+        self._set_grid(grid)
+        return frame.copy()
+
+    def _set_grid(self, segments: tuple) -> None:
+        if segments == self._shown_grid:
+            return
+        self._shown_grid = segments
+        self.start_freq, self.stop_freq = segments[0][0], segments[-1][1]
+        self.frequency_grid = segments_grid(segments)
+
+    def get_number_of_points(self):
+        with self._lock:
+            return fp.grid_bins(self._frame_grid) if self._frame_grid else 0
+
+    def get_stats(self) -> dict:
+        return {'frames_received': self.frames_received, 'frames_missed': self.frames_missed,
+                'bytes_received': self.bytes_received, 'connected': self.connected}
@@ -1,5 +1,7 @@
 import numpy as np
+import threading
 import time
+from typing import Optional
 try:
     from rtlsdr import RtlSdr
     _RTL_AVAILABLE = True
@@ -15,6 +17,28 @@ import logging
 logger = logging.getLogger(__name__)
 
 class RtlSamplesDataSource(SampleDataSource):
+    """Local RTL-SDR dongle streamed continuously by a reader thread.
+
+    The reader runs an asynchronous read (librtlsdr's pool of queued USB
+    transfers, so the stream survives the thread being late) into a
+    preallocated complex64 ring and publishes every block to the stream
+    consumers, so they see the gap-free sample stream rather than one FFT's
+    worth per display frame.  ``get_power_levels`` transforms the newest
+    ``fft_size`` samples of the ring.  Samples read just after a retune or
+    rate change are still at the old setting and are skipped for
+    ``SETTLE_S``.  A rate change stops the asynchronous read while the
+    device is reconfigured; a retune or gain change is sent while it runs.
+    """
+
+    READ_SAMPLES = 1 << 14         # per callback; 6.8 ms at 2.4 MS/s
+    RING_BLOCKS = 64               # 1 M samples of history
+    SETTLE_S = 0.05                # PLL lock plus the queued transfers
+    CONSUME_TIMEOUT = 0.5
+    IDLE_S = 0.05                  # reader poll interval while paused
+    ERROR_BACKOFF_S = 0.1
+    STOP_TIMEOUT = 2.0
+    _STREAM_FROM_READER = True     # reader thread publishes every block to stream consumers
+
     def __init__(self, sample_rate: int, centre_freq: int):
         super().__init__(sample_rate, centre_freq)
         self.fft_size = 1024
@@ -24,7 +48,21 @@ class RtlSamplesDataSource(SampleDataSource):
         self.last_sample_rate = sample_rate
         self.use_psd = False  # Flag to enable PSD mode
         self._gain = 'auto'
-        self._flush_reads_remaining = 0
+
+        self._ring_size = self.READ_SAMPLES * self.RING_BLOCKS
+        self._ring = np.zeros(self._ring_size, dtype=np.complex64)
+        self._device_lock = threading.Lock()       # held for each asynchronous read
+        self._reconfiguring = threading.Event()    # ends the asynchronous read for a rate change
+        self._lock = threading.Lock()              # ring position and tuning state
+        self._data_ready = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._written = 0                          # samples read since starting
+        self._valid_from = 0                       # first sample at the current settings
+        self._last_end = 0                         # ring position of the last frame
+        self._tuned = (float(centre_freq or 0), float(sample_rate or 0))
+        self._last_power: Optional[tuple] = None
+        self.read_errors = 0
         logger.debug(f"Initialised RtlSamplesDataSource with sample_rate={sample_rate}, centre_freq={centre_freq}")
 
     def start(self, frequency: FrequencyRange = None):
@@ -49,14 +87,20 @@ class RtlSamplesDataSource(SampleDataSource):
             actual_sample_rate = self.sdr.get_sample_rate()
             self.sample_rate = actual_sample_rate
             self.last_sample_rate = actual_sample_rate
-
-            self.running = True
-            logger.debug(f"RTL-SDR started successfully at {self.centre_freq/1e6:.2f} MHz with {actual_sample_rate/1e6:.6f} MHz sample rate")
         except Exception as e:
             self.running = False
             logger.error(f"RTL-SDR initialisation failed: {str(e)}")
             raise RuntimeError(f"RTL-SDR initialisation failed: {str(e)}")
 
+        with self._lock:
+            self._written = self._valid_from = self._last_end = 0
+        self._settle()
+        self.running = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._reader, name="RtlSamplesReader", daemon=True)
+        self._thread.start()
+        logger.debug(f"RTL-SDR started successfully at {self.centre_freq/1e6:.2f} MHz with {actual_sample_rate/1e6:.6f} MHz sample rate")
+
     def pause(self):
         """Pause the device without closing it (for quick resume)."""
         self.running = False
@@ -67,10 +111,20 @@ class RtlSamplesDataSource(SampleDataSource):
         if self.sdr is None:
             logger.warning("Cannot resume: RTL-SDR device not initialized")
             return
+        self._settle()                 # the dongle's FIFO overflowed while nobody read it
         self.running = True
         logger.debug("RTL-SDR resumed (no reinitialization needed)")
 
     def stop(self):
+        self.running = False
+        self._stop_event.set()
+        with self._data_ready:
+            self._data_ready.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.STOP_TIMEOUT)
+            if self._thread.is_alive():
+                logger.warning("RTL-SDR reader did not stop in time")
+        self._thread = None
         if self.sdr:
             try:
                 self.sdr.close()
@@ -78,9 +132,14 @@ class RtlSamplesDataSource(SampleDataSource):
             except Exception as e:
                 logger.error(f"Error closing RTL-SDR: {str(e)}")
             self.sdr = None
-        self.running = False
         logger.debug("RTL-SDR stopped")
 
+    def _settle(self) -> None:
+        """Skip the samples still in flight at the previous settings."""
+        with self._lock:
+            self._tuned = (float(self.centre_freq), float(self.sample_rate))
+            self._valid_from = self._written + int(self.SETTLE_S * self.sample_rate)
+
     def update_centre_frequency(self, centre_freq: float):
         """Update just the centre frequency without restarting the device"""
         if not self.running:
@@ -95,9 +154,7 @@ class RtlSamplesDataSource(SampleDataSource):
         self.centre_freq = centre_freq
         try:
             self.sdr.center_freq = centre_freq
-            # Flush enough reads to cover PLL lock time (~5ms) plus USB FIFO.
-            # Done all at once in get_power_levels() so live display recovers immediately.
-            self._flush_reads_remaining = max(3, int(0.006 * self.sample_rate / self.fft_size))
+            self._settle()
             logger.debug(f"Updated centre frequency to {centre_freq/1e6:.2f} MHz without reinitialisation")
         except Exception as e:
             logger.error(f"Error updating centre frequency: {str(e)}")
@@ -112,23 +169,29 @@ class RtlSamplesDataSource(SampleDataSource):
 
         if self.running and self.sdr:
             # Change sample rate on running device without restart
+            self._reconfiguring.set()
             try:
-                self.sdr.sample_rate = sample_rate
-                # Read back actual rate (hardware may adjust slightly)
-                actual_sample_rate = self.sdr.get_sample_rate()
+                with self._device_lock:
+                    self.sdr.sample_rate = sample_rate
+                    # Read back actual rate (hardware may adjust slightly)
+                    actual_sample_rate = self.sdr.get_sample_rate()
+
+                    # CRITICAL: Re-set centre frequency after sample rate change
+                    # RTL-SDR may shift centre when sample rate changes
+                    self.sdr.center_freq = self.centre_freq
+                    actual_centre = self.sdr.get_center_freq()
                 self.sample_rate = actual_sample_rate
                 self.last_sample_rate = actual_sample_rate
-
-                # CRITICAL: Re-set centre frequency after sample rate change
-                # RTL-SDR may shift centre when sample rate changes
-                self.sdr.center_freq = self.centre_freq
-                actual_centre = self.sdr.get_center_freq()
                 self.centre_freq = actual_centre
+                self._averager.reset()
+                self._settle()
 
                 logger.debug(f"Updated sample rate to {actual_sample_rate/1e6:.6f} MHz, centre={actual_centre/1e6:.2f} MHz")
             except Exception as e:
                 logger.error(f"Error updating sample rate: {str(e)}")
                 raise RuntimeError(f"Error updating sample rate: {str(e)}")
+            finally:
+                self._reconfiguring.clear()
         else:
             self.sample_rate = sample_rate
 
@@ -145,27 +208,88 @@ class RtlSamplesDataSource(SampleDataSource):
         if centre_freq != self.centre_freq:
             self.update_centre_frequency(centre_freq)
 
+    # ------------------------------------------------------------------
+    # Reader thread
+    # ------------------------------------------------------------------
+
+    def _reader(self) -> None:
+        while not self._stop_event.is_set():
+            if not self.running or self._reconfiguring.is_set():
+                self._stop_event.wait(self.IDLE_S)
+                continue
+            try:
+                with self._device_lock:
+                    if self._reconfiguring.is_set():
+                        continue
+                    # Returns once _on_samples cancels it
+                    self.sdr.read_samples_async(self._on_samples, self.READ_SAMPLES)
+            except Exception as e:
+                if self._stop_event.is_set():
+                    break
+                self.read_errors += 1
+                logger.error(f"Error reading RTL-SDR samples: {e}")
+                self._stop_event.wait(self.ERROR_BACKOFF_S)
+
+    def _on_samples(self, samples: np.ndarray, context=None) -> None:
+        """Asynchronous read callback: store and publish one block, or end the read."""
+        if self._stop_event.is_set() or not self.running or self._reconfiguring.is_set():
+            self.sdr.cancel_read_async()
+            return
+        n = len(samples)
+        if n == self.READ_SAMPLES:
+            pos = self._written % self._ring_size            # blocks never straddle the wrap
+            self._ring[pos:pos + n] = samples
+            with self._data_ready:
+                self._written += n
+                fresh = self._written > self._valid_from
+                self._data_ready.notify_all()
+            self.last_data_time = time.monotonic()
+            if fresh and self._stream_consumers:
+                self._publish_stream(self._ring[pos:pos + n])
+
+    def _latest_samples(self) -> Optional[np.ndarray]:
+        """Copy of the newest ``fft_size`` samples at the current settings, or None on timeout."""
+        n = min(self.fft_size, self._ring_size - self.READ_SAMPLES)
+        deadline = time.monotonic() + self.CONSUME_TIMEOUT
+        with self._data_ready:
+            while (self._written - n < self._valid_from or self._written <= self._last_end):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.running:
+                    return None
+                self._data_ready.wait(remaining)
+            end = self._written
+            self._last_end = end
+        start = (end - n) % self._ring_size
+        if start + n <= self._ring_size:
+            return self._ring[start:start + n].copy()
+        return np.concatenate((self._ring[start:], self._ring[:start + n - self._ring_size]))
+
+    # ------------------------------------------------------------------
+    # SampleDataSource interface
+    # ------------------------------------------------------------------
+
+    def _empty_spectrum(self) -> tuple[np.ndarray, np.ndarray]:
+        return np.zeros(self.fft_size), np.linspace(
+            self.centre_freq - self.sample_rate / 2,
+            self.centre_freq + self.sample_rate / 2,
+            self.fft_size
+        )
+
     def get_power_levels(self) -> tuple[np.ndarray, np.ndarray]:
         if not self.running:
             logger.warning("RTL-SDR not running, returning zero data")
-            return np.zeros(self.fft_size), np.linspace(
-                self.centre_freq - self.sample_rate / 2,
-                self.centre_freq + self.sample_rate / 2,
-                self.fft_size
-            )
+            return self._empty_spectrum()
 
         try:
-            # CRITICAL: Always use actual hardware values for all calculations
-            actual_fs = self.sdr.get_sample_rate()
-            actual_fc = self.sdr.get_center_freq()
-
-            if self._flush_reads_remaining > 0:
-                for _ in range(self._flush_reads_remaining):
-                    self.sdr.read_samples(self.fft_size)
-                self._flush_reads_remaining = 0
-
-            samples = self.sdr.read_samples(self.fft_size)
-            self._store_raw(samples.copy())
+            # CRITICAL: Always use the hardware values the samples were taken at
+            with self._lock:
+                actual_fc, actual_fs = self._tuned
+            samples = self._latest_samples()
+            if samples is None or len(samples) != self.fft_size:
+                if self._last_power is not None and len(self._last_power[0]) == self.fft_size:
+                    return self._last_power
+                return self._empty_spectrum()
+            self._store_raw(samples)
             samples = samples * self.window
             spectrum = fft.fft(samples, n=self.fft_size)
 
@@ -187,14 +311,11 @@ class RtlSamplesDataSource(SampleDataSource):
             # This matches the shifted FFT output
             freq_bins = fft.fftshift(fft.fftfreq(self.fft_size, 1/actual_fs)) + actual_fc
 
+            self._last_power = (power_db, freq_bins)
             return power_db, freq_bins
         except Exception as e:
             logger.error(f"Error computing power levels: {str(e)}")
-            return np.zeros(self.fft_size), np.linspace(
-                self.centre_freq - self.sample_rate / 2,
-                self.centre_freq + self.sample_rate / 2,
-                self.fft_size
-            )
+            return self._empty_spectrum()
 
     def set_window_type(self, window_type: str):
         window_funcs = {
@@ -212,6 +333,7 @@ class RtlSamplesDataSource(SampleDataSource):
         self.fft_size = fft_size
         self.window = np.hanning(self.fft_size)
         self._averager.reset()
+        self._last_power = None
         logger.debug(f"Set FFT size to {fft_size}")
 
     @property
@@ -227,13 +349,11 @@ class RtlSamplesDataSource(SampleDataSource):
     def read_samples_only(self) -> np.ndarray | None:
         if not self.running or self.sdr is None:
             return None
-        try:
-            samples = self.sdr.read_samples(self.fft_size)
-            self._store_raw(samples.copy())
-            return self._last_raw_samples
-        except Exception as e:
-            logger.error(f"Error reading samples: {e}")
+        samples = self._latest_samples()
+        if samples is None:
             return None
+        self._store_raw(samples)
+        return samples
 
     def set_gain(self, gain) -> None:
         """Set tuner gain. Pass 'auto' for AGC or a numeric dB value."""
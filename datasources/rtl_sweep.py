@@ -1,222 +1,229 @@
-import subprocess
-import shlex
-import numpy as np
+"""RTL-SDR wideband sweep by retuning in-process.
+
+RtlSweepDataSource hops the dongle across the range with pyrtlsdr, the way
+``rtl_power`` does but without its one-second integration floor, text
+parsing or a child process.  Each hop:
+
+    1. reads ``discard + capture`` samples and drops the first ``discard``
+       (samples still queued from the previous frequency and the PLL lock),
+    2. retunes to the next hop at once, so the PLL settles while
+    3. the capture is windowed and FFT'd as one batch of frames, averaged,
+       and the middle half of the band (``crop``, as ``rtl_power -c 50%``)
+       written into its slice of the sweep.
+
+Everything that depends only on the range — hop centres, grid slices,
+window, work buffers — is planned once at start and reused every sweep.
+The FFT size is the smallest power of two giving bins no wider than
+``bin_size``, and the grid is those FFT bins, so ``bin_size`` reads back
+as the real resolution.
+"""
+
 import logging
-import select
-import os
+import threading
 import time
-from threading import Thread
+from typing import Optional
+
+import numpy as np
+try:
+    from rtlsdr import RtlSdr
+    _RTL_AVAILABLE = True
+except (ImportError, OSError):
+    _RTL_AVAILABLE = False
+    RtlSdr = None
+
 from datasources.base import SweepDataSource
+from utils.constants import DSPConstants
 from utils.frequency_selector import FrequencyRange
 
 logger = logging.getLogger(__name__)
 
+_MIN_FREQ = 24e6                  # R820T tuning range
+_MAX_FREQ = 1766e6
+_HOP_RATE = 2_400_000             # highest rate the RTL2832 delivers without dropping samples
+_TRANSFER = 512                   # USB bulk packet, in samples
+_FIFO_DUMP = 2048                 # samples still queued in the RTL2832 after a retune (rtl_power's BUFFER_DUMP)
+_MIN_FFT = 16
+_MAX_FFT = 1 << 14
+
+
 class RtlSweepDataSource(SweepDataSource):
-    """Data source for RTL-SDR frequency sweep using rtl_power binary."""
+    """Wideband RTL-SDR sweep stitched from retuned captures.
+
+    Args:
+        start_freq: First frequency in Hz (clamped to 24–1766 MHz).
+        stop_freq:  Last frequency in Hz.
+        bin_size:   Widest acceptable bin in Hz; the FFT size is chosen from it.
+    """
+
+    SETTLE_S = 0.001              # PLL lock after a retune, discarded by sample count
+    CAPTURE_SAMPLES = 2048        # kept per hop, split into FFT frames
 
     def __init__(self, start_freq: float, stop_freq: float, bin_size: float):
         super().__init__()
-        self.start_freq = max(24e6, min(start_freq, 1766e6))  # RTL range: 24–1766 MHz
-        self.stop_freq = max(24e6, min(stop_freq, 1766e6))
-        self.bin_size = 10e3  # 10 kHz for finer resolution
-        self.interval = 1.0  # Update interval in seconds
-        self.gain = -1  # Auto gain
-        self.ppm = 0  # Frequency correction
-        self.crop = "50%"  # No cropping
-        self.device = 0  # Default device index
-        self.lnb_lo = 0  # No LNB offset
-        self.process = None
-        self.stdout_thread = None
-        self.stderr_thread = None
-        self.databuffer = {}
-        self._stable_buffer = {}
-        self.last_timestamp = ""
+        self.start_freq = max(_MIN_FREQ, min(start_freq, _MAX_FREQ))
+        self.stop_freq = max(_MIN_FREQ, min(stop_freq, _MAX_FREQ))
+        self.requested_bin_size = float(bin_size)
+        self.bin_size = float(bin_size)
+        self.crop = 0.5               # fraction of each hop's band discarded at the edges
+        self.gain = -1                # auto gain
+        self.ppm = 0                  # frequency correction
+        self.device = 0
+        self.sdr = None
         self.running = False
-        self.sweep_rate = None  # Sweeps per second
-        self.last_sweep_time = None  # Track sweep timing
-        self.sweep_count = 0  # Track number of completed sweeps
+        self.sweep_rate = None        # sweeps per second
+        self.sweep_count = 0
+        self.frequency_grid = np.array([])
+        self.hops = 0
+        self.fft_size = 0
+        self._sample_rate = float(_HOP_RATE)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._sweep: Optional[np.ndarray] = None       # last complete sweep
+        self._plan_grid(self._sample_rate)
         logger.debug(f"Initialized RtlSweepDataSource: start={self.start_freq/1e6:.2f} MHz, "
                      f"stop={self.stop_freq/1e6:.2f} MHz, bin_size={self.bin_size/1e3:.2f} kHz")
 
-    def start(self, frequency: FrequencyRange):
-        """Start the rtl_power process with the given frequency range."""
+    # ------------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------------
+
+    def _plan_grid(self, rate: float) -> None:
+        """Choose the FFT size and lay the hops over the grid for sample rate ``rate``."""
+        n = _MIN_FFT
+        while rate / n > self.requested_bin_size and n < _MAX_FFT:
+            n *= 2
+        res = rate / n
+        keep = max(int(round(n * (1.0 - self.crop))) // 2 * 2, 2)
+        bins = int(round((self.stop_freq - self.start_freq) / res)) + 1
+        hops = -(-bins // keep)
+        # Hop k writes grid bins [g0, g1) from FFT bins [f0, f0 + g1 - g0) of the shifted spectrum
+        slices = []
+        centres = []
+        for k in range(hops):
+            g0, g1 = k * keep, min((k + 1) * keep, bins)
+            offset = g0 + keep // 2
+            centre = self.start_freq + offset * res
+            if centre > _MAX_FREQ:                   # last hop past the tuner's range: tune lower
+                shift = int(np.ceil((centre - _MAX_FREQ) / res))
+                offset -= shift
+                centre -= shift * res
+            centres.append(centre)
+            slices.append((g0, g1, n // 2 - (offset - g0)))
+        self.fft_size = n
+        self.bin_size = res
+        self.hops = hops
+        self.frequency_grid = self.start_freq + np.arange(bins) * res
+        self._centres = centres
+        self._slices = slices
+        self._window = np.hanning(n).astype(np.float32)
+        # Full scale tone -> 0 dB; averaging the frames is folded into the same constant
+        self._frames = max(self.CAPTURE_SAMPLES // n, 1)
+        self._scale = 1.0 / (float(np.sum(self._window)) ** 2 * self._frames)
+        self._discard = -(-(int(self.SETTLE_S * rate) + _FIFO_DUMP) // _TRANSFER) * _TRANSFER
+        self._work = np.empty(bins, dtype=np.float32)
+        self._hop_power = np.empty(n, dtype=np.float64)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self, frequency: FrequencyRange = None):
+        """Open the dongle and start sweeping ``frequency`` (or the current range)."""
+        if not _RTL_AVAILABLE:
+            raise RuntimeError("RTL-SDR library (librtlsdr) not available on this system")
+        if frequency is not None:
+            self.start_freq = max(_MIN_FREQ, min(frequency.start, _MAX_FREQ))
+            self.stop_freq = max(_MIN_FREQ, min(frequency.stop, _MAX_FREQ))
+        if self.start_freq >= self.stop_freq:
+            raise ValueError("Start frequency must be less than stop frequency")
+        if self.running:
+            self.stop()
         try:
-            self.start_freq = max(24e6, min(frequency.start, 1766e6))
-            self.stop_freq = max(24e6, min(frequency.stop, 1766e6))
-            if self.start_freq >= self.stop_freq:
-                raise ValueError("Start frequency must be less than stop frequency")
-            
-            if self.running:
-                self.stop()
-            
-            # Kill any stray RTL-SDR processes to free the device
-            try:
-                subprocess.run(["pkill", "-f", "rtl_power"], check=False)
-                subprocess.run(["pkill", "-f", "rtl_test"], check=False)
-                logger.debug("Terminated stray rtl_power and rtl_test processes")
-            except subprocess.SubprocessError as e:
-                logger.warning(f"Failed to kill stray processes: {str(e)}")
-            
-            cmdline = shlex.split("rtl_power")
-            cmdline.extend([
-                "-f", f"{int(self.start_freq/1e6)}M:{int(self.stop_freq/1e6)}M:{int(self.bin_size/1e3)}k",
-                "-i", f"{self.interval}",
-                "-d", f"{self.device}",
-                "-p", f"{self.ppm}",
-                "-c", f"{self.crop}"
-            ])
-            if self.gain >= 0:
-                cmdline.extend(["-g", f"{self.gain}"])
-            
-            logger.debug(f"Starting rtl_power: {' '.join(cmdline)}")
-            for attempt in range(3):  # Retry up to 3 times
-                try:
-                    self.process = subprocess.Popen(
-                        cmdline,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        universal_newlines=True,
-                        bufsize=1
-                    )
-                    # Check if process started
-                    if self.process.poll() is None:
-                        break
-                    logger.warning(f"rtl_power attempt {attempt+1} failed, retrying...")
-                except subprocess.SubprocessError as e:
-                    logger.error(f"rtl_power attempt {attempt+1} failed: {str(e)}")
-                    if attempt == 2:
-                        raise RuntimeError(f"Failed to start rtl_power after 3 attempts: {str(e)}")
-            
-            self.running = True
-            self.databuffer = {}
-            self._stable_buffer = {}
-            self.last_timestamp = ""
-            self.sweep_rate = None
-            self.last_sweep_time = None
-            self.sweep_count = 0
-
-            # Start threads for stdout and stderr
-            self.stdout_thread = Thread(target=self._read_stdout, daemon=True)
-            self.stderr_thread = Thread(target=self._read_stderr, daemon=True)
-            self.stdout_thread.start()
-            self.stderr_thread.start()
-            logger.debug("rtl_power process started successfully")
+            self.sdr = RtlSdr(self.device)
+            self.sdr.sample_rate = _HOP_RATE
+            if self.ppm:
+                self.sdr.freq_correction = self.ppm
+            self.sdr.gain = 'auto' if self.gain < 0 else self.gain
+            self._sample_rate = float(self.sdr.get_sample_rate())
+            self._plan_grid(self._sample_rate)
+            self.sdr.center_freq = self._centres[0]
         except Exception as e:
-            self.running = False
-            logger.error(f"Failed to start rtl_power: {str(e)}")
             self.stop()
-            raise
-
+            logger.error(f"Failed to start RTL sweep: {e}")
+            raise RuntimeError(f"RTL sweep start failed: {e}")
+        with self._lock:
+            self._sweep = None
+        self.sweep_rate = None
+        self.sweep_count = 0
+        self.running = True
+        self._thread = threading.Thread(target=self._sweep_loop, name="RtlSweep", daemon=True)
+        self._thread.start()
+        logger.debug(f"RTL sweep started: {self.hops} hops of {self.fft_size}-point FFTs, "
+                     f"{len(self.frequency_grid)} bins of {self.bin_size/1e3:.2f} kHz")
 
     def stop(self):
-        """Stop the rtl_power process and clean up."""
-        try:
-            self.running = False
-            if self.process:
-                self.process.terminate()
-                try:
-                    self.process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    self.process.kill()
-                    logger.warning("rtl_power process killed after timeout")
-                self.process = None
-            self.stdout_thread = None
-            self.stderr_thread = None
-            self.databuffer = {}
-            self._stable_buffer = {}
-            self.last_timestamp = ""
-            logger.debug("rtl_power process stopped")
-        except Exception as e:
-            logger.error(f"Error stopping rtl_power: {str(e)}")
+        """Stop sweeping and close the dongle."""
+        self.running = False
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2.0)
+        if self.sdr is not None:
+            try:
+                self.sdr.close()
+            except Exception as e:
+                logger.error(f"Error closing RTL-SDR: {e}")
+            self.sdr = None
+        logger.debug("RTL sweep stopped")
 
     def get_data(self) -> np.ndarray:
-        """Return the last complete sweep from the stable buffer."""
-        try:
-            if not self.running:
+        """Return a copy of the last complete sweep (empty until the first completes)."""
+        with self._lock:
+            if not self.running or self._sweep is None:
                 return np.array([])
-            buf = self._stable_buffer
-            if not buf or "y" not in buf:
-                return np.array([])
-            return np.array(buf["y"], dtype=np.float32)
-        except Exception as e:
-            logger.error(f"Error getting data: {str(e)}")
-            return np.array([])
+            return self._sweep.copy()
 
-    def _read_stdout(self):
-        """Read and parse rtl_power stdout."""
-        try:
-            while self.running and self.process:
-                rlist, _, _ = select.select([self.process.stdout], [], [], 1.0)
-                if not rlist:
-                    continue
-                line = self.process.stdout.readline().strip()
-                if not line:
-                    if self.process.poll() is not None:
-                        break
-                    continue
-                logger.debug(f"Raw rtl_power output: {line}")
-                self._parse_output(line)
-        except Exception as e:
-            logger.error(f"Error reading rtl_power stdout: {str(e)}")
-        finally:
-            if self.running:
-                self.stop()
+    # ------------------------------------------------------------------
+    # Sweeping
+    # ------------------------------------------------------------------
 
-    def _read_stderr(self):
-        """Read rtl_power stderr for errors."""
+    def _sweep_loop(self) -> None:
+        sdr = self.sdr
+        hops = self.hops
+        discard = self._discard
+        count = self._frames * self.fft_size
+        last = None
         try:
-            while self.running and self.process:
-                rlist, _, _ = select.select([self.process.stderr], [], [], 1.0)
-                if not rlist:
-                    continue
-                line = self.process.stderr.readline().strip()
-                if line:
-                    logger.debug(f"rtl_power stderr: {line}")
+            while self.running:
+                for k in range(hops):
+                    samples = sdr.read_samples(discard + count)[discard:]
+                    sdr.center_freq = self._centres[(k + 1) % hops]     # settles during the FFT
+                    self._process_hop(k, samples)
+                    self._report_cpu()
+                    if not self.running:
+                        return
+                with self._lock:
+                    if self._sweep is None:
+                        self._sweep = self._work.copy()
+                    else:
+                        np.copyto(self._sweep, self._work)
+                now = time.monotonic()
+                if last is not None:
+                    self.sweep_rate = 1.0 / max(now - last, 1e-6)
+                last = now
+                self.sweep_count += 1
         except Exception as e:
-            logger.error(f"Error reading rtl_power stderr: {str(e)}")
+            if self.running:
+                logger.error(f"RTL sweep stopped on error: {e}")
+                self.running = False
 
-    def _parse_output(self, line: str):
-        """Parse one line of rtl_power output."""
-        try:
-            line = [col.strip() for col in line.split(",")]
-            if len(line) < 6:
-                logger.warning(f"Invalid rtl_power output: {line}")
-                return
-            timestamp = " ".join(line[:2])
-            start_freq = int(line[2])
-            stop_freq = int(line[3])
-            step = float(line[4])
-            samples = float(line[5])
-            y_axis = [float(y) for y in line[6:] if y]
-            
-            x_axis = list(np.linspace(
-                start_freq + self.lnb_lo,
-                stop_freq + self.lnb_lo,
-                len(y_axis)
-            ))
-            
-            if timestamp != self.last_timestamp:
-                # New sweep cycle — promote the completed accumulation
-                if self.databuffer and "y" in self.databuffer and self.databuffer["y"]:
-                    self._stable_buffer = self.databuffer
-
-                current_time = time.time()
-                if self.last_sweep_time is not None:
-                    sweep_interval = current_time - self.last_sweep_time
-                    if sweep_interval > 0:
-                        self.sweep_rate = 1.0 / sweep_interval
-                        self.sweep_count += 1
-                        logger.debug(f"Sweep {self.sweep_count} completed, sweep rate: {self.sweep_rate:.2f} S/s")
-
-                self.last_sweep_time = current_time
-                self.last_timestamp = timestamp
-                self.databuffer = {
-                    "timestamp": timestamp,
-                    "x": x_axis,
-                    "y": y_axis
-                }
-            else:
-                self.databuffer["x"].extend(x_axis)
-                self.databuffer["y"].extend(y_axis)
-        except Exception as e:
-            logger.error(f"Error parsing rtl_power output: {str(e)}")
\ No newline at end of file
+    def _process_hop(self, k: int, samples: np.ndarray) -> None:
+        """Average the hop's FFT frames and write its cropped band into the sweep."""
+        n = self.fft_size
+        frames = samples[:self._frames * n].reshape(self._frames, n) * self._window
+        spectrum = np.fft.fft(frames, axis=1)
+        power = self._hop_power
+        np.sum(spectrum.real ** 2 + spectrum.imag ** 2, axis=0, out=power)
+        power = np.fft.fftshift(power)
+        g0, g1, f0 = self._slices[k]
+        band = power[f0:f0 + g1 - g0] * self._scale
+        self._work[g0:g1] = 10.0 * np.log10(band + DSPConstants.POWER_LOG_FLOOR)
@@ -0,0 +1,402 @@
+"""RTL-SDR samples streamed from a remote ``rtl_tcp`` server.
+
+RtlTcpSamplesDataSource connects to ``rtl_tcp`` running next to the dongle,
+so USB handling stays on the remote node and only the raw 8-bit IQ crosses
+the network.  The protocol is the one the stock server speaks:
+
+    server → client   12-byte header ``RTL0``, tuner type, gain count
+                      (big-endian u32), then unsigned 8-bit I/Q pairs
+    client → server   5-byte commands: command byte, big-endian u32 value
+
+Tuning, sample rate and gain are sent as commands on the open connection,
+so retuning never reconnects.  A reader thread receives the stream with
+``recv_into`` into a preallocated byte block and converts each full block
+to complex64 in one lookup-table pass, straight into a preallocated ring.
+The samples received just after a command are still at the old setting
+(PLL lock plus whatever the server had already queued) and are skipped for
+``SETTLE_S``.  ``get_power_levels`` transforms the newest ``fft_size``
+samples of the ring.
+
+If the connection drops, the reader reconnects every ``RECONNECT_S`` and
+re-sends the current settings.
+"""
+
+import logging
+import socket
+import struct
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from utils.constants import DSPConstants
+from utils.frequency_selector import FrequencyRange
+from .base import SampleDataSource
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 1234
+
+_MAGIC = b"RTL0"
+_HEADER = struct.Struct(">4sII")          # magic, tuner type, gain count
+_COMMAND = struct.Struct(">BI")
+
+CMD_SET_FREQ = 0x01
+CMD_SET_SAMPLE_RATE = 0x02
+CMD_SET_GAIN_MODE = 0x03                  # 0 = automatic, 1 = manual
+CMD_SET_GAIN = 0x04                       # tenths of a dB
+
+TUNER_NAMES = {0: "unknown", 1: "E4000", 2: "FC0012", 3: "FC0013",
+               4: "FC2580", 5: "R820T", 6: "R828D"}
+
+_XTAL = 28.8e6
+
+# cu8 byte -> float32 in (-1, 1); one table lookup converts a whole block
+_CU8_LUT = ((np.arange(256, dtype=np.float32) - 127.5) / 127.5).astype(np.float32)
+
+
+def rtl2832_rate(rate: float) -> float:
+    """Sample rate the RTL2832 resampler actually produces for ``rate``.
+
+    rtl_tcp does not report it back, so the client computes it with the
+    same formula as librtlsdr.
+    """
+    ratio = int(_XTAL * (1 << 22) / rate) & 0x0FFFFFFC
+    return _XTAL * (1 << 22) / ratio
+
+
+class RtlTcpSamplesDataSource(SampleDataSource):
+    BLOCK_SAMPLES = 1 << 14        # converted per pass; 6.8 ms at 2.4 MS/s
+    RING_BLOCKS = 64               # 1 M samples of history
+    SETTLE_S = 0.05                # skipped after a retune or rate change
+    CONNECT_TIMEOUT = 3.0
+    CONSUME_TIMEOUT = 0.5
+    RECONNECT_S = 1.0
+    STOP_TIMEOUT = 2.0
+    _STREAM_FROM_READER = True     # reader thread publishes every block to stream consumers
+
+    def __init__(self, sample_rate: int, centre_freq: int, host: str = "127.0.0.1",
+                 port: int = DEFAULT_PORT):
+        super().__init__(sample_rate, centre_freq)
+        self.host = host
+        self.port = int(port)
+        self.fft_size = 1024
+        self.window = np.hanning(self.fft_size)
+        self.running = False
+        self.connected = False
+        self.last_sample_rate = sample_rate
+        self.use_psd = False
+        self.tuner: Optional[str] = None
+        self.gain_count = 0
+        self._gain = 'auto'
+
+        self.bytes_received = 0
+        self.blocks_converted = 0
+        self.reconnects = 0
+
+        self._ring_size = self.BLOCK_SAMPLES * self.RING_BLOCKS
+        self._ring = np.zeros(self._ring_size, dtype=np.complex64)
+        self._ring_floats = self._ring.view(np.float32)
+        self._block = np.empty(2 * self.BLOCK_SAMPLES, dtype=np.uint8)
+
+        self._lock = threading.Lock()              # ring position and tuning state
+        self._data_ready = threading.Condition(self._lock)
+        self._send_lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._written = 0                          # samples converted since connecting
+        self._valid_from = 0                       # first sample at the current settings
+        self._last_end = 0                         # ring position of the last frame
+        self._tuned = (float(centre_freq or 0), float(sample_rate or 0))
+        self._last_power: Optional[tuple] = None
+        logger.debug(f"Initialised RtlTcpSamplesDataSource for {host}:{port}")
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self, frequency: FrequencyRange = None):
+        if frequency:
+            self.centre_freq = int(frequency.centre)
+            self.sample_rate = int(frequency.span)
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._connect()
+        self.running = True
+        self._thread = threading.Thread(target=self._reader, name="RtlTcpReader", daemon=True)
+        self._thread.start()
+        logger.info(f"rtl_tcp {self.host}:{self.port} ({self.tuner}) streaming at "
+                    f"{self.centre_freq/1e6:.3f} MHz, {self.sample_rate/1e6:.6f} MS/s")
+
+    def stop(self):
+        self.running = False
+        self._stop_event.set()
+        self._close_socket()
+        with self._data_ready:
+            self._data_ready.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.STOP_TIMEOUT)
+        self._thread = None
+        logger.debug("rtl_tcp source stopped")
+
+    def _connect(self) -> None:
+        try:
+            sock = socket.create_connection((self.host, self.port), timeout=self.CONNECT_TIMEOUT)
+            header = self._recv_header(sock)
+        except OSError as e:
+            raise RuntimeError(f"Cannot connect to rtl_tcp at {self.host}:{self.port}: {e}")
+        magic, tuner, gain_count = _HEADER.unpack(header)
+        if magic != _MAGIC:
+            sock.close()
+            raise RuntimeError(f"{self.host}:{self.port} is not an rtl_tcp server")
+        sock.settimeout(None)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.tuner = TUNER_NAMES.get(tuner, f"type {tuner}")
+        self.gain_count = gain_count
+        with self._lock:
+            self._written = 0
+            self._valid_from = 0
+            self._last_end = 0
+        self._sock = sock
+        self.connected = True
+        self._send_settings()
+
+    @staticmethod
+    def _recv_header(sock) -> bytes:
+        header = b""
+        while len(header) < _HEADER.size:
+            chunk = sock.recv(_HEADER.size - len(header))
+            if not chunk:
+                raise ConnectionError("Connection closed before the rtl_tcp header")
+            header += chunk
+        return header
+
+    def _close_socket(self) -> None:
+        sock, self._sock = self._sock, None
+        self.connected = False
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+    # ------------------------------------------------------------------
+    # Commands
+    # ------------------------------------------------------------------
+
+    def _send(self, command: int, value: int) -> None:
+        sock = self._sock
+        if sock is None:
+            return                 # sent with the other settings on reconnect
+        with self._send_lock:
+            sock.sendall(_COMMAND.pack(command, int(value) & 0xFFFFFFFF))
+
+    def _send_settings(self) -> None:
+        rate = rtl2832_rate(self.sample_rate)
+        self._send(CMD_SET_SAMPLE_RATE, int(self.sample_rate))
+        self._send(CMD_SET_FREQ, int(self.centre_freq))
+        self._send_gain()
+        self.sample_rate = self.last_sample_rate = rate
+        self._settle()
+
+    def _send_gain(self) -> None:
+        if self._gain == 'auto':
+            self._send(CMD_SET_GAIN_MODE, 0)
+        else:
+            self._send(CMD_SET_GAIN_MODE, 1)
+            self._send(CMD_SET_GAIN, int(round(float(self._gain) * 10)))
+
+    def _settle(self) -> None:
+        """Skip the samples still in flight at the previous settings."""
+        with self._lock:
+            self._tuned = (float(self.centre_freq), float(self.sample_rate))
+            self._valid_from = self._written + int(self.SETTLE_S * self.sample_rate)
+
+    def update_centre_frequency(self, centre_freq: float):
+        """Retune on the open connection."""
+        centre_freq = int(centre_freq)
+        if centre_freq == self.centre_freq:
+            return
+        self.centre_freq = centre_freq
+        try:
+            self._send(CMD_SET_FREQ, centre_freq)
+        except OSError as e:
+            raise RuntimeError(f"Error updating centre frequency: {e}")
+        self._settle()
+        logger.debug(f"rtl_tcp tuned to {centre_freq/1e6:.3f} MHz")
+
+    def update_sample_rate(self, sample_rate: float):
+        """Change the sample rate on the open connection."""
+        sample_rate = int(sample_rate)
+        if abs(rtl2832_rate(sample_rate) - self.last_sample_rate) < 1:
+            return
+        try:
+            self._send(CMD_SET_SAMPLE_RATE, sample_rate)
+        except OSError as e:
+            raise RuntimeError(f"Error updating sample rate: {e}")
+        self.sample_rate = self.last_sample_rate = rtl2832_rate(sample_rate)
+        self._averager.reset()
+        self._settle()
+        logger.debug(f"rtl_tcp sample rate {self.sample_rate/1e6:.6f} MS/s")
+
+    def update_frequency(self, sample_rate: float, centre_freq: float):
+        """Update sample rate and centre frequency without reconnecting."""
+        self.update_sample_rate(sample_rate)
+        self.update_centre_frequency(centre_freq)
+
+    def set_gain(self, gain) -> None:
+        """Set tuner gain. Pass 'auto' for AGC or a numeric dB value."""
+        self._gain = gain
+        try:
+            self._send_gain()
+            logger.info(f"rtl_tcp gain set to {gain}")
+        except OSError as e:
+            logger.error(f"Error setting rtl_tcp gain: {e}")
+
+    # ------------------------------------------------------------------
+    # Reader thread
+    # ------------------------------------------------------------------
+
+    def _reader(self) -> None:
+        block = self._block
+        view = memoryview(block)
+        block_bytes = len(block)
+        fill = 0
+        while not self._stop_event.is_set():
+            sock = self._sock
+            try:
+                if sock is None:
+                    self._connect()
+                    self.reconnects += 1
+                    fill = 0
+                    continue
+                k = sock.recv_into(view[fill:])
+                if k == 0:
+                    raise ConnectionError("rtl_tcp closed the connection")
+                self.bytes_received += k
+                fill += k
+                if fill == block_bytes:
+                    self._convert_block()
+                    fill = 0
+            except (OSError, ConnectionError, RuntimeError) as e:
+                if self._stop_event.is_set():
+                    break
+                logger.warning(f"rtl_tcp {self.host}:{self.port}: {e}")
+                self._close_socket()
+                self._stop_event.wait(self.RECONNECT_S)
+
+    def _convert_block(self) -> None:
+        """Convert the received cu8 block into the next ring slot and publish it."""
+        n = self.BLOCK_SAMPLES
+        pos = self._written % self._ring_size              # blocks never straddle the wrap
+        np.take(_CU8_LUT, self._block, out=self._ring_floats[2 * pos:2 * (pos + n)])
+        with self._data_ready:
+            self._written += n
+            fresh = self._written > self._valid_from
+            self._data_ready.notify_all()
+        self.blocks_converted += 1
+        self.last_data_time = time.monotonic()
+        if fresh and self._stream_consumers:
+            self._publish_stream(self._ring[pos:pos + n])
+
+    # ------------------------------------------------------------------
+    # SampleDataSource interface
+    # ------------------------------------------------------------------
+
+    def _latest_samples(self) -> Optional[np.ndarray]:
+        """Copy of the newest ``fft_size`` samples at the current settings, or None on timeout."""
+        n = min(self.fft_size, self._ring_size - self.BLOCK_SAMPLES)
+        deadline = time.monotonic() + self.CONSUME_TIMEOUT
+        with self._data_ready:
+            while (self._written - n < self._valid_from or self._written <= self._last_end):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.running:
+                    return None
+                self._data_ready.wait(remaining)
+            end = self._written
+            self._last_end = end
+        start = (end - n) % self._ring_size
+        if start + n <= self._ring_size:
+            return self._ring[start:start + n].copy()
+        return np.concatenate((self._ring[start:], self._ring[:start + n - self._ring_size]))
+
+    def _empty_spectrum(self) -> tuple[np.ndarray, np.ndarray]:
+        return np.zeros(self.fft_size), np.linspace(
+            self.centre_freq - self.sample_rate / 2,
+            self.centre_freq + self.sample_rate / 2,
+            self.fft_size
+        )
+
+    def get_power_levels(self) -> tuple[np.ndarray, np.ndarray]:
+        if not self.running:
+            return self._empty_spectrum()
+        with self._lock:
+            centre, rate = self._tuned
+        samples = self._latest_samples()
+        if samples is None or len(samples) != self.fft_size:
+            if self._last_power is not None and len(self._last_power[0]) == self.fft_size:
+                return self._last_power
+            return self._empty_spectrum()
+        self._store_raw(samples)
+        spectrum = np.fft.fftshift(np.fft.fft(samples * self.window))
+        if self.use_psd:
+            psd = (np.abs(spectrum) ** 2) / (rate * self.fft_size)
+            psd = self._averager.process(psd)
+            power_db = 10 * np.log10(psd + DSPConstants.LOG_FLOOR)
+        else:
+            power = self._averager.process(np.abs(spectrum) ** 2)
+            power_db = 10 * np.log10(power + DSPConstants.POWER_LOG_FLOOR)
+        freq_bins = np.fft.fftshift(np.fft.fftfreq(self.fft_size, 1 / rate)) + centre
+        self._last_power = (power_db, freq_bins)
+        return power_db, freq_bins
+
+    def read_samples_only(self) -> Optional[np.ndarray]:
+        if not self.running:
+            return None
+        samples = self._latest_samples()
+        if samples is None:
+            return None
+        self._store_raw(samples)
+        return samples
+
+    def set_window_type(self, window_type: str):
+        window_funcs = {
+            'hanning': np.hanning,
+            'hamming': np.hamming,
+            'rectangle': np.ones
+        }
+        self.window = window_funcs.get(window_type.lower(), np.hanning)(self.fft_size)
+        logger.debug(f"Set window type to {window_type}")
+
+    def set_fft_size(self, fft_size: int):
+        if fft_size == self.fft_size:
+            return
+        self.fft_size = fft_size
+        self.window = np.hanning(self.fft_size)
+        self._averager.reset()
+        self._last_power = None
+        logger.debug(f"Set FFT size to {fft_size}")
+
+    @property
+    def sample_count(self) -> int:
+        """Get the number of samples used for FFT."""
+        return self.fft_size
+
+    @sample_count.setter
+    def sample_count(self, value: int):
+        """Set the number of samples used for FFT."""
+        self.set_fft_size(value)
+
+    def set_psd_mode(self, enabled: bool):
+        """Enable or disable PSD (Power Spectral Density) mode."""
+        self.use_psd = enabled
+        logger.debug(f"PSD mode {'enabled' if enabled else 'disabled'}")
+
+    def get_stats(self) -> dict:
+        return {'connected': self.connected, 'tuner': self.tuner,
+                'bytes_received': self.bytes_received, 'blocks': self.blocks_converted,
+                'samples': self._written, 'reconnects': self.reconnects}
@@ -0,0 +1,113 @@
+"""Frames from another analyser on the same host, read from its shared-memory ring.
+
+SharedMemorySweepDataSource opens the ring an analyser publishes with
+``utils.frame_ring.FrameRing`` and plays its latest frame through the
+normal sweep data path, so a second GUI instance can show the live
+spectrum with no radio of its own and no TCP in between.  As with the
+network stream, the producer owns tuning: ``frequency_grid`` holds every
+bin of the last frame returned (gaps between bands included) and
+``start_freq``/``stop_freq`` follow it.
+
+If the producer restarts it creates a new block under the same name; the
+source re-opens the ring when no new frame has arrived for ``REOPEN_S``.
+"""
+
+import logging
+import time
+from typing import Optional
+
+import numpy as np
+
+from utils.frame_ring import DEFAULT_NAME, FrameRingReader
+from utils.frequency_helpers import segments_grid
+from .base import SweepDataSource
+
+logger = logging.getLogger(__name__)
+
+
+class SharedMemorySweepDataSource(SweepDataSource):
+    REOPEN_S = 1.0
+
+    has_own_grid = True
+
+    def __init__(self, name: str = DEFAULT_NAME):
+        self.name = name
+        self.start_freq: Optional[float] = None     # grid of the last frame returned
+        self.stop_freq: Optional[float] = None
+        self.frequency_grid = np.array([])
+        self.is_running = False
+        self.sweep_rate = None
+        self._reader: Optional[FrameRingReader] = None
+        self._frame = -1
+        self._power = np.array([])
+        self._last_new = 0.0
+        self._last_time: Optional[float] = None
+        self._segments: tuple = ()
+        logger.debug(f"Initialised SharedMemorySweepDataSource for '{name}'")
+
+    def start(self, frequency=None):
+        """Open the ring; its grid is kept regardless of ``frequency``."""
+        if self.is_running:
+            return
+        try:
+            self._reader = FrameRingReader(self.name)
+        except (FileNotFoundError, ValueError) as e:
+            raise RuntimeError(f"No frame ring '{self.name}' on this host: {e}")
+        view = self._reader.latest()
+        if view is None:
+            self._reader.close()
+            self._reader = None
+            raise RuntimeError(f"Frame ring '{self.name}' has no frames yet")
+        self._set_grid(view.segments)
+        self._frame = -1
+        self._last_new = time.monotonic()
+        self.is_running = True
+
+    def stop(self):
+        self.is_running = False
+        self._power = np.array([])
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        logger.debug("Shared memory source stopped")
+
+    def _reopen(self) -> None:
+        try:
+            reader = FrameRingReader(self.name)
+        except (FileNotFoundError, ValueError):
+            return
+        self._reader.close()
+        self._reader = reader
+        self._frame = -1
+
+    def get_data(self):
+        """Latest frame in the ring."""
+        if not self.is_running:
+            return np.array([])
+        now = time.monotonic()
+        view = self._reader.latest()
+        if view is not None and view.frame != self._frame:
+            power = view.copy()
+            if power is not None:
+                self._frame = view.frame
+                self._power = power
+                self._set_grid(view.segments)
+                if self._last_time is not None and view.timestamp > self._last_time:
+                    rate = 1.0 / (view.timestamp - self._last_time)
+                    self.sweep_rate = rate if self.sweep_rate is None else 0.9 * self.sweep_rate + 0.1 * rate
+                self._last_time = view.timestamp
+                self._last_new = now
+        elif now - self._last_new > self.REOPEN_S:
+            self._last_new = now
+            self._reopen()
+        return self._power.copy()
+
+    def _set_grid(self, segments: tuple) -> None:
+        if segments == self._segments:
+            return
+        self._segments = segments
+        self.start_freq, self.stop_freq = segments[0][0], segments[-1][1]
+        self.frequency_grid = segments_grid(segments)
+
+    def get_number_of_points(self):
+        return len(self._power)
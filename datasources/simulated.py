@@ -0,0 +1,275 @@
+"""Synthetic sample and sweep sources for load testing without hardware.
+
+SimulatedSamplesDataSource and SimulatedSweepDataSource produce a
+realistic mix of signals at any sample rate or sweep grid size:
+
+    tone   CW carrier
+    fm     sinusoidally frequency-modulated carrier
+    ofdm   flat-topped wideband block of QPSK subcarriers
+    burst  gated wideband block with a given period and duty cycle
+    hop    carrier hopping over a set of channels with a fixed dwell
+
+Emitters are placed by fraction of the span (−0.5 … 0.5 about the centre),
+so one scenario fills whatever span is selected.  ``level`` is the
+emitter's total power in dB; wideband emitters spread it over their band.
+
+Nothing is generated per frame.  The sample source synthesises one bank of
+IQ up front (every component vectorised over the whole bank) and plays it
+through BufferPlaybackDataSource, so frames are slices of a preallocated array.
+Tone and modulation frequencies are snapped to the bank's frequency
+resolution, making the bank periodic and its wrap seamless.  The sweep
+source precomputes a bank of sweeps in the same way and indexes it by
+wall-clock time × ``sweep_rate``.
+"""
+
+import logging
+import time
+from typing import Optional, Sequence
+
+import numpy as np
+
+from utils.frequency_selector import FrequencyRange
+from .base import SweepDataSource
+from .file_samples import BufferPlaybackDataSource
+
+logger = logging.getLogger(__name__)
+
+SIGNAL_KINDS = ("tone", "fm", "ofdm", "burst", "hop")
+
+DEFAULT_SCENARIO = (
+    {"kind": "tone",  "position": -0.30, "level": -30.0},
+    {"kind": "tone",  "position":  0.12, "level": -55.0},
+    {"kind": "fm",    "position": -0.12, "level": -40.0, "deviation": 0.02, "rate": 1_000.0},
+    {"kind": "ofdm",  "position":  0.30, "level": -40.0, "width": 0.15},
+    {"kind": "burst", "position":  0.02, "level": -35.0, "width": 0.03,
+     "period": 0.037, "duty": 0.3},
+    {"kind": "hop",   "position": -0.45, "level": -42.0, "spacing": 0.02,
+     "channels": 8, "dwell": 0.02},
+)
+
+_SAMPLE_NOISE_FLOOR = -50.0       # dBFS total noise power
+_SWEEP_NOISE_FLOOR = -95.0        # dB per sweep bin
+_SWEEP_NOISE_DOF = 16             # averaged-power fluctuation of sweep bins
+_BANK_SECONDS = 0.5
+_MIN_BANK_SAMPLES = 1 << 16
+_MAX_BANK_SAMPLES = 1 << 21
+_BURST_BLOCK = 1 << 16            # period of the tiled burst modulation
+_MAX_SWEEP_BANK_ROWS = 256
+_MAX_SWEEP_BANK_VALUES = 32_000_000
+
+
+def _db_to_power(db: float) -> float:
+    return 10.0 ** (db / 10.0)
+
+
+def _band_bins(n: int, first_bin: int, width_bins: int,
+               rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    """Bin indices and QPSK spectrum values giving a unit-power block after ``np.fft.ifft``."""
+    width_bins = max(int(width_bins), 1)
+    idx = np.arange(first_bin, first_bin + width_bins) % n
+    symbols = np.exp(1j * (np.pi / 4 + np.pi / 2 * rng.integers(0, 4, width_bins)))
+    return idx, symbols * (n / np.sqrt(width_bins))
+
+
+def _add_carrier(out: np.ndarray, amp: float, phase: np.ndarray) -> None:
+    """Add ``amp``·e^(j·phase) in place, evaluating the trig in float32."""
+    phase = np.mod(phase, 2 * np.pi).astype(np.float32)
+    out.real += amp * np.cos(phase)
+    out.imag += amp * np.sin(phase)
+
+
+def synthesise_iq(sample_rate: float, n: int, scenario: Sequence[dict],
+                  noise_floor: float = _SAMPLE_NOISE_FLOOR,
+                  rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """Synthesise ``n`` complex64 samples of ``scenario`` over white noise.
+
+    Tones and OFDM blocks are written straight into one spectrum and
+    brought to the time domain by a single inverse FFT; bursts gate a short
+    band-limited block tiled over the bank; FM and hopping carriers are
+    added by phase; noise is drawn directly in float32.
+
+    Args:
+        sample_rate: Sample rate in Hz; emitter positions scale with it.
+        n:           Bank length in samples.
+        scenario:    Emitter dicts (see module docstring).
+        noise_floor: Total noise power in dBFS.
+        rng:         Random generator (a fresh default one if omitted).
+
+    Returns:
+        complex64 array, periodic over ``n`` for tones and modulation.
+    """
+    rng = rng or np.random.default_rng()
+    res = sample_rate / n                      # bank frequency resolution
+    t = np.arange(n) / sample_rate
+    spectrum = np.zeros(n, dtype=np.complex128)
+    carriers = []
+
+    def to_bin(fraction: float) -> int:
+        return int(round(fraction * sample_rate / res))
+
+    bursts = []
+    for e in scenario:
+        kind = e["kind"]
+        amp = np.sqrt(_db_to_power(e["level"]))
+        k = to_bin(e["position"])
+        if kind == "tone":
+            spectrum[k % n] += amp * n
+        elif kind == "ofdm":
+            width = to_bin(e["width"])
+            idx, values = _band_bins(n, k - width // 2, width, rng)
+            spectrum[idx] += amp * values
+        elif kind == "burst":
+            bursts.append(e)
+        elif kind == "fm":
+            fm = max(round(e["rate"] / res), 1) * res
+            beta = e["deviation"] * sample_rate / fm
+            carriers.append((amp, 2 * np.pi * k * res * t + beta * np.sin(2 * np.pi * fm * t)))
+        elif kind == "hop":
+            seq = rng.permutation(e["channels"])
+            slot = (t // e["dwell"]).astype(np.int64) % e["channels"]
+            f_inst = (k + seq[slot] * to_bin(e["spacing"])) * res
+            carriers.append((amp, 2 * np.pi * np.cumsum(f_inst) / sample_rate))
+        else:
+            raise ValueError(f"unknown simulated signal kind '{kind}'")
+
+    out = rng.standard_normal(2 * n, dtype=np.float32).view(np.complex64)
+    out *= np.float32(np.sqrt(_db_to_power(noise_floor) / 2))
+    out += np.fft.ifft(spectrum).astype(np.complex64)
+    m = min(n, _BURST_BLOCK)
+    for e in bursts:
+        width = max(int(round(e["width"] * m)), 1)
+        block = np.zeros(m, dtype=np.complex128)
+        idx, values = _band_bins(m, int(round(e["position"] * m)) - width // 2, width, rng)
+        block[idx] = np.sqrt(_db_to_power(e["level"])) * values
+        gate = (t % e["period"]) < e["duty"] * e["period"]
+        out[gate] += np.resize(np.fft.ifft(block).astype(np.complex64), n)[gate]
+    for amp, phase in carriers:
+        _add_carrier(out, amp, phase)
+    return out
+
+
+def synthesise_sweeps(freqs: np.ndarray, rows: int, sweep_rate: float,
+                      scenario: Sequence[dict], noise_floor: float = _SWEEP_NOISE_FLOOR,
+                      rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """Synthesise ``rows`` consecutive sweeps of ``scenario`` on the grid ``freqs``.
+
+    Returns:
+        float32 array of shape (rows, len(freqs)) in dB.
+    """
+    rng = rng or np.random.default_rng()
+    bins = len(freqs)
+    lo = float(freqs[0])
+    step = (float(freqs[-1]) - lo) / max(bins - 1, 1) or 1.0
+    span = step * bins
+    centre = lo + span / 2
+    t = np.arange(rows) / sweep_rate
+    lin = rng.gamma(_SWEEP_NOISE_DOF, _db_to_power(noise_floor) / _SWEEP_NOISE_DOF,
+                    (rows, bins))
+
+    def band(fraction: float, width_hz: float) -> slice:
+        first = int(np.clip((centre + fraction * span - width_hz / 2 - lo) / step, 0, bins - 1))
+        return slice(first, min(first + max(int(width_hz / step), 1), bins))
+
+    for e in scenario:
+        kind = e["kind"]
+        p = _db_to_power(e["level"])
+        if kind == "tone":
+            lin[:, band(e["position"], 0)] += p
+        elif kind in ("fm", "ofdm"):
+            width = (2 * (e["deviation"] * span + e["rate"]) if kind == "fm"
+                     else e["width"] * span)
+            s = band(e["position"], width)
+            lin[:, s] += p / (s.stop - s.start)
+        elif kind == "burst":
+            s = band(e["position"], e["width"] * span)
+            on = (t % e["period"]) < e["duty"] * e["period"]
+            lin[on, s] += p / (s.stop - s.start)
+        elif kind == "hop":
+            seq = rng.permutation(e["channels"])
+            slot = (t // e["dwell"]).astype(np.int64) % e["channels"]
+            first = band(e["position"], 0).start
+            cols = np.clip(first + np.rint(seq[slot] * e["spacing"] * span / step).astype(np.int64),
+                           0, bins - 1)
+            lin[np.arange(rows), cols] += p
+        else:
+            raise ValueError(f"unknown simulated signal kind '{kind}'")
+    return (10.0 * np.log10(lin)).astype(np.float32)
+
+
+class SimulatedSamplesDataSource(BufferPlaybackDataSource):
+    """Sample source playing a synthesised IQ bank at the selected rate."""
+
+    def __init__(self, sample_rate: float = 2_048_000, centre_freq: float = 100e6,
+                 scenario: Optional[Sequence[dict]] = None,
+                 noise_floor: float = _SAMPLE_NOISE_FLOOR, seed: Optional[int] = None):
+        super().__init__(sample_rate, centre_freq)
+        self.scenario = tuple(scenario or DEFAULT_SCENARIO)
+        self.noise_floor = noise_floor
+        self._seed = seed
+        logger.debug(f"Initialised SimulatedSamplesDataSource at {sample_rate / 1e6:.3f} MS/s")
+
+    def _load(self) -> np.ndarray:
+        n = int(np.clip(self.sample_rate * _BANK_SECONDS, _MIN_BANK_SAMPLES, _MAX_BANK_SAMPLES))
+        t0 = time.perf_counter()
+        bank = synthesise_iq(self.sample_rate, n, self.scenario, self.noise_floor,
+                             np.random.default_rng(self._seed))
+        logger.debug(f"Synthesised {n} IQ samples in {(time.perf_counter() - t0) * 1e3:.0f} ms")
+        return bank
+
+    def update_frequency(self, sample_rate: float, centre_freq: float):
+        """Retune; a new sample rate re-synthesises the bank."""
+        rate_changed = sample_rate != self.sample_rate
+        self.sample_rate, self.centre_freq = sample_rate, centre_freq
+        if rate_changed and self.running:
+            self._set_buffer(self._load())
+            self._averager.reset()
+
+    def update_centre_frequency(self, centre_freq: float):
+        self.centre_freq = centre_freq
+
+
+class SimulatedSweepDataSource(SweepDataSource):
+    """Sweep source replaying a synthesised bank of sweeps at ``sweep_rate``."""
+
+    def __init__(self, start_freq: float, stop_freq: float, bin_size: int = 100_000,
+                 sweep_rate: float = 20.0, scenario: Optional[Sequence[dict]] = None,
+                 noise_floor: float = _SWEEP_NOISE_FLOOR, seed: Optional[int] = None):
+        self.start_freq = int(start_freq)
+        self.stop_freq = int(stop_freq)
+        self.bin_size = int(bin_size)
+        self.sweep_rate = float(sweep_rate)
+        self.scenario = tuple(scenario or DEFAULT_SCENARIO)
+        self.noise_floor = noise_floor
+        self.is_running = False
+        self.frequency_grid = np.array([])
+        self._seed = seed
+        self._bank: Optional[np.ndarray] = None
+        self._t0 = 0.0
+
+    def start(self, frequency: FrequencyRange = None):
+        if frequency:
+            self.start_freq = int(frequency.start)
+            self.stop_freq = int(frequency.stop)
+        num_bins = max(int((self.stop_freq - self.start_freq) / self.bin_size), 2)
+        self.frequency_grid = np.linspace(self.start_freq, self.stop_freq, num_bins)
+        rows = int(np.clip(_MAX_SWEEP_BANK_VALUES // num_bins, 8, _MAX_SWEEP_BANK_ROWS))
+        t0 = time.perf_counter()
+        self._bank = synthesise_sweeps(self.frequency_grid, rows, self.sweep_rate, self.scenario,
+                                       self.noise_floor, np.random.default_rng(self._seed))
+        logger.debug(f"Synthesised {rows} sweeps of {num_bins} bins in "
+                     f"{(time.perf_counter() - t0) * 1e3:.0f} ms")
+        self._t0 = time.monotonic()
+        self.is_running = True
+
+    def stop(self):
+        self.is_running = False
+        self._bank = None
+
+    def get_data(self):
+        if not self.is_running:
+            return np.array([])
+        row = int((time.monotonic() - self._t0) * self.sweep_rate) % len(self._bank)
+        return self._bank[row].copy()
+
+    def get_number_of_points(self):
+        return len(self.frequency_grid)
@@ -0,0 +1,168 @@
+"""Replay of recorded sweeps.
+
+SweepFileDataSource plays a recording written by ``core.sweep_recorder``
+through the normal sweep data path, so the waterfall, density and every
+other display can review a long survey with no radio attached.
+
+The rows and time index are opened with ``np.memmap``; only the rows that
+are played are ever read.  Playback follows the wall clock scaled by
+``speed`` and picks rows by their recorded timestamps, so gaps in the
+recording are reproduced.  When more than one row falls due in one display
+tick (high speeds) they are combined with a NaN-aware peak hold, so short
+bursts are not lost to decimation.
+"""
+
+import logging
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from utils.frequency_helpers import segments_grid
+from .base import SweepDataSource
+from .file_samples import read_sidecar
+
+logger = logging.getLogger(__name__)
+
+SWEEP_DTYPES = ("float16", "float32")
+INDEX_SUFFIX = ".tidx"            # float64 Unix time of each row
+
+
+class SweepFileDataSource(SweepDataSource):
+    has_own_grid = True           # the recorded grid, gaps between bands included
+
+    def __init__(self, path):
+        meta = read_sidecar(path)
+        if meta.get('format') != "sweeps" or meta.get('dtype') not in SWEEP_DTYPES:
+            raise ValueError(f"{Path(path).name} has no sweep recording sidecar")
+        self.path = Path(path)
+        self.meta = meta
+        self.start_freq = float(meta['start_freq'])
+        self.stop_freq = float(meta['stop_freq'])
+        self.bins = int(meta['bins'])
+        self.bin_size = (self.stop_freq - self.start_freq) / max(self.bins - 1, 1)
+        # Recordings of a band set with gaps, or a mixed-resolution sweep, carry their segments
+        segments = meta.get('segments') or [(self.start_freq, self.stop_freq, self.bins)]
+        self.frequency_grid = segments_grid(segments)
+        self.is_running = False
+        self.sweep_rate = None            # rows per second at the current speed
+
+        self.speed = 1.0
+        self.loop = True
+        self.at_end = False
+
+        self._data: Optional[np.ndarray] = None
+        self._times: Optional[np.ndarray] = None   # seconds from the first row
+        self._rows = 0
+        self._recorded_rate = 0.0
+        self._t = 0.0                     # playback position in recording seconds
+        self._last_tick: Optional[float] = None
+        self._row = -1                    # last row returned
+        self._frame = np.array([])
+        logger.debug(f"Initialised SweepFileDataSource for {self.path.name}")
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self, frequency=None):
+        """Open the recording; its own grid is kept regardless of ``frequency``."""
+        if self.is_running:
+            return
+        try:
+            times = np.memmap(self.path.with_suffix(INDEX_SUFFIX), dtype=np.float64, mode='r')
+        except (OSError, ValueError) as e:
+            raise RuntimeError(f"Cannot open sweep index for {self.path.name}: {e}")
+        # An unfinished recording has a zero-filled tail past the last written row
+        rows = int(self.meta.get('rows', 0)) if self.meta.get('complete') else int(np.count_nonzero(times))
+        try:
+            data = np.memmap(self.path, dtype=self.meta['dtype'], mode='r')
+        except (OSError, ValueError) as e:
+            raise RuntimeError(f"Cannot open sweep recording {self.path.name}: {e}")
+        rows = min(rows, len(times), len(data) // self.bins)
+        if rows == 0:
+            raise RuntimeError(f"{self.path.name} contains no sweeps")
+        self._data = data[:rows * self.bins].reshape(rows, self.bins)
+        self._times = np.asarray(times[:rows]) - times[0]
+        self._rows = rows
+        self._recorded_rate = (rows - 1) / self._times[-1] if self._times[-1] > 0 else 0.0
+        self._update_rate()
+        self._last_tick = None
+        self._row = -1
+        self.at_end = False
+        self.is_running = True
+        logger.debug(f"Replaying {self.path.name}: {rows} sweeps over {self.duration:.1f} s")
+
+    def stop(self):
+        self.is_running = False
+        self._data = self._times = None
+        logger.debug("Sweep replay stopped")
+
+    # ------------------------------------------------------------------
+    # Playback control
+    # ------------------------------------------------------------------
+
+    @property
+    def duration(self) -> float:
+        """Recording length in seconds."""
+        return float(self._times[-1]) if self._times is not None else 0.0
+
+    @property
+    def position(self) -> float:
+        """Playback position in recording seconds."""
+        return self._t
+
+    def set_speed(self, speed: float) -> None:
+        """Play at ``speed`` × real time."""
+        self.speed = max(float(speed), 1e-3)
+        self._update_rate()
+
+    def set_loop(self, enabled: bool) -> None:
+        self.loop = enabled
+        if enabled:
+            self.at_end = False
+
+    def seek(self, seconds: float) -> None:
+        """Jump to ``seconds`` from the first recorded sweep (clamped)."""
+        self._t = min(max(float(seconds), 0.0), self.duration)
+        self._row = -1
+        self._last_tick = None
+        self.at_end = False
+
+    def _update_rate(self) -> None:
+        self.sweep_rate = self._recorded_rate * self.speed if self._recorded_rate else None
+
+    def _advance(self) -> None:
+        now = time.monotonic()
+        if self._last_tick is not None and not self.at_end:
+            self._t += (now - self._last_tick) * self.speed
+        self._last_tick = now
+        duration = self.duration
+        if self._t > duration:
+            if self.loop and duration > 0:
+                self._t %= duration
+                self._row = -1
+            else:
+                self._t = duration
+                self.at_end = True
+
+    # ------------------------------------------------------------------
+    # SweepDataSource interface
+    # ------------------------------------------------------------------
+
+    def get_data(self):
+        if not self.is_running:
+            return np.array([])
+        self._advance()
+        row = int(np.searchsorted(self._times, self._t, side='right')) - 1
+        row = max(row, 0)
+        if row != self._row:
+            first = self._row + 1 if 0 <= self._row < row else row
+            rows = self._data[first:row + 1].astype(np.float32)
+            self._frame = np.fmax.reduce(rows, axis=0) if len(rows) > 1 else rows[0]
+            self._row = row
+        return self._frame.copy()
+
+    def get_number_of_points(self):
+        return self.bins
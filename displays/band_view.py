@@ -0,0 +1,132 @@
+"""Band display — separate frequency bands shown side by side, one panel each."""
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
+import logging
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+_GAP_FACTOR = 4.0       # a step this many times the typical bin spacing starts a new band
+
+
+def split_bands(frequency_bins: np.ndarray) -> List[slice]:
+    """Slices of ``frequency_bins`` between the gaps of a multi-band grid (one slice if contiguous)."""
+    if len(frequency_bins) < 3:
+        return [slice(0, len(frequency_bins))]
+    steps = np.diff(frequency_bins)
+    edges = np.flatnonzero(steps > _GAP_FACTOR * np.median(steps)) + 1
+    bounds = [0, *edges.tolist(), len(frequency_bins)]
+    return [slice(a, b) for a, b in zip(bounds, bounds[1:])]
+
+
+class BandView(QWidget):
+    """One plot per band of a multi-band sweep, side by side on a shared amplitude axis.
+
+    The bands are found from the gaps in the frequency bins, so a contiguous
+    source simply shows one panel.  Each panel spans only its own band, so
+    narrow bands far apart (433 MHz, 868 MHz, 2.4 GHz) each get a usable
+    share of the screen.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.layout_widget = pg.GraphicsLayoutWidget()
+        self.layout_widget.setBackground('k')
+        layout = QVBoxLayout()
+        layout.addWidget(self.layout_widget)
+        self.setLayout(layout)
+
+        self.ref_level = 0.0
+        self.range_db  = 100.0
+        self.log_scale = True
+
+        self.max_peak_search_enabled = False
+        self.min_hold_enabled        = False
+
+        self._panels: list = []           # (plot item, live, max, min) per band
+        self._bands: List[slice] = []
+        self._edges: Optional[tuple] = None   # (n, first, last) the panels were built for
+        logger.debug("BandView: initialised")
+
+    # ------------------------------------------------------------------
+    # Amplitude / holds
+    # ------------------------------------------------------------------
+
+    def set_amplitude(self, ref_level: float, range_db: float) -> None:
+        self.ref_level = ref_level
+        self.range_db  = range_db
+        for plot, *_ in self._panels:
+            plot.setYRange(ref_level - range_db, ref_level, padding=0)
+
+    def set_max_peak_search_enabled(self, enabled: bool) -> None:
+        self.max_peak_search_enabled = enabled
+        if not enabled:
+            for _, _, max_curve, _ in self._panels:
+                max_curve.setData([], [])
+
+    def set_min_hold_enabled(self, enabled: bool) -> None:
+        self.min_hold_enabled = enabled
+        if not enabled:
+            for _, _, _, min_curve in self._panels:
+                min_curve.setData([], [])
+
+    # ------------------------------------------------------------------
+    # Panels
+    # ------------------------------------------------------------------
+
+    def _build_panels(self, frequency_bins: np.ndarray) -> None:
+        self.layout_widget.clear()
+        self._panels = []
+        self._bands = split_bands(frequency_bins)
+        first_plot = None
+        for band in self._bands:
+            plot = self.layout_widget.addPlot()
+            plot.showGrid(x=True, y=True, alpha=0.25)
+            plot.setLabel('bottom', 'Frequency', units='Hz')
+            if first_plot is None:
+                plot.setLabel('left', 'Power', units='dBm')
+                first_plot = plot
+            else:
+                plot.setYLink(first_plot)
+                plot.hideAxis('left')
+            plot.enableAutoRange(enable=False)
+            freqs = frequency_bins[band]
+            plot.setXRange(freqs[0], freqs[-1], padding=0)
+            plot.setYRange(self.ref_level - self.range_db, self.ref_level, padding=0)
+            live = plot.plot(pen=pg.mkPen((0, 200, 60), width=1))
+            max_curve = plot.plot(pen=pg.mkPen('y', width=1, style=Qt.PenStyle.DashLine))
+            min_curve = plot.plot(pen=pg.mkPen((80, 100, 255), width=1, style=Qt.PenStyle.DashLine))
+            self._panels.append((plot, live, max_curve, min_curve))
+        self._edges = (len(frequency_bins), frequency_bins[0], frequency_bins[-1])
+        logger.debug(f"BandView: {len(self._bands)} band panel(s)")
+
+    def update_widget_data(
+        self,
+        live_power_levels,
+        max_power_levels: Optional[np.ndarray],
+        frequency_bins: np.ndarray,
+        min_power_levels: Optional[np.ndarray] = None,
+    ) -> None:
+        """Split the trace (and holds) at the band gaps and draw each band in its panel."""
+        if live_power_levels is None or frequency_bins is None or len(frequency_bins) == 0:
+            return
+        if isinstance(live_power_levels, tuple):      # stereo audio: the left channel
+            live_power_levels = live_power_levels[0]
+        if self._edges != (len(frequency_bins), frequency_bins[0], frequency_bins[-1]):
+            self._build_panels(frequency_bins)
+        for band, (plot, live, max_curve, min_curve) in zip(self._bands, self._panels):
+            freqs = frequency_bins[band]
+            levels = live_power_levels[band]
+            live.setData(freqs, levels)
+            if self.max_peak_search_enabled and max_power_levels is not None:
+                max_curve.setData(freqs, max_power_levels[band])
+            if self.min_hold_enabled and min_power_levels is not None:
+                min_curve.setData(freqs, min_power_levels[band])
+            finite = np.isfinite(levels)
+            if finite.any():
+                peak = int(np.nanargmax(np.where(finite, levels, -np.inf)))
+                plot.setTitle(f"{freqs[0] / 1e6:.2f}–{freqs[-1] / 1e6:.2f} MHz   "
+                              f"peak {freqs[peak] / 1e6:.3f} MHz {levels[peak]:.1f} dBm", size='9pt')
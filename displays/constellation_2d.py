@@ -4,6 +4,7 @@ import numpy as np
 import pyqtgraph as pg
 from PyQt6.QtWidgets import QWidget, QVBoxLayout
 from PyQt6.QtCore import QRectF
+from utils import colour_maps
 import logging
 
 logger = logging.getLogger(__name__)
@@ -32,6 +33,47 @@ _CONST_REFS = {
     "64qam": _qam_grid(8),
 }
 
+# Decision-slicer parameters: ("qam", levels per axis) or ("psk", order, phase offset)
+_SLICER_SPECS = {
+    "bpsk":  ("psk", 2, 0.0),
+    "qpsk":  ("psk", 4, np.pi / 4),
+    "8psk":  ("psk", 8, 0.0),
+    "16qam": ("qam", 4),
+    "64qam": ("qam", 8),
+}
+
+
+def _slice(i_data: np.ndarray, q_data: np.ndarray, modulation: str):
+    """Return the nearest ideal symbol for every sample in O(N).
+
+    QAM decisions round each axis onto the level grid independently; PSK
+    decisions quantise the sample phase.  Both match a brute-force
+    nearest-point search against ``_CONST_REFS``.
+
+    Returns:
+        (ref_i, ref_q) float32 arrays, or None for an unknown modulation.
+    """
+    spec = _SLICER_SPECS.get(modulation)
+    if spec is None:
+        return None
+    if spec[0] == "qam":
+        levels = spec[1]
+        pts = _CONST_REFS[modulation]
+        step = float(pts[:, 0].max() - pts[:, 0].min()) / (levels - 1)  # grid pitch
+        half = (levels - 1) / 2.0
+        ref = []
+        for axis in (i_data, q_data):
+            k = np.rint(axis / step + half)
+            np.clip(k, 0, levels - 1, out=k)
+            ref.append(((k - half) * step).astype(np.float32))
+        return ref[0], ref[1]
+
+    _, order, offset = spec
+    sector = np.float32(2.0 * np.pi / order)
+    k = np.rint((np.arctan2(q_data, i_data) - offset) / sector)
+    theta = (k * sector + offset).astype(np.float32)
+    return np.cos(theta), np.sin(theta)
+
 
 class Constellation2D(QWidget):
     """IQ constellation diagram with density (histogram) and scatter display modes."""
@@ -50,8 +92,7 @@ class Constellation2D(QWidget):
 
         # Density mode: 2D histogram as ImageItem
         self._img = pg.ImageItem()
-        cm = pg.colormap.get('viridis')
-        self._img.setColorMap(cm)
+        self._img.setLookupTable(colour_maps.lut_u8('viridis'))
         self._plot.addItem(self._img)
 
         # Scatter mode
@@ -107,24 +148,20 @@ class Constellation2D(QWidget):
             return
         try:
             iq = self._to_complex(samples)
+            i_data = np.real(iq).astype(np.float32)
+            q_data = np.imag(iq).astype(np.float32)
 
             # RMS AGC — normalise to unit average power
-            rms = np.sqrt(np.mean(np.abs(iq) ** 2))
+            rms = np.sqrt(np.mean(i_data * i_data + q_data * q_data))
             if rms > 1e-10:
-                iq = iq / rms
-
-            i_data = np.real(iq).astype(np.float32)
-            q_data = np.imag(iq).astype(np.float32)
+                i_data *= np.float32(1.0 / rms)
+                q_data *= np.float32(1.0 / rms)
 
             self.last_evm_rms = self._compute_evm(i_data, q_data)
 
             r = self._range
             if self._mode == "density":
-                res = self._resolution
-                hist, _, _ = np.histogram2d(
-                    i_data, q_data, bins=res, range=[[-r, r], [-r, r]]
-                )
-                disp = np.log1p(hist).T
+                disp = self._density_image(i_data, q_data, r)
                 self._img.setImage(disp, autoLevels=True)
                 self._img.setRect(QRectF(-r, -r, 2 * r, 2 * r))
             else:
@@ -151,13 +188,23 @@ class Constellation2D(QWidget):
             self._ref_scatter.setVisible(False)
 
     def _compute_evm(self, i_data: np.ndarray, q_data: np.ndarray) -> float | None:
-        pts = _CONST_REFS.get(self._modulation)
-        if pts is None or len(pts) == 0:
+        decided = _slice(i_data, q_data, self._modulation)
+        if decided is None:
             return None
-        iq = np.column_stack([i_data, q_data])          # (N, 2)
-        diffs = iq[:, np.newaxis, :] - pts[np.newaxis, :, :]  # (N, M, 2)
-        min_dist_sq = np.min(np.sum(diffs ** 2, axis=2), axis=1)  # (N,)
-        return float(np.sqrt(np.mean(min_dist_sq)))
+        err_i = i_data - decided[0]
+        err_q = q_data - decided[1]
+        return float(np.sqrt(np.mean(err_i * err_i + err_q * err_q)))
+
+    def _density_image(self, i_data: np.ndarray, q_data: np.ndarray, r: float) -> np.ndarray:
+        """Log-scaled (res, res) occupancy image, Q along rows, via np.bincount."""
+        res = self._resolution
+        scale = np.float32(res / (2.0 * r))
+        ix = np.floor((i_data + np.float32(r)) * scale).astype(np.int32)
+        iy = np.floor((q_data + np.float32(r)) * scale).astype(np.int32)
+        inside = (ix >= 0) & (ix < res) & (iy >= 0) & (iy < res)
+        flat = iy[inside] * res + ix[inside]
+        hist = np.bincount(flat, minlength=res * res).astype(np.float32)
+        return np.log1p(hist).reshape(res, res)
 
     def _update_mode_visibility(self) -> None:
         self._img.setVisible(self._mode == "density")
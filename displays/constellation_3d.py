@@ -23,16 +23,34 @@ _MAX_FRAMES = 20      # Time slices kept
 _Z_STEP = 0.15        # Spacing between time planes
 _POINTS_PER_FRAME = 400
 
+# Colour per age (0 = newest): green rises and alpha fades toward the newest slice
+_AGE = (_MAX_FRAMES - np.arange(_MAX_FRAMES, dtype=np.float32)) / _MAX_FRAMES
+_AGE_RAMP = np.column_stack([
+    np.zeros(_MAX_FRAMES, dtype=np.float32), _AGE,
+    np.ones(_MAX_FRAMES, dtype=np.float32), _AGE * 0.8 + 0.2,
+])
+
 
 class Constellation3D(QWidget):
-    """3D IQ scatter with time depth: X=I, Y=Q, Z=time (newest at Z=0)."""
+    """3D IQ scatter with time depth: X=I, Y=Q, Z=time (newest at Z=0).
+
+    Points live in a fixed-capacity ring of ``_MAX_FRAMES`` time slices.
+    Each slice is drawn by its own scatter item whose vertex buffer is a
+    view into the ring, so a new frame uploads only the slice it
+    overwrites.  Ageing the older slices is just a Z translation and a
+    uniform colour from ``_AGE_RAMP``, both O(1) per slice.
+    """
 
     def __init__(self, parent=None):
         super().__init__(parent)
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
 
-        self._frames = []  # list of (i_data, q_data) float32 arrays
+        self._points_per_frame = _POINTS_PER_FRAME
+        self._ring = np.zeros((_MAX_FRAMES, self._points_per_frame, 3), dtype=np.float32)
+        self._slot_frame = np.full(_MAX_FRAMES, -1, dtype=np.int64)  # frame number held by each slot
+        self._frame = 0
+        self._slices: list = []
 
         if _HAS_GL:
             self._view = gl.GLViewWidget()
@@ -45,8 +63,11 @@ class Constellation3D(QWidget):
             grid.scale(0.5, 0.5, 0.5)
             self._view.addItem(grid)
 
-            self._scatter = gl.GLScatterPlotItem()
-            self._view.addItem(self._scatter)
+            for _ in range(_MAX_FRAMES):
+                item = gl.GLScatterPlotItem(size=3)
+                item.setVisible(False)
+                self._view.addItem(item)
+                self._slices.append(item)
             layout.addWidget(self._view)
         else:
             from PyQt6.QtWidgets import QLabel
@@ -57,7 +78,14 @@ class Constellation3D(QWidget):
         self._range = r
 
     def set_max_points(self, n: int) -> None:
-        self._points_per_frame = n // max(_MAX_FRAMES, 1)
+        ppf = max(1, n // max(_MAX_FRAMES, 1))
+        if ppf == self._points_per_frame:
+            return
+        self._points_per_frame = ppf
+        self._ring = np.zeros((_MAX_FRAMES, ppf, 3), dtype=np.float32)
+        self._slot_frame.fill(-1)
+        for item in self._slices:
+            item.setVisible(False)
 
     def set_modulation(self, mod: str) -> None:
         pass  # reference overlay not implemented for 3D view
@@ -68,52 +96,42 @@ class Constellation3D(QWidget):
         try:
             iq = self._to_complex(samples)
 
-            # RMS AGC
-            rms = np.sqrt(np.mean(np.abs(iq) ** 2))
-            if rms > 1e-10:
-                iq = iq / rms
+            # Decimate first so AGC and conversion only touch the kept points
+            n = min(self._points_per_frame, len(iq))
+            idx = np.linspace(0, len(iq) - 1, n, dtype=int)
+            kept = iq[idx]
 
-            i_data = np.real(iq).astype(np.float32)
-            q_data = np.imag(iq).astype(np.float32)
+            # RMS AGC (estimated on the kept points)
+            rms = np.sqrt(np.mean(kept.real ** 2 + kept.imag ** 2))
+            gain = np.float32(1.0 / rms) if rms > 1e-10 else np.float32(1.0)
 
-            ppf = getattr(self, '_points_per_frame', _POINTS_PER_FRAME)
-            n = min(ppf, len(i_data))
-            idx = np.linspace(0, len(i_data) - 1, n, dtype=int)
-            self._frames.append((i_data[idx], q_data[idx]))
-            if len(self._frames) > _MAX_FRAMES:
-                self._frames.pop(0)
+            slot = self._frame % _MAX_FRAMES
+            row = self._ring[slot, :n]
+            row[:, 0] = kept.real
+            row[:, 1] = kept.imag
+            row[:, :2] *= gain
+            self._slot_frame[slot] = self._frame
 
-            self._rebuild_scatter()
+            item = self._slices[slot]
+            item.setData(pos=row)   # only this slice's buffer is re-uploaded
+            item.setVisible(True)
+            self._frame += 1
+
+            self._age_slices()
         except Exception as e:
             logger.error(f"Constellation3D update error: {e}")
 
-    def _rebuild_scatter(self) -> None:
-        if not self._frames:
-            return
-        n_frames = len(self._frames)
-        all_pos = []
-        all_colors = []
-
-        for z_idx, (i_data, q_data) in enumerate(self._frames):
-            z_val = (z_idx - n_frames + 1) * _Z_STEP
-            n = len(i_data)
-            pos = np.column_stack([
-                i_data, q_data, np.full(n, z_val, dtype=np.float32)
-            ]).astype(np.float32)
-
-            age = (z_idx + 1) / n_frames  # 0=oldest, 1=newest
-            colors = np.zeros((n, 4), dtype=np.float32)
-            colors[:, 0] = 0.0
-            colors[:, 1] = age
-            colors[:, 2] = 1.0
-            colors[:, 3] = age * 0.8 + 0.2
-
-            all_pos.append(pos)
-            all_colors.append(colors)
-
-        pos = np.vstack(all_pos).astype(np.float32)
-        colors = np.vstack(all_colors).astype(np.float32)
-        self._scatter.setData(pos=pos, color=colors, size=3)
+    def _age_slices(self) -> None:
+        """Move every slice to its age plane and apply its ramp colour."""
+        newest = self._frame - 1
+        for slot, item in enumerate(self._slices):
+            written = self._slot_frame[slot]
+            if written < 0:
+                continue
+            age = int(newest - written)
+            item.resetTransform()
+            item.translate(0.0, 0.0, -age * _Z_STEP)
+            item.setData(color=tuple(_AGE_RAMP[age]))
 
     def _to_complex(self, samples: np.ndarray) -> np.ndarray:
         if np.iscomplexobj(samples):
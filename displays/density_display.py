@@ -7,6 +7,8 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout
 import logging
 from typing import Optional
 
+from utils import colour_maps
+
 logger = logging.getLogger(__name__)
 
 _AMP_BINS    = 512
@@ -33,7 +35,7 @@ class DensityDisplay(QWidget):
 
         # Density histogram image — drawn first so the trace sits on top
         self._img = pg.ImageItem()
-        self._img.setColorMap(pg.colormap.get('magma'))
+        self._img.setLookupTable(colour_maps.lut_u8('magma'))
         self.plot_widget.addItem(self._img)
 
         # Live trace
@@ -121,7 +123,7 @@ class DensityDisplay(QWidget):
 
     def set_colourmap(self, name: str) -> None:
         try:
-            self._img.setColorMap(pg.colormap.get(name))
+            self._img.setLookupTable(colour_maps.lut_u8(name))
             self._colourmap_name = name
         except Exception as e:
             logger.warning(f"DensityDisplay: colourmap '{name}' unavailable: {e}")
@@ -0,0 +1,135 @@
+"""Multi-source display — frames from several sources at once, overlaid or side by side."""
+
+import time
+import numpy as np
+import pyqtgraph as pg
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
+import logging
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+OVERLAY      = "overlay"
+SIDE_BY_SIDE = "side_by_side"
+
+_COLOURS = ((0, 200, 60), (255, 170, 0), (60, 160, 255), (230, 60, 200), (240, 240, 240), (255, 80, 80))
+
+
+class MultiSourceView(QWidget):
+    """The latest frame of every channel of a SourceGroup.
+
+    Overlay draws every source on one plot whose frequency axis covers all
+    of them, one colour per source.  Side by side gives each source its own
+    panel over its own range, on a shared amplitude axis.  Titles show each
+    frame's age, and the overlay title the spread between the oldest and
+    newest frame.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.layout_widget = pg.GraphicsLayoutWidget()
+        self.layout_widget.setBackground('k')
+        layout = QVBoxLayout()
+        layout.addWidget(self.layout_widget)
+        self.setLayout(layout)
+
+        self.ref_level = 0.0
+        self.range_db  = 100.0
+        self.mode      = OVERLAY
+
+        self._plots: list = []            # one plot item (overlay) or one per source
+        self._curves: dict = {}           # name -> (live, max)
+        self._layout_key: Optional[tuple] = None   # (mode, names, ranges) the plots were built for
+        logger.debug("MultiSourceView: initialised")
+
+    # ------------------------------------------------------------------
+    # Settings
+    # ------------------------------------------------------------------
+
+    def set_amplitude(self, ref_level: float, range_db: float) -> None:
+        self.ref_level = ref_level
+        self.range_db  = range_db
+        for plot in self._plots:
+            plot.setYRange(ref_level - range_db, ref_level, padding=0)
+
+    def set_mode(self, mode: str) -> None:
+        """Show the sources overlaid (``OVERLAY``) or side by side (``SIDE_BY_SIDE``)."""
+        if mode not in (OVERLAY, SIDE_BY_SIDE):
+            raise ValueError(f"Unknown multi-source view mode '{mode}'")
+        self.mode = mode
+        self._layout_key = None
+
+    # ------------------------------------------------------------------
+    # Plots
+    # ------------------------------------------------------------------
+
+    def _new_plot(self, first_plot) -> pg.PlotItem:
+        plot = self.layout_widget.addPlot()
+        plot.showGrid(x=True, y=True, alpha=0.25)
+        plot.setLabel('bottom', 'Frequency', units='Hz')
+        if first_plot is None:
+            plot.setLabel('left', 'Power', units='dBm')
+        else:
+            plot.setYLink(first_plot)
+            plot.hideAxis('left')
+        plot.enableAutoRange(enable=False)
+        plot.setYRange(self.ref_level - self.range_db, self.ref_level, padding=0)
+        return plot
+
+    def _build_plots(self, frames: list, key: tuple) -> None:
+        self.layout_widget.clear()
+        self._plots = []
+        self._curves = {}
+        if self.mode == OVERLAY:
+            plot = self._new_plot(None)
+            plot.addLegend(offset=(-10, 10))
+            plot.setXRange(min(f.freqs[0] for f in frames), max(f.freqs[-1] for f in frames), padding=0)
+            self._plots.append(plot)
+        for i, frame in enumerate(frames):
+            if self.mode == SIDE_BY_SIDE:
+                plot = self._new_plot(self._plots[0] if self._plots else None)
+                plot.setXRange(frame.freqs[0], frame.freqs[-1], padding=0)
+                self._plots.append(plot)
+            colour = _COLOURS[i % len(_COLOURS)]
+            live = plot.plot(pen=pg.mkPen(colour, width=1), name=frame.name)
+            held = plot.plot(pen=pg.mkPen(colour, width=1, style=Qt.PenStyle.DashLine))
+            self._curves[frame.name] = (live, held)
+        self._layout_key = key
+        logger.debug(f"MultiSourceView: {len(frames)} source(s), {self.mode}")
+
+    def update_frames(self, frames: List) -> None:
+        """Draw the latest frame of each source (SourceFrame objects, as SourceGroup.snapshot returns)."""
+        frames = [f for f in frames if len(f.freqs) and len(f.freqs) == len(f.power)]
+        key = (self.mode, tuple((f.name, f.freqs[0], f.freqs[-1]) for f in frames))
+        if key != self._layout_key:
+            if not frames:
+                self.layout_widget.clear()
+                self._plots, self._curves, self._layout_key = [], {}, key
+                return
+            self._build_plots(frames, key)
+        now = time.time()
+        for i, frame in enumerate(frames):
+            live, held = self._curves[frame.name]
+            live.setData(frame.freqs, frame.power)
+            if frame.max_power is not None and len(frame.max_power) == len(frame.freqs):
+                held.setData(frame.freqs, frame.max_power)
+            else:
+                held.setData([], [])
+            if self.mode == SIDE_BY_SIDE:
+                self._plots[i].setTitle(self._describe(frame, now), size='9pt')
+        if self.mode == OVERLAY:
+            stamps = [f.timestamp for f in frames]
+            ages = "   ".join(f"{f.name} {1000 * (now - f.timestamp):.0f} ms" for f in frames)
+            self._plots[0].setTitle(f"{ages}   spread {1000 * (max(stamps) - min(stamps)):.0f} ms",
+                                    size='9pt')
+
+    @staticmethod
+    def _describe(frame, now: float) -> str:
+        text = (f"{frame.name}   {frame.freqs[0] / 1e6:.2f}–{frame.freqs[-1] / 1e6:.2f} MHz   "
+                f"{1000 * (now - frame.timestamp):.0f} ms old")
+        finite = np.isfinite(frame.power)
+        if finite.any():
+            peak = int(np.nanargmax(np.where(finite, frame.power, -np.inf)))
+            text += f"   peak {frame.freqs[peak] / 1e6:.3f} MHz {frame.power[peak]:.1f} dBm"
+        return text
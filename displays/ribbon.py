@@ -1,23 +1,103 @@
+from functools import lru_cache
+
 import numpy as np
 from PyQt6 import QtWidgets
 import pyqtgraph.opengl as gl
-from matplotlib.colors import hsv_to_rgb
 import logging
 
+from utils import colour_maps
+
 logger = logging.getLogger(__name__)
 
+_COLOUR_MAP    = "rainbow"
+_REBASE_FRAMES = 4096     # frames between re-zeroing the rows' Y coordinates
+_MAX_PENDING   = 64       # queued ranges after which the next paint uploads everything
+
+
+@lru_cache(maxsize=None)
+def _age_height_lut(age_steps: int, levels: int) -> np.ndarray:
+    """Return the cached (age_steps, levels, 4) uint8 RGBA ribbon table.
+
+    Row index is age step (0 = newest), column index is quantised height.
+    Colours are gathered from the shared rainbow map: the newest rows stay
+    near its red end, older rows spread towards blue and fade.
+    """
+    t   = np.linspace(0.0, 1.0, levels, dtype=np.float32)
+    age = np.arange(age_steps, dtype=np.float32) / max(age_steps - 1, 1)
+    position = 1.0 - (1.0 - t[None, :]) * (0.3 + 0.7 * age[:, None])
+    table = colour_maps.lut(_COLOUR_MAP, levels)[colour_maps.to_indices(position, 0.0, 1.0, levels)]
+    table[..., :3] *= np.clip(1.0 - age * 0.6, 0.3, 1.0)[:, None, None]
+    table[..., 3]   = np.maximum(0.3, 1.0 - age * 0.5)[:, None]
+    table = np.rint(table * 255.0).astype(np.uint8)
+    table.setflags(write=False)
+    return table
+
+
+class _RingMeshItem(gl.GLMeshItem):
+    """A GLMeshItem whose arrays are rewritten a few vertices at a time.
+
+    The vertex and colour arrays are kept by reference.  ``write_vertices``
+    and ``write_colours`` queue a vertex range of one of them and the next
+    paint copies just that range into the item's existing GL buffer (those
+    of pyqtgraph 0.14's GLMeshItem); the first paint uploads everything as
+    usual.
+    """
+
+    def __init__(self, vertexes: np.ndarray, faces: np.ndarray, colors: np.ndarray):
+        super().__init__(vertexes=vertexes, faces=faces, vertexColors=colors,
+                         drawEdges=False, smooth=True, computeNormals=False)
+        self._arrays  = (vertexes, colors)
+        self._pending = ([], [])    # (first, stop) vertex ranges to upload, per array
+
+    def write_vertices(self, first: int, stop: int) -> None:
+        self._queue(0, first, stop)
+
+    def write_colours(self, first: int, stop: int) -> None:
+        self._queue(1, first, stop)
+
+    def _queue(self, which: int, first: int, stop: int) -> None:
+        pending = self._pending[which]
+        everything = (0, len(self._arrays[which]))
+        if len(pending) >= _MAX_PENDING or (first, stop) == everything:
+            pending[:] = [everything]         # not painted for a while, or all of it changed
+        elif pending[:1] != [everything]:
+            pending.append((first, stop))
+        self.update()
+
+    def paint(self):
+        if self.vertexes is not None and self.m_vbo_position.isCreated():
+            buffers = (self.m_vbo_position, self.m_vbo_color)
+            for vbo, arr, pending in zip(buffers, self._arrays, self._pending):
+                for first, stop in pending:
+                    part = arr[first:stop]
+                    vbo.bind()
+                    vbo.write(first * arr.strides[0], part, part.nbytes)
+                    vbo.release()
+        for pending in self._pending:
+            pending.clear()
+        super().paint()
+
 
 class RibbonWidget(QtWidgets.QWidget):
     """3-D ribbon waterfall display.
 
-    Each frame's spectrum becomes a solid ribbon mesh.  History scrolls away
+    Each frame's spectrum becomes a solid ribbon.  History scrolls away
     from the viewer so the newest data is always at the front.  Ribbons are
     colour-coded from red (newest / highest power) to blue (oldest / lowest).
+
+    All rows live in a single mesh backed by preallocated vertex and colour
+    arrays used as a ring.  Each new row is written at the next Y position
+    back and the whole mesh is translated forward by one row, so a frame
+    uploads the newest row's vertices only.  Colours are gathered from a
+    cached (age step, height) table built on the shared colour map; a row's
+    colours are rewritten only when it enters a new age step.
     """
 
-    NUM_ROWS = 30
-    SPACING  = 0.7    # Y gap between ribbon rows in GL units
-    Z_SCALE  = 8.0    # maximum height in GL units
+    NUM_ROWS   = 30
+    SPACING    = 0.7    # Y gap between ribbon rows in GL units
+    Z_SCALE    = 8.0    # maximum height in GL units
+    LUT_LEVELS = 256    # height quantisation steps in the colour LUT
+    AGE_STEPS  = 10     # age shades; NUM_ROWS / AGE_STEPS rows share each
 
     def __init__(self):
         super().__init__()
@@ -38,10 +118,17 @@ class RibbonWidget(QtWidgets.QWidget):
 
         self.frequency_bins  = None
         self.num_bins        = 0
-        self.all_heights     = None   # shape (NUM_ROWS, num_bins)
-        self.ribbons: list   = []
+        self.all_heights     = None   # ring of heights, shape (NUM_ROWS, num_bins)
+        self.mesh            = None
         self.faces           = None
         self._x              = None
+        self._verts          = None   # (NUM_ROWS, num_bins * 2, 3) float32
+        self._colors         = None   # (NUM_ROWS, num_bins * 2, 4) uint8
+        self._levels         = None   # ring of LUT height indices, (NUM_ROWS, num_bins)
+        self._steps          = None   # age step each slot's colours were gathered for
+        self._frame          = 0      # frame number of the newest row
+        self._base           = 0      # frame number drawn at Y = 0 before translation
+        self._lut            = _age_height_lut(self.AGE_STEPS, self.LUT_LEVELS)
         self._initialised    = False
 
         logger.debug("RibbonWidget: initialised")
@@ -66,82 +153,97 @@ class RibbonWidget(QtWidgets.QWidget):
             return (-10.0 + (self.frequency_bins.astype(np.float32) - f0) / span * 20.0)
         return np.linspace(-10.0, 10.0, n, dtype=np.float32)
 
+    def _ages(self) -> np.ndarray:
+        """Age in frames of the row in each ring slot (0 = newest)."""
+        return (self._frame - np.arange(self.NUM_ROWS)) % self.NUM_ROWS
+
     # ------------------------------------------------------------------
     # Geometry builders
     # ------------------------------------------------------------------
 
-    def _make_faces(self, n: int) -> np.ndarray:
+    @staticmethod
+    def _make_faces(n: int) -> np.ndarray:
         """Pre-compute face index array for an n-bin ribbon."""
-        faces = []
-        for i in range(n - 1):
-            faces.append([i * 2,     i * 2 + 1, i * 2 + 2])
-            faces.append([i * 2 + 1, i * 2 + 3, i * 2 + 2])
-        return np.array(faces, dtype=np.uint32)
-
-    def _row_verts_colors(self, row_idx: int, heights: np.ndarray):
-        """Return (verts, vertex_colors) for one ribbon row."""
-        x        = self._x
-        y_front  = row_idx * self.SPACING
-        y_back   = y_front + self.SPACING * 0.85
-        n        = len(heights)
-
-        verts = np.empty((n * 2, 3), dtype=np.float32)
-        verts[0::2, 0] = x
-        verts[0::2, 1] = y_front
-        verts[0::2, 2] = heights
-        verts[1::2, 0] = x
-        verts[1::2, 1] = y_back
-        verts[1::2, 2] = heights
-
-        # Colour: hue from red (new/high) to blue (old/low) per vertex
-        t   = np.clip(heights / self.Z_SCALE, 0.0, 1.0)
-        age = row_idx / max(self.NUM_ROWS - 1, 1)
-        # hue: newest high-power → red (0.0), oldest low-power → blue (0.66)
-        hue = (1.0 - t) * 0.66 * (0.3 + 0.7 * age)
-        sat = np.ones_like(hue)
-        val = np.clip(1.0 - age * 0.6, 0.3, 1.0) * np.ones_like(hue)
-
-        hsv    = np.stack([hue, sat, val], axis=1)
-        rgb    = hsv_to_rgb(hsv).astype(np.float32)
-        alpha  = np.full((n, 1), max(0.3, 1.0 - age * 0.5), dtype=np.float32)
-        per_v  = np.concatenate([rgb, alpha], axis=1)
-
-        colors = np.empty((n * 2, 4), dtype=np.float32)
-        colors[0::2] = per_v
-        colors[1::2] = per_v
-
-        return verts, colors
+        a = np.arange(max(n - 1, 0), dtype=np.uint32) * 2
+        faces = np.empty((len(a), 2, 3), dtype=np.uint32)
+        faces[:, 0] = np.stack([a,     a + 1, a + 2], axis=1)
+        faces[:, 1] = np.stack([a + 1, a + 3, a + 2], axis=1)
+        return faces.reshape(-1, 3)
+
+    def _make_mesh_faces(self, n: int) -> np.ndarray:
+        """Face array for NUM_ROWS ribbons packed into one vertex buffer."""
+        base    = self._make_faces(n)
+        offsets = np.arange(self.NUM_ROWS, dtype=np.uint32) * (n * 2)
+        return (base[None, :, :] + offsets[:, None, None]).reshape(-1, 3)
+
+    def _place_row(self, slot: int, age: int) -> None:
+        """Set a slot's Y coordinates for the frame it holds."""
+        y_front = -float(self._frame - age - self._base) * self.SPACING
+        self._verts[slot, 0::2, 1] = y_front
+        self._verts[slot, 1::2, 1] = y_front + self.SPACING * 0.85
+
+    def _colour_row(self, slot: int, step: int) -> None:
+        rgba = self._lut[step, self._levels[slot]]
+        self._colors[slot, 0::2] = rgba
+        self._colors[slot, 1::2] = rgba
+        self._steps[slot] = step
+
+    def _slot_range(self, slot: int) -> tuple:
+        first = slot * self.num_bins * 2
+        return first, first + self.num_bins * 2
+
+    def _translate(self) -> None:
+        self.mesh.resetTransform()
+        self.mesh.translate(0.0, float(self._frame - self._base) * self.SPACING, 0.0)
+
+    def _rebase(self) -> None:
+        """Re-zero every row's Y before float32 coordinates lose precision."""
+        self._base = self._frame
+        for slot, age in enumerate(self._ages()):
+            self._place_row(slot, int(age))
+        self.mesh.write_vertices(0, self.NUM_ROWS * self.num_bins * 2)
 
     # ------------------------------------------------------------------
     # Initialisation
     # ------------------------------------------------------------------
 
     def _init_geometry(self, num_bins: int) -> None:
-        for r in self.ribbons:
-            self.widget.removeItem(r)
-        self.ribbons.clear()
+        if self.mesh is not None:
+            self.widget.removeItem(self.mesh)
+            self.mesh = None
 
         self.num_bins    = num_bins
         self.all_heights = np.zeros((self.NUM_ROWS, num_bins), dtype=np.float32)
-        self.faces       = self._make_faces(num_bins)
+        self._levels     = np.zeros((self.NUM_ROWS, num_bins), dtype=np.intp)
+        self._steps      = np.zeros(self.NUM_ROWS, dtype=np.intp)
+        self._frame      = self.NUM_ROWS - 1     # slot s holds frame s
+        self._base       = self._frame
+        self.faces       = self._make_mesh_faces(num_bins)
         self._x          = self._make_x()
 
-        for i in range(self.NUM_ROWS):
-            verts, colors = self._row_verts_colors(i, self.all_heights[i])
-            ribbon = gl.GLMeshItem(
-                vertexes=verts,
-                faces=self.faces,
-                vertexColors=colors,
-                drawEdges=False,
-                smooth=False,
-                computeNormals=False,
-            )
-            self.widget.addItem(ribbon)
-            self.ribbons.append(ribbon)
+        self._verts  = np.zeros((self.NUM_ROWS, num_bins * 2, 3), dtype=np.float32)
+        self._colors = np.zeros((self.NUM_ROWS, num_bins * 2, 4), dtype=np.uint8)
+        self._apply_x()
+        steps = self._ages() * self.AGE_STEPS // self.NUM_ROWS
+        for slot, age in enumerate(self._ages()):
+            self._place_row(slot, int(age))
+            self._colour_row(slot, int(steps[slot]))
+
+        self.mesh = _RingMeshItem(
+            self._verts.reshape(-1, 3),
+            self.faces,
+            self._colors.reshape(-1, 4),
+        )
+        self._translate()
+        self.widget.addItem(self.mesh)
 
         self._initialised = True
         logger.debug(f"RibbonWidget: initialised geometry for {num_bins} bins")
 
+    def _apply_x(self) -> None:
+        verts = self._verts.reshape(self.NUM_ROWS, self.num_bins, 2, 3)
+        verts[:, :, :, 0] = self._x[None, :, None]
+
     # ------------------------------------------------------------------
     # Public interface (matches ThreeD / Surface)
     # ------------------------------------------------------------------
@@ -158,6 +260,8 @@ class RibbonWidget(QtWidgets.QWidget):
             self._init_geometry(len(bins))
         else:
             self._x = self._make_x()
+            self._apply_x()
+            self.mesh.write_vertices(0, self.NUM_ROWS * self.num_bins * 2)   # a retune moves every row's bins
 
     def update_widget_data(
         self,
@@ -184,17 +288,29 @@ class RibbonWidget(QtWidgets.QWidget):
 
         new_heights = self._dbm_to_z(live_power_levels)
 
-        # Scroll history and insert newest row at front
-        self.all_heights[1:] = self.all_heights[:-1]
-        self.all_heights[0]  = new_heights
-
-        for i, ribbon in enumerate(self.ribbons):
-            verts, colors = self._row_verts_colors(i, self.all_heights[i])
-            ribbon.setMeshData(
-                vertexes=verts,
-                faces=self.faces,
-                vertexColors=colors,
-            )
+        # Advance the ring: the oldest slot becomes the newest row
+        self._frame += 1
+        head = self._frame % self.NUM_ROWS
+        self.all_heights[head] = new_heights
+        self._levels[head] = colour_maps.to_indices(new_heights, 0.0, self.Z_SCALE, self.LUT_LEVELS)
+
+        row = self._verts[head]
+        row[0::2, 2] = new_heights
+        row[1::2, 2] = new_heights
+        self._place_row(head, 0)
+        self._colour_row(head, 0)
+        self.mesh.write_vertices(*self._slot_range(head))
+        self.mesh.write_colours(*self._slot_range(head))
+
+        # Older rows only need new colours when they cross into the next age step
+        steps = self._ages() * self.AGE_STEPS // self.NUM_ROWS
+        for slot in np.flatnonzero(steps != self._steps):
+            self._colour_row(int(slot), int(steps[slot]))
+            self.mesh.write_colours(*self._slot_range(int(slot)))
+
+        if self._frame - self._base >= _REBASE_FRAMES:
+            self._rebase()
+        self._translate()
 
     def set_amplitude(self, ref_level: float, range_db: float) -> None:
         self.ref_level = ref_level
@@ -1,10 +1,15 @@
 import numpy as np
 from vispy import scene
-from vispy.color import Colormap
 from PyQt6.QtWidgets import QWidget, QVBoxLayout
 from vispy.scene import visuals
 import logging
 
+from utils import colour_maps
+
+_MAX_COLUMNS = 512   # frequency-axis vertex budget per history row
+_LUT_SIZE    = 256
+
+
 class Surface(QWidget):
     def __init__(self):
         super().__init__()
@@ -56,8 +61,12 @@ class Surface(QWidget):
         self.max_peak_search_enabled = False
         self.z_scale_min = -100.0
         self.z_scale_max = 0.0
-        self._cmap = Colormap(['blue', 'red'])
+        self._lut = colour_maps.lut('blue_red', _LUT_SIZE)
         self.auto_rotate = False
+        self.max_columns = _MAX_COLUMNS
+        self._column_edges = None   # reduceat start indices, None when not decimating
+        self._live_data = None      # last full-resolution live trace
+        self._topology_dirty = True
 
     @staticmethod
     def _format_freq(freq_mhz: float) -> str:
@@ -76,14 +85,37 @@ class Surface(QWidget):
                 return
             self.frequency_bins = frequency_bins * 1e-6  # Convert Hz to MHz
             self.number_of_points = len(frequency_bins)
-            self.fft_history_array = np.zeros((self.history_depth, self.number_of_points))
-            x = np.linspace(0, 1, self.number_of_points)
-            y = np.linspace(0, 1, self.history_depth)  # row 0 (newest) → y=0 (front)
-            self._mesh_x, self._mesh_y = np.meshgrid(x, y)
+            self._build_topology()
             logging.debug(f"Surface: Updated frequency bins, {self.number_of_points} points")
         else:
             logging.warning("Surface: Frequency bins are None or empty")
 
+    def _build_topology(self) -> None:
+        """Allocate history and x/y mesh for the current bin count and depth.
+
+        When the bin count exceeds ``max_columns`` the frequency axis is
+        split into contiguous groups whose maxima become the mesh columns,
+        so narrow peaks survive decimation.
+        """
+        n = self.number_of_points
+        if n > self.max_columns:
+            self._column_edges = np.linspace(0, n, self.max_columns, endpoint=False).astype(np.intp)
+            ends = np.append(self._column_edges[1:], n)
+            x = (self._column_edges + ends - 1) * 0.5 / max(n - 1, 1)
+        else:
+            self._column_edges = None
+            x = np.linspace(0, 1, n)
+        y = np.linspace(0, 1, self.history_depth)  # row 0 (newest) → y=0 (front)
+        self._mesh_x, self._mesh_y = np.meshgrid(x, y)
+        self.fft_history_array = np.zeros((self.history_depth, len(x)), dtype=np.float32)
+        self._topology_dirty = True
+
+    def _decimate(self, live_data: np.ndarray) -> np.ndarray:
+        """Reduce a full-resolution trace to the mesh column count (peak-preserving)."""
+        if self._column_edges is None:
+            return live_data
+        return np.maximum.reduceat(live_data, self._column_edges)
+
     def set_peak_search_enabled(self, enabled: bool):
         """Enable or disable peak search and update the peak marker."""
         self.peak_search_enabled = enabled
@@ -100,8 +132,8 @@ class Surface(QWidget):
             self.peak_sphere.visible = False
             return
 
-        live_data = self.fft_history_array[0]
-        if len(live_data) == 0 or len(self.frequency_bins) != len(live_data):
+        live_data = self._live_data
+        if live_data is None or len(live_data) == 0 or len(self.frequency_bins) != len(live_data):
             self.annotation_peak_label.text = "Live peak"
             self.annotation_peak_info.text = "N/A"
             self.peak_sphere.visible = False
@@ -165,10 +197,7 @@ class Surface(QWidget):
     def set_history_lines(self, n: int) -> None:
         self.history_depth = n
         if self.number_of_points > 0:
-            self.fft_history_array = np.zeros((self.history_depth, self.number_of_points))
-            x = np.linspace(0, 1, self.number_of_points)
-            y = np.linspace(0, 1, self.history_depth)  # row 0 (newest) → y=0 (front)
-            self._mesh_x, self._mesh_y = np.meshgrid(x, y)
+            self._build_topology()
 
     def toggle_auto_rotate(self) -> None:
         self.auto_rotate = not self.auto_rotate
@@ -187,9 +216,13 @@ class Surface(QWidget):
         if self.fft_history_array is None:
             return
 
+        if len(live_data) != self.number_of_points:
+            return
+        self._live_data = live_data
+
         # Shift history in-place; np.roll would allocate a full copy
         self.fft_history_array[1:] = self.fft_history_array[:-1]
-        self.fft_history_array[0] = live_data
+        self.fft_history_array[0] = self._decimate(np.asarray(live_data, dtype=np.float32))
 
         if self.auto_rotate:
             self.view.camera.azimuth = (self.view.camera.azimuth + 0.1) % 360
@@ -206,13 +239,21 @@ class Surface(QWidget):
             return
 
         if self.z_scale_max == self.z_scale_min:
-            normalised_z_values = np.ones_like(z_values) * 0.5
+            normalised_z_values = np.full(z_values.shape, 0.5, dtype=np.float32)
         else:
-            normalised_z_values = (z_values - self.z_scale_min) / (self.z_scale_max - self.z_scale_min)
-            normalised_z_values = np.clip(normalised_z_values, 0.0, 1.0)
-
-        colours = self._cmap.map(normalised_z_values.flatten())[:, :3]
-        colours = colours.reshape(z_values.shape[0], z_values.shape[1], 3)
-
-        self.surface.set_data(x=self._mesh_x, y=self._mesh_y, z=normalised_z_values)
-        self.surface.mesh_data.set_vertex_colors(colours.reshape(-1, 3))
+            scale = 1.0 / (self.z_scale_max - self.z_scale_min)
+            normalised_z_values = (z_values - self.z_scale_min) * scale
+            np.clip(normalised_z_values, 0.0, 1.0, out=normalised_z_values)
+
+        # Quantise to a uint8 index and gather from the cached colour table
+        lut_idx = np.nan_to_num(normalised_z_values * (_LUT_SIZE - 1)).astype(np.uint8)
+        colours = self._lut[lut_idx]
+
+        if self._topology_dirty:
+            # Faces must exist before vertex colours can be attached
+            self.surface.set_data(x=self._mesh_x, y=self._mesh_y, z=normalised_z_values)
+            self.surface.set_data(colors=colours)
+            self._topology_dirty = False
+        else:
+            # x/y and faces are reused; only z and colours are re-uploaded
+            self.surface.set_data(z=normalised_z_values, colors=colours)
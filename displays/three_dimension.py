@@ -2,7 +2,8 @@ from PyQt6 import QtGui, QtWidgets
 import pyqtgraph.opengl as gl
 import numpy as np
 import logging
-from matplotlib.colors import hsv_to_rgb
+
+from utils import colour_maps
 
 logger = logging.getLogger(__name__)
 
@@ -496,12 +497,7 @@ class ThreeD(QtWidgets.QWidget):
 
         hues = int(self.Z_SCALE * 1.4)
         ind  = (self.Z_SCALE - self.z).astype(np.int32) % hues
-        hsv  = np.stack([ind.astype(np.float32) / hues,
-                         np.ones(len(ind), dtype=np.float32),
-                         np.ones(len(ind), dtype=np.float32)], axis=1)
-        colours = np.empty((len(self.frequency_bins), 4), dtype=np.float32)
-        colours[:, :3] = hsv_to_rgb(hsv).astype(np.float32)
-        colours[:, 3]  = 1.0
+        colours = colour_maps.lut('hsv', hues)[ind]
         self.set_plotdata(0, np.vstack((self.x, self.y, self.z)).T,
                           colours, self.TRACE_WIDTH)
 
@@ -1,7 +1,6 @@
-import collections
 import numpy as np
 from PyQt6.QtWidgets import QWidget, QVBoxLayout
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QRectF
 from PyQt6.QtGui import QLinearGradient, QColor, QBrush
 import pyqtgraph as pg
 import logging
@@ -17,6 +16,10 @@ _TRACE_COLOURS = {
 
 logger = logging.getLogger(__name__)
 
+_PERSIST_DEFAULT_SIZE = (1024, 512)   # raster (width, height) before the view is laid out
+_PERSIST_MAX_SIZE     = 4096
+_PERSIST_FLOOR        = 0.05          # intensity left after `depth` frames
+
 class TwoD(QWidget):
     def __init__(self) -> None:
         super().__init__()
@@ -114,9 +117,15 @@ class TwoD(QWidget):
             name='A-B'
         )
 
-        # Persistence ghost traces
-        self._persist_plots: list = []
-        self._persist_buffer: collections.deque = collections.deque()
+        # Persistence raster — decaying intensity image drawn behind the traces
+        self._persist_img = pg.ImageItem(axisOrder='row-major')
+        self._persist_img.setZValue(-10)
+        self._persist_img.hide()
+        self.plot_widget.addItem(self._persist_img)
+        self._persist_buf: Optional[np.ndarray] = None   # (height, width) float32
+        self._persist_rows: Optional[np.ndarray] = None  # (height, 1) row index column
+        self._persist_extent: Optional[tuple] = None     # (x0, x1, y0, y1) of the raster
+        self._persist_decay: float = 0.0
         self._persist_depth: int = 0
 
         # Colour and fill state
@@ -183,6 +192,7 @@ class TwoD(QWidget):
         r, g, b = self._trace_colour_rgb
         self.live_plot.setPen(pg.mkPen(color=(r, g, b), width=1))
         self._apply_fill()
+        self._persist_img.setLookupTable(self._persistence_lut())
 
     def set_amplitude(self, ref_level: float, range_db: float) -> None:
         """Set the amplitude reference level and range."""
@@ -419,43 +429,109 @@ class TwoD(QWidget):
     _PERSIST_DEPTHS = {"off": 0, "short": 5, "medium": 15, "long": 30}
 
     def set_persistence(self, mode: str) -> None:
-        """Set persistence ghost-trace mode."""
+        """Set persistence mode.
+
+        Persistence is a single decaying raster, so every depth costs the
+        same per frame; the depth only sets the decay rate.
+        """
         new_depth = self._PERSIST_DEPTHS.get(mode, 0)
-        for plot in self._persist_plots:
-            self.plot_widget.removeItem(plot)
-        self._persist_plots.clear()
-        r, g, b = self._trace_colour_rgb
-        for _ in range(new_depth):
-            plot = self.plot_widget.plot(pen=pg.mkPen(color=(r // 2, g // 2, b // 2, 20), width=1))
-            self._persist_plots.append(plot)
         self._persist_depth = new_depth
-        prev = list(self._persist_buffer)[-new_depth:] if new_depth > 0 else []
-        self._persist_buffer = collections.deque(prev, maxlen=max(new_depth, 1))
+        if new_depth == 0:
+            self._persist_buf = None
+            self._persist_extent = None
+            self._persist_img.hide()
+        else:
+            self._persist_decay = _PERSIST_FLOOR ** (1.0 / new_depth)
+            if self._persist_buf is None:
+                self._allocate_persistence()
+            self._persist_img.setLookupTable(self._persistence_lut())
+            self._persist_img.show()
         logger.debug(f"TwoD: Persistence set to {mode} ({new_depth} frames)")
 
+    def _allocate_persistence(self) -> None:
+        """Size the raster to the plot area in screen pixels."""
+        vb = self.plot_widget.getViewBox()
+        w, h = int(vb.width()), int(vb.height())
+        if w < 16 or h < 16:
+            w, h = _PERSIST_DEFAULT_SIZE
+        w, h = min(w, _PERSIST_MAX_SIZE), min(h, _PERSIST_MAX_SIZE)
+        self._persist_buf = np.zeros((h, w), dtype=np.float32)
+        self._persist_rows = np.arange(h, dtype=np.int32)[:, None]
+        self._persist_extent = None
+
+    def _persistence_lut(self) -> np.ndarray:
+        """Transparent → half-brightness trace colour ramp."""
+        r, g, b = self._trace_colour_rgb
+        ramp = np.linspace(0.0, 1.0, 256, dtype=np.float32)
+        lut = np.empty((256, 4), dtype=np.uint8)
+        lut[:, 0] = r // 2
+        lut[:, 1] = g // 2
+        lut[:, 2] = b // 2
+        lut[:, 3] = (ramp * 200).astype(np.uint8)
+        return lut
+
+    def _persistence_extent(self, freq_bins: np.ndarray) -> tuple:
+        """Return the (x0, x1, y0, y1) view-space rectangle the raster covers."""
+        if self.log_freq:
+            positive = freq_bins[freq_bins > 0]
+            x0 = np.log10(positive[0]) if len(positive) > 0 else 0.0
+            x1 = np.log10(max(float(freq_bins[-1]), 1.0))
+        else:
+            x0, x1 = float(freq_bins[0]), float(freq_bins[-1])
+        y0, y1 = self.ref_level - self.range_db, self.ref_level
+        if not self.log_scale:
+            y0, y1 = 10.0 ** (y0 / 10.0), 10.0 ** (y1 / 10.0)
+        return (float(x0), float(x1), float(y0), float(y1))
+
     def _update_persistence(self, freq_bins: np.ndarray, live_data: np.ndarray) -> None:
-        """Render ghost traces from the history buffer, then push the current frame."""
-        n_plots = len(self._persist_plots)
-        if n_plots == 0:
-            return
+        """Decay the raster and stamp the current trace into it.
 
-        buf_list = list(self._persist_buffer)
-        for i, plot in enumerate(self._persist_plots):
-            buf_idx = len(buf_list) - n_plots + i
-            if 0 <= buf_idx < len(buf_list):
-                fraction = i / max(n_plots - 1, 1) if n_plots > 1 else 1.0
-                alpha = int(15 + fraction * 55)
-                r, g, b = self._trace_colour_rgb
-                plot.setPen(pg.mkPen(color=(r // 2, g // 2, b // 2, alpha), width=1))
-                bfreq, bdata = buf_list[buf_idx]
-                if len(bfreq) == len(freq_bins):
-                    plot.setData(bfreq, bdata)
-                else:
-                    plot.setData([], [])
-            else:
-                plot.setData([], [])
+        Each occupied column receives a vertical span covering its own
+        samples plus the last sample of the previous column, so steep edges
+        stay connected.
+        """
+        if self._persist_depth == 0 or self._persist_buf is None or len(freq_bins) < 2:
+            return
 
-        self._persist_buffer.append((freq_bins.copy(), live_data.copy()))
+        buf = self._persist_buf
+        h, w = buf.shape
+        extent = self._persistence_extent(freq_bins)
+        x0, x1, y0, y1 = extent
+        if x1 <= x0 or y1 <= y0:
+            return
+        if extent != self._persist_extent:
+            buf.fill(0.0)
+            self._persist_extent = extent
+            self._persist_img.setRect(QRectF(x0, y0, x1 - x0, y1 - y0))
+
+        x = np.log10(np.maximum(freq_bins, 1e-12)) if self.log_freq else freq_bins
+        y = np.nan_to_num(live_data, nan=y0, posinf=y1, neginf=y0)
+        if len(x) < w:
+            # Sparse trace — resample so every column is occupied
+            cx = x0 + (np.arange(w) + 0.5) * ((x1 - x0) / w)
+            y = np.interp(cx, x, y)
+            cols = np.arange(w)
+        else:
+            cols = ((x - x0) * (w / (x1 - x0))).astype(np.int32)
+            np.clip(cols, 0, w - 1, out=cols)
+        rows = ((y - y0) * (h / (y1 - y0))).astype(np.int32)
+        np.clip(rows, 0, h - 1, out=rows)
+
+        starts = np.flatnonzero(np.diff(cols, prepend=-1))
+        lo = np.minimum.reduceat(rows, starts)
+        hi = np.maximum.reduceat(rows, starts)
+        prev_last = rows[starts[1:] - 1]
+        lo[1:] = np.minimum(lo[1:], prev_last)
+        hi[1:] = np.maximum(hi[1:], prev_last)
+        occupied = cols[starts]
+
+        buf *= self._persist_decay
+        hit = (self._persist_rows >= lo) & (self._persist_rows <= hi)
+        if len(occupied) == w:
+            np.maximum(buf, hit, out=buf)
+        else:
+            buf[:, occupied] = np.maximum(buf[:, occupied], hit)
+        self._persist_img.setImage(buf, autoLevels=False, levels=(0.0, 1.0))
 
     # ------------------------------------------------------------------
     # Marker lines
@@ -538,7 +614,7 @@ class TwoD(QWidget):
 
         live_data = live_power_levels if self.log_scale else 10.0 ** (live_power_levels / 10.0)
 
-        # Persistence ghost traces (rendered before live so live draws on top)
+        # Persistence raster (drawn behind the live trace)
         self._update_persistence(freq_bins, live_data)
 
         # Fill curve (same data as live; brush controls visibility)
@@ -4,6 +4,7 @@ import numpy as np
 import pyqtgraph as pg
 from PyQt6 import QtWidgets
 from PyQt6.QtCore import Qt
+from utils import colour_maps
 import logging
 
 logger = logging.getLogger(__name__)
@@ -59,24 +60,6 @@ class _TimeAxis(pg.AxisItem):
         return out
 
 
-# ── gqrx-style colourmap ───────────────────────────────────────────────────
-
-def _build_gqrx_cmap() -> pg.ColorMap:
-    pos = np.array([0.0, 0.20, 0.40, 0.60, 0.80, 1.0])
-    col = np.array([
-        [  0,   0,   0, 255],
-        [  0,   0, 200, 255],
-        [  0, 200, 200, 255],
-        [200, 200,   0, 255],
-        [200,   0,   0, 255],
-        [255, 255, 255, 255],
-    ], dtype=np.uint8)
-    return pg.ColorMap(pos, col)
-
-
-_GQRX_CMAP = _build_gqrx_cmap()
-
-
 # ── Main widget ────────────────────────────────────────────────────────────
 
 class Waterfall(QtWidgets.QWidget):
@@ -146,9 +129,7 @@ class Waterfall(QtWidgets.QWidget):
 
         # Colourmap
         self._colourmap_name: str   = 'magma'
-        self.colourmap: pg.ColorMap = pg.colormap.get('magma')
-        self._lut:      np.ndarray  = self.colourmap.getLookupTable(nPts=256, mode='byte')
-        self._lut_rgba: np.ndarray  = self.colourmap.getLookupTable(nPts=256, alpha=True)
+        self._lut:      np.ndarray  = colour_maps.lut_u8('magma')
         self.image_item.setLookupTable(self._lut)
         self.image_item.setLevels((self.wf_min_db, self.wf_max_db))
 
@@ -255,11 +236,8 @@ class Waterfall(QtWidgets.QWidget):
 
     def set_colourmap(self, name: str) -> None:
         try:
-            cmap = _GQRX_CMAP if name == 'gqrx' else pg.colormap.get(name)
+            self._lut = colour_maps.lut_u8(name)
             self._colourmap_name = name
-            self.colourmap  = cmap
-            self._lut       = cmap.getLookupTable(nPts=256, mode='byte')
-            self._lut_rgba  = cmap.getLookupTable(nPts=256, alpha=True)
             self.image_item.setLookupTable(self._lut)
         except Exception as e:
             logger.warning(f"Waterfall: colourmap '{name}' failed: {e}")
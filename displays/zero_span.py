@@ -6,18 +6,20 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_PIXELS = 1024   # envelope width before the view has been laid out
+
 
 class ZeroSpan(QWidget):
     def __init__(self) -> None:
         super().__init__()
         self.plot_widget = pg.PlotWidget()
         self.plot_widget.setBackground('k')
-        self.plot_widget.setLabel('left', 'Amplitude')
+        self.plot_widget.setLabel('left', 'Power', units='dBm')
         self.plot_widget.setLabel('bottom', 'Time', units='s')
         self.plot_widget.showGrid(x=True, y=True)
         self.plot_widget.setMouseEnabled(x=True, y=True)
 
-        self.live_plot = self.plot_widget.plot(pen=pg.mkPen('g', width=1), name='Signal')
+        self.live_plot = self.plot_widget.plot(pen=pg.mkPen('g', width=1), name='Power')
 
         # Draggable trigger level line — shown in triggered modes
         self._trigger_line: Optional[pg.InfiniteLine] = None
@@ -52,6 +54,11 @@ class ZeroSpan(QWidget):
         if self._trigger_mode != "free_run":
             self._show_trigger_line(True)
 
+    def pixel_width(self) -> int:
+        """Width of the plot area in screen pixels (envelope resolution)."""
+        w = int(self.plot_widget.getViewBox().width())
+        return w if w >= 16 else _DEFAULT_PIXELS
+
     def update_zero_span_data(self, time_s: np.ndarray, samples: np.ndarray) -> None:
         if len(time_s) == 0:
             return
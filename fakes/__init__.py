@@ -0,0 +1,53 @@
+"""Timing-accurate stand-ins for the radio hardware.
+
+The modules here replace the device libraries the real sources import —
+``hackrf``, ``rtlsdr`` and ``sounddevice`` — and ``bin/`` holds fake
+``hackrf_sweep``, ``hackrf_info`` and ``rtl_tcp`` executables.  Reads block for the time
+the samples would take to arrive, so the unmodified source classes can be
+benchmarked and stress-tested on a machine with no radio attached.
+
+Call ``install()`` before the sources are used (main.py does so when
+``TDNSA_FAKE_DEVICES`` is set).
+"""
+
+import os
+import sys
+from pathlib import Path
+
+BIN_DIR = Path(__file__).resolve().parent / "bin"
+
+# library module -> (fake module, module-level names the sources bind)
+_LIBRARIES = {
+    'hackrf':      ('fakes.hackrf',      {'datasources.hackrf_samples': ('HackRF', '_HACKRF_AVAILABLE')}),
+    'rtlsdr':      ('fakes.rtlsdr',      {'datasources.rtl_samples': ('RtlSdr', '_RTL_AVAILABLE'),
+                                          'datasources.rtl_sweep':   ('RtlSdr', '_RTL_AVAILABLE')}),
+    'sounddevice': ('fakes.sounddevice', {'datasources.audio_samples': ('sd', None)}),
+}
+
+
+def install(libraries=('hackrf', 'rtlsdr', 'sounddevice'), sweep_tools: bool = True) -> None:
+    """Route the device libraries and sweep tools to the fakes.
+
+    Source modules already imported are rebound as well, so the order of
+    imports does not matter.
+
+    Args:
+        libraries:   Library module names to replace.
+        sweep_tools: Put the fake ``hackrf_sweep`` and ``hackrf_info`` first on PATH.
+    """
+    import importlib
+    for name in libraries:
+        fake_name, users = _LIBRARIES[name]
+        fake = importlib.import_module(fake_name)
+        sys.modules[name] = fake
+        for module_name, (attr, flag) in users.items():
+            module = sys.modules.get(module_name)
+            if module is None:
+                continue
+            setattr(module, attr, fake if attr == 'sd' else getattr(fake, attr))
+            if flag:
+                setattr(module, flag, True)
+    if sweep_tools:
+        path = os.environ.get("PATH", "")
+        if not path.startswith(str(BIN_DIR)):
+            os.environ["PATH"] = os.pathsep.join([str(BIN_DIR), path]) if path else str(BIN_DIR)
@@ -0,0 +1,63 @@
+"""Stand-in for the ``hackrf`` Python bindings (libhackrf).
+
+Provides the subset of ``hackrf.HackRF`` used by HackrfSamplesDataSource.
+``read_samples`` blocks for the real streaming time of the samples it
+returns and delivers 8-bit quantised IQ normalised to ±1, like the real
+bindings.  The most recently opened device is available as
+``HackRF.last_device`` so tests can inject faults into it.
+"""
+
+import numpy as np
+
+from .rf import StreamingReceiver
+
+_MIN_RATE = 2e6
+_MAX_RATE = 20e6
+_MIN_FREQ = 1e6
+_MAX_FREQ = 6e9
+_AMP_GAIN_DB = 14.0
+
+
+class HackRF(StreamingReceiver):
+    FIFO_SAMPLES = 1 << 20             # libhackrf: 15 transfers of 128 K samples
+    TRANSFER_SAMPLES = 1 << 17
+    SETTLE_S = 0.0005
+
+    last_device = None
+
+    def __init__(self, device_index: int = 0):
+        super().__init__(seed=device_index)
+        self.rate = 10e6
+        self.lna_gain = 16
+        self.vga_gain = 20
+        self.amp = False
+        HackRF.last_device = self
+
+    def set_sample_rate(self, rate: float) -> None:
+        if not _MIN_RATE <= rate <= _MAX_RATE:
+            raise IOError(f"HACKRF_ERROR_INVALID_PARAM: sample rate {rate}")
+        self._set_rate(rate)
+
+    def set_freq(self, freq: float) -> None:
+        if not _MIN_FREQ <= freq <= _MAX_FREQ:
+            raise IOError(f"HACKRF_ERROR_INVALID_PARAM: frequency {freq}")
+        self._retune(freq)
+
+    def set_lna_gain(self, gain: int) -> None:
+        self.lna_gain = int(gain) // 8 * 8          # 0–40 dB in 8 dB steps
+        self.lna_gain = min(max(self.lna_gain, 0), 40)
+
+    def set_vga_gain(self, gain: int) -> None:
+        self.vga_gain = min(max(int(gain) // 2 * 2, 0), 62)
+
+    def enable_amp(self) -> None:
+        self.amp = True
+
+    def disable_amp(self) -> None:
+        self.amp = False
+
+    def _gain_db(self) -> float:
+        return self.lna_gain + self.vga_gain + (_AMP_GAIN_DB if self.amp else 0.0)
+
+    def read_samples(self, num_samples: int) -> np.ndarray:
+        return self._read(int(num_samples))
@@ -0,0 +1,204 @@
+"""The shared fake RF environment.
+
+Every fake device sees the same small set of carriers at fixed absolute
+frequencies, so a tone found by the fake HackRF at 433.92 MHz is also in
+the fake ``hackrf_sweep`` output and retuning moves it across the band
+exactly as a real signal would.  Levels are dBFS at the reference gain;
+each device scales them by its own gain setting.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+# (frequency Hz, level dBFS at the reference gain, occupied width Hz)
+CARRIERS = (
+    (98.5e6,    -30.0, 200e3),     # FM broadcast
+    (100.0e6,   -20.0, 0.0),       # test carrier
+    (145.5e6,   -45.0, 0.0),
+    (433.92e6,  -25.0, 0.0),
+    (868.3e6,   -40.0, 0.0),
+    (1090.0e6,  -35.0, 2e6),       # ADS-B
+    (2437.0e6,  -40.0, 20e6),      # Wi-Fi channel 6
+)
+NOISE_FLOOR_DBFS = -70.0           # complex noise power per sample at the reference gain
+REFERENCE_GAIN_DB = 40.0
+
+_NOISE_BANK = 1 << 18
+_SWEEP_AVERAGES = 16
+_TONE_BLOCK = 512
+
+
+class IQRenderer:
+    """Renders the carriers seen by a receiver tuned to ``centre`` at ``rate``.
+
+    Phase is continuous across calls because every sample is rendered at its
+    absolute index in the stream.  Noise comes from a pre-generated bank read
+    at a random offset, so rendering stays cheap at 20 MS/s.
+    """
+
+    def __init__(self, seed=None):
+        rng = np.random.default_rng(seed)
+        sigma = np.sqrt(10 ** (NOISE_FLOOR_DBFS / 10) / 2)
+        self._noise = (rng.normal(0, sigma, _NOISE_BANK)
+                       + 1j * rng.normal(0, sigma, _NOISE_BANK)).astype(np.complex64)
+        self._rng = rng
+
+    def render(self, centre: float, rate: float, start: int, n: int,
+               gain_db: float = REFERENCE_GAIN_DB) -> np.ndarray:
+        """Complex baseband samples ``start .. start + n`` of the stream."""
+        offset = int(self._rng.integers(0, _NOISE_BANK - n)) if n < _NOISE_BANK else 0
+        out = np.resize(self._noise[offset:], n).astype(np.complex64)
+        for freq, level, _width in CARRIERS:
+            delta = freq - centre
+            if abs(delta) >= rate / 2:
+                continue
+            out += np.float32(10 ** (level / 20)) * _tone(2 * np.pi * delta / rate, start, n)
+        out *= np.float32(10 ** ((gain_db - REFERENCE_GAIN_DB) / 20))
+        return out
+
+
+def _tone(step: float, start: int, n: int) -> np.ndarray:
+    """``exp(1j * step * k)`` for ``k = start .. start + n``, as complex64.
+
+    Built as the outer product of one block of phasors and the phasor at
+    each block's start, so only ``n / _TONE_BLOCK + _TONE_BLOCK`` complex
+    exponentials are evaluated: cheap enough to keep up with 20 MS/s.
+    """
+    inner = np.exp(1j * step * np.arange(_TONE_BLOCK))
+    outer = np.exp(1j * step * (start + _TONE_BLOCK * np.arange(-(-n // _TONE_BLOCK), dtype=np.float64)))
+    return (outer[:, None] * inner[None, :]).ravel()[:n].astype(np.complex64)
+
+
+def quantise(iq: np.ndarray, bits: int = 8) -> np.ndarray:
+    """Clip and quantise to a ``bits``-bit ADC, as the real front ends do."""
+    full = float(2 ** (bits - 1) - 1)
+    re = np.clip(np.round(iq.real * full), -full, full)
+    im = np.clip(np.round(iq.imag * full), -full, full)
+    return ((re + 1j * im) / full).astype(np.complex64)
+
+
+def power_spectrum_db(freqs: np.ndarray, bin_width: float, rng: np.random.Generator,
+                      gain_db: float = REFERENCE_GAIN_DB) -> np.ndarray:
+    """Per-bin power in dB as a sweeping receiver would report it."""
+    # Sweeping tools average many FFT frames per bin, so the noise estimate
+    # is gamma distributed with a spread of about 1 dB rather than exponential
+    noise = 10 ** (NOISE_FLOOR_DBFS / 10) * rng.gamma(_SWEEP_AVERAGES, 1 / _SWEEP_AVERAGES, len(freqs))
+    power = noise.astype(np.float64)
+    for freq, level, width in CARRIERS:
+        if width > 0:
+            inside = np.abs(freqs - freq) <= width / 2
+            power[inside] += 10 ** (level / 10) * min(bin_width / width, 1.0)
+        else:
+            nearest = int(np.argmin(np.abs(freqs - freq)))
+            if abs(freqs[nearest] - freq) <= bin_width / 2:
+                power[nearest] += 10 ** (level / 10)
+    return 10 * np.log10(power) + (gain_db - REFERENCE_GAIN_DB)
+
+
+class StreamingReceiver:
+    """Timing model shared by the fake HackRF and RTL-SDR.
+
+    The ADC is modelled as running continuously from the first read into a
+    FIFO of ``FIFO_SAMPLES``.  A read returns the oldest unread samples and
+    blocks until the USB transfer holding its last sample has completed, so
+    latency comes in ``TRANSFER_SAMPLES`` quanta as on the real hardware.  A
+    reader that falls more than a FIFO behind loses the oldest samples
+    (``overruns`` counts them).  After a retune the next ``SETTLE_S`` of
+    samples are still at the old frequency while the PLL locks.  The time
+    spent synthesising a read is not counted as host delay before a retune,
+    so a reader that retunes straight after a read sees the staleness the
+    real device would.
+
+    Fault injection, for stress tests:
+        fail_reads  the next N reads raise IOError
+        stall       reads block until ``close()`` is called
+    """
+
+    FIFO_SAMPLES = 1 << 20
+    TRANSFER_SAMPLES = 1 << 17
+    SETTLE_S = 0.001
+    BITS = 8
+
+    def __init__(self, seed=None):
+        self.centre = 100e6
+        self.rate = 2e6
+        self.fail_reads = 0
+        self.stall = False
+        self.overruns = 0
+        self.reads = 0
+        self.closed = False
+        self._renderer = IQRenderer(seed)
+        self._closed_event = threading.Event()
+        self._t0 = None
+        self._index = 0
+        self._old_centre = None
+        self._settled_at = 0
+        self._ready_index = 0              # stream position when the last read's transfer completed
+        self._returned_at = 0.0
+
+    # ------------------------------------------------------------------
+    # Configuration
+    # ------------------------------------------------------------------
+
+    def _set_rate(self, rate: float) -> None:
+        self.rate = float(rate)
+        self._t0 = None                    # a rate change restarts the stream
+
+    def _retune(self, centre: float) -> None:
+        if self._t0 is not None and centre != self.centre:
+            now = time.monotonic()
+            captured = min(int((now - self._t0) * self.rate),
+                           self._ready_index + int((now - self._returned_at) * self.rate))
+            self._old_centre = self.centre
+            self._settled_at = captured + int(self.SETTLE_S * self.rate)
+        self.centre = float(centre)
+
+    def _gain_db(self) -> float:
+        return REFERENCE_GAIN_DB
+
+    # ------------------------------------------------------------------
+    # Streaming
+    # ------------------------------------------------------------------
+
+    def _read(self, n: int) -> np.ndarray:
+        if self.closed:
+            raise IOError("device closed")
+        if self.fail_reads > 0:
+            self.fail_reads -= 1
+            raise IOError("USB transfer error")
+        if self.stall:
+            self._closed_event.wait()
+            raise IOError("device closed during read")
+        if self._t0 is None:
+            self._t0 = time.monotonic()
+            self._index = 0
+            self._old_centre = None
+        captured = int((time.monotonic() - self._t0) * self.rate)
+        if captured - self._index > self.FIFO_SAMPLES:
+            skip = captured - self.FIFO_SAMPLES - self._index
+            self.overruns += skip
+            self._index += skip
+        start = self._index
+        end = start + n
+        need = -(-end // self.TRANSFER_SAMPLES) * self.TRANSFER_SAMPLES
+        delay = self._t0 + need / self.rate - time.monotonic()
+        if delay > 0 and self._closed_event.wait(delay):
+            raise IOError("device closed during read")
+        self._index = end
+        self.reads += 1
+        ready = max(need, int((time.monotonic() - self._t0) * self.rate))
+
+        gain = self._gain_db()
+        iq = self._renderer.render(self.centre, self.rate, start, n, gain)
+        if self._old_centre is not None and start < self._settled_at:
+            stale = min(self._settled_at - start, n)
+            iq[:stale] = self._renderer.render(self._old_centre, self.rate, start, stale, gain)
+        iq = quantise(iq, self.BITS)
+        self._ready_index, self._returned_at = ready, time.monotonic()
+        return iq
+
+    def close(self) -> None:
+        self.closed = True
+        self._closed_event.set()
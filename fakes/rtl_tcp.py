@@ -0,0 +1,152 @@
+"""Fake ``rtl_tcp`` server.
+
+Serves the fake RTL-SDR from ``fakes.rtlsdr`` over the rtl_tcp protocol, so
+the rtl_tcp source can be tested against a local stand-in.  Like the real
+server it takes one client at a time, sends the 12-byte ``RTL0`` header
+(an R820T with 29 gain steps) and then streams unsigned 8-bit IQ at the
+real sample rate.  Commands arrive on a separate thread and are applied
+between reads, so a retune takes effect within one transfer; every command
+received is kept in ``commands`` for tests to inspect.
+
+Run ``fakes/bin/rtl_tcp -a 127.0.0.1 -p 1234`` for a standalone server.
+"""
+
+import argparse
+import socket
+import struct
+import sys
+import threading
+from collections import deque
+
+import numpy as np
+
+from .rtlsdr import RtlSdr
+
+_HEADER = struct.Struct(">4sII")
+_COMMAND = struct.Struct(">BI")
+_TUNER_R820T = 5
+_R820T_GAINS = 29
+_CHUNK_SAMPLES = 1 << 14
+
+
+def _to_cu8(iq: np.ndarray) -> bytes:
+    out = np.empty(2 * len(iq), dtype=np.float32)
+    out[0::2] = iq.real
+    out[1::2] = iq.imag
+    return np.clip(np.round(out * 127.5 + 127.5), 0, 255).astype(np.uint8).tobytes()
+
+
+class RtlTcpServer:
+    """One-client-at-a-time rtl_tcp server in a background thread.
+
+    Args:
+        host:         Address to listen on.
+        port:         TCP port; 0 picks a free one (see ``address``).
+        device_index: Fake dongle to open for each client.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 1234, device_index: int = 0):
+        self.device_index = device_index
+        self.commands: list = []           # (command, value) in arrival order
+        self.clients = 0
+        self.device = None
+        self._listener = socket.create_server((host, port))
+        self.address = self._listener.getsockname()[:2]
+        self._pending = deque()
+        self._stop_event = threading.Event()
+        self._client = None
+        self._thread = threading.Thread(target=self._serve, name="FakeRtlTcp", daemon=True)
+        self._thread.start()
+
+    def _serve(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                break
+            self.clients += 1
+            self._client = conn
+            try:
+                self._stream(conn)
+            except OSError:
+                pass
+            finally:
+                conn.close()
+                self._client = None
+
+    def _stream(self, conn) -> None:
+        device = RtlSdr(self.device_index)
+        device.sample_rate = 2.048e6
+        self.device = device
+        self._pending.clear()
+        conn.sendall(_HEADER.pack(b"RTL0", _TUNER_R820T, _R820T_GAINS))
+        reader = threading.Thread(target=self._read_commands, args=(conn,), daemon=True)
+        reader.start()
+        try:
+            while not self._stop_event.is_set() and reader.is_alive():
+                while self._pending:
+                    self._apply(device, *self._pending.popleft())
+                conn.sendall(_to_cu8(device.read_samples(_CHUNK_SAMPLES)))
+        finally:
+            device.close()
+
+    def _read_commands(self, conn) -> None:
+        buf = b""
+        while True:
+            try:
+                chunk = conn.recv(64)
+            except OSError:
+                return
+            if not chunk:
+                return
+            buf += chunk
+            while len(buf) >= _COMMAND.size:
+                command = _COMMAND.unpack(buf[:_COMMAND.size])
+                buf = buf[_COMMAND.size:]
+                self.commands.append(command)
+                self._pending.append(command)
+
+    @staticmethod
+    def _apply(device, command: int, value: int) -> None:
+        try:
+            if command == 0x01:
+                device.center_freq = value
+            elif command == 0x02:
+                device.sample_rate = value
+            elif command == 0x03 and value == 0:
+                device.gain = 'auto'
+            elif command == 0x04:
+                device.gain = struct.unpack(">i", struct.pack(">I", value))[0] / 10
+        except IOError as e:
+            print(f"rtl_tcp: {e}", file=sys.stderr)     # the real server logs and carries on
+
+    def drop_client(self) -> None:
+        """Close the current connection, as a network fault would."""
+        conn = self._client
+        if conn is not None:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        self._stop_event.set()
+        self.drop_client()
+        self._listener.close()
+        self._thread.join(timeout=2.0)
+
+
+def main(argv) -> int:
+    parser = argparse.ArgumentParser(prog="rtl_tcp")
+    parser.add_argument("-a", dest="address", default="127.0.0.1")
+    parser.add_argument("-p", dest="port", type=int, default=1234)
+    parser.add_argument("-d", dest="device", type=int, default=0)
+    args = parser.parse_args(argv)
+    server = RtlTcpServer(args.address, args.port, args.device)
+    print(f"listening on {server.address[0]}:{server.address[1]}", file=sys.stderr)
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        pass
+    server.close()
+    return 0
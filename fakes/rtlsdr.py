@@ -0,0 +1,98 @@
+"""Stand-in for ``pyrtlsdr``.
+
+Provides the subset of ``rtlsdr.RtlSdr`` used by the RTL sources.  The
+sample rate is quantised by the RTL2832 resampler formula, so the value read
+back differs slightly from the one requested, and the FIFO is small: a slow
+reader sees only the last few milliseconds, as with synchronous reads on
+the real dongle.  ``read_samples`` returns complex128 like pyrtlsdr.
+
+``read_samples_async`` streams into the callback until ``cancel_read_async``
+is called, with librtlsdr's pool of 15 transfers of ``num_samples`` as the
+FIFO instead.
+"""
+
+import threading
+
+import numpy as np
+
+from .rf import StreamingReceiver
+
+_XTAL = 28.8e6
+_VALID_RATES = ((225_001, 300_000), (900_001, 3_200_000))
+_MIN_FREQ = 24e6
+_MAX_FREQ = 1766e6
+_AUTO_GAIN_DB = 30.0
+
+
+class RtlSdr(StreamingReceiver):
+    FIFO_SAMPLES = 8192
+    TRANSFER_SAMPLES = 256             # 512-byte bulk packets
+    SETTLE_S = 0.001
+    ASYNC_BUFFERS = 15                 # librtlsdr's default transfer pool
+
+    last_device = None
+
+    def __init__(self, device_index: int = 0, serial_number=None):
+        super().__init__(seed=100 + device_index)
+        self.rate = 2.048e6
+        self._gain = 'auto'
+        self.serial_number = serial_number or f"{device_index:08d}"
+        self._async_cancel = threading.Event()
+        RtlSdr.last_device = self
+
+    # ------------------------------------------------------------------
+    # Properties mirrored from pyrtlsdr
+    # ------------------------------------------------------------------
+
+    @property
+    def sample_rate(self) -> float:
+        return self.rate
+
+    @sample_rate.setter
+    def sample_rate(self, rate: float) -> None:
+        if not any(lo <= rate <= hi for lo, hi in _VALID_RATES):
+            raise IOError(f"Error code -22 when setting sample rate to {rate} Hz")
+        ratio = int(_XTAL * (1 << 22) / rate) & 0x0FFFFFFC
+        self._set_rate(_XTAL * (1 << 22) / ratio)
+
+    @property
+    def center_freq(self) -> float:
+        return self.centre
+
+    @center_freq.setter
+    def center_freq(self, freq: float) -> None:
+        if not _MIN_FREQ <= freq <= _MAX_FREQ:
+            raise IOError(f"Error code -22 when setting center frequency to {freq} Hz")
+        self._retune(float(int(freq)))
+
+    @property
+    def gain(self):
+        return self._gain
+
+    @gain.setter
+    def gain(self, value) -> None:
+        self._gain = value
+
+    def get_sample_rate(self) -> float:
+        return self.sample_rate
+
+    def get_center_freq(self) -> float:
+        return self.center_freq
+
+    def _gain_db(self) -> float:
+        return _AUTO_GAIN_DB if self._gain == 'auto' else float(self._gain)
+
+    def read_samples(self, num_samples: int = 131072) -> np.ndarray:
+        return self._read(int(num_samples)).astype(np.complex128)
+
+    def read_samples_async(self, callback, num_samples: int = 131072, context=None) -> None:
+        self._async_cancel.clear()
+        self.FIFO_SAMPLES = self.ASYNC_BUFFERS * int(num_samples)
+        try:
+            while not self._async_cancel.is_set():
+                callback(self.read_samples(num_samples), context)
+        finally:
+            del self.FIFO_SAMPLES
+
+    def cancel_read_async(self) -> None:
+        self._async_cancel.set()
@@ -0,0 +1,103 @@
+"""Stand-in for ``sounddevice``.
+
+``query_devices`` reports one stereo input and ``InputStream.read`` blocks
+until the requested frames have been captured in real time.  The left
+channel carries a 1 kHz tone and the right a 3 kHz tone over white noise.
+A reader that falls more than ``InputStream.BUFFER_FRAMES`` behind loses
+the oldest frames and the next read reports ``overflowed``, as PortAudio
+does.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+LEFT_TONE_HZ = 1000.0
+RIGHT_TONE_HZ = 3000.0
+_TONE_AMPLITUDE = 0.25
+_NOISE_RMS = 1e-3
+
+_DEVICE = {
+    'name':                     "Fake stereo input",
+    'index':                    0,
+    'hostapi':                  0,
+    'max_input_channels':       2,
+    'max_output_channels':      0,
+    'default_samplerate':       48000.0,
+    'default_low_input_latency': 0.01,
+}
+
+
+class PortAudioError(Exception):
+    pass
+
+
+def query_devices(device=None, kind=None):
+    if kind not in (None, 'input'):
+        raise PortAudioError(f"No default {kind} device")
+    return dict(_DEVICE)
+
+
+class InputStream:
+    BUFFER_FRAMES = 1 << 15
+
+    def __init__(self, samplerate=None, blocksize=None, device=None, channels=None,
+                 dtype=None, **kwargs):
+        self.samplerate = float(samplerate or _DEVICE['default_samplerate'])
+        self.channels = int(channels or 1)
+        if self.channels > _DEVICE['max_input_channels']:
+            raise PortAudioError("Invalid number of channels")
+        self.blocksize = blocksize or 0
+        self.dtype = np.dtype(dtype or np.float32)
+        self.active = False
+        self.closed = False
+        self.overflows = 0
+        self._t0 = None
+        self._index = 0
+        self._rng = np.random.default_rng(0)
+        self._closed_event = threading.Event()
+
+    def start(self) -> None:
+        if self.closed:
+            raise PortAudioError("Stream is closed")
+        self._t0 = time.monotonic()
+        self._index = 0
+        self.active = True
+
+    def stop(self) -> None:
+        self.active = False
+
+    def close(self) -> None:
+        self.active = False
+        self.closed = True
+        self._closed_event.set()
+
+    def read(self, frames: int):
+        if not self.active:
+            raise PortAudioError("Stream is stopped")
+        captured = int((time.monotonic() - self._t0) * self.samplerate)
+        overflowed = captured - self._index > self.BUFFER_FRAMES
+        if overflowed:
+            self.overflows += 1
+            self._index = captured - self.BUFFER_FRAMES
+        start = self._index
+        self._index += frames
+        delay = self._t0 + self._index / self.samplerate - time.monotonic()
+        if delay > 0 and self._closed_event.wait(delay):
+            raise PortAudioError("Stream closed during read")
+
+        t = np.arange(start, start + frames) / self.samplerate
+        data = self._rng.normal(0.0, _NOISE_RMS, (frames, self.channels))
+        data[:, 0] += _TONE_AMPLITUDE * np.sin(2 * np.pi * LEFT_TONE_HZ * t)
+        if self.channels > 1:
+            data[:, 1] += _TONE_AMPLITUDE * np.sin(2 * np.pi * RIGHT_TONE_HZ * t)
+        return data.astype(self.dtype), overflowed
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        self.close()
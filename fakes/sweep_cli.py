@@ -0,0 +1,156 @@
+"""Fake ``hackrf_sweep`` command-line tool.
+
+The executable in ``fakes/bin`` calls this function.  It accepts the
+options the sweep source passes, prints CSV in the real tool's format and
+paces its output at a realistic rate: it tunes in 20 MHz steps at about
+8 GHz/s, printing two 5 MHz lines per tuning in the interleaved order of
+the real tool, and reports ``N total sweeps completed, X sweeps/second``
+on stderr once a second.
+
+Three devices are attached: ``hackrf_info`` lists their serial numbers and
+``hackrf_sweep -d SERIAL`` opens one of them.  Each reads a few dB off
+the others, as uncalibrated radios do (``HACKRF_LEVEL_OFFSETS_DB``).
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from .rf import power_spectrum_db
+
+_HACKRF_RATE = 20e6
+_HACKRF_TUNE_STEP = 20e6
+_HACKRF_HZ_PER_S = 8e9             # sweep speed of the real tool
+_HACKRF_AMP_DB = 14.0
+
+HACKRF_SERIALS = (
+    "0000000000000000457863dc2f1e4a5b",
+    "0000000000000000457863dc2f2b7c11",
+    "0000000000000000660062dc3a4d9e07",
+)
+HACKRF_LEVEL_OFFSETS_DB = (0.0, 3.0, -2.0)    # each device's reading error
+
+
+def _fmt_row(values: np.ndarray) -> str:
+    return ", ".join(["%.2f"] * len(values)) % tuple(values)
+
+
+def _emit(text: str) -> bool:
+    """Write to stdout; False once the reader has gone."""
+    try:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+        return True
+    except (BrokenPipeError, ValueError):
+        return False
+
+
+# ------------------------------------------------------------------
+# hackrf_info
+# ------------------------------------------------------------------
+
+def hackrf_info(argv) -> int:
+    print("hackrf_info version: 2023.01.1")
+    print("libhackrf version: 2023.01.1 (0.8)")
+    for index, serial in enumerate(HACKRF_SERIALS):
+        print("Found HackRF")
+        print(f"Index: {index}")
+        print(f"Serial number: {serial}")
+        print("Board ID Number: 2 (HackRF One)")
+        print("Firmware Version: 2023.01.1 (API:1.07)")
+        print("")
+    return 0
+
+
+# ------------------------------------------------------------------
+# hackrf_sweep
+# ------------------------------------------------------------------
+
+def _hackrf_lines(f_min: float, f_max: float, fft_size: int):
+    """(low, high, centre frequencies of the bins) for one sweep, in output order."""
+    quarter = _HACKRF_RATE / 4
+    bins = fft_size // 4
+    width = _HACKRF_RATE / fft_size
+    lines = []
+    f = f_min
+    while f < f_max:
+        for offset in (0.0, 2 * quarter, quarter, 3 * quarter):
+            low = f + offset
+            lines.append((low, low + quarter, low + (np.arange(bins) + 0.5) * width))
+        f += _HACKRF_TUNE_STEP
+    return lines
+
+
+def hackrf_sweep(argv) -> int:
+    parser = argparse.ArgumentParser(prog="hackrf_sweep")
+    parser.add_argument("-f", action="append", default=[], help="freq_min:freq_max in MHz")
+    parser.add_argument("-a", type=int, default=0)
+    parser.add_argument("-l", type=int, default=16)
+    parser.add_argument("-g", type=int, default=20)
+    parser.add_argument("-w", type=float, default=1e6)
+    parser.add_argument("-N", type=int, default=0)
+    parser.add_argument("-1", dest="one_shot", action="store_true")
+    parser.add_argument("-d", default=None)
+    args = parser.parse_args(argv)
+    if args.d is not None and args.d not in HACKRF_SERIALS:
+        print("hackrf_open() failed: HACKRF_ERROR_NOT_FOUND (-5)", file=sys.stderr)
+        return 1
+    device = HACKRF_SERIALS.index(args.d) if args.d else 0
+
+    ranges = []
+    for spec in args.f or ["0:6000"]:
+        lo, hi = (float(v) * 1e6 for v in spec.split(":"))
+        steps = max(int(np.ceil((hi - lo) / _HACKRF_TUNE_STEP)), 1)
+        ranges.append((lo, lo + steps * _HACKRF_TUNE_STEP))
+    fft_size = int(min(max(round(_HACKRF_RATE / args.w), 4), 8180)) // 4 * 4
+    width = _HACKRF_RATE / fft_size
+    gain_db = (args.l // 8 * 8 + args.g // 2 * 2 + (_HACKRF_AMP_DB if args.a else 0.0)
+               + HACKRF_LEVEL_OFFSETS_DB[device])
+    limit = 1 if args.one_shot else args.N
+
+    lines = [line for lo, hi in ranges for line in _hackrf_lines(lo, hi, fft_size)]
+    freqs = np.concatenate([centres for _, _, centres in lines])
+    bins = fft_size // 4
+    sweep_time = sum(hi - lo for lo, hi in ranges) / _HACKRF_HZ_PER_S
+    rng = np.random.default_rng()
+
+    print(f"call hackrf_sample_rate_set({_HACKRF_RATE / 1e6:.3f} MHz)", file=sys.stderr)
+    print(f"Sweeping from {ranges[0][0] / 1e6:.0f} MHz to {ranges[-1][1] / 1e6:.0f} MHz",
+          file=sys.stderr, flush=True)
+
+    total = 0
+    window_start, window_sweeps = time.monotonic(), 0
+    due = time.monotonic()
+    try:
+        while not limit or total < limit:
+            now = datetime.now()
+            stamp = now.strftime("%Y-%m-%d, %H:%M:%S.%f")
+            power = power_spectrum_db(freqs, width, rng, gain_db)
+            out = []
+            for k, (low, high, _) in enumerate(lines):
+                row = power[k * bins:(k + 1) * bins]
+                out.append(f"{stamp}, {int(low)}, {int(high)}, {width:.2f}, {fft_size}, "
+                           f"{_fmt_row(row)}\n")
+            if not _emit("".join(out)):
+                return 0
+            total += 1
+            window_sweeps += 1
+
+            due += sweep_time
+            t = time.monotonic()
+            if due > t:
+                time.sleep(due - t)
+            else:
+                due = t                    # running slower than real time
+            if t - window_start >= 1.0:
+                rate = window_sweeps / (t - window_start)
+                print(f"{total} total sweeps completed, {rate:.2f} sweeps/second",
+                      file=sys.stderr, flush=True)
+                window_start, window_sweeps = t, 0
+    except KeyboardInterrupt:
+        pass
+    print(f"Total sweeps: {total}", file=sys.stderr)
+    return 0
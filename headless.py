@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Headless acquisition daemon.
+
+Runs a source from a saved preset through the analyser's DSP pipeline with
+no display and no Qt, writing frames, peaks and events to a directory,
+a local socket, a TCP frame server for remote viewers and/or a
+shared-memory ring for other processes on the host, optionally taking
+SCPI-like measurement commands over TCP:
+
+    python3 headless.py --preset "2.4 GHz" --output /var/lib/tdnsa/run1
+    python3 headless.py --preset 8 --socket /run/tdnsa.sock --report 30
+    python3 headless.py --preset 8 --serve 0.0.0.0:5299
+    python3 headless.py --preset 8 --shm
+    python3 headless.py --preset 8 --scpi 5025
+
+The sustained frame rate is logged as an event every ``--report`` seconds
+and printed when the run ends.  Stop with Ctrl+C or SIGTERM.
+"""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+
+if os.environ.get("TDNSA_FAKE_DEVICES", "0") not in ("", "0"):
+    import fakes
+    fakes.install()
+
+from core.command_server import CommandServer
+from core.frame_server import FrameServer, ENCODINGS
+from core.headless import HeadlessAnalyser, DirectorySink, SocketSink, load_preset
+from datasources.network_source import parse_address
+from utils.frame_ring import FrameRing, DEFAULT_NAME as FRAME_RING_NAME
+
+_log_level = getattr(logging, os.environ.get("LOGLEVEL", "WARNING").upper(), logging.WARNING)
+logging.basicConfig(level=_log_level,
+                    format="%(asctime)s - %(levelname)s - %(message)s")
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description="Top Dog spectrum analyser, headless")
+    parser.add_argument("--preset", required=True, help="preset slot number or name")
+    parser.add_argument("--presets", default=None, help="presets file (default: the GUI's)")
+    parser.add_argument("--source", default=None, help="override the preset's source type")
+    parser.add_argument("--file", default=None, help="recording for iq_file / sweep_file sources")
+    parser.add_argument("--bands", default=None, metavar="LO:HI[,LO:HI...]",
+                        help="hackrf_sweep only these bands, in MHz (e.g. 433:435,863:870)")
+    parser.add_argument("--output", default=None, help="directory for frames, peaks and events")
+    parser.add_argument("--dtype", default="float32", choices=("float16", "float32"),
+                        help="frame storage in --output")
+    parser.add_argument("--socket", default=None, help="Unix socket path for live output")
+    parser.add_argument("--serve", default=None, metavar="[HOST:]PORT",
+                        help="serve frames to remote viewers over TCP (default host 127.0.0.1)")
+    parser.add_argument("--encoding", default="delta", choices=ENCODINGS,
+                        help="frame encoding for --serve")
+    parser.add_argument("--shm", nargs="?", const=FRAME_RING_NAME, default=None, metavar="NAME",
+                        help=f"publish frames to a shared-memory ring (default name {FRAME_RING_NAME})")
+    parser.add_argument("--scpi", default=None, metavar="[HOST:]PORT",
+                        help="accept measurement commands over TCP (default host 127.0.0.1)")
+    parser.add_argument("--duration", type=float, default=None, help="seconds to run")
+    parser.add_argument("--frames", type=int, default=None, help="frames to produce")
+    parser.add_argument("--fps", type=float, default=None, help="maximum frame rate")
+    parser.add_argument("--report", type=float, default=10.0, help="seconds between rate reports")
+    parser.add_argument("--tare", action="store_true", help="normalise to the first frames")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    try:
+        name, settings = load_preset(args.preset, args.presets)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"headless: {e}", file=sys.stderr)
+        return 2
+    if args.source:
+        settings['source_type'] = args.source
+    if args.bands:
+        try:
+            settings['sweep_bands'] = [[float(v) * 1e6 for v in band.split(":")]
+                                       for band in args.bands.split(",")]
+            if any(len(band) != 2 for band in settings['sweep_bands']):
+                raise ValueError("each band is LO:HI")
+        except ValueError as e:
+            print(f"headless: bad --bands '{args.bands}': {e}", file=sys.stderr)
+            return 2
+
+    sinks = []
+    if args.output:
+        sinks.append(DirectorySink(args.output, args.dtype))
+    if args.socket:
+        try:
+            sinks.append(SocketSink(args.socket))
+        except OSError as e:
+            for sink in sinks:
+                sink.close()
+            print(f"headless: cannot listen on {args.socket}: {e}", file=sys.stderr)
+            return 2
+    if args.serve:
+        try:
+            serve = args.serve if ':' in args.serve else f"127.0.0.1:{args.serve}"
+            host, port = parse_address(serve)
+            sinks.append(FrameServer(host, port, encoding=args.encoding))
+        except (OSError, ValueError) as e:
+            for sink in sinks:
+                sink.close()
+            print(f"headless: cannot serve on {args.serve}: {e}", file=sys.stderr)
+            return 2
+    if args.shm:
+        try:
+            sinks.append(FrameRing(args.shm))
+        except (OSError, ValueError) as e:
+            for sink in sinks:
+                sink.close()
+            print(f"headless: cannot create shared memory '{args.shm}': {e}", file=sys.stderr)
+            return 2
+    if args.scpi:
+        try:
+            scpi = args.scpi if ':' in args.scpi else f"127.0.0.1:{args.scpi}"
+            host, port = parse_address(scpi)
+            sinks.append(CommandServer(host, port))
+        except (OSError, ValueError) as e:
+            for sink in sinks:
+                sink.close()
+            print(f"headless: cannot take commands on {args.scpi}: {e}", file=sys.stderr)
+            return 2
+    if not sinks:
+        logger.warning("No --output, --socket, --serve, --shm or --scpi given; "
+                       "frames are processed and discarded")
+
+    try:
+        analyser = HeadlessAnalyser(settings, sinks, source_path=args.file)
+        analyser.start(tare=args.tare)
+    except Exception as e:
+        for sink in sinks:
+            sink.close()
+        print(f"headless: cannot start preset '{name}': {e}", file=sys.stderr)
+        return 1
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    try:
+        stats = analyser.run(duration=args.duration, max_frames=args.frames, fps=args.fps,
+                             report_interval=args.report, should_stop=lambda: bool(stopping))
+    except KeyboardInterrupt:
+        stats = None
+    finally:
+        analyser.stop()
+    if stats:
+        print(f"{name}: {stats['frames']} frames in {stats['elapsed']:.1f} s, "
+              f"{stats['fps']:.1f} fps sustained")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
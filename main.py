@@ -3,6 +3,9 @@ import os
 import signal
 import logging
 import numpy as np
+if os.environ.get("TDNSA_FAKE_DEVICES", "0") not in ("", "0"):
+    import fakes
+    fakes.install()
 from PyQt6.QtWidgets import QMainWindow, QApplication, QProxyStyle, QStyle
 from PyQt6.uic import loadUi
 from PyQt6.QtCore import Qt, QTimer
@@ -17,7 +20,8 @@ from datasources.base import SampleDataSource, SweepDataSource
 from datasources.audio_samples import MicrophoneSamplesDataSource
 from utils.constants import DisplayMode, UIConstants, FFTSize, AmplitudeConstants, EntryMode
 from utils.validators import clamp_centre_span
-from utils.frequency_helpers import calculate_frequency_bins_from_range, update_display_frequency_bins
+from utils.frequency_helpers import (calculate_frequency_bins_from_range, update_display_frequency_bins,
+                                     format_seconds)
 from core.calibration_manager import CalibrationManager
 
 # Configure logging with British English spelling
@@ -79,6 +83,9 @@ class MainWindow(QMainWindow):
         self._keypad_actions      = None  # built lazily after UISetup
         self.hackrf_lna_gain      = 16    # shared across hackrf sweep/samples (valid LNA steps: 0,8,16,24,32,40)
         self.hackrf_vga_gain      = 20
+        self.frame_server         = None  # publishes processed frames to remote viewers
+        self.frame_ring           = None  # ... and to local processes through shared memory
+        self.command_server       = None  # SCPI-like remote control over TCP
 
     def _init_display_state(self) -> None:
         self.current_stacked_index   = DisplayMode.LOGO
@@ -342,21 +349,15 @@ class MainWindow(QMainWindow):
         step = (y_range[1] - y_range[0]) / 100.0
         self.display_manager.zero_span_trigger_level += delta * step
         self.zero_span_widget.set_trigger_level(self.display_manager.zero_span_trigger_level)
-        self.status_label.setText(f"Trigger level: {self.display_manager.zero_span_trigger_level:.4f}")
+        self.status_label.setText(f"Trigger level: {self.display_manager.zero_span_trigger_level:.1f} dBm")
 
     def _adjust_zero_span_time(self, delta: int) -> None:
         steps = self._ZS_TIME_STEPS
         idx = min(range(len(steps)), key=lambda i: abs(steps[i] - self.display_manager.zero_span_time_window))
         idx = max(0, min(len(steps) - 1, idx + delta))
         self.display_manager.zero_span_time_window = steps[idx]
-        t = self.display_manager.zero_span_time_window
-        if t >= 1.0:
-            label = f"{t:.0f} s"
-        elif t >= 0.001:
-            label = f"{t * 1000:.3g} ms"
-        else:
-            label = f"{t * 1e6:.3g} µs"
-        self.status_label.setText(f"Time window: {label}")
+        self.status_label.setText(
+            f"Time window: {format_seconds(self.display_manager.zero_span_time_window)}")
 
     def _adjust_centre_frequency(self, delta: int):
         """Adjust centre frequency by a delta amount.
@@ -660,6 +661,9 @@ class MainWindow(QMainWindow):
             if self.is_popped_out:
                 self.return_widget_from_popout()
 
+            for publisher in (self.frame_server, self.frame_ring, self.command_server):
+                if publisher is not None:
+                    publisher.close()
             self.source_manager.close()
             logging.debug("Application closed successfully")
             event.accept()
@@ -2,12 +2,21 @@ from PyQt6.QtWidgets import QPushButton
 from typing import List, Dict, Optional, Callable
 from datasources.rtl_samples import RtlSamplesDataSource
 from datasources.hackrf_samples import HackrfSamplesDataSource
+from datasources.hackrf_wideband import HackrfWidebandDataSource
+from datasources.hackrf_adaptive import HackrfAdaptiveDataSource
+from datasources.hackrf_sharded import HackrfShardedDataSource
 from datasources.audio_samples import MicrophoneSamplesDataSource
 import math
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+
+def developer_options_enabled() -> bool:
+    """True when TDNSA_DEVELOPER is set (and not "0"): shows the simulated sources."""
+    return os.environ.get("TDNSA_DEVELOPER", "0") not in ("", "0")
+
 class MenuItem:
     def __init__(self, id: str, label: str, sub_menu: Optional[List["MenuItem"]] = None):
         self.id = id
@@ -39,6 +48,9 @@ class MenuManager:
             "Input":            self._create_source_menu(),
             "RTL-SDR":          self._create_rtl_mode_menu(),
             "HackRF":           self._create_hackrf_mode_menu(),
+            "IQ\nFile":         self._create_iq_file_menu(),
+            "Sweep\nFile":      self._create_sweep_file_menu(),
+            "Simulate":         self._create_simulate_menu(),
             "Analysis":         self._create_analysis_menu(),
             "FFT":              self._create_fft_menu(),
             "Constellation":    self._create_constellation_menu(),
@@ -72,9 +84,22 @@ class MenuManager:
             "Export\nImage":      self._create_export_menu(),
             "Current\nDisplay":  self._create_export_display_formats(),
             "Full\nWindow":      self._create_export_window_formats(),
+            "IQ\nCapture":       self._create_iq_capture_menu(),
+            "Sweep\nRecord":     self._create_sweep_record_menu(),
+            "Frame\nServer":     self._create_frame_server_menu(),
+            "Shared\nMemory":    self._create_frame_ring_menu(),
+            "Remote\nControl":   self._create_command_server_menu(),
+            "Band\nSets":        self._create_hackrf_bands_menu(),
+            "Adap-\ntive":       self._create_hackrf_adaptive_menu(),
+            "Multi\nDevice":     self._create_hackrf_sharded_menu(),
+            "Multi\nSource":     self._create_multi_source_menu(),
             "Surface\nDisplay": self._create_surface_display_menu(),
             "History":          self._create_surface_history_menu(),
             "Zero\nSpan":       self._create_zero_span_menu(),
+            "Res\nBW":          self._create_zero_span_rbw_menu(),
+            "Hyst":             self._create_zero_span_hysteresis_menu(),
+            "Hold\noff":        self._create_zero_span_holdoff_menu(),
+            "Pre\nTrig":        self._create_zero_span_pre_trigger_menu(),
             "RF\nGain":         self._create_rf_gain_menu(),
             "HackRF\nSamples":  self._create_hackrf_samples_menu(),
             "LNA\nGain":        self._create_hackrf_lna_menu(),
@@ -104,6 +129,45 @@ class MenuManager:
             MenuItem("btnZeroSpanRise",     "Rise"),
             MenuItem("btnZeroSpanFall",     "Fall"),
             MenuItem("btnZeroSpanTime",     "Time"),
+            MenuItem("btnZeroSpanRbw",      "Res\nBW", sub_menu=self._create_zero_span_rbw_menu()),
+            MenuItem("btnZeroSpanHysteresis", "Hyst", sub_menu=self._create_zero_span_hysteresis_menu()),
+            MenuItem("btnZeroSpanHoldoff",  "Hold\noff", sub_menu=self._create_zero_span_holdoff_menu()),
+            MenuItem("btnZeroSpanPreTrigger", "Pre\nTrig", sub_menu=self._create_zero_span_pre_trigger_menu()),
+        ]
+
+    def _create_zero_span_rbw_menu(self) -> List[MenuItem]:
+        return [
+            MenuItem("btnZeroSpanRbw1k",    "1 kHz"),
+            MenuItem("btnZeroSpanRbw10k",   "10 kHz"),
+            MenuItem("btnZeroSpanRbw30k",   "30 kHz"),
+            MenuItem("btnZeroSpanRbw100k",  "100 kHz"),
+            MenuItem("btnZeroSpanRbw300k",  "300 kHz"),
+            MenuItem("btnZeroSpanRbw1M",    "1 MHz"),
+        ]
+
+    def _create_zero_span_hysteresis_menu(self) -> List[MenuItem]:
+        return [
+            MenuItem("btnZeroSpanHyst0_5",  "0.5 dB"),
+            MenuItem("btnZeroSpanHyst1",    "1 dB"),
+            MenuItem("btnZeroSpanHyst3",    "3 dB"),
+            MenuItem("btnZeroSpanHyst6",    "6 dB"),
+        ]
+
+    def _create_zero_span_holdoff_menu(self) -> List[MenuItem]:
+        return [
+            MenuItem("btnZeroSpanHoldoffOff",  "Off"),
+            MenuItem("btnZeroSpanHoldoff100u", "100 µs"),
+            MenuItem("btnZeroSpanHoldoff1m",   "1 ms"),
+            MenuItem("btnZeroSpanHoldoff10m",  "10 ms"),
+            MenuItem("btnZeroSpanHoldoff100m", "100 ms"),
+        ]
+
+    def _create_zero_span_pre_trigger_menu(self) -> List[MenuItem]:
+        return [
+            MenuItem("btnZeroSpanPre0",     "0 %"),
+            MenuItem("btnZeroSpanPre10",    "10 %"),
+            MenuItem("btnZeroSpanPre25",    "25 %"),
+            MenuItem("btnZeroSpanPre50",    "50 %"),
         ]
 
     def _create_span_menu(self) -> List[MenuItem]:
@@ -148,7 +212,8 @@ class MenuManager:
                 zero_span,
             ]
         from datasources.hackrf_sweep import HackRFSweepDataSource
-        if isinstance(src, HackRFSweepDataSource):
+        if isinstance(src, (HackRFSweepDataSource, HackrfWidebandDataSource, HackrfAdaptiveDataSource,
+                            HackrfShardedDataSource)):
             return self._create_hackrf_sweep_rbw_menu()
         return [MenuItem("btnBwNotAvailable", "Not\nAvailable")]
 
@@ -219,7 +284,8 @@ class MenuManager:
         if isinstance(src, HackrfSamplesDataSource):
             return self._create_hackrf_rf_gain_menu()
         from datasources.hackrf_sweep import HackRFSweepDataSource
-        if isinstance(src, HackRFSweepDataSource):
+        if isinstance(src, (HackRFSweepDataSource, HackrfWidebandDataSource, HackrfAdaptiveDataSource,
+                            HackrfShardedDataSource)):
             return self._create_hackrf_sweep_gain_menu()
         return [MenuItem("btnGainNotAvailable", "Not\nAvailable")]
 
@@ -299,22 +365,92 @@ class MenuManager:
 
 
     def _create_source_menu(self) -> List[MenuItem]:
-        return [
+        items = [
             MenuItem("btnSourceRtl",         "RTL-SDR",    sub_menu=self._create_rtl_mode_menu()),
             MenuItem("btnSourceHackRF",       "HackRF",     sub_menu=self._create_hackrf_mode_menu()),
             MenuItem("btnMicrophoneSamples", "Microphone"),
+            MenuItem("btnIqFile",            "IQ\nFile",   sub_menu=self._create_iq_file_menu()),
+            MenuItem("btnSweepFile",         "Sweep\nFile", sub_menu=self._create_sweep_file_menu()),
+            MenuItem("btnNetworkStream",     "Network\nStream"),
+            MenuItem("btnSharedMemory",      "Shared\nMemory"),
+            MenuItem("btnMultiSource",       "Multi\nSource", sub_menu=self._create_multi_source_menu()),
+        ]
+        if developer_options_enabled():
+            items.append(MenuItem("btnSimulate", "Simulate", sub_menu=self._create_simulate_menu()))
+        return items
+
+    def _create_multi_source_menu(self) -> List[MenuItem]:
+        return [
+            MenuItem("btnMultiSourceAdd",        "Add\nCurrent"),
+            MenuItem("btnMultiSourceOverlay",    "Over-\nlay"),
+            MenuItem("btnMultiSourceSideBySide", "Side by\nSide"),
+            MenuItem("btnMultiSourceRemove",     "Remove\nLast"),
+            MenuItem("btnMultiSourceClear",      "Clear\nAll"),
+        ]
+
+    def _create_simulate_menu(self) -> List[MenuItem]:
+        return [
+            MenuItem("btnSimSamples", "Sim\nSamples"),
+            MenuItem("btnSimSweep",   "Sim\nSweep"),
+        ]
+
+    def _create_iq_file_menu(self) -> List[MenuItem]:
+        return [
+            MenuItem("btnIqFileOpen",       "Open\nFile"),
+            MenuItem("btnPlaybackRealtime", "Real\nTime"),
+            MenuItem("btnPlaybackX4",       "Speed\n×4"),
+            MenuItem("btnPlaybackFast",     "Max\nSpeed"),
+            MenuItem("btnPlaybackStep",     "Step\nFrame"),
+            MenuItem("btnPlaybackLoop",     "Loop"),
+            MenuItem("btnPlaybackRewind",   "Rewind"),
+            MenuItem("btnPlaybackSkip",     "Skip\n+10%"),
+        ]
+
+    def _create_sweep_file_menu(self) -> List[MenuItem]:
+        return [
+            MenuItem("btnSweepFileOpen",   "Open\nFile"),
+            MenuItem("btnSweepPlayX1",     "Real\nTime"),
+            MenuItem("btnSweepPlayX10",    "Speed\n×10"),
+            MenuItem("btnSweepPlayX100",   "Speed\n×100"),
+            MenuItem("btnSweepPlayLoop",   "Loop"),
+            MenuItem("btnSweepPlayRewind", "Rewind"),
+            MenuItem("btnSweepPlaySkip",   "Skip\n+10%"),
         ]
 
     def _create_rtl_mode_menu(self) -> List[MenuItem]:
         return [
             MenuItem("btnRtlSamples", "Samples"),
             MenuItem("btnRtlSweep",   "Sweep"),
+            MenuItem("btnRtlTcp",     "rtl_tcp"),
         ]
 
     def _create_hackrf_mode_menu(self) -> List[MenuItem]:
         return [
-            MenuItem("btnHackrfSamples", "Samples"),
-            MenuItem("btnHackRFSweep",   "Sweep"),
+            MenuItem("btnHackrfSamples",  "Samples"),
+            MenuItem("btnHackRFSweep",    "Sweep"),
+            MenuItem("btnHackrfWideband", "Wide\nband"),
+            MenuItem("btnHackrfAdaptiveMenu", "Adap-\ntive", sub_menu=self._create_hackrf_adaptive_menu()),
+            MenuItem("btnHackrfShardedMenu",  "Multi\nDevice", sub_menu=self._create_hackrf_sharded_menu()),
+            MenuItem("btnHackRFBands",    "Band\nSets", sub_menu=self._create_hackrf_bands_menu()),
+        ]
+
+    def _create_hackrf_adaptive_menu(self) -> List[MenuItem]:
+        return [
+            MenuItem("btnHackrfAdaptive",   "Sweep\nDwell"),
+            MenuItem("btnHackrfAdaptiveIq", "IQ\nDwell"),
+        ]
+
+    def _create_hackrf_sharded_menu(self) -> List[MenuItem]:
+        return [
+            MenuItem("btnHackrfSharded",      "All\nHackRFs"),
+            MenuItem("btnHackrfShardedMatch", "Match\nLevels"),
+        ]
+
+    def _create_hackrf_bands_menu(self) -> List[MenuItem]:
+        return [
+            MenuItem("btnHackRFBandsIsm",    "ISM\n433/868/2.4G"),
+            MenuItem("btnHackRFBandsIsmAll", "All\nISM"),
+            MenuItem("btnHackRFBandsOff",    "Single\nRange"),
         ]
 
     def _create_marker_menu(self) -> List[MenuItem]:
@@ -346,6 +482,7 @@ class MenuManager:
             MenuItem("btnSurface",   "Surface"),
             MenuItem("btnRibbon",    "Ribbon"),
             MenuItem("btnDensity",   "Density"),
+            MenuItem("btnBands",     "Bands"),
         ]
 
     def _create_2d_display_menu(self) -> List[MenuItem]:
@@ -470,6 +607,46 @@ class MenuManager:
         return [
             MenuItem("btnExportDisplay", "Current\nDisplay", sub_menu=self._create_export_display_formats()),
             MenuItem("btnExportWindow",  "Full\nWindow",     sub_menu=self._create_export_window_formats()),
+            MenuItem("btnIqCapture",     "IQ\nCapture",      sub_menu=self._create_iq_capture_menu()),
+            MenuItem("btnSweepRecord",   "Sweep\nRecord",     sub_menu=self._create_sweep_record_menu()),
+            MenuItem("btnFrameServer",   "Frame\nServer",     sub_menu=self._create_frame_server_menu()),
+            MenuItem("btnFrameRing",     "Shared\nMemory",    sub_menu=self._create_frame_ring_menu()),
+            MenuItem("btnScpiServer",    "Remote\nControl",   sub_menu=self._create_command_server_menu()),
+        ]
+
+    def _create_iq_capture_menu(self) -> List[MenuItem]:
+        return [
+            MenuItem("btnIqSave",        "Save\nLast IQ"),
+            MenuItem("btnIqHistory1s",   "History\n1 s"),
+            MenuItem("btnIqHistory2s",   "History\n2 s"),
+            MenuItem("btnIqHistory5s",   "History\n5 s"),
+            MenuItem("btnIqHistory10s",  "History\n10 s"),
+        ]
+
+    def _create_sweep_record_menu(self) -> List[MenuItem]:
+        return [
+            MenuItem("btnSweepRecordF16",  "Record\nfloat16"),
+            MenuItem("btnSweepRecordF32",  "Record\nfloat32"),
+            MenuItem("btnSweepRecordStop", "Stop\nRecording"),
+        ]
+
+    def _create_frame_server_menu(self) -> List[MenuItem]:
+        return [
+            MenuItem("btnFrameServeDelta", "Serve\nDelta"),
+            MenuItem("btnFrameServeInt16", "Serve\nint16"),
+            MenuItem("btnFrameServeStop",  "Stop\nServing"),
+        ]
+
+    def _create_frame_ring_menu(self) -> List[MenuItem]:
+        return [
+            MenuItem("btnFrameRingStart", "Publish"),
+            MenuItem("btnFrameRingStop",  "Stop\nPublishing"),
+        ]
+
+    def _create_command_server_menu(self) -> List[MenuItem]:
+        return [
+            MenuItem("btnScpiStart", "Start"),
+            MenuItem("btnScpiStop",  "Stop"),
         ]
 
     def _create_hold_menu(self) -> List[MenuItem]:
@@ -572,6 +749,7 @@ class MenuManager:
             MenuItem("btnConstPoints2K",   "2k"),
             MenuItem("btnConstPoints5K",   "5k"),
             MenuItem("btnConstPoints10K",  "10k"),
+            MenuItem("btnConstPoints100K", "100k"),
         ]
 
     def _create_audio_channel_menu(self) -> List[MenuItem]:
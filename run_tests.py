@@ -24,6 +24,19 @@ TESTS = [
     ("Marker manager",                "test_marker_manager.py"),
     ("Preset manager",                "test_preset_manager.py"),
     ("Duty cycle analyser",           "test_duty_cycle.py"),
+    ("Zero span detector",            "test_zero_span.py"),
+    ("Trigger engine",                "test_trigger.py"),
+    ("IQ history",                    "test_iq_history.py"),
+    ("IQ file playback",              "test_file_samples.py"),
+    ("Sweep recording",               "test_sweep_recording.py"),
+    ("Simulated sources",             "test_simulated.py"),
+    ("Device fakes",                  "test_device_fakes.py"),
+    ("Headless daemon",               "test_headless.py"),
+    ("Frame server",                  "test_frame_server.py"),
+    ("Frame ring",                    "test_frame_ring.py"),
+    ("rtl_tcp source",                "test_rtl_tcp.py"),
+    ("Command server",                "test_command_server.py"),
+    ("Multi-source",                  "test_multi_source.py"),
 ]
 
 HARDWARE_ERRORS = ("No module named 'hackrf'",
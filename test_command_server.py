@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Tests for the SCPI-like command server against a headless simulated source (no Qt or hardware required)."""
+
+import socket
+import threading
+import time
+
+import numpy as np
+from core.command_server import CommandServer, IDENTITY
+from core.headless import HeadlessAnalyser
+
+
+class _Session:
+    """A headless sim_samples analyser running in a thread with a command server and one client."""
+
+    def __init__(self):
+        self.server = CommandServer(port=0)
+        settings = {"source_type": "sim_samples", "freq_start": 99e6, "freq_stop": 101e6,
+                    "fft_size": 1024, "avg_mode": "off", "avg_n": 1, "peak_excursion": 10.0}
+        self.analyser = HeadlessAnalyser(settings, [self.server])
+        self.analyser.start()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self.analyser.run, kwargs={"should_stop": self._stop.is_set}, daemon=True)
+        self._thread.start()
+        self.sock = socket.create_connection(self.server.address, timeout=10.0)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self.sock.makefile('r', encoding='ascii')
+
+    def send(self, line: str) -> None:
+        self.sock.sendall(line.encode() + b"\n")
+
+    def read(self) -> str:
+        return self._reader.readline().rstrip("\n")
+
+    def query(self, line: str) -> str:
+        self.send(line)
+        return self.read()
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=5.0)
+        self.analyser.stop()
+        self._reader.close()
+        self.sock.close()
+
+
+def test_frequency_and_fft_size():
+    """Settings map onto the frequency range and FFT size; bad commands queue SCPI errors."""
+    print("### frequency and FFT size ###")
+    s = _Session()
+    try:
+        assert s.query("*IDN?") == IDENTITY
+        s.send("frequency:center 100.5 MHz; SENS:FREQ:SPAN 1MHz")
+        assert float(s.query("FREQ:STAR?")) == 100e6
+        assert float(s.query("freq:stop?")) == 101e6
+        assert s.query("FFT:SIZE 2048;FFT:SIZE?") == "2048"
+        assert s.analyser.current_source.sample_count == 2048
+        assert s.query("SYST:ERR?") == '0,"No error"'
+        s.send("FREQ:STOP 50MHz")
+        s.send("BOGUS:CMD 1")
+        s.send("FFT:SIZE 1000")
+        assert s.query("SYST:ERR?").startswith("-222,")
+        assert s.query("SYST:ERR?").startswith('-113,"Undefined header')
+        assert s.query("SYST:ERR?").startswith("-222,")
+        assert s.query("*OPC?") == "1"
+        start, stop, points = s.query("TRAC:FREQ?").split(",")
+        assert abs(float(start) - 100e6) < 2e3 and abs(float(stop) - 101e6) < 2e3 and points == "2048"
+    finally:
+        s.close()
+    print("  100–101 MHz, FFT 2048, errors -222/-113/-222 in order  ✓")
+
+
+def test_markers_band_power_and_peaks():
+    """Marker, band power and peak queries read the live trace."""
+    print("### markers, band power, peaks ###")
+    s = _Session()
+    try:
+        s.query("*OPC?")
+        strongest = 100e6 - 0.30 * 2e6                     # the -30 dB tone of the default scenario
+        s.send("CALC:MARK1:MAX")
+        assert abs(float(s.query("CALC:MARK1:X?")) - strongest) < 5e3
+        level = float(s.query("CALC:MARK1:Y?"))
+        s.send("CALC:MARK2:X 100.4MHz")
+        quiet = float(s.query("CALC:MARK2:Y?"))
+        assert level > quiet + 20, (level, quiet)
+        assert s.analyser.marker_manager.markers['F2'].enabled
+        peaks = [float(v) for v in s.query("CALC:PEAK? 3").split(",")]
+        assert len(peaks) % 2 == 0 and abs(peaks[0] - strongest) < 5e3
+        near = float(s.query("CALC:BPOW? 99.39MHz,99.41MHz"))
+        away = float(s.query("CALC:BPOW? 100.39MHz,100.41MHz"))
+        assert near > away + 20, (near, away)
+        assert s.query("CALC:BPOW?") != ""                 # between markers 1 and 2
+        s.send("CALC:MARK:AOFF")
+        assert s.query("CALC:MARK1:X?") == ""
+        assert s.query("SYST:ERR?").startswith("-221,")
+    finally:
+        s.close()
+    print(f"  marker on {strongest / 1e6:.2f} MHz at {level:.1f} dB, band power {near:.1f} dB  ✓")
+
+
+def test_batched_queries_in_one_round_trip():
+    """TRAC? n and TRAC:MAXH? collect frames server-side; later commands wait for them."""
+    print("### batched traces and max hold ###")
+    s = _Session()
+    try:
+        s.query("*OPC?")
+        s.send("TRAC? 5;*OPC?")
+        traces = [np.array(t.split(","), dtype=float) for t in s.read().split(";")]
+        assert s.read() == "1"
+        assert len(traces) == 5 and all(len(t) == 1024 for t in traces)
+        assert not all(np.array_equal(traces[0], t) for t in traces[1:])
+        t0 = time.monotonic()
+        hold = np.array(s.query("TRAC:MAXH? 300ms").split(","), dtype=float)
+        elapsed = time.monotonic() - t0
+        assert 0.3 <= elapsed < 2.0 and len(hold) == 1024
+        live = np.array(s.query("TRAC?").split(","), dtype=float)
+        assert np.mean(hold) > np.mean(live)
+    finally:
+        s.close()
+    print(f"  5 traces and a {elapsed * 1e3:.0f} ms max hold in one reply each  ✓")
+
+
+def test_query_throughput():
+    """Queries per second, one per round trip and pipelined 50 to a line."""
+    print("### throughput ###")
+    s = _Session()
+    try:
+        s.query("CALC:MARK1:MAX;*OPC?")
+        n, t0 = 0, time.monotonic()
+        while time.monotonic() - t0 < 1.0:
+            assert s.query("CALC:MARK1:Y?")
+            n += 1
+        single = n / (time.monotonic() - t0)
+        line = ";".join(["CALC:MARK1:Y?"] * 50)
+        n, t0 = 0, time.monotonic()
+        while time.monotonic() - t0 < 1.0:
+            s.send(line)
+            for _ in range(50):
+                assert s.read()
+            n += 50
+        pipelined = n / (time.monotonic() - t0)
+        assert single > 20 and pipelined > single, (single, pipelined)
+        assert s.server.queries_served >= n
+    finally:
+        s.close()
+    print(f"  {single:.0f} qps one per round trip, {pipelined:.0f} qps pipelined  ✓")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Command Server Tests")
+    print("=" * 60)
+    test_frequency_and_fft_size()
+    test_markers_band_power_and_peaks()
+    test_batched_queries_in_one_round_trip()
+    test_query_throughput()
+    print("\nAll tests passed.")
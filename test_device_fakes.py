@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""Tests that drive the real source classes against the fake devices (no radio required)."""
+
+import time
+
+import fakes
+fakes.install()
+
+import numpy as np
+from fakes.hackrf import HackRF
+from fakes.sounddevice import LEFT_TONE_HZ, RIGHT_TONE_HZ
+from datasources.hackrf_samples import HackrfSamplesDataSource
+from datasources.rtl_samples import RtlSamplesDataSource
+from datasources.audio_samples import MicrophoneSamplesDataSource
+from datasources.hackrf_sweep import HackRFSweepDataSource
+from datasources.hackrf_wideband import HackrfWidebandDataSource
+from datasources.hackrf_adaptive import HackrfAdaptiveDataSource
+from datasources.hackrf_sharded import HackrfShardedDataSource, list_hackrf_serials
+from datasources.rtl_sweep import RtlSweepDataSource
+from utils.frame_ring import MAX_SEGMENTS
+from utils.frequency_helpers import grid_segments, segments_grid
+from utils.frequency_selector import FrequencyRange
+from testing_utils import wait_for
+
+
+def _peak_freq(power, freqs) -> float:
+    return float(freqs[int(np.argmax(power))])
+
+
+def test_hackrf_streams_in_real_time():
+    """Reads arrive at the sample rate and retuning moves the carrier."""
+    print("### HackRF streaming ###")
+    src = HackrfSamplesDataSource(10_000_000, 99_000_000)
+    src.start()
+    try:
+        device = HackRF.last_device
+        time.sleep(0.5)
+        received = device.reads * src.READ_CHUNK
+        assert 0.3 * 10e6 < received < 0.65 * 10e6, received
+        power, freqs = src.get_power_levels()
+        assert abs(_peak_freq(power, freqs) - 100e6) < 2 * 10e6 / len(power)
+        src.update_centre_frequency(101_000_000)
+        assert HackRF.last_device is device and device.centre == 101e6
+        time.sleep(0.05)
+        power, freqs = src.get_power_levels()
+        assert freqs[0] < 100e6 < freqs[-1]
+        assert abs(_peak_freq(power, freqs) - 100e6) < 2 * 10e6 / len(power)
+    finally:
+        src.stop()
+    assert device.closed
+    print(f"  {received / 0.5 / 1e6:.1f} MS/s delivered, carrier tracked across retune  ✓")
+
+
+def test_hackrf_overflow_errors_and_stall():
+    """Queue overflow, transient read errors and a stuck read are all survived."""
+    print("### HackRF stress ###")
+    src = HackrfSamplesDataSource(20_000_000, 100_000_000)
+    src.STOP_TIMEOUT = 0.3
+    src.start()
+    device = HackRF.last_device
+    time.sleep(0.3)                                   # nobody consuming
+    stats = src.get_stats()
+    assert stats['queue_overflows'] > 0 and stats['samples_dropped'] > 0, stats
+    device.fail_reads = 3
+    assert wait_for(lambda: src.get_stats()['read_errors'] >= 3, 1.0)
+    assert src.is_running
+    device.stall = True
+    time.sleep(0.1)
+    t0 = time.monotonic()
+    src.stop()
+    elapsed = time.monotonic() - t0
+    assert not src.is_running and device.closed
+    assert elapsed < 1.5, elapsed
+    print(f"  {stats['queue_overflows']} overflows, 3 read errors, stuck read freed in "
+          f"{elapsed:.2f} s  ✓")
+
+
+def test_rtl_rate_readback_and_retune_flush():
+    """The quantised rate is read back and the post-retune flush discards stale samples."""
+    print("### RTL-SDR ###")
+    src = RtlSamplesDataSource(2_500_000, 100_300_000)
+    src.start()
+    try:
+        assert src.sample_rate != 2_500_000 and abs(src.sample_rate - 2.5e6) < 1.0
+        for _ in range(5):
+            power, freqs = src.get_power_levels()
+        bin_width = src.sample_rate / src.fft_size
+        assert abs(_peak_freq(power, freqs) - 100e6) < 2 * bin_width
+        src.update_centre_frequency(99_600_000)
+        power, freqs = src.get_power_levels()         # first frame after the retune
+        assert abs(_peak_freq(power, freqs) - 100e6) < 2 * bin_width
+    finally:
+        src.stop()
+    print(f"  {src.sample_rate:.4f} S/s read back, no stale frame after retune  ✓")
+
+
+def test_microphone_channels_and_pacing():
+    """Blocking reads pace the audio source; each channel carries its own tone."""
+    print("### audio ###")
+    src = MicrophoneSamplesDataSource(48_000)
+    src.start(None)
+    try:
+        t0 = time.monotonic()
+        for _ in range(10):
+            power, freqs = src.get_power_levels()
+        elapsed = time.monotonic() - t0
+        assert elapsed > 0.8 * 10 * src._audio_block / 48_000, elapsed
+        src.set_channel_mode('left')
+        power, freqs = src.get_power_levels()
+        assert abs(_peak_freq(power, freqs) - LEFT_TONE_HZ) < 2 * 48_000 / src.fft_size
+        src.set_channel_mode('right')
+        power, freqs = src.get_power_levels()
+        assert abs(_peak_freq(power, freqs) - RIGHT_TONE_HZ) < 2 * 48_000 / src.fft_size
+    finally:
+        src.stop()
+    print(f"  10 blocks in {elapsed * 1e3:.0f} ms, L/R tones separated  ✓")
+
+
+def test_rtl_and_microphone_stream_gap_free():
+    """Stream consumers get every sample even when nobody asks for frames."""
+    print("### continuous streams ###")
+    from fakes.rtlsdr import RtlSdr
+    for src, rate in ((RtlSamplesDataSource(2_400_000, 100_000_000), 2.4e6),
+                      (MicrophoneSamplesDataSource(48_000), 48_000)):
+        received = []
+        src.add_stream_consumer(lambda block: received.append(len(block)))
+        src.start(None)
+        try:
+            time.sleep(0.3)
+            t0, before = time.monotonic(), sum(received)
+            time.sleep(0.5)                           # no get_power_levels() calls at all
+            delivered = (sum(received) - before) / (time.monotonic() - t0)
+        finally:
+            src.stop()
+        assert 0.9 * rate < delivered < 1.1 * rate, (type(src).__name__, delivered)
+    assert RtlSdr.last_device.overruns == 0
+    print("  RTL-SDR and microphone deliver their full sample rate  ✓")
+
+
+def test_hackrf_sweep_tool():
+    """The sweep source parses the fake tool's CSV and its sweep-rate reports."""
+    print("### hackrf_sweep ###")
+    src = HackRFSweepDataSource(80e6, 120e6, 100_000)
+    src.start()
+    try:
+        assert wait_for(lambda: not np.isnan(src.get_data()).any(), 2.0)
+        data = src.get_data()
+        assert abs(src.frequency_grid[int(np.argmax(data))] - 100e6) < 300e3
+        assert abs(np.median(data) - (-70.0 + 10.0)) < 2.0, np.median(data)   # LNA 16 + VGA 20 + amp 14
+        assert wait_for(lambda: src.sweep_rate is not None, 2.0)
+        assert 20.0 < src.sweep_rate < 400.0, src.sweep_rate
+    finally:
+        src.stop()
+    assert src.process is None
+    print(f"  {src.sweep_rate:.0f} sweeps/s reported, carrier at 100 MHz  ✓")
+
+
+def test_rtl_hop_sweep():
+    """The in-process RTL sweep stitches cropped hops onto a fixed grid several times a second."""
+    print("### RTL hop sweep ###")
+    src = RtlSweepDataSource(95e6, 105e6, 10e3)
+    src.start(FrequencyRange(95e6, 105e6))
+    try:
+        assert wait_for(lambda: src.sweep_count >= 2, 4.0)
+        data = src.get_data()
+        assert len(data) == len(src.frequency_grid) == 1068 and src.bin_size == 9375.0
+        assert abs(_peak_freq(data, src.frequency_grid) - 100e6) < src.bin_size
+        assert src.get_data() is not data                          # callers get their own copy
+    finally:
+        src.stop()
+    src = RtlSweepDataSource(88e6, 208e6, 100e3)
+    src.start(FrequencyRange(88e6, 208e6))
+    try:
+        grid = src.frequency_grid
+        assert wait_for(lambda: src.sweep_count >= 4, 4.0)
+        assert src.frequency_grid is grid                          # planned once, reused every sweep
+        data = src.get_data()
+        assert abs(_peak_freq(data, grid) - 100e6) < src.bin_size
+        below = grid < 99.5e6
+        assert abs(_peak_freq(data[below], grid[below]) - 98.5e6) < src.bin_size
+        rate = src.sweep_rate
+        assert rate > 2.0, rate
+    finally:
+        src.stop()
+    assert src.sdr is None
+    print(f"  {src.hops} hops over 120 MHz at {rate:.1f} sweeps/s, carriers at 98.5 and 100 MHz  ✓")
+
+
+def test_hackrf_wideband_stitch():
+    """The HackRF wideband source stitches both DC-free sidebands of 20 MS/s hops into one grid."""
+    print("### HackRF wideband stitch ###")
+    src = HackrfWidebandDataSource(400e6, 450e6, 30e3)
+    src.start()
+    try:
+        assert src.bin_size == 20e6 / 1024 and src.hops == 4                # both sidebands: 7 one-sided
+        guard = src.DC_GUARD_HZ / src.bin_size
+        for pieces in src._slices:                                          # nothing in the DC notch
+            for g0, g1, f0 in pieces:
+                assert min(abs(f0 - 512), abs(f0 + g1 - g0 - 1 - 512)) >= guard
+        assert wait_for(lambda: src.sweep_count >= 4, 4.0)
+        narrow = src.sweep_rate
+        assert narrow > 5.0, narrow
+    finally:
+        src.stop()
+    src = HackrfWidebandDataSource(350e6, 550e6, 30e3)
+    src.start(FrequencyRange(350e6, 550e6))
+    try:
+        assert wait_for(lambda: src.sweep_count >= 3, 4.0)
+        grid = src.frequency_grid
+        data = src.get_data()
+        assert len(data) == len(grid) and abs(grid[-1] - 550e6) < src.bin_size
+        assert not np.isnan(data).any()                              # each layout fills the other's notches
+        assert abs(_peak_freq(data, grid) - 433.92e6) < src.bin_size
+        away = np.abs(grid - 433.92e6) > 1e6
+        assert data[away].max() < data.max() - 30                   # no stale copy in a later hop
+        wide = src.sweep_rate
+        assert wide > 2.0, wide
+    finally:
+        src.stop()
+    assert src.device is None
+    print(f"  50 MHz at {narrow:.1f} and 200 MHz ({src.hops} hops) at {wide:.1f} spans/s, "
+          f"carrier at 433.92 MHz  ✓")
+
+
+def test_hackrf_sweep_bands():
+    """Several hackrf_sweep ranges give a composite grid with one slice per band, swept much faster."""
+    print("### hackrf_sweep bands ###")
+    src = HackRFSweepDataSource(400e6, 2500e6, 100_000)
+    assert not src.has_own_grid
+    src.start()
+    try:
+        assert wait_for(lambda: src.sweep_rate is not None, 3.0)
+        full = src.sweep_rate
+    finally:
+        src.stop()
+    src = HackRFSweepDataSource(400e6, 2500e6, 100_000)
+    src.set_bands([(2400e6, 2500e6), (433e6, 435e6), (863e6, 870e6)])
+    assert src.bands[0] == (433e6, 435e6) and (src.start_freq, src.stop_freq) == (433e6, 2500e6)
+    src.start(FrequencyRange(433e6, 2500e6))                      # same range: the bands are kept
+    try:
+        assert len(src.bands) == 3
+        assert wait_for(lambda: not np.isnan(src.get_data()).any(), 3.0)
+        assert wait_for(lambda: src.sweep_rate is not None, 3.0)
+        data, grid = src.get_data(), src.frequency_grid
+        assert len(data) == len(grid) == src.band_slices[-1].stop
+        assert src.has_own_grid and len(grid_segments(grid)) == 3
+        carriers = ((433.92e6, 1e6), (868.3e6, 1e6), (2437e6, 10e6))   # Wi-Fi is a 20 MHz channel
+        for band, (low, high), (carrier, tol) in zip(src.band_slices, src.bands, carriers):
+            assert grid[band][0] == low and grid[band][-1] == high
+            assert abs(_peak_freq(data[band], grid[band]) - carrier) < tol, carrier
+        banded = src.sweep_rate
+        assert banded > 5 * full, (full, banded)
+        try:
+            src.set_bands([(433e6, 870e6), (863e6, 900e6)])
+            raise AssertionError("overlapping bands accepted")
+        except ValueError:
+            pass
+    finally:
+        src.stop()
+    print(f"  3 bands at {banded:.0f} sweeps/s vs {full:.1f} over 400–2500 MHz  ✓")
+
+
+def test_hackrf_adaptive_dwell():
+    """The adaptive survey revisits the whole range and resolves its active regions finely."""
+    print("### HackRF adaptive ###")
+    for mode in ('sweep', 'capture'):
+        src = HackrfAdaptiveDataSource(300e6, 1200e6, 500_000)
+        src.set_fine_mode(mode)
+        src.start()
+        try:
+            assert wait_for(lambda: src.sweep_count >= 2 and src.fine_count >= 1, 8.0)
+            data, grid = src.get_data(), src.frequency_grid
+            assert len(data) == len(grid) and np.all(np.diff(grid) > 0)
+            segments = grid_segments(grid)               # as the frame server, ring and recorder carry it
+            assert src.has_own_grid and 1 < len(segments) <= MAX_SEGMENTS
+            assert np.allclose(segments_grid(segments), grid, rtol=0, atol=1e-3)
+            assert grid[0] == 300e6 and grid[-1] >= 1199e6
+            ism = [(432e6, 435e6), (867e6, 870e6)]          # ADS-B bursts may add 1088-1092 MHz
+            assert set(ism) <= set(src.regions), src.regions
+            rate = src.sweep_rate
+            assert rate > 0.5, rate
+            for (low, high), carrier in zip(ism, (433.92e6, 868.3e6)):
+                inside = (grid >= low) & (grid <= high)
+                assert np.diff(grid[inside]).max() < 2 * src.fine_bin_size
+                assert abs(_peak_freq(data[inside], grid[inside]) - carrier) < 2 * src.fine_bin_size
+            outside = grid < 400e6
+            assert np.diff(grid[outside]).min() > src.bin_size / 2        # coarse away from signals
+        finally:
+            src.stop()
+        assert src._coarse.process is None and src._fine.process is None and src._capture is None
+    print(f"  900 MHz revisited at {rate:.1f}/s, {src.fine_bin_size / 1e3:g} kHz bins on "
+          f"433 and 868 MHz with sweep and IQ dwell  ✓")
+
+
+def test_hackrf_sharded_sweep():
+    """Three HackRFs share the range, sweep it about three times as often and agree once matched."""
+    print("### HackRF multi-device ###")
+    serials = list_hackrf_serials()
+    assert len(serials) == 3
+    rates = []
+    for count in (1, 3):
+        src = HackrfShardedDataSource(400e6, 2500e6, 100_000, serials[:count])
+        src.start()
+        try:
+            assert wait_for(lambda: src.sweep_count >= 2 and src.sweep_rate is not None, 5.0)
+            rates.append(src.sweep_rate)
+            data = src.get_data()
+            assert len(data) == len(src.frequency_grid) and not np.isnan(data).any()
+            assert abs(_peak_freq(data, src.frequency_grid) - 433.92e6) < 300e3
+        finally:
+            src.stop()
+    assert src.boundaries == [400e6, 1100e6, 1800e6, 2500e6]
+    assert [s.serial for s in src.shards] == serials
+    assert rates[1] > 2.2 * rates[0], rates
+    errors = src.stitch_errors_db                 # the fake devices read 0, +3 and -2 dB off
+    assert abs(errors[0] + 3.0) < 1.0 and abs(errors[1] - 5.0) < 1.0 and not src.stitch_ok, errors
+    src.cal_offsets = src.match_levels()
+    src.start()
+    try:
+        assert wait_for(lambda: src.sweep_count >= 2, 5.0)
+        src.get_data()
+        assert src.stitch_ok, src.stitch_errors_db
+    finally:
+        src.stop()
+    print(f"  {rates[0]:.1f} → {rates[1]:.1f} sweeps/s with 3 devices, boundaries "
+          f"{errors[0]:+.1f}/{errors[1]:+.1f} dB matched to "
+          f"{src.stitch_errors_db[0]:+.1f}/{src.stitch_errors_db[1]:+.1f} dB  ✓")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Device Fake Tests")
+    print("=" * 60)
+    test_hackrf_streams_in_real_time()
+    test_hackrf_overflow_errors_and_stall()
+    test_rtl_rate_readback_and_retune_flush()
+    test_microphone_channels_and_pacing()
+    test_rtl_and_microphone_stream_gap_free()
+    test_hackrf_sweep_tool()
+    test_hackrf_sweep_bands()
+    test_rtl_hop_sweep()
+    test_hackrf_wideband_stitch()
+    test_hackrf_adaptive_dwell()
+    test_hackrf_sharded_sweep()
+    print("\nAll tests passed.")
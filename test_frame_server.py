@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Tests for the binary frame server and the network stream source (no Qt or hardware required)."""
+
+import socket
+import time
+
+import numpy as np
+from core.frame_server import FrameServer
+from core.headless import HeadlessAnalyser
+from datasources.network_source import NetworkSweepDataSource, parse_address
+from utils import frame_protocol as fp
+from testing_utils import wait_for
+
+
+def _spectrum(rng, bins: int, t: int) -> np.ndarray:
+    power = -90.0 + rng.normal(0.0, 0.3, bins).astype(np.float32)
+    power[bins // 3] = -30.0 + (t % 7)
+    return power
+
+
+def test_quantise_and_delta_round_trip():
+    """0.01 dB quantisation, NaN survival and exact delta reconstruction."""
+    print("### protocol ###")
+    rng = np.random.default_rng(1)
+    a = rng.uniform(-140.0, 20.0, 4096).astype(np.float32)
+    a[[5, 100]] = np.nan
+    qa = fp.quantise(a)
+    back = fp.dequantise(qa)
+    assert np.all(np.isnan(back[[5, 100]]))
+    assert np.nanmax(np.abs(back - a)) <= 0.005 + 1e-4
+    b = a + rng.normal(0.0, 0.2, len(a)).astype(np.float32)
+    b[7] = np.nan                                   # NaN appearing and disappearing
+    b[5] = 10.0
+    qb = fp.quantise(b)
+    assert np.array_equal(fp.apply_delta(fp.delta_payload(qb, qa), qa), qb)
+    header = fp.encode_header(fp.MSG_FRAME, 3, 42, 1.5, 8192)
+    assert len(header) == 24 and fp.decode_header(header) == (fp.MSG_FRAME, 3, 42, 1.5, 8192)
+    try:
+        fp.decode_header(b"XX" + header[2:])
+        raise AssertionError("expected ProtocolError")
+    except fp.ProtocolError:
+        pass
+    segments = ((433e6, 434e6, 101), (2400e6, 2500e6, 1001))
+    grid = fp.encode_grid(7, segments)
+    assert fp.decode_header(grid[:24])[:2] == (fp.MSG_GRID, 7) and len(grid) == 24 + 2 * fp.GRID.size
+    assert fp.decode_grid(grid[24:]) == segments and fp.grid_bins(segments) == 1102
+    assert parse_address("node1") == ("node1", fp.DEFAULT_PORT)
+    assert parse_address("[::1]:6000") == ("::1", 6000)
+    print("  ±0.005 dB, NaN kept, deltas exact  ✓")
+
+
+def test_stream_to_network_source_with_grid_change():
+    """A client reconstructs every frame exactly and follows a grid change."""
+    print("### stream and grid change ###")
+    server = FrameServer(port=0, queue_depth=64)
+    src = NetworkSweepDataSource(*server.address)
+    rng = np.random.default_rng(2)
+    freqs = np.linspace(88e6, 108e6, 20_000)
+    try:
+        server.publish(freqs, _spectrum(rng, len(freqs), 0))
+        src.start()
+        assert (src.start_freq, src.stop_freq) == (88e6, 108e6)
+        for t in range(1, 40):
+            expected = _spectrum(rng, len(freqs), t)
+            server.publish(freqs, expected)
+            time.sleep(0.002)
+        assert not server.publish(freqs, expected)          # a repeat is not re-sent
+        assert wait_for(lambda: src.frames_received >= 40, 2.0), src.get_stats()
+        assert np.max(np.abs(src.get_data() - expected)) <= 0.0051
+        assert src.frames_missed == 0
+
+        wide = np.linspace(2400e6, 2500e6, 5_000)
+        server.publish(wide, _spectrum(rng, len(wide), 0))
+        assert wait_for(lambda: len(src.get_data()) == 5_000, 2.0)
+        assert (src.start_freq, src.stop_freq) == (2400e6, 2500e6)
+        stats = server.get_stats()[0]
+        key_bytes = 40 * 2 * len(freqs)
+        assert stats['sent'] == 41 and stats['dropped'] == 0
+        assert stats['bytes'] < 0.7 * key_bytes, stats            # deltas are smaller than key frames
+
+        bands = np.concatenate((np.linspace(433e6, 434e6, 101), np.linspace(2400e6, 2500e6, 1001)))
+        server.publish(bands, _spectrum(rng, len(bands), 0))
+        assert wait_for(lambda: len(src.get_data()) == len(bands), 2.0)
+        assert np.allclose(src.frequency_grid, bands, rtol=0, atol=1e-3)   # the gap is not linearised
+    finally:
+        src.stop()
+        server.close()
+    print(f"  41 frames exact, grid changes followed, {stats['bytes'] / key_bytes:.0%} of int16 size  ✓")
+
+
+def test_slow_client_drops_old_frames():
+    """A stalled client loses old frames without slowing publish or other clients."""
+    print("### backpressure ###")
+    server = FrameServer(port=0, encoding="int16", queue_depth=2)
+    stalled = socket.create_connection(server.address)
+    stalled.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    src = NetworkSweepDataSource(*server.address)
+    rng = np.random.default_rng(3)
+    freqs = np.linspace(0.0, 6e9, 100_000)
+    try:
+        server.publish(freqs, _spectrum(rng, len(freqs), 0))
+        src.start()
+        assert wait_for(lambda: server.client_count == 2, 1.0)
+        t0 = time.monotonic()
+        for t in range(1, 301):
+            server.publish(freqs, _spectrum(rng, len(freqs), t))
+            time.sleep(0.001)
+        publish_s = time.monotonic() - t0
+        last = _spectrum(rng, len(freqs), 301)
+        server.publish(freqs, last)
+        assert wait_for(lambda: np.max(np.abs(src.get_data() - last)) <= 0.0051, 2.0)
+        stats = {s['address']: s for s in server.get_stats()}
+        slow = stats[stalled.getsockname()[:2]]
+        assert slow['dropped'] > 250, slow
+        assert slow['sent'] + slow['dropped'] <= 302
+        fast_received = src.frames_received
+    finally:
+        src.stop()
+        stalled.close()
+        server.close()
+    assert publish_s < 2.0, publish_s
+    print(f"  stalled client dropped {slow['dropped']}/302, live client got {fast_received}, "
+          f"publish {publish_s / 300 * 1e3:.2f} ms/frame  ✓")
+
+
+def test_headless_serves_frames():
+    """The headless daemon feeds the frame server as one of its sinks."""
+    print("### headless --serve ###")
+    server = FrameServer(port=0)
+    settings = {"source_type": "sim_sweep", "freq_start": 2400e6, "freq_stop": 2500e6,
+                "avg_mode": "off", "avg_n": 1, "sweep_bin_size": 100000}
+    analyser = HeadlessAnalyser(settings, [server])
+    analyser.start()
+    analyser.run(max_frames=1)
+    src = NetworkSweepDataSource(*server.address)
+    try:
+        src.start()
+        analyser.run(duration=0.3)
+        assert wait_for(lambda: np.max(np.abs(src.get_data() - analyser.live_power_levels)) <= 0.0051, 1.0)
+        assert len(src.get_data()) == 1000 and src.start_freq == 2400e6
+        assert src.frames_received >= 2
+        analyser.stop()                 # closes the server after sending the last event
+        assert wait_for(lambda: (src.last_event or "").startswith("Stopped after"), 1.0), src.last_event
+    finally:
+        analyser.stop()
+        src.stop()
+    print(f"  {src.frames_received} frames received from the headless node  ✓")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Frame Server Tests")
+    print("=" * 60)
+    test_quantise_and_delta_round_trip()
+    test_stream_to_network_source_with_grid_change()
+    test_slow_client_drops_old_frames()
+    test_headless_serves_frames()
+    print("\nAll tests passed.")
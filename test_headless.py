@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Tests for the headless acquisition daemon (no Qt or hardware required)."""
+
+import json
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+from core.calibration_manager import CalibrationManager
+from core.headless import HeadlessAnalyser, DirectorySink, SocketSink, load_preset
+from datasources.sweep_file import SweepFileDataSource
+
+_ROOT = Path(__file__).resolve().parent
+_PRESETS = {
+    "1": {"name": "Sim Band", "settings": {
+        "source_type": "sim_samples", "freq_start": 95e6, "freq_stop": 105e6,
+        "avg_mode": "exp", "avg_n": 4, "fft_size": 2048, "window_type": "hanning",
+        "max_hold_enabled": True, "peak_excursion": 6.0}},
+    "2": {"name": "Sim Sweep", "settings": {
+        "source_type": "sim_sweep", "freq_start": 2400e6, "freq_stop": 2500e6,
+        "avg_mode": "off", "avg_n": 1, "sweep_bin_size": 100000}},
+}
+
+
+def _preset_file(directory: Path) -> Path:
+    path = directory / "presets.json"
+    path.write_text(json.dumps(_PRESETS))
+    return path
+
+
+def _calibration(offset_db: float) -> CalibrationManager:
+    cal = CalibrationManager()
+    cal._cal = {"sim_samples": {"offset_db": offset_db}}    # in memory only
+    return cal
+
+
+def test_load_preset():
+    """Presets are found by slot or by name."""
+    print("### preset lookup ###")
+    with tempfile.TemporaryDirectory() as d:
+        path = _preset_file(Path(d))
+        assert load_preset("2", path)[0] == "Sim Sweep"
+        name, settings = load_preset("sim band", path)
+        assert name == "Sim Band" and settings["fft_size"] == 2048
+        try:
+            load_preset("missing", path)
+            raise AssertionError("expected KeyError")
+        except KeyError:
+            pass
+    print("  by slot and by name  ✓")
+
+
+def test_directory_output_with_cal_and_tare():
+    """Frames replay as a sweep recording; calibration, tare and peaks are applied."""
+    print("### directory sink ###")
+    with tempfile.TemporaryDirectory() as d:
+        out = Path(d) / "run"
+        _, settings = load_preset("1", _preset_file(Path(d)))
+        analyser = HeadlessAnalyser(settings, [DirectorySink(out)], calibration=_calibration(10.0))
+        analyser.start()
+        src = analyser.current_source
+        assert src.sample_count == 2048 and src._averager.is_active
+        stats = analyser.run(max_frames=20)
+        untared_peak = float(np.max(analyser.live_power_levels))
+        analyser.tare_state.collecting = True
+        analyser.run(max_frames=40)
+        assert analyser.tare_active
+        analyser.stop()
+        assert stats['frames'] == 20 and stats['fps'] > 0
+
+        rec = SweepFileDataSource(out / "frames_001.sweeps")
+        rec.start()
+        assert rec.bins == 2048 and rec._rows == 60
+        assert abs(np.max(rec._data[19]) - untared_peak) < 1e-3
+        assert abs(np.median(rec._data[59])) < 3.0            # normalised to the baseline
+        meta = json.loads((out / "frames_001.json").read_text())
+        assert meta["source"] == "sim_samples" and meta["cal_offset_db"] == 10.0
+
+        peaks = [json.loads(line) for line in (out / "peaks.jsonl").read_text().splitlines()]
+        assert len(peaks) == 60 and len(peaks[0]["peaks"]) > 0
+        events = [json.loads(line)["event"] for line in (out / "events.jsonl").read_text().splitlines()]
+        assert events[0].startswith("Started sim_samples") and "cal +10.0 dB" in events[0]
+        assert any("Tare active" in e for e in events)
+    print(f"  60 frames replayable, tare and cal applied, {stats['fps']:.0f} fps  ✓")
+
+
+def test_socket_output_and_sweep_dedupe():
+    """Socket clients receive JSON lines; repeated sweeps are not re-sent."""
+    print("### socket sink ###")
+    with tempfile.TemporaryDirectory() as d:
+        path = Path(d) / "headless.sock"
+        _, settings = load_preset("Sim Sweep", _preset_file(Path(d)))
+        sink = SocketSink(path)
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(str(path))
+        received = bytearray()
+
+        def read():
+            while chunk := client.recv(1 << 20):
+                received.extend(chunk)
+
+        reader = threading.Thread(target=read, daemon=True)
+        reader.start()
+        analyser = HeadlessAnalyser(settings, [sink])
+        analyser.start()
+        stats = analyser.run(duration=0.5)
+        assert sink.client_count == 1
+        analyser.stop()
+        reader.join(timeout=2.0)
+        client.close()
+        messages = [json.loads(line) for line in received.decode().splitlines()]
+        frames = [m for m in messages if m["type"] == "frame"]
+        assert len(frames) == stats['frames'] > 0
+        assert len(frames[0]["power"]) == 1000 and frames[0]["start"] == 2400e6
+        assert frames[0]["segments"] == [[2400e6, frames[0]["stop"], 1000]]
+        assert messages[-1] == {"type": "event", "t": messages[-1]["t"],
+                                "event": f"Stopped after {stats['frames']} frames"}
+        assert not path.exists()
+
+        path.write_text("not a socket")
+        try:
+            SocketSink(path)
+            raise AssertionError("expected FileExistsError for a regular file")
+        except FileExistsError:
+            pass
+        assert path.read_text() == "not a socket"
+        path.unlink()
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(path))
+        stale.close()                        # a crashed run leaves its socket file behind
+        SocketSink(path).close()
+        assert not path.exists()
+    print(f"  {len(frames)} sweeps delivered over the socket  ✓")
+
+
+def test_no_gui_imports():
+    """The daemon runs without importing PyQt6, pyqtgraph or vispy."""
+    print("### no GUI imports ###")
+    with tempfile.TemporaryDirectory() as d:
+        presets = _preset_file(Path(d))
+        code = (
+            "import sys, headless\n"
+            f"rc = headless.main(['--preset', '1', '--presets', {str(presets)!r}, '--frames', '10'])\n"
+            "gui = [m for m in sys.modules if m.split('.')[0] in ('PyQt6', 'pyqtgraph', 'vispy')]\n"
+            "print('GUI', gui)\n"
+            "sys.exit(rc)\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=_ROOT, capture_output=True,
+                                text=True, timeout=60)
+        assert result.returncode == 0, result.stderr
+        assert "GUI []" in result.stdout, result.stdout
+        assert "10 frames" in result.stdout
+    print("  10 frames with no GUI modules loaded  ✓")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Headless Daemon Tests")
+    print("=" * 60)
+    test_load_preset()
+    test_directory_output_with_cal_and_tare()
+    test_socket_output_and_sweep_dedupe()
+    test_no_gui_imports()
+    print("\nAll tests passed.")
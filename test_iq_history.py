@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Tests for the retroactive IQ history ring and its background dump (no Qt required)."""
+
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from core.iq_history import IQHistory
+
+
+class _FakeSource:
+    """Minimal stream-publishing source: just the attributes IQHistory reads."""
+
+    def __init__(self, sample_rate: float, centre_freq: float):
+        self.sample_rate = sample_rate
+        self.centre_freq = centre_freq
+        self.consumers = []
+
+    def add_stream_consumer(self, consumer):
+        self.consumers.append(consumer)
+
+    def remove_stream_consumer(self, consumer):
+        self.consumers = [c for c in self.consumers if c != consumer]
+
+    def publish(self, samples):
+        for c in self.consumers:
+            c(samples)
+
+
+def _ramp(start: int, n: int) -> np.ndarray:
+    k = np.arange(start, start + n, dtype=np.float32)
+    return (k + 1j * -k).astype(np.complex64)
+
+
+def _wait_for_saves() -> None:
+    for t in threading.enumerate():
+        if t.name == "iq-history-save":
+            t.join(timeout=5.0)
+
+
+def test_ring_keeps_latest_in_order():
+    """After wrapping, the dump holds exactly the newest N seconds, oldest first."""
+    print("### ring order ###")
+    src = _FakeSource(1000.0, 100e6)
+    hist = IQHistory(seconds=2.0)                  # 2000 samples
+    hist.attach(src)
+    for i in range(0, 5300, 300):
+        src.publish(_ramp(i, 300))
+    assert abs(hist.duration - 2.0) < 1e-9
+    with tempfile.TemporaryDirectory() as d:
+        path = hist.save_async(Path(d) / "cap.cf32")
+        _wait_for_saves()
+        data = np.fromfile(path, dtype=np.complex64)
+        assert np.array_equal(data, _ramp(5400 - 2000, 2000)), data[:4]
+    print(f"  {len(data)} samples, first={data[0].real:.0f}  ✓")
+
+
+def test_sidecar_metadata():
+    """The JSON sidecar carries centre, rate, sample count and timestamp."""
+    print("### sidecar ###")
+    src = _FakeSource(2_000_000.0, 433.92e6)
+    hist = IQHistory(seconds=0.5)
+    hist.attach(src)
+    src.publish(_ramp(0, 250_000))
+    with tempfile.TemporaryDirectory() as d:
+        path = hist.save_async(Path(d) / "cap.cf32")
+        _wait_for_saves()
+        meta = json.loads(path.with_suffix('.json').read_text())
+        assert meta["format"] == "cf32"
+        assert meta["sample_rate"] == 2_000_000.0
+        assert meta["centre_freq"] == 433.92e6
+        assert meta["samples"] == 250_000 == path.stat().st_size // 8
+        assert "timestamp" in meta
+    print(f"  {meta['duration_s']:.3f} s @ {meta['centre_freq'] / 1e6:.2f} MHz  ✓")
+
+
+def test_capture_continues_after_save():
+    """Saving keeps the history; samples overwritten during the copy are dropped, not mixed in."""
+    print("### save keeps the history ###")
+    src = _FakeSource(1000.0, 100e6)
+    hist = IQHistory(seconds=1.0)
+    hist.attach(src)
+    src.publish(_ramp(0, 1000))
+    with tempfile.TemporaryDirectory() as d:
+        path = hist.save_async(Path(d) / "cap.cf32")
+        src.publish(_ramp(1000, 400))                # may arrive while the ring is copied
+        _wait_for_saves()
+        data = np.fromfile(path, dtype=np.complex64)
+        meta = json.loads(path.with_suffix('.json').read_text())
+        assert 600 <= len(data) <= 1000 and meta["samples"] == len(data)
+        assert np.array_equal(data, _ramp(1000 - len(data), len(data)))
+        assert abs(hist.duration - 1.0) < 1e-9
+        again = hist.save_async(Path(d) / "again.cf32")
+        _wait_for_saves()
+        assert np.array_equal(np.fromfile(again, dtype=np.complex64), _ramp(400, 1000))
+    print(f"  first save {len(data)} samples, second save the latest 1000  ✓")
+
+
+def test_gap_restarts_history():
+    """A block arriving well after the previous one starts a new, contiguous history."""
+    print("### gap ###")
+    src = _FakeSource(1000.0, 100e6)
+    hist = IQHistory(seconds=2.0)
+    hist.attach(src)
+    src.publish(_ramp(0, 100))
+    src.publish(_ramp(100, 100))                      # early blocks are not gaps
+    assert abs(hist.duration - 0.2) < 1e-9
+    time.sleep(0.5)                                   # 0.1 s block, 0.4 s late
+    src.publish(_ramp(5000, 100))
+    assert abs(hist.duration - 0.1) < 1e-9 and hist.gaps == 1
+    with tempfile.TemporaryDirectory() as d:
+        path = hist.save_async(Path(d) / "cap.cf32")
+        _wait_for_saves()
+        assert np.array_equal(np.fromfile(path, dtype=np.complex64), _ramp(5000, 100))
+    print("  history restarted after the gap  ✓")
+
+
+def test_retune_and_detach():
+    """A retune restarts the history; detach unregisters and empties it."""
+    print("### retune / detach ###")
+    src = _FakeSource(1000.0, 100e6)
+    hist = IQHistory(seconds=1.0)
+    hist.attach(src)
+    src.publish(_ramp(0, 800))
+    src.centre_freq = 101e6
+    src.publish(_ramp(0, 100))
+    assert abs(hist.duration - 0.1) < 1e-9
+    hist.detach()
+    assert src.consumers == []
+    assert hist.save_async() is None
+    print("  retune cleared, detach emptied  ✓")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("IQ History Tests")
+    print("=" * 60)
+    test_ring_keeps_latest_in_order()
+    test_sidecar_metadata()
+    test_capture_continues_after_save()
+    test_gap_restarts_history()
+    test_retune_and_detach()
+    print("\nAll tests passed.")
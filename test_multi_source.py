@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Tests for concurrent sources and their shared CPU budget (no Qt or hardware required)."""
+
+import time
+
+import fakes
+fakes.install()
+
+import numpy as np
+from core.multi_source import CpuBudget, SourceGroup, frame_skew
+from testing_utils import wait_for
+
+_SAMPLES = {"source_type": "sim_samples", "freq_start": 95e6, "freq_stop": 105e6,
+            "fft_size": 2048, "max_hold_enabled": True}
+_SWEEP = {"source_type": "sim_sweep", "freq_start": 2400e6, "freq_stop": 2500e6,
+          "sweep_bin_size": 100000}
+_WIDEBAND = {"source_type": "hackrf_wideband", "freq_start": 400e6, "freq_stop": 600e6,
+             "sweep_bin_size": 30000}
+
+
+def test_budget_shares():
+    """Each channel gets an equal share; only frames over it are made to wait."""
+    print("### CPU budget ###")
+    budget = CpuBudget(cores=1.0)
+    assert budget.share == 1.0
+    for name in ("a", "b", "c", "d"):
+        budget.register(name)
+    assert budget.share == 0.25
+    assert abs(budget.charge(0.01, 0.01) - 0.03) < 1e-9      # 10 ms of CPU per 40 ms
+    assert budget.charge(0.01, 0.05) == 0.0                 # already within its share
+    budget.unregister("d")
+    budget.unregister("d")
+    assert abs(budget.share - 1 / 3) < 1e-9
+    try:
+        CpuBudget(cores=0)
+        raise AssertionError("expected ValueError for an empty budget")
+    except ValueError:
+        pass
+    print("  equal shares, waits only over the share  ✓")
+
+
+def test_sources_run_concurrently():
+    """A sample and a sweep source run at once, each with its own pipeline, into one snapshot."""
+    print("### concurrent sources ###")
+    group = SourceGroup()
+    try:
+        group.add("Sim", _SAMPLES)
+        group.add("Sim", _SWEEP)
+        assert [c.name for c in group.channels] == ["Sim", "Sim 2"]
+        assert wait_for(lambda: all(c.frames >= 3 for c in group.channels), 5.0)
+        frames = group.snapshot()
+        assert [f.name for f in frames] == ["Sim", "Sim 2"]
+        samples, sweep = frames
+        assert 95e6 <= samples.freqs[0] < samples.freqs[-1] <= 105e6
+        assert 2400e6 <= sweep.freqs[0] < sweep.freqs[-1] <= 2500e6
+        assert len(samples.power) == len(samples.freqs) and len(sweep.power) == len(sweep.freqs)
+        assert samples.max_power is not None and sweep.max_power is None     # per-channel holds
+        assert np.all(samples.max_power >= samples.power - 1e-6)
+        assert all(abs(time.time() - f.timestamp) < 1.0 for f in frames)
+        assert frame_skew(frames) < 1.0
+        again = group.snapshot()
+        assert wait_for(lambda: group.snapshot()[0].seq > again[0].seq, 2.0)
+        group.remove("Sim")
+        assert [c.name for c in group.channels] == ["Sim 2"]
+        try:
+            group.add("Network", {"source_type": "network"})
+            raise AssertionError("expected ValueError for a source a channel cannot run")
+        except ValueError:
+            pass
+        assert len(group) == 1
+    finally:
+        channels = list(group.channels)
+        group.clear()
+    assert not group.channels and not any(c.is_running for c in channels)
+    print(f"  {samples.seq} sample and {sweep.seq} sweep frames, "
+          f"{1000 * frame_skew(frames):.0f} ms apart  ✓")
+
+
+def test_greedy_source_is_throttled():
+    """A source over its CPU share waits, and a cheap one keeps its frame rate."""
+    print("### greedy source ###")
+    group = SourceGroup(cores=0.3)
+    try:
+        light = group.add("Light", _SAMPLES)
+        assert wait_for(lambda: light.frames >= 5, 5.0)
+        start, t0 = light.frames, time.monotonic()
+        time.sleep(1.0)
+        alone = (light.frames - start) / (time.monotonic() - t0)
+
+        heavy = group.add("Heavy", dict(_SAMPLES, fft_size=1048576))
+        assert wait_for(lambda: heavy.frames >= 2, 10.0)
+        start, t0 = light.frames, time.monotonic()
+        time.sleep(1.5)
+        shared = (light.frames - start) / (time.monotonic() - t0)
+        assert heavy.throttled > 0 and light.throttled == 0
+        assert shared > 0.7 * alone, (alone, shared)
+    finally:
+        group.clear()
+    print(f"  cheap source {alone:.0f} → {shared:.0f} fps beside a 1M-point FFT, "
+          f"which waited after {heavy.throttled} of {heavy.frames} frames  ✓")
+
+
+def test_sweep_thread_is_throttled():
+    """A source sweeping on its own thread is charged for it and paused between hops."""
+    print("### sweeping thread ###")
+    results = []
+    for cores in (4.0, 0.2):
+        group = SourceGroup(cores=cores)
+        try:
+            channel = group.add("Wideband", _WIDEBAND)
+            src = channel.analyser.current_source
+            assert src.cpu_meter is not None
+            assert wait_for(lambda: src.sweep_count >= 1, 10.0)
+            start, t0 = src.sweep_count, time.monotonic()
+            time.sleep(2.0)
+            results.append(((src.sweep_count - start) / (time.monotonic() - t0), channel.throttled))
+        finally:
+            group.clear()
+    (free, free_waits), (paced, paced_waits) = results
+    assert free_waits == 0 and paced_waits > 0, results
+    assert paced < 0.5 * free, results
+    print(f"  {free:.1f} → {paced:.1f} sweeps/s on a 0.2-core budget, "
+          f"{paced_waits} budget waits  ✓")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Multi-Source Tests")
+    print("=" * 60)
+    test_budget_shares()
+    test_sources_run_concurrently()
+    test_greedy_source_is_throttled()
+    test_sweep_thread_is_throttled()
+    print("\nAll tests passed.")
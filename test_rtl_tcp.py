@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Tests for the rtl_tcp sample source against the fake rtl_tcp server (no Qt or hardware required)."""
+
+import time
+
+import numpy as np
+from datasources.rtl_tcp import (RtlTcpSamplesDataSource, CMD_SET_FREQ, CMD_SET_GAIN,
+                                 CMD_SET_GAIN_MODE, CMD_SET_SAMPLE_RATE, rtl2832_rate)
+from fakes.rtl_tcp import RtlTcpServer
+from testing_utils import wait_for
+
+
+def _peak(src) -> float:
+    power, freqs = src.get_power_levels()
+    return freqs[int(np.argmax(power))]
+
+
+def test_stream_converts_and_keeps_up():
+    """cu8 is converted block by block into the ring at the full stream rate."""
+    print("### stream ###")
+    server = RtlTcpServer(port=0)
+    src = RtlTcpSamplesDataSource(2_400_000, 100_000_000, *server.address)
+    blocks = []
+    src.add_stream_consumer(lambda block: blocks.append(block.copy()))
+    try:
+        src.start()
+        assert src.tuner == "R820T" and src.gain_count == 29
+        assert src.sample_rate == rtl2832_rate(2_400_000)
+        t0 = time.monotonic()
+        assert abs(_peak(src) - 100e6) < src.sample_rate / src.fft_size
+        time.sleep(0.5)
+        elapsed = time.monotonic() - t0
+        stats = src.get_stats()
+        rate = stats['samples'] / elapsed
+        assert rate > 0.8 * src.sample_rate, stats
+        assert blocks and all(b.dtype == np.complex64 and len(b) == src.BLOCK_SAMPLES for b in blocks)
+        assert np.all(np.abs(blocks[-1].real) <= 1.0)
+    finally:
+        src.stop()
+        server.close()
+    print(f"  {rate / 1e6:.2f} MS/s received, {len(blocks)} blocks published  ✓")
+
+
+def test_commands_without_reconnecting():
+    """Retuning, rate and gain go over the open connection and stale samples are skipped."""
+    print("### commands ###")
+    server = RtlTcpServer(port=0)
+    src = RtlTcpSamplesDataSource(2_048_000, 98_000_000, *server.address)
+    try:
+        src.start()
+        assert abs(_peak(src) - 98.5e6) < src.sample_rate / src.fft_size    # FM broadcast carrier
+        src.update_frequency(1_024_000, 100_200_000)
+        src.set_gain(20)
+        assert abs(_peak(src) - 100e6) < src.sample_rate / src.fft_size
+        assert src.sample_rate == 1_024_000
+        assert server.clients == 1
+        assert (CMD_SET_FREQ, 100_200_000) in server.commands
+        assert (CMD_SET_SAMPLE_RATE, 1_024_000) in server.commands
+        assert server.commands[-2:] == [(CMD_SET_GAIN_MODE, 1), (CMD_SET_GAIN, 200)]
+        assert wait_for(lambda: server.device.gain == 20.0, 1.0)
+        assert server.device.centre == 100.2e6
+    finally:
+        src.stop()
+        server.close()
+    print("  retuned, rate and gain changed on one connection  ✓")
+
+
+def test_reconnect_resends_settings():
+    """A dropped connection is re-established with the current settings."""
+    print("### reconnect ###")
+    server = RtlTcpServer(port=0)
+    src = RtlTcpSamplesDataSource(2_048_000, 100_000_000, *server.address)
+    src.RECONNECT_S = 0.1
+    try:
+        src.start()
+        src.update_centre_frequency(433_500_000)
+        server.drop_client()
+        assert wait_for(lambda: server.clients == 2 and src.connected, 2.0)
+        assert abs(_peak(src) - 433.92e6) < src.sample_rate / src.fft_size
+        assert server.device.centre == 433.5e6 and src.get_stats()['reconnects'] == 1
+    finally:
+        src.stop()
+        server.close()
+    print("  reconnected and retuned to 433.5 MHz  ✓")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("rtl_tcp Source Tests")
+    print("=" * 60)
+    test_stream_converts_and_keeps_up()
+    test_commands_without_reconnecting()
+    test_reconnect_resends_settings()
+    print("\nAll tests passed.")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Tests for the synthetic sample and sweep sources (no Qt or hardware required)."""
+
+import time
+
+import numpy as np
+from datasources.simulated import (SimulatedSamplesDataSource, SimulatedSweepDataSource,
+                                   synthesise_iq, synthesise_sweeps)
+
+_RATE = 10e6
+
+
+def test_tones_land_on_their_bins():
+    """Tone positions and levels come out where the scenario puts them."""
+    print("### tone placement ###")
+    n = 1 << 16
+    scenario = ({"kind": "tone", "position": 0.25, "level": -20.0},
+                {"kind": "tone", "position": -0.1, "level": -40.0})
+    iq = synthesise_iq(_RATE, n, scenario, noise_floor=-90.0, rng=np.random.default_rng(1))
+    assert iq.dtype == np.complex64 and len(iq) == n
+    spectrum = np.abs(np.fft.fft(iq)) ** 2 / n ** 2
+    freqs = np.fft.fftfreq(n, 1 / _RATE)
+    top = np.argsort(spectrum)[-2:]
+    assert np.allclose(sorted(freqs[top] / _RATE), [-0.1, 0.25], atol=1 / n)
+    assert abs(10 * np.log10(spectrum[top[-1]]) + 20.0) < 0.1
+    assert abs(10 * np.log10(spectrum[top[-2]]) + 40.0) < 0.1
+    print("  two tones at −20 / −40 dB  ✓")
+
+
+def test_bank_wraps_seamlessly():
+    """Tone and FM frequencies are snapped so the bank is periodic."""
+    print("### periodic bank ###")
+    n = 1 << 15
+    scenario = ({"kind": "tone", "position": 0.123, "level": 0.0},
+                {"kind": "fm", "position": -0.2, "level": 0.0, "deviation": 0.01, "rate": 777.0})
+    iq = synthesise_iq(_RATE, n, scenario, noise_floor=-200.0, rng=np.random.default_rng(2))
+    step = np.abs(np.diff(iq)).max()
+    assert abs(iq[0] - iq[-1]) <= step * 1.01, (abs(iq[0] - iq[-1]), step)
+    print("  wrap step within one sample step  ✓")
+
+
+def test_wideband_burst_and_hop():
+    """OFDM, burst and hopping components occupy their bands."""
+    print("### wideband components ###")
+    n = 1 << 18
+    scenario = ({"kind": "ofdm", "position": 0.2, "level": -20.0, "width": 0.1},
+                {"kind": "burst", "position": -0.2, "level": -20.0, "width": 0.05,
+                 "period": 0.004, "duty": 0.25},
+                {"kind": "hop", "position": -0.45, "level": -20.0, "spacing": 0.02,
+                 "channels": 4, "dwell": 0.001})
+    iq = synthesise_iq(_RATE, n, scenario, noise_floor=-80.0, rng=np.random.default_rng(3))
+    psd = np.abs(np.fft.fftshift(np.fft.fft(iq))) ** 2
+    frac = np.fft.fftshift(np.fft.fftfreq(n))
+    ofdm = (frac > 0.16) & (frac < 0.24)
+    quiet = (frac > 0.3) & (frac < 0.4)
+    assert psd[ofdm].mean() > 1000 * psd[quiet].mean()
+    burst_band = (frac > -0.22) & (frac < -0.18)
+    assert psd[burst_band].mean() > 100 * psd[quiet].mean()
+    for ch in range(4):
+        f = -0.45 + 0.02 * ch
+        assert psd[np.abs(frac - f) < 0.002].max() > 1000 * psd[quiet].mean(), ch
+    print("  OFDM, burst and 4 hop channels present  ✓")
+
+
+def test_sample_source_throughput():
+    """Frames come from the precomputed bank, far faster than real time."""
+    print("### sample source throughput ###")
+    src = SimulatedSamplesDataSource(sample_rate=_RATE, centre_freq=100e6, seed=4)
+    src.start()
+    src.set_pacing("fast")
+    t0 = time.perf_counter()
+    for _ in range(500):
+        power, freqs = src.get_power_levels()
+    elapsed = time.perf_counter() - t0
+    assert len(power) == 1024 and freqs[0] < 100e6 < freqs[-1]
+    assert elapsed < 1.0, f"{elapsed:.2f}s for 500 frames"
+    src.update_frequency(2e6, 101e6)
+    assert src.duration == src._length / 2e6
+    src.stop()
+    print(f"  500 frames in {elapsed * 1e3:.0f} ms  ✓")
+
+
+def test_sweep_source():
+    """The sweep bank has the requested grid, bursts come and go and hops move."""
+    print("### sweep source ###")
+    freqs = np.linspace(2.4e9, 2.5e9, 1000)
+    scenario = ({"kind": "burst", "position": 0.0, "level": -40.0, "width": 0.02,
+                 "period": 0.37, "duty": 0.3},
+                {"kind": "hop", "position": -0.4, "level": -40.0, "spacing": 0.05,
+                 "channels": 6, "dwell": 0.05})
+    bank = synthesise_sweeps(freqs, 64, 20.0, scenario, noise_floor=-95.0,
+                             rng=np.random.default_rng(5))
+    assert bank.shape == (64, 1000) and bank.dtype == np.float32
+    assert abs(np.median(bank) + 95.0) < 1.0
+    burst_on = bank[:, 495:505].max(axis=1) > -70.0
+    assert 0 < burst_on.sum() < 64
+    hop_cols = np.argmax(bank[:, :400], axis=1)
+    assert len(np.unique(hop_cols)) == 6
+
+    src = SimulatedSweepDataSource(2.4e9, 2.5e9, bin_size=100_000, seed=6)
+    src.start()
+    assert src.get_number_of_points() == 1000 and len(src.get_data()) == 1000
+    src.stop()
+    assert len(src.get_data()) == 0
+    print("  bursts in some sweeps, 6 hop channels  ✓")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Simulated Source Tests")
+    print("=" * 60)
+    test_tones_land_on_their_bins()
+    test_bank_wraps_seamlessly()
+    test_wideband_burst_and_hop()
+    test_sample_source_throughput()
+    test_sweep_source()
+    print("\nAll tests passed.")
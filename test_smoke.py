@@ -175,6 +175,73 @@ def _test_trace_averager_reset():
 check("TraceAverager reset clears NaN buffer", _test_trace_averager_reset)
 
 
+def _test_sample_ring():
+    from utils.signal_processing import SampleRing
+    ring = SampleRing(8)
+    history = []
+    for n in (3, 5, 7, 0, 20, 1):
+        chunk = np.arange(len(history), len(history) + n, dtype=np.float32)
+        history.extend(chunk)
+        ring.write(chunk)
+        assert np.array_equal(ring.latest(), np.array(history[-8:], dtype=np.float32))
+    assert ring.total == len(history)
+    assert np.array_equal(ring.since(len(history) - 2), history[-2:])
+
+check("SampleRing keeps the newest samples contiguous across wrap", _test_sample_ring)
+
+
+def _test_minmax_envelope():
+    from utils.signal_processing import minmax_envelope
+    sig = np.zeros(100_000, dtype=np.float32)
+    sig[54_321] = 5.0                  # single-sample spike
+    x, y = minmax_envelope(sig, 500, 1e-6)
+    assert len(x) == len(y) == 1000
+    assert y.max() == 5.0, "spike lost in decimation"
+    x, y = minmax_envelope(sig[:600], 500)
+    assert len(y) == 600, "short traces should pass through unchanged"
+
+check("minmax_envelope preserves spikes and passes short traces through", _test_minmax_envelope)
+
+
+# ------------------------------------------------------------------
+# Colour maps
+# ------------------------------------------------------------------
+print("\n── Colour maps ──")
+
+
+def _test_colour_map_lookup():
+    from utils import colour_maps
+    lut = colour_maps.lut('gqrx', 64)
+    assert lut.shape == (64, 4) and lut.dtype == np.float32
+    assert colour_maps.lut('gqrx', 64) is lut, "table not cached"
+    rgba = colour_maps.map_values(np.array([-200.0, np.nan, -50.0, 10.0]),
+                                  -100.0, 0.0, 'gqrx', byte=True)
+    assert rgba.dtype == np.uint8 and rgba.shape == (4, 4)
+    assert tuple(rgba[0]) == (0, 0, 0, 255), "below range should clamp to first entry"
+    assert tuple(rgba[1]) == (0, 0, 0, 255), "NaN should map to first entry"
+    assert tuple(rgba[3]) == (255, 255, 255, 255), "above range should clamp to last entry"
+    hsv = colour_maps.lut('hsv', 6)
+    assert np.allclose(hsv[0, :3], (1, 0, 0)) and np.allclose(hsv[2, :3], (0, 1, 0))
+
+check("colour_maps tables are cached and lookups clamp / handle NaN", _test_colour_map_lookup)
+
+
+def _test_constellation_slicer():
+    from displays.constellation_2d import _slice, _CONST_REFS
+    rng = np.random.default_rng(0)
+    i = rng.normal(0, 0.8, 4000).astype(np.float32)
+    q = rng.normal(0, 0.8, 4000).astype(np.float32)
+    for mod, pts in _CONST_REFS.items():
+        d = np.stack([i, q], axis=1)[:, None, :] - pts[None, :, :]
+        brute = np.min(np.sum(d ** 2, axis=2), axis=1)
+        ref_i, ref_q = _slice(i, q, mod)
+        fast = (i - ref_i) ** 2 + (q - ref_q) ** 2
+        assert np.allclose(fast, brute, atol=1e-5), f"{mod} slicer disagrees with brute force"
+    assert _slice(i, q, "none") is None
+
+check("Constellation slicer matches brute-force nearest symbol", _test_constellation_slicer)
+
+
 # ------------------------------------------------------------------
 # FrequencyRange
 # ------------------------------------------------------------------
@@ -225,7 +292,7 @@ def _test_data_processor_methods():
     required = {
         'update_data', '_process_sample_data', '_process_sweep_data',
         '_process_constellation_data', '_process_zero_span_data',
-        '_find_top_peaks', '_nan_safe', '_apply_tare', '_apply_cal_offset',
+        '_nan_safe', '_apply_tare', '_apply_cal_offset',
         '_update_max_hold', '_update_min_hold', '_update_duty_cycle',
         '_update_peak_list', 'reset_sweep_averager',
         '_dispatch_widget_data', '_refresh_display',
@@ -237,7 +304,7 @@ check("DataProcessor has all required methods", _test_data_processor_methods)
 
 
 def _test_find_top_peaks():
-    from core.display_data_processor import DataProcessor
+    from utils.signal_processing import find_top_peaks
     freq  = np.linspace(88e6, 108e6, 1000)
     power = np.full(1000, -80.0)
     # Plant three proper peaks with a Gaussian shape so local maxima exist
@@ -247,7 +314,7 @@ def _test_find_top_peaks():
             if 0 <= idx + k < 1000:
                 power[idx + k] = amp - (k * k) * 0.3  # Gaussian drop-off
 
-    peaks = DataProcessor._find_top_peaks(
+    peaks = find_top_peaks(
         freq, power, n=5, min_sep_bins=30, min_excursion_db=5.0
     )
     assert len(peaks) == 3, f"Expected 3 peaks, got {len(peaks)}: {peaks}"
@@ -256,7 +323,7 @@ def _test_find_top_peaks():
     assert abs(peak_freqs[1] - 98e6) < 1e6, f"Peak 2 at {peak_freqs[1]/1e6:.1f} MHz"
     assert abs(peak_freqs[2] - 105e6) < 1e6, f"Peak 3 at {peak_freqs[2]/1e6:.1f} MHz"
 
-check("_find_top_peaks locates three planted Gaussian peaks", _test_find_top_peaks)
+check("find_top_peaks locates three planted Gaussian peaks", _test_find_top_peaks)
 
 
 def _test_nan_safe():
@@ -414,7 +481,7 @@ check("PresetManager loads and all slot labels are non-empty strings",
 # ------------------------------------------------------------------
 # Summary
 # ------------------------------------------------------------------
-total = 22
+total = 26
 print(f"\n{'=' * 60}")
 if errors:
     print(f"FAILED: {len(errors)} / {total} test(s)")
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Tests for the chunked sweep recorder and the sweep file replay source (no Qt required)."""
+
+import json
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import core.sweep_recorder as sweep_recorder
+from core.sweep_recorder import SweepRecorder
+from datasources.sweep_file import SweepFileDataSource
+from utils.frequency_helpers import grid_segments
+
+_BINS = 256
+
+
+def _sweep(k: int) -> np.ndarray:
+    """Flat −90 dB sweep with a single −20 dB peak at bin ``k``."""
+    row = np.full(_BINS, -90.0, dtype=np.float32)
+    row[k % _BINS] = -20.0
+    return row
+
+
+def _record(path: Path, rows: int, rate: float = 10.0, dtype: str = "float32",
+            finish: bool = True) -> SweepRecorder:
+    rec = SweepRecorder()
+    rec.start(100e6, 200e6, _BINS, dtype, path=path, source="hackrf_sweep")
+    for k in range(rows):
+        rec.append(_sweep(k), timestamp=1_700_000_000.0 + k / rate)
+    if finish:
+        rec.stop()
+    return rec
+
+
+def _advance(src: SweepFileDataSource, seconds: float) -> np.ndarray:
+    """Pretend ``seconds`` of wall-clock time passed since the last read."""
+    src._last_tick -= seconds
+    return src.get_data()
+
+
+def test_round_trip_and_chunk_growth():
+    """Rows survive many chunk extensions; duplicates are dropped; files are trimmed."""
+    print("### round trip ###")
+    saved = sweep_recorder._CHUNK_BYTES
+    sweep_recorder._CHUNK_BYTES = 1024          # 16-row chunks
+    try:
+        with tempfile.TemporaryDirectory() as d:
+            path = Path(d) / "survey.sweeps"
+            rec = SweepRecorder()
+            rec.start(100e6, 200e6, _BINS, "float32", path=path)
+            for k in range(100):
+                rec.append(_sweep(k), timestamp=1000.0 + k)
+                rec.append(_sweep(k), timestamp=1000.5 + k)   # same sweep polled again
+            assert rec.append(np.zeros(_BINS + 1)) is False
+            assert rec.rows == 100
+            rec.stop()
+            assert path.stat().st_size == 100 * _BINS * 4
+            assert path.with_suffix(".tidx").stat().st_size == 100 * 8
+            meta = json.loads(path.with_suffix(".json").read_text())
+            assert meta["rows"] == 100 and meta["complete"] and meta["bins"] == _BINS
+            data = np.fromfile(path, dtype=np.float32).reshape(100, _BINS)
+            assert np.array_equal(data[37], _sweep(37))
+            times = np.fromfile(path.with_suffix(".tidx"), dtype=np.float64)
+            assert np.array_equal(times, 1000.0 + np.arange(100))
+    finally:
+        sweep_recorder._CHUNK_BYTES = saved
+    print("  100 sweeps over 7 chunks  ✓")
+
+
+def test_float16_halves_size():
+    """float16 rows take half the space and keep dB values to within 0.05 dB."""
+    print("### float16 ###")
+    with tempfile.TemporaryDirectory() as d:
+        path = Path(d) / "half.sweeps"
+        rec = _record(path, 20, dtype="float16")
+        assert path.stat().st_size == 20 * _BINS * 2
+        src = SweepFileDataSource(path)
+        src.start()
+        assert src.bin_size == 100e6 / (_BINS - 1)
+        first = src.get_data()
+        assert first.dtype == np.float32
+        assert np.max(np.abs(first - _sweep(0))) < 0.05
+        assert rec.rows == 20
+    print("  2 bytes per bin  ✓")
+
+
+def test_replay_speed_seek_and_peak_hold():
+    """Rows are chosen by recorded time × speed; skipped rows are peak-held."""
+    print("### replay speed ###")
+    with tempfile.TemporaryDirectory() as d:
+        path = Path(d) / "survey.sweeps"
+        _record(path, 200, rate=10.0)               # 19.9 s of sweeps
+        src = SweepFileDataSource(path)
+        src.start()
+        assert abs(src.duration - 19.9) < 1e-6
+        assert np.argmax(src.get_data()) == 0
+        src.set_speed(10.0)
+        assert abs(src.sweep_rate - 100.0) < 1e-6
+        frame = _advance(src, 0.5)                   # 5 s of recording → row 50
+        peaks = np.flatnonzero(frame > -50.0)
+        assert np.array_equal(peaks, np.arange(1, 51)), peaks
+        src.seek(12.0)
+        frame = src.get_data()
+        assert np.array_equal(np.flatnonzero(frame > -50.0), [120])
+    print("  ×10 replay held 50 rows  ✓")
+
+
+def test_loop_and_end():
+    """Replay wraps when looping and holds the last row otherwise."""
+    print("### loop / end ###")
+    with tempfile.TemporaryDirectory() as d:
+        path = Path(d) / "survey.sweeps"
+        _record(path, 50, rate=10.0)                # 4.9 s
+        src = SweepFileDataSource(path)
+        src.start()
+        src.get_data()
+        frame = _advance(src, 5.4)                   # wraps to 0.5 s → row 5
+        assert np.argmax(frame) == 5 and not src.at_end
+        src.set_loop(False)
+        frame = _advance(src, 100.0)
+        assert src.at_end and frame[49] > -50.0
+        assert np.array_equal(_advance(src, 1.0), frame)
+    print("  loop and stop at end  ✓")
+
+
+def test_unfinished_recording_replays():
+    """A recording that was never stopped replays up to its last written row."""
+    print("### unfinished recording ###")
+    with tempfile.TemporaryDirectory() as d:
+        path = Path(d) / "crash.sweeps"
+        rec = _record(path, 30, finish=False)
+        rec._release()
+        meta = json.loads(path.with_suffix(".json").read_text())
+        assert not meta["complete"]
+        src = SweepFileDataSource(path)
+        src.start()
+        assert src._rows == 30, src._rows
+        assert abs(src.duration - 2.9) < 1e-6
+    print("  30 rows recovered  ✓")
+
+
+def test_band_set_grid_round_trip():
+    """A recording of bands with gaps replays on its own grid, and only that grid matches."""
+    print("### band set grid ###")
+    bands = np.concatenate((np.linspace(433e6, 434e6, 128), np.linspace(2400e6, 2500e6, 128)))
+    segments = grid_segments(bands)
+    with tempfile.TemporaryDirectory() as d:
+        path = Path(d) / "bands.sweeps"
+        rec = SweepRecorder()
+        rec.start(bands[0], bands[-1], len(bands), "float32", path=path, segments=segments)
+        assert rec.matches_grid(segments)
+        assert not rec.matches_grid(grid_segments(np.linspace(bands[0], bands[-1], len(bands))))
+        for k in range(3):
+            assert rec.append(_sweep(k), timestamp=1000.0 + k)
+        rec.stop()
+        src = SweepFileDataSource(path)
+        src.start()
+        assert np.array_equal(src.get_data(), _sweep(0))
+        assert np.allclose(src.frequency_grid, bands, rtol=0, atol=1e-3)
+    print("  2 bands replayed with their gap  ✓")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Sweep Recording Tests")
+    print("=" * 60)
+    test_round_trip_and_chunk_growth()
+    test_float16_halves_size()
+    test_replay_speed_seek_and_peak_hold()
+    test_loop_and_end()
+    test_unfinished_recording_replays()
+    test_band_set_grid_round_trip()
+    print("\nAll tests passed.")
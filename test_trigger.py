@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Tests for the streaming trigger engine and edge-timed duty cycle (no Qt required)."""
+
+import time
+
+import numpy as np
+from core.trigger import TriggerEngine, find_edges, apply_holdoff
+from core.duty_cycle import DutyCycleAnalyser
+
+_RATE = 1_000_000.0
+
+
+def _pulses(n: int, period: int, width: int, on: float = -20.0, off: float = -80.0) -> np.ndarray:
+    """Rectangular pulse train in dB starting with a rising edge at index 0."""
+    k = np.arange(n)
+    return np.where(k % period < width, on, off).astype(np.float32)
+
+
+def _feed(engine: TriggerEngine, values: np.ndarray, chunk: int) -> None:
+    for i in range(0, len(values), chunk):
+        engine.process(values[i:i + chunk], i)
+
+
+def test_hysteresis_rejects_chatter():
+    """Noise around the level produces one edge per real transition."""
+    print("### hysteresis ###")
+    rng = np.random.default_rng(1)
+    values = _pulses(10_000, 1000, 300, on=-50.0, off=-60.0)
+    values += rng.uniform(-0.8, 0.8, len(values)).astype(np.float32)
+    level = -50.5
+    naive = np.count_nonzero((values[:-1] < level) & (values[1:] >= level))
+    rises, falls, _ = find_edges(values, level, hysteresis=3.0, state=-1)
+    assert len(rises) == 10, f"rises={len(rises)}"
+    assert len(falls) == 10, f"falls={len(falls)}"
+    assert naive > len(rises), "test signal should chatter without hysteresis"
+    print(f"  {len(rises)} rises (naive crossings {naive})  ✓")
+
+
+def test_chunking_is_seamless():
+    """Edges found block-by-block match a single pass, including across block joins."""
+    print("### block carry ###")
+    values = _pulses(50_000, 777, 200)
+    whole = TriggerEngine()
+    whole.reset(_RATE)
+    whole.configure("rise", -50.0)
+    whole.process(values, 0)
+    split = TriggerEngine()
+    split.reset(_RATE)
+    split.configure("rise", -50.0)
+    _feed(split, values, 333)
+    assert np.array_equal(whole.triggers(), split.triggers())
+    r1, f1 = whole.edge_times()
+    r2, f2 = split.edge_times()
+    assert np.array_equal(r1, r2) and np.array_equal(f1, f2)
+    print(f"  {len(split.triggers())} triggers identical  ✓")
+
+
+def test_holdoff():
+    """Triggers inside the holdoff window are suppressed, also across blocks."""
+    print("### holdoff ###")
+    eng = TriggerEngine()
+    eng.reset(_RATE)
+    eng.configure("rise", -50.0, holdoff=2.5e-3)           # 2500 samples
+    _feed(eng, _pulses(20_000, 1000, 100), 1500)
+    trig = eng.triggers()
+    assert np.all(np.diff(trig) >= 2500), trig
+    assert np.array_equal(trig, np.arange(1000, 20_000, 3000)), trig   # no edge seen at 0
+    assert np.array_equal(apply_holdoff(np.arange(0, 20_000, 1000), 2500),
+                          np.arange(0, 20_000, 3000))
+    print("  triggers every 3 ms  ✓")
+
+
+def test_fall_and_pre_trigger_window():
+    """Falling triggers and the pre-trigger window placement."""
+    print("### fall trigger window ###")
+    eng = TriggerEngine()
+    eng.reset(_RATE)
+    eng.configure("fall", -50.0, pre_trigger=0.25)
+    values = _pulses(10_000, 2000, 500)
+    eng.process(values, 0)
+    assert np.array_equal(eng.triggers(), np.arange(500, 10_000, 2000))
+    start = eng.window_start(total=10_000, window=1000, available=10_000)
+    assert start == 8500 - 250, start
+    window = values[start:start + 1000]
+    assert window[249] > -50.0 and window[250] < -50.0
+    print(f"  window starts {start}  ✓")
+
+
+def test_duty_cycle_from_edges():
+    """DutyCycleAnalyser derives width, period and duty from shared edge times."""
+    print("### duty cycle from edges ###")
+    eng = TriggerEngine()
+    eng.reset(_RATE)
+    eng.configure("free_run", -50.0)
+    values = _pulses(100_000, 4000, 1000)
+    eng.process(values, 0)
+    dc = DutyCycleAnalyser()
+    dc.update_from_edges(*eng.edge_times(), values, -50.0)
+    assert abs(dc.period_s - 4e-3) < 1e-9, dc.period_s
+    assert abs(dc.pulse_width_s - 1e-3) < 1e-9, dc.pulse_width_s
+    assert abs(dc.duty_pct - 25.0) < 1e-6, dc.duty_pct
+    assert dc.on_power_dbm == -20.0 and dc.off_power_dbm == -80.0
+    assert "Period" in dc.get_readout()
+    print(f"  duty={dc.duty_pct:.1f}%  ✓")
+
+
+def test_throughput():
+    """Trigger evaluation keeps well ahead of a 20 MSPS stream."""
+    print("### throughput ###")
+    rng = np.random.default_rng(2)
+    values = (_pulses(2_000_000, 997, 300) + rng.normal(0, 1, 2_000_000)).astype(np.float32)
+    eng = TriggerEngine()
+    eng.reset(20e6)
+    eng.configure("rise", -50.0, hysteresis=3.0, holdoff=1e-4)
+    t0 = time.perf_counter()
+    _feed(eng, values, 65536)
+    elapsed = time.perf_counter() - t0
+    assert elapsed < 0.1, f"{elapsed:.3f}s for 0.1 s of stream"
+    print(f"  2 M samples in {elapsed * 1e3:.1f} ms  ✓")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Trigger Engine Tests")
+    print("=" * 60)
+    test_hysteresis_rejects_chatter()
+    test_chunking_is_seamless()
+    test_holdoff()
+    test_fall_and_pre_trigger_window()
+    test_duty_cycle_from_edges()
+    test_throughput()
+    print("\nAll tests passed.")
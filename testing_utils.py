@@ -0,0 +1,19 @@
+"""Helpers shared by the test scripts (not itself a test module)."""
+
+import time
+
+_POLL_S = 0.01
+
+
+def wait_for(predicate, timeout: float) -> bool:
+    """Poll ``predicate`` until it is true or ``timeout`` seconds pass.
+
+    Returns:
+        The predicate's last result, which is checked once more at the deadline.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(_POLL_S)
+    return bool(predicate())
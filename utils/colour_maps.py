@@ -0,0 +1,165 @@
+"""Shared colour-map lookup tables for the display widgets.
+
+Tables are built once per (name, size) and cached.  ``lut`` returns float32
+RGBA in 0–1 (for OpenGL / VisPy vertex colours) and ``lut_u8`` returns uint8
+RGBA (for pyqtgraph ``ImageItem.setLookupTable`` and image export).  Colour
+lookup is then a single integer gather via ``to_indices`` / ``map_values``.
+
+Named maps:
+    gqrx      — black → blue → cyan → yellow → red → white (gqrx waterfall)
+    blue_red  — linear blue → red (surface display)
+    rainbow   — blue → cyan → green → yellow → red at full value (ribbon display)
+    hsv       — full-saturation hue wheel, hue = i / n
+    anything else is resolved through ``pyqtgraph.colormap.get`` (magma,
+    viridis, inferno, plasma, CET-L1, CET-R4, ...)
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+DEFAULT_SIZE = 256
+
+# Stop tables for maps that are not provided by pyqtgraph: (positions, RGBA 0–255)
+_STOP_MAPS = {
+    "gqrx": (
+        [0.0, 0.20, 0.40, 0.60, 0.80, 1.0],
+        [
+            [  0,   0,   0, 255],
+            [  0,   0, 200, 255],
+            [  0, 200, 200, 255],
+            [200, 200,   0, 255],
+            [200,   0,   0, 255],
+            [255, 255, 255, 255],
+        ],
+    ),
+    "blue_red": (
+        [0.0, 1.0],
+        [
+            [  0,   0, 255, 255],
+            [255,   0,   0, 255],
+        ],
+    ),
+    "rainbow": (
+        [0.0, 0.25, 0.50, 0.75, 1.0],
+        [
+            [  0,   0, 255, 255],
+            [  0, 255, 255, 255],
+            [  0, 255,   0, 255],
+            [255, 255,   0, 255],
+            [255,   0,   0, 255],
+        ],
+    ),
+}
+
+
+# ------------------------------------------------------------------
+# Builders
+# ------------------------------------------------------------------
+
+def hsv_to_rgb(hsv: np.ndarray) -> np.ndarray:
+    """Vectorised HSV → RGB for arrays whose last axis is (h, s, v) in 0–1.
+
+    Args:
+        hsv: Array of shape (..., 3).
+
+    Returns:
+        float32 array of shape (..., 3).
+    """
+    hsv = np.asarray(hsv, dtype=np.float32)
+    h, s, v = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+    i = np.floor(h * 6.0)
+    f = h * 6.0 - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i = i.astype(np.int32) % 6
+
+    r = np.choose(i, [v, q, p, p, t, v])
+    g = np.choose(i, [t, v, v, q, p, p])
+    b = np.choose(i, [p, p, t, v, v, q])
+    return np.stack([r, g, b], axis=-1).astype(np.float32)
+
+
+def _from_stops(positions, colours, n: int) -> np.ndarray:
+    pos = np.asarray(positions, dtype=np.float64)
+    col = np.asarray(colours, dtype=np.float64) / 255.0
+    x = np.linspace(0.0, 1.0, n)
+    return np.stack([np.interp(x, pos, col[:, c]) for c in range(4)], axis=1)
+
+
+def _build(name: str, n: int) -> np.ndarray:
+    if name in _STOP_MAPS:
+        return _from_stops(*_STOP_MAPS[name], n)
+    if name == "hsv":
+        rgba = np.ones((n, 4), dtype=np.float32)
+        hue = np.arange(n, dtype=np.float32) / n
+        rgba[:, :3] = hsv_to_rgb(np.stack([hue, np.ones(n), np.ones(n)], axis=1))
+        return rgba
+
+    import pyqtgraph as pg   # deferred so non-Qt callers can use the module
+    cmap = pg.colormap.get(name)
+    if cmap is None:
+        raise ValueError(f"unknown colour map '{name}'")
+    table = np.asarray(cmap.getLookupTable(nPts=n, alpha=True, mode='float'), dtype=np.float64)
+    if table.shape[1] == 3:
+        table = np.column_stack([table, np.ones(n)])
+    return table
+
+
+# ------------------------------------------------------------------
+# Cached tables
+# ------------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def lut(name: str, n: int = DEFAULT_SIZE) -> np.ndarray:
+    """Return a cached, read-only (n, 4) float32 RGBA table in 0–1.
+
+    Raises:
+        ValueError: if the colour map name is unknown.
+    """
+    table = np.clip(_build(name, n), 0.0, 1.0).astype(np.float32)
+    table.setflags(write=False)
+    return table
+
+
+@lru_cache(maxsize=None)
+def lut_u8(name: str, n: int = DEFAULT_SIZE) -> np.ndarray:
+    """Return a cached, read-only (n, 4) uint8 RGBA table."""
+    table = np.rint(lut(name, n) * 255.0).astype(np.uint8)
+    table.setflags(write=False)
+    return table
+
+
+# ------------------------------------------------------------------
+# Lookup helpers
+# ------------------------------------------------------------------
+
+def to_indices(values: np.ndarray, vmin: float, vmax: float,
+               n: int = DEFAULT_SIZE, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Scale values in [vmin, vmax] to integer LUT indices in [0, n-1].
+
+    Non-finite values map to index 0.
+    """
+    values = np.asarray(values, dtype=np.float32)
+    span = vmax - vmin
+    scale = (n - 1) / span if span != 0 else 0.0
+    idx = np.nan_to_num((values - vmin) * scale, nan=0.0, posinf=n - 1, neginf=0.0)
+    np.clip(idx, 0, n - 1, out=idx)
+    if out is None:
+        return idx.astype(np.intp)
+    out[...] = idx
+    return out
+
+
+def map_values(values: np.ndarray, vmin: float, vmax: float, name: str,
+               n: int = DEFAULT_SIZE, byte: bool = False) -> np.ndarray:
+    """Map values to RGBA through the named table.
+
+    Returns:
+        Array of shape values.shape + (4,), uint8 when ``byte`` is True,
+        otherwise float32 in 0–1.
+    """
+    table = lut_u8(name, n) if byte else lut(name, n)
+    return table[to_indices(values, vmin, vmax, n)]
@@ -15,6 +15,8 @@ class DisplayMode(IntEnum):
     ZERO_SPAN        = 7
     RIBBON           = 8
     DENSITY          = 9
+    BANDS            = 10
+    MULTI_SOURCE     = 11
 
 
 class FFTSize(IntEnum):
@@ -85,6 +87,11 @@ class FrequencyPresets:
     FM_RADIO_START = 88e6
     FM_RADIO_STOP = 108e6
 
+    # Band sets for the multi-band HackRF sweep: (start, stop) per band
+    ISM_BANDS = ((433.05e6, 434.79e6), (863e6, 870e6), (2400e6, 2500e6))
+    ISM_ALL_BANDS = ((433.05e6, 434.79e6), (863e6, 870e6), (902e6, 928e6),
+                     (2400e6, 2500e6), (5725e6, 5875e6))
+
     # Full-span extents for sweep sources
     HACKRF_SWEEP_FULL_START = 0
     HACKRF_SWEEP_FULL_STOP  = 7e9
@@ -170,6 +177,16 @@ class SourceType(str, Enum):
     RTL_SAMPLES = "rtl_samples"
     MICROPHONE_SAMPLES = "microphone_samples"
     HACKRF_SAMPLES = "hackrf_samples"
+    IQ_FILE = "iq_file"
+    SWEEP_FILE = "sweep_file"
+    SIM_SAMPLES = "sim_samples"
+    SIM_SWEEP = "sim_sweep"
+    NETWORK = "network"
+    SHARED_MEMORY = "shared_memory"
+    RTL_TCP = "rtl_tcp"
+    HACKRF_WIDEBAND = "hackrf_wideband"
+    HACKRF_ADAPTIVE = "hackrf_adaptive"
+    HACKRF_SHARDED = "hackrf_sharded"
 
 
 class MenuButtonId(str, Enum):
@@ -208,6 +225,7 @@ class MenuButtonId(str, Enum):
     TWO_D_COLOUR_WHITE  = "btnTwoDColourWhite"
     TWO_D_COLOUR_BLUE   = "btnTwoDColourBlue"
     DENSITY                  = "btnDensity"
+    BANDS                    = "btnBands"
     DENSITY_COLOURMAP        = "btnDensityColourmap"
     DENSITY_COLOURMAP_MAGMA  = "btnDensityColourmapMagma"
     DENSITY_COLOURMAP_VIRIDIS = "btnDensityColourmapViridis"
@@ -222,6 +240,40 @@ class MenuButtonId(str, Enum):
     RTL_SAMPLES = "btnRtlSamples"
     MICROPHONE_SAMPLES = "btnMicrophoneSamples"
     HACKRF_SAMPLES = "btnHackrfSamples"
+    IQ_FILE             = "btnIqFile"
+    IQ_FILE_OPEN        = "btnIqFileOpen"
+    PLAYBACK_REALTIME   = "btnPlaybackRealtime"
+    PLAYBACK_X4         = "btnPlaybackX4"
+    PLAYBACK_FAST       = "btnPlaybackFast"
+    PLAYBACK_STEP       = "btnPlaybackStep"
+    PLAYBACK_LOOP       = "btnPlaybackLoop"
+    PLAYBACK_REWIND     = "btnPlaybackRewind"
+    PLAYBACK_SKIP       = "btnPlaybackSkip"
+    SWEEP_FILE          = "btnSweepFile"
+    SWEEP_FILE_OPEN     = "btnSweepFileOpen"
+    SWEEP_PLAY_X1       = "btnSweepPlayX1"
+    SWEEP_PLAY_X10      = "btnSweepPlayX10"
+    SWEEP_PLAY_X100     = "btnSweepPlayX100"
+    SWEEP_PLAY_LOOP     = "btnSweepPlayLoop"
+    SWEEP_PLAY_REWIND   = "btnSweepPlayRewind"
+    SWEEP_PLAY_SKIP     = "btnSweepPlaySkip"
+    SIMULATE            = "btnSimulate"
+    SIM_SAMPLES         = "btnSimSamples"
+    SIM_SWEEP           = "btnSimSweep"
+    NETWORK_STREAM      = "btnNetworkStream"
+    SHARED_MEMORY       = "btnSharedMemory"
+    RTL_TCP             = "btnRtlTcp"
+    HACKRF_WIDEBAND     = "btnHackrfWideband"
+    HACKRF_ADAPTIVE     = "btnHackrfAdaptive"
+    HACKRF_ADAPTIVE_IQ  = "btnHackrfAdaptiveIq"
+    HACKRF_SHARDED      = "btnHackrfSharded"
+    HACKRF_MATCH_LEVELS = "btnHackrfShardedMatch"
+    MULTI_SOURCE        = "btnMultiSource"
+    MULTI_ADD           = "btnMultiSourceAdd"
+    MULTI_OVERLAY       = "btnMultiSourceOverlay"
+    MULTI_SIDE_BY_SIDE  = "btnMultiSourceSideBySide"
+    MULTI_REMOVE        = "btnMultiSourceRemove"
+    MULTI_CLEAR         = "btnMultiSourceClear"
     HAMMING = "btnHamming"
     HANNING = "btnHanning"
     RECTANGLE = "btnRectangle"
@@ -331,6 +383,7 @@ class MenuButtonId(str, Enum):
     CONST_POINTS_2K         = "btnConstPoints2K"
     CONST_POINTS_5K         = "btnConstPoints5K"
     CONST_POINTS_10K        = "btnConstPoints10K"
+    CONST_POINTS_100K       = "btnConstPoints100K"
     DUTY_CYCLE            = "btnDutyCycle"
     # 3D display options
     THREE_D_GRID        = "btn3dGrid"
@@ -354,6 +407,29 @@ class MenuButtonId(str, Enum):
     ZERO_SPAN_FALL           = "btnZeroSpanFall"
     ZERO_SPAN_TRIGGER_LEVEL  = "btnZeroSpanTriggerLevel"
     ZERO_SPAN_TIME           = "btnZeroSpanTime"
+    ZERO_SPAN_RBW            = "btnZeroSpanRbw"
+    ZERO_SPAN_RBW_1K         = "btnZeroSpanRbw1k"
+    ZERO_SPAN_RBW_10K        = "btnZeroSpanRbw10k"
+    ZERO_SPAN_RBW_30K        = "btnZeroSpanRbw30k"
+    ZERO_SPAN_RBW_100K       = "btnZeroSpanRbw100k"
+    ZERO_SPAN_RBW_300K       = "btnZeroSpanRbw300k"
+    ZERO_SPAN_RBW_1M         = "btnZeroSpanRbw1M"
+    ZERO_SPAN_HYSTERESIS     = "btnZeroSpanHysteresis"
+    ZERO_SPAN_HYST_0_5       = "btnZeroSpanHyst0_5"
+    ZERO_SPAN_HYST_1         = "btnZeroSpanHyst1"
+    ZERO_SPAN_HYST_3         = "btnZeroSpanHyst3"
+    ZERO_SPAN_HYST_6         = "btnZeroSpanHyst6"
+    ZERO_SPAN_HOLDOFF        = "btnZeroSpanHoldoff"
+    ZERO_SPAN_HOLDOFF_OFF    = "btnZeroSpanHoldoffOff"
+    ZERO_SPAN_HOLDOFF_100U   = "btnZeroSpanHoldoff100u"
+    ZERO_SPAN_HOLDOFF_1M     = "btnZeroSpanHoldoff1m"
+    ZERO_SPAN_HOLDOFF_10M    = "btnZeroSpanHoldoff10m"
+    ZERO_SPAN_HOLDOFF_100M   = "btnZeroSpanHoldoff100m"
+    ZERO_SPAN_PRE_TRIGGER    = "btnZeroSpanPreTrigger"
+    ZERO_SPAN_PRE_0          = "btnZeroSpanPre0"
+    ZERO_SPAN_PRE_10         = "btnZeroSpanPre10"
+    ZERO_SPAN_PRE_25         = "btnZeroSpanPre25"
+    ZERO_SPAN_PRE_50         = "btnZeroSpanPre50"
     # RF Gain
     RF_GAIN              = "btnRfGain"
     GAIN_NOT_AVAILABLE   = "btnGainNotAvailable"
@@ -396,6 +472,10 @@ class MenuButtonId(str, Enum):
     HACKRF_SWEEP_RBW_100K = "btnHackRFSweepRbw100k"
     HACKRF_SWEEP_RBW_200K = "btnHackRFSweepRbw200k"
     HACKRF_SWEEP_RBW_500K = "btnHackRFSweepRbw500k"
+    # HackRF Sweep band sets (one hackrf_sweep -f per band)
+    HACKRF_BANDS_ISM      = "btnHackRFBandsIsm"
+    HACKRF_BANDS_ISM_ALL  = "btnHackRFBandsIsmAll"
+    HACKRF_BANDS_OFF      = "btnHackRFBandsOff"
     # Waterfall colour maps
     WFALL_COLOUR_GQRX    = "btnWfallColourGqrx"
     WFALL_COLOUR_MAGMA   = "btnWfallColourMagma"
@@ -421,3 +501,23 @@ class MenuButtonId(str, Enum):
     EXPORT_DISPLAY_SVG  = "btnExportDisplaySvg"
     EXPORT_WINDOW_PNG   = "btnExportWindowPng"
     EXPORT_WINDOW_JPEG  = "btnExportWindowJpeg"
+    IQ_CAPTURE          = "btnIqCapture"
+    IQ_SAVE             = "btnIqSave"
+    IQ_HISTORY_1S       = "btnIqHistory1s"
+    IQ_HISTORY_2S       = "btnIqHistory2s"
+    IQ_HISTORY_5S       = "btnIqHistory5s"
+    IQ_HISTORY_10S      = "btnIqHistory10s"
+    SWEEP_RECORD        = "btnSweepRecord"
+    SWEEP_RECORD_F16    = "btnSweepRecordF16"
+    SWEEP_RECORD_F32    = "btnSweepRecordF32"
+    SWEEP_RECORD_STOP   = "btnSweepRecordStop"
+    FRAME_SERVER        = "btnFrameServer"
+    FRAME_SERVE_INT16   = "btnFrameServeInt16"
+    FRAME_SERVE_DELTA   = "btnFrameServeDelta"
+    FRAME_SERVE_STOP    = "btnFrameServeStop"
+    FRAME_RING          = "btnFrameRing"
+    FRAME_RING_START    = "btnFrameRingStart"
+    FRAME_RING_STOP     = "btnFrameRingStop"
+    SCPI_SERVER         = "btnScpiServer"
+    SCPI_START          = "btnScpiStart"
+    SCPI_STOP           = "btnScpiStop"
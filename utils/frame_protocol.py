@@ -0,0 +1,135 @@
+"""Binary wire format for streaming processed spectrum frames.
+
+Shared by the frame server (core.frame_server) and the network client
+source (datasources.network_source).  Every message is a 24-byte header
+followed by ``payload_len`` bytes:
+
+    magic    2s   b"TD"
+    version  B
+    type     B    MSG_GRID / MSG_FRAME / MSG_DELTA / MSG_EVENT
+    grid_id  H    grid the frame belongs to (0 for events)
+    flags    H    reserved, 0
+    seq      I    frame sequence number
+    time     d    Unix time the frame was produced
+    length   I    payload bytes
+
+A grid is sent once before the first frame that uses it, as one
+(first bin, last bin, bin count) record per evenly spaced run of bins: a
+single record for a linspace grid, one per band or bin size for a band set
+with gaps or a mixed-resolution sweep (``utils.frequency_helpers.grid_segments``).  Frame power is quantised to int16 in 0.01 dB steps with NaN
+carried as -32768.  A delta frame is the int16 difference from the
+previous frame on the same grid, its low and high bytes grouped and then
+zlib-compressed, so a slowly changing spectrum costs a fraction of a key
+frame.
+"""
+
+import struct
+import zlib
+
+import numpy as np
+
+DEFAULT_PORT = 5299
+
+MAGIC = b"TD"
+VERSION = 1
+
+MSG_GRID = 1
+MSG_FRAME = 2          # int16 key frame
+MSG_DELTA = 3          # zlib(byte-grouped int16 difference from the previous frame)
+MSG_EVENT = 4          # UTF-8 status text
+
+HEADER = struct.Struct("<2sBBHHIdI")
+GRID = struct.Struct("<ddI")
+
+DB_STEP = 0.01
+NAN_CODE = -32768
+_DELTA_LEVEL = 1
+MAX_PAYLOAD = 64 * 1024 * 1024
+
+
+class ProtocolError(ValueError):
+    """Raised for a malformed or unsupported message."""
+
+
+def quantise(power: np.ndarray) -> np.ndarray:
+    """Power in dB → int16 in 0.01 dB steps (NaN → NAN_CODE)."""
+    power = np.asarray(power, dtype=np.float32)
+    q = np.rint(np.clip(power, -327.67, 327.67) / DB_STEP)
+    q[np.isnan(power)] = NAN_CODE
+    return q.astype(np.int16)
+
+
+def dequantise(q: np.ndarray) -> np.ndarray:
+    """int16 in 0.01 dB steps → float32 dB (NAN_CODE → NaN)."""
+    power = q.astype(np.float32) * np.float32(DB_STEP)
+    power[q == NAN_CODE] = np.nan
+    return power
+
+
+def encode_header(msg_type: int, grid_id: int, seq: int, timestamp: float, payload_len: int) -> bytes:
+    return HEADER.pack(MAGIC, VERSION, msg_type, grid_id, 0, seq & 0xFFFFFFFF, timestamp, payload_len)
+
+
+def decode_header(data: bytes) -> tuple:
+    """Returns (type, grid_id, seq, timestamp, payload_len)."""
+    magic, version, msg_type, grid_id, _flags, seq, timestamp, length = HEADER.unpack(data)
+    if magic != MAGIC:
+        raise ProtocolError(f"Bad magic {magic!r}")
+    if version != VERSION:
+        raise ProtocolError(f"Unsupported protocol version {version}")
+    if length > MAX_PAYLOAD:
+        raise ProtocolError(f"Payload of {length} bytes exceeds the limit")
+    return msg_type, grid_id, seq, timestamp, length
+
+
+def encode_grid(grid_id: int, segments, timestamp: float = 0.0) -> bytes:
+    """Grid message for a tuple of (start, stop, bins) segments."""
+    payload = b"".join(GRID.pack(start, stop, bins) for start, stop, bins in segments)
+    return encode_header(MSG_GRID, grid_id, 0, timestamp, len(payload)) + payload
+
+
+def decode_grid(payload: bytes) -> tuple:
+    """Returns a tuple of (start, stop, bins) segments."""
+    if not payload or len(payload) % GRID.size:
+        raise ProtocolError(f"Grid payload is {len(payload)} bytes, expected a multiple of {GRID.size}")
+    return tuple(GRID.iter_unpack(payload))
+
+
+def grid_bins(segments) -> int:
+    """Total bin count of a grid's segments."""
+    return sum(int(bins) for _, _, bins in segments)
+
+
+def frame_payload(q: np.ndarray) -> bytes:
+    return q.astype('<i2', copy=False).tobytes()
+
+
+def delta_payload(q: np.ndarray, previous: np.ndarray) -> bytes:
+    # int16 wrap-around is undone exactly by the wrapping add in apply_delta
+    diff = np.subtract(q, previous, dtype=np.int16).astype('<i2', copy=False)
+    # Low bytes then high bytes: small differences make the high half nearly constant
+    shuffled = diff.view(np.uint8).reshape(-1, 2).T.tobytes()
+    return zlib.compress(shuffled, _DELTA_LEVEL)
+
+
+def decode_frame(payload: bytes, bins: int) -> np.ndarray:
+    q = np.frombuffer(payload, dtype='<i2')
+    if len(q) != bins:
+        raise ProtocolError(f"Frame has {len(q)} bins, grid has {bins}")
+    return q.astype(np.int16)
+
+
+def apply_delta(payload: bytes, previous: np.ndarray) -> np.ndarray:
+    try:
+        shuffled = np.frombuffer(zlib.decompress(payload), dtype=np.uint8)
+    except zlib.error as e:
+        raise ProtocolError(f"Corrupt delta frame: {e}")
+    if len(shuffled) != 2 * len(previous):
+        raise ProtocolError(f"Delta has {len(shuffled) // 2} bins, grid has {len(previous)}")
+    diff = np.ascontiguousarray(shuffled.reshape(2, -1).T).view('<i2').ravel()
+    return np.add(previous, diff, dtype=np.int16)
+
+
+def encode_event(text: str, timestamp: float) -> bytes:
+    data = text.encode('utf-8')
+    return encode_header(MSG_EVENT, 0, 0, timestamp, len(data)) + data
@@ -0,0 +1,291 @@
+"""Shared-memory ring of processed spectrum frames for local consumers.
+
+The analyser (GUI or headless daemon) is the single producer: FrameRing
+writes each processed frame into the next slot of a
+``multiprocessing.shared_memory`` block.  Any process on the host can open
+the block by name with FrameRingReader and read the latest frame or the
+last N frames as numpy views straight onto the shared memory, without
+copying and without the producer knowing it is there.
+
+Layout (little-endian):
+
+    header    64 bytes   magic, version, slots, max_bins, frames written
+    slots     slots × 48 bytes   per-slot seqlock word, frame number,
+                                 timestamp, first bin, last bin, bin count,
+                                 segment count
+    segments  slots × MAX_SEGMENTS × 24 bytes   per-slot grid: first bin,
+                                 last bin, bin count of each evenly spaced run
+    data      slots × max_bins float32
+
+The segment table carries grids that are not one linspace — bands with gaps
+between them, or a mixed-resolution sweep — so readers rebuild every bin
+(``FrameView.freqs``); a frame whose grid has more than ``MAX_SEGMENTS``
+runs is skipped.
+
+Each slot is guarded by a seqlock: the producer makes the slot's sequence
+word odd, writes the frame and its metadata, then makes it even again.  A
+reader reads the word, uses the data and checks the word is unchanged and
+even; otherwise the producer overwrote the slot meanwhile.  With S slots a
+view of the latest frame stays valid for the next S - 1 frames, so
+``FrameView.valid()`` after processing is enough to trust a zero-copy read.
+"""
+
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+from utils.frequency_helpers import grid_segments, segments_grid
+
+DEFAULT_NAME = "tdnsa_frames"
+DEFAULT_SLOTS = 32
+DEFAULT_MAX_BINS = 1 << 18         # a full 0-7 GHz HackRF sweep at 30 kHz bins fits
+
+MAX_SEGMENTS = 64                  # evenly spaced runs per frame grid
+
+MAGIC = 0x52534454                 # b"TDSR"
+VERSION = 2
+
+_HEADER = struct.Struct("<IHxxIIQ")         # magic, version, slots, max_bins, frames written
+_HEADER_SIZE = 64
+_SLOT = struct.Struct("<QQdddII")           # seq, frame number, time, start, stop, bins, segments
+_SLOT_META = struct.Struct("<QdddII")        # the slot after its seq word
+_SEGMENT = struct.Struct("<ddI4x")           # first bin, last bin, bin count
+_COUNTER = struct.Struct("<Q")
+_FRAMES_OFFSET = 16                          # byte offset of the frames-written counter
+_READ_RETRIES = 8
+
+_created: set = set()              # blocks this process produces
+
+
+def _layout(slots: int, max_bins: int) -> tuple[int, int, int]:
+    """Returns (segment table offset, data offset, total size)."""
+    segments_offset = _HEADER_SIZE + slots * _SLOT.size
+    data_offset = segments_offset + slots * MAX_SEGMENTS * _SEGMENT.size
+    data_offset = (data_offset + 63) // 64 * 64
+    return segments_offset, data_offset, data_offset + slots * max_bins * 4
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Open an existing block without registering it for removal when this process exits."""
+    shm = shared_memory.SharedMemory(name=name)
+    if name in _created:
+        return shm                 # the producer's own registration covers it
+    try:
+        # Before Python 3.13 every attach is tracked and the block is unlinked
+        # when the reader exits, taking it away from the producer
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    return shm
+
+
+class FrameView:
+    """A zero-copy frame in the ring.
+
+    ``power`` is a view onto shared memory.  Call ``valid()`` after using it
+    to confirm the producer did not overwrite the slot meanwhile, or
+    ``copy()`` to take a private copy that is checked the same way.
+    """
+
+    __slots__ = ('frame', 'timestamp', 'segments', 'power', '_reader', '_slot', '_seq')
+
+    def __init__(self, reader, slot, seq, frame, timestamp, segments, power):
+        self._reader = reader
+        self._slot = slot
+        self._seq = seq
+        self.frame = frame
+        self.timestamp = timestamp
+        self.segments = segments
+        self.power = power
+
+    @property
+    def start(self) -> float:
+        return self.segments[0][0]
+
+    @property
+    def stop(self) -> float:
+        return self.segments[-1][1]
+
+    @property
+    def freqs(self) -> np.ndarray:
+        return segments_grid(self.segments)
+
+    def valid(self) -> bool:
+        return self._reader._slot_seq(self._slot) == self._seq
+
+    def copy(self) -> Optional[np.ndarray]:
+        """Private copy of the power, or None if the slot was overwritten."""
+        power = self.power.copy()
+        return power if self.valid() else None
+
+
+class FrameRing:
+    """Producer side: creates the block and writes frames into it.
+
+    Also usable as a headless sink (``set_source``, ``write_frame``,
+    ``write_peaks``, ``write_event``, ``close``).
+
+    Args:
+        name:     Shared memory block name.
+        slots:    Frames kept.
+        max_bins: Largest frame accepted; larger frames, and frames whose
+                  grid has more than ``MAX_SEGMENTS`` runs, are skipped.
+    """
+
+    def __init__(self, name: str = DEFAULT_NAME, slots: int = DEFAULT_SLOTS,
+                 max_bins: int = DEFAULT_MAX_BINS):
+        if slots < 2 or max_bins < 1:
+            raise ValueError("A frame ring needs at least 2 slots and 1 bin")
+        self.name = name
+        self.slots = int(slots)
+        self.max_bins = int(max_bins)
+        self._segments_offset, self._data_offset, size = _layout(self.slots, self.max_bins)
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _created.add(name)
+        buf = self._shm.buf
+        self._slot_words = np.ndarray((self.slots, _SLOT.size // 8), dtype='<u8',
+                                      buffer=buf, offset=_HEADER_SIZE)
+        self._data = np.ndarray((self.slots, self.max_bins), dtype='<f4',
+                                buffer=buf, offset=self._data_offset)
+        self._slot_words[:] = 0
+        _HEADER.pack_into(buf, 0, MAGIC, VERSION, self.slots, self.max_bins, 0)
+        self.frames_written = 0
+        self.frames_skipped = 0
+        self._grid = None
+
+    def publish(self, freqs: np.ndarray, power: np.ndarray, timestamp: Optional[float] = None) -> bool:
+        """Write one frame into the next slot.
+
+        Returns:
+            False if the frame repeats the previous one, or has more than
+            ``max_bins`` bins or ``MAX_SEGMENTS`` grid runs, and was not
+            written.
+        """
+        bins = len(power)
+        grid = grid_segments(freqs) if bins else ()
+        if bins == 0 or bins > self.max_bins or len(grid) > MAX_SEGMENTS:
+            self.frames_skipped += 1
+            return False
+        power = np.asarray(power, dtype=np.float32)
+        frame = self.frames_written
+        slot = frame % self.slots
+        if grid == self._grid and np.array_equal(
+                self._data[(frame - 1) % self.slots, :bins], power, equal_nan=True):
+            return False                  # a sweep source repeating its last sweep
+        self._grid = grid
+        timestamp = time.time() if timestamp is None else timestamp
+        words = self._slot_words[slot]
+        seq = int(words[0])
+        words[0] = seq + 1                                   # odd: being written
+        self._data[slot, :bins] = power
+        _SLOT_META.pack_into(self._shm.buf, _HEADER_SIZE + slot * _SLOT.size + 8,
+                             frame, timestamp, grid[0][0], grid[-1][1], bins, len(grid))
+        table = self._segments_offset + slot * MAX_SEGMENTS * _SEGMENT.size
+        for i, segment in enumerate(grid):
+            _SEGMENT.pack_into(self._shm.buf, table + i * _SEGMENT.size, *segment)
+        words[0] = seq + 2                                   # even: complete
+        self.frames_written = frame + 1
+        _COUNTER.pack_into(self._shm.buf, _FRAMES_OFFSET, self.frames_written)
+        return True
+
+    # Headless sink interface
+
+    def set_source(self, source_type: str, cal_offset_db: float) -> None:
+        pass
+
+    def write_frame(self, timestamp: float, freqs: np.ndarray, power: np.ndarray) -> None:
+        self.publish(freqs, power, timestamp)
+
+    def write_peaks(self, timestamp: float, peaks: list) -> None:
+        pass
+
+    def write_event(self, timestamp: float, text: str) -> None:
+        pass
+
+    def close(self) -> None:
+        """Remove the block; readers that still have it mapped keep their views."""
+        if self._shm is None:
+            return
+        self._slot_words = self._data = None
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        _created.discard(self.name)
+        self._shm = None
+
+
+class FrameRingReader:
+    """Consumer side: maps an existing ring read-only by convention.
+
+    Args:
+        name: Shared memory block name the producer created.
+    """
+
+    def __init__(self, name: str = DEFAULT_NAME):
+        self.name = name
+        self._shm = _attach(name)
+        magic, version, slots, max_bins, _ = _HEADER.unpack_from(self._shm.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self._shm.close()
+            raise ValueError(f"Shared memory '{name}' is not a version {VERSION} frame ring")
+        self.slots = slots
+        self.max_bins = max_bins
+        self._segments_offset, data_offset, _ = _layout(slots, max_bins)
+        self._slot_words = np.ndarray((slots, _SLOT.size // 8), dtype='<u8',
+                                      buffer=self._shm.buf, offset=_HEADER_SIZE)
+        self._data = np.ndarray((slots, max_bins), dtype='<f4',
+                                buffer=self._shm.buf, offset=data_offset)
+
+    @property
+    def frames_written(self) -> int:
+        return _COUNTER.unpack_from(self._shm.buf, _FRAMES_OFFSET)[0]
+
+    def _slot_seq(self, slot: int) -> int:
+        return int(self._slot_words[slot, 0])
+
+    def _read(self, frame: int) -> Optional[FrameView]:
+        slot = frame % self.slots
+        for _ in range(_READ_RETRIES):
+            seq = self._slot_seq(slot)
+            if seq & 1:
+                continue                                     # being written
+            number, timestamp, _start, _stop, bins, count = _SLOT_META.unpack_from(
+                self._shm.buf, _HEADER_SIZE + slot * _SLOT.size + 8)
+            table = self._segments_offset + slot * MAX_SEGMENTS * _SEGMENT.size
+            segments = tuple(_SEGMENT.unpack_from(self._shm.buf, table + i * _SEGMENT.size)
+                             for i in range(min(count, MAX_SEGMENTS)))
+            if self._slot_seq(slot) != seq:
+                continue
+            if number != frame:
+                return None                                  # already overwritten
+            return FrameView(self, slot, seq, number, timestamp, segments,
+                             self._data[slot, :bins])
+        return None
+
+    def latest(self) -> Optional[FrameView]:
+        """The newest complete frame, or None if nothing has been written."""
+        written = self.frames_written
+        return self._read(written - 1) if written else None
+
+    def last(self, n: int) -> list:
+        """Up to ``n`` newest frames, oldest first (at most ``slots - 1``)."""
+        written = self.frames_written
+        n = min(int(n), written, self.slots - 1)
+        views = (self._read(frame) for frame in range(written - n, written))
+        return [v for v in views if v is not None]
+
+    def close(self) -> None:
+        if self._shm is None:
+            return
+        self._slot_words = self._data = None
+        try:
+            self._shm.close()
+        except BufferError:
+            pass                  # views handed out still reference the mapping
+        self._shm = None
@@ -36,6 +36,42 @@ def calculate_frequency_bins_from_range(start_freq: float, stop_freq: float, num
     return np.linspace(start_freq, stop_freq, num_bins)
 
 
+def grid_segments(freq_bins: np.ndarray) -> tuple:
+    """Split a frequency grid into its evenly spaced runs.
+
+    A linspace grid is one run; bands laid end to end with gaps between
+    them, or a grid mixing bin sizes, is one run per band or resolution.
+    ``segments_grid`` rebuilds the grid from the result.
+
+    Returns:
+        Tuple of (first bin, last bin, bin count) per run, in Hz.
+    """
+    f = np.asarray(freq_bins, dtype=np.float64)
+    n = len(f)
+    if n < 3:
+        return ((float(f[0]), float(f[-1]), n),) if n else ()
+    d = np.diff(f)
+    # Bin k + 1 starts a new step where d[k] differs from d[k - 1]
+    breaks = np.flatnonzero(np.abs(d[1:] - d[:-1]) > 1e-6 * np.abs(d[:-1])) + 1
+    segments, i = [], 0
+    while i < n:
+        if i == n - 1:
+            segments.append((float(f[i]), float(f[i]), 1))
+            break
+        k = np.searchsorted(breaks, i, side='right')     # first step change after bin i
+        j = int(breaks[k]) if k < len(breaks) else n - 1
+        segments.append((float(f[i]), float(f[j]), j - i + 1))
+        i = j + 1
+    return tuple(segments)
+
+
+def segments_grid(segments) -> np.ndarray:
+    """Frequency grid of (first bin, last bin, bin count) runs, as ``grid_segments`` returns."""
+    if not segments:
+        return np.array([])
+    return np.concatenate([np.linspace(start, stop, int(bins)) for start, stop, bins in segments])
+
+
 def update_display_frequency_bins(main_window, freq_bins: np.ndarray) -> None:
     """Update frequency bins for the current display widget.
 
@@ -97,6 +133,20 @@ def format_hz(hz: float, precision: int = 4) -> str:
     return f"{hz:.1f} Hz"
 
 
+def format_seconds(t: float, precision: int = 3) -> str:
+    """Format a duration in seconds with a readable unit (s/ms/µs).
+
+    Returns:
+        e.g. '2 s', '12.5 ms', '800 µs'.
+    """
+    a = abs(t)
+    if a >= 1.0:
+        return f"{t:.{precision}g} s"
+    if a >= 1e-3:
+        return f"{t * 1e3:.{precision}g} ms"
+    return f"{t * 1e6:.{precision}g} µs"
+
+
 def format_frequency(freq: float, is_microphone: bool = False) -> tuple[str, str]:
     """Format frequency value with appropriate unit.
 
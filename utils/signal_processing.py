@@ -71,3 +71,134 @@ class TraceAverager:
     @property
     def n(self) -> int:
         return self._n
+
+
+class SampleRing:
+    """Fixed-capacity sample history with zero-copy access to recent data.
+
+    Every sample is written twice (at ``pos`` and ``pos + capacity``) so
+    the most recent ``capacity`` samples are always one contiguous slice
+    of the backing array — the same double-buffer layout the waterfall
+    uses for its rows.  ``total`` counts every sample ever written, giving
+    callers a stable absolute index for timestamps.
+    """
+
+    def __init__(self, capacity: int, dtype=np.float32):
+        self.capacity = max(int(capacity), 1)
+        self._buf = np.zeros(2 * self.capacity, dtype=dtype)
+        self._pos = 0
+        self._count = 0
+        self.total = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def dtype(self):
+        return self._buf.dtype
+
+    def clear(self) -> None:
+        self._pos = 0
+        self._count = 0
+        self.total = 0
+
+    def write(self, samples: np.ndarray) -> None:
+        """Append samples, overwriting the oldest once full."""
+        n = len(samples)
+        if n == 0:
+            return
+        cap = self.capacity
+        if n >= cap:
+            samples = samples[-cap:]
+            self._buf[:cap] = samples
+            self._buf[cap:] = samples
+            self._pos = 0
+        else:
+            first = min(n, cap - self._pos)
+            for base in (0, cap):
+                self._buf[base + self._pos:base + self._pos + first] = samples[:first]
+                self._buf[base:base + n - first] = samples[first:]
+            self._pos = (self._pos + n) % cap
+        self._count = min(self._count + n, cap)
+        self.total += n
+
+    def latest(self, n: Optional[int] = None) -> np.ndarray:
+        """Return a read-only view of the most recent ``n`` samples (oldest first)."""
+        n = self._count if n is None else min(int(n), self._count)
+        end = self._pos + self.capacity
+        view = self._buf[end - n:end]
+        view.flags.writeable = False
+        return view
+
+    def since(self, abs_index: int) -> np.ndarray:
+        """Return a view of every retained sample from absolute index ``abs_index`` on."""
+        oldest = self.total - self._count
+        return self.latest(self.total - max(int(abs_index), oldest))
+
+
+def minmax_envelope(samples: np.ndarray, n_pixels: int, dt: float = 1.0):
+    """Reduce a trace to a min/max pair per output pixel.
+
+    Narrow spikes stay visible however many samples fall in a pixel.
+    Short traces (at most two samples per pixel) are returned unchanged.
+
+    Args:
+        samples: 1-D sample array.
+        n_pixels: Number of horizontal output pixels.
+        dt: Time step between samples, used to build the x axis.
+
+    Returns:
+        (x, y) arrays; x holds each pixel's start time, repeated for the
+        min and max points.
+    """
+    n = len(samples)
+    n_pixels = max(int(n_pixels), 1)
+    if n <= 2 * n_pixels:
+        return np.arange(n, dtype=np.float64) * dt, samples
+    edges = np.linspace(0, n, n_pixels, endpoint=False).astype(np.intp)
+    y = np.empty(2 * n_pixels, dtype=samples.dtype)
+    y[0::2] = np.minimum.reduceat(samples, edges)
+    y[1::2] = np.maximum.reduceat(samples, edges)
+    x = np.repeat(edges * dt, 2)
+    return x, y
+
+
+def find_top_peaks(freq_bins: np.ndarray, power: np.ndarray,
+                   n: int = 5, min_sep_bins: int = 10,
+                   min_excursion_db: float = 10.0) -> list:
+    """Return up to n (freq, power) tuples for the highest local maxima.
+
+    Two candidates are treated as the same signal unless there is both a
+    minimum bin separation AND a valley at least min_excursion_db below
+    both peaks between them.
+    """
+    if len(power) < 3:
+        return []
+    is_max = (power[1:-1] > power[:-2]) & (power[1:-1] > power[2:])
+    indices = np.where(is_max)[0] + 1
+
+    if len(indices) == 0:
+        return []
+
+    indices = indices[np.argsort(power[indices])[::-1]]
+    selected, selected_power = [], []
+
+    for idx in indices:
+        if len(selected) >= n:
+            break
+        reject = False
+        for sel_idx, sel_pwr in zip(selected, selected_power):
+            if abs(idx - sel_idx) < min_sep_bins:
+                reject = True
+                break
+            lo, hi = min(idx, sel_idx), max(idx, sel_idx)
+            valley = float(np.min(power[lo : hi + 1]))
+            if (power[idx] - valley < min_excursion_db
+                    or sel_pwr - valley < min_excursion_db):
+                reject = True
+                break
+        if not reject:
+            selected.append(idx)
+            selected_power.append(float(power[idx]))
+
+    return [(float(freq_bins[i]), float(power[i])) for i in selected]